@@ -34,7 +34,8 @@ options:
         description:
             - Specifies the name of a BFD session.
               The value is a string of 1 to 15 case-sensitive characters without spaces.
-        required: true
+              Either session_name or sessions must be set.
+        required: false
         default: null
     create_type:
         description:
@@ -80,6 +81,20 @@ options:
               The value is a bool type.
         required: false
         default: false
+    sessions:
+        description:
+            - A list of BFD sessions, each one is a dict with session_name and optionally create_type,
+              addr_type, out_if_name, dest_addr, src_addr, vrf_name and use_default_ip.
+              Unset create_type, addr_type and src_addr take the value of the module option of the same name,
+              so does vrf_name for sessions with dest_addr.
+              If C(state=present), the list is the whole set of BFD sessions of the device,
+              the ones that are not in the list are removed and the missing ones are created.
+              The binding of an existing session can not be changed, so a listed session whose
+              binding differs from the device fails the module before anything is sent.
+              If C(state=absent), the sessions in the list are removed.
+              Can not be used with session_name, out_if_name, dest_addr and use_default_ip.
+        required: false
+        default: null
     state:
         description:
             - Determines whether the config should be present or not on the device.
@@ -121,6 +136,15 @@ EXAMPLES = '''
       session_name: bfd_multi_hop
       dest_addr: 10.1.1.1
       provider: '{{ cli }}'
+
+  - name: Replace all BFD sessions of the device
+    ce_bfd_session:
+      vrf_name: vpna
+      sessions:
+        - {session_name: pe1_static, dest_addr: 10.1.1.1}
+        - {session_name: pe1_bgp, dest_addr: 10.1.2.1, src_addr: 10.1.2.2}
+        - {session_name: bfd_l2link, out_if_name: 10GE1/0/1, use_default_ip: true}
+      provider: '{{ cli }}'
 '''
 
 RETURN = '''
@@ -178,41 +202,37 @@ changed:
 
 import sys
 import socket
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import set_nc_config, set_nc_config_chunks, ce_argument_spec, get_bfd_snapshot
 
 
-CE_NC_GET_BFD = """
-    <filter type="subtree">
-      <bfd xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-      %s
-      </bfd>
-    </filter>
+CE_NC_SET_BFD_SESSIONS_HEAD = """
+<config>
+  <bfd xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <bfdCfgSessions>
 """
 
-CE_NC_GET_BFD_GLB = """
-        <bfdSchGlobal>
-          <bfdEnable></bfdEnable>
-          <defaultIp></defaultIp>
-        </bfdSchGlobal>
+CE_NC_SET_BFD_SESSIONS_TAIL = """
+    </bfdCfgSessions>
+  </bfd>
+</config>
 """
 
-CE_NC_GET_BFD_SESSION = """
-        <bfdCfgSessions>
-          <bfdCfgSession>
-            <sessName>%s</sessName>
-            <createType></createType>
-            <addrType></addrType>
-            <outIfName></outIfName>
-            <destAddr></destAddr>
-            <srcAddr></srcAddr>
-            <vrfName></vrfName>
-            <useDefaultIp></useDefaultIp>
-          </bfdCfgSession>
-        </bfdCfgSessions>
+CE_NC_DELETE_BFD_SESSION = """
+      <bfdCfgSession operation="delete">
+        <sessName>%s</sessName>
+      </bfdCfgSession>
 """
 
+# leaves of a bfd session that belong to the session binding
+BFD_SESSION_ATTRS = ["sessName", "createType", "addrType", "outIfName", "destAddr",
+                     "srcAddr", "vrfName", "useDefaultIp"]
+
+# options of a sessions entry, the ones that take the module option when unset
+BFD_SESSION_OPTIONS = ["session_name", "create_type", "addr_type", "out_if_name", "dest_addr",
+                       "src_addr", "vrf_name", "use_default_ip"]
+BFD_SESSION_INHERITED = ["create_type", "addr_type", "src_addr", "vrf_name"]
+
 
 def is_valid_ip_vpn(vpname):
     """check ip vpn"""
@@ -334,6 +354,7 @@ class BfdSession(object):
         self.src_addr = self.module.params['src_addr']
         self.vrf_name = self.module.params['vrf_name']
         self.use_default_ip = self.module.params['use_default_ip']
+        self.sessions = self.module.params['sessions']
         self.state = self.module.params['state']
 
         # host info
@@ -354,78 +375,108 @@ class BfdSession(object):
     def __init_module__(self):
         """init module"""
 
-        mutually_exclusive = [('use_default_ip', 'dest_addr')]
+        mutually_exclusive = [('use_default_ip', 'dest_addr'), ('sessions', 'session_name'),
+                              ('sessions', 'out_if_name'), ('sessions', 'dest_addr'), ('sessions', 'use_default_ip')]
+        required_one_of = [('session_name', 'sessions')]
         self.module = AnsibleModule(argument_spec=self.spec,
                                     mutually_exclusive=mutually_exclusive,
+                                    required_one_of=required_one_of,
                                     supports_check_mode=True)
 
-    def get_bfd_dict(self):
+    def get_bfd_dict(self, refresh=False):
         """bfd config dict"""
 
         bfd_dict = dict()
-        bfd_dict["global"] = dict()
-        bfd_dict["session"] = dict()
-        conf_str = CE_NC_GET_BFD % (CE_NC_GET_BFD_GLB + (CE_NC_GET_BFD_SESSION % self.session_name))
-
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return bfd_dict
-
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
+        snapshot = get_bfd_snapshot(self.module, refresh)
 
         # get bfd global info
-        glb = root.find("data/bfd/bfdSchGlobal")
-        if glb:
-            for attr in glb:
-                bfd_dict["global"][attr.tag] = attr.text
+        bfd_dict["global"] = snapshot["globals"]
 
         # get bfd session info
-        sess = root.find("data/bfd/bfdCfgSessions/bfdCfgSession")
-        if sess:
-            for attr in sess:
-                bfd_dict["session"][attr.tag] = attr.text
+        bfd_dict["session"] = dict()
+        bfd_dict["sessions"] = dict((name, dict((tag, session.get(tag)) for tag in BFD_SESSION_ATTRS))
+                                    for name, session in snapshot["sessions"].items())
+        if self.session_name in bfd_dict["sessions"]:
+            bfd_dict["session"] = bfd_dict["sessions"][self.session_name]
 
         return bfd_dict
 
-    def is_session_match(self):
+    def get_want(self):
+        """options of the single session"""
+
+        return dict((option, getattr(self, option)) for option in BFD_SESSION_OPTIONS)
+
+    def is_session_match(self, session, want):
         """is bfd session match"""
 
-        if not self.bfd_dict["session"] or not self.session_name:
+        if not session or not want["session_name"]:
             return False
 
-        session = self.bfd_dict["session"]
-        if self.session_name != session.get("sessName", ""):
+        if want["session_name"] != session.get("sessName", ""):
             return False
 
-        if self.create_type and self.create_type.upper() not in session.get("createType", "").upper():
+        if want["create_type"] and want["create_type"].upper() not in (session.get("createType") or "").upper():
             return False
 
-        if self.addr_type and self.addr_type != session.get("addrType").lower():
+        if want["addr_type"] and want["addr_type"] != (session.get("addrType") or "").lower():
             return False
 
-        if self.dest_addr and self.dest_addr != session.get("destAddr"):
+        if want["dest_addr"] and want["dest_addr"] != session.get("destAddr"):
             return False
 
-        if self.src_addr and self.src_addr != session.get("srcAddr"):
+        if want["src_addr"] and want["src_addr"] != session.get("srcAddr"):
             return False
 
-        if self.out_if_name:
+        if want["out_if_name"]:
             if not session.get("outIfName"):
                 return False
-            if self.out_if_name.replace(" ", "").lower() != session.get("outIfName").replace(" ", "").lower():
+            if want["out_if_name"].replace(" ", "").lower() != session.get("outIfName").replace(" ", "").lower():
                 return False
 
-        if self.vrf_name and self.vrf_name != session.get("vrfName"):
+        if want["vrf_name"] and want["vrf_name"] != session.get("vrfName"):
             return False
 
-        if str(self.use_default_ip).lower() != session.get("useDefaultIp"):
+        if str(want["use_default_ip"]).lower() != session.get("useDefaultIp"):
             return False
 
         return True
 
+    def get_create_config(self, want):
+        """xml leaves and command that create a bfd session"""
+
+        xml_str = "<sessName>%s</sessName>" % want["session_name"]
+        cmd_session = "bfd %s" % want["session_name"]
+
+        if want["create_type"]:
+            xml_str += "<createType>SESS_%s</createType>" % want["create_type"].upper()
+        else:
+            xml_str += "<createType>SESS_STATIC</createType>"
+        xml_str += "<linkType>IP</linkType>"
+        cmd_session += " bind"
+        if want["addr_type"]:
+            xml_str += "<addrType>%s</addrType>" % want["addr_type"].upper()
+        else:
+            xml_str += "<addrType>IPV4</addrType>"
+        if want["dest_addr"]:
+            xml_str += "<destAddr>%s</destAddr>" % want["dest_addr"]
+            cmd_session += " peer-%s %s" % ("ipv6" if want["addr_type"] == "ipv6" else "ip", want["dest_addr"])
+        if want["use_default_ip"]:
+            xml_str += "<useDefaultIp>%s</useDefaultIp>" % str(want["use_default_ip"]).lower()
+            cmd_session += " peer-ip default-ip"
+        if want["vrf_name"]:
+            xml_str += "<vrfName>%s</vrfName>" % want["vrf_name"]
+            cmd_session += " vpn-instance %s" % want["vrf_name"]
+        if want["out_if_name"]:
+            xml_str += "<outIfName>%s</outIfName>" % want["out_if_name"]
+            cmd_session += " interface %s" % want["out_if_name"].lower()
+        if want["src_addr"]:
+            xml_str += "<srcAddr>%s</srcAddr>" % want["src_addr"]
+            cmd_session += " source-%s %s" % ("ipv6" if want["addr_type"] == "ipv6" else "ip", want["src_addr"])
+        if want["create_type"] == "auto":
+            cmd_session += " auto"
+
+        return xml_str, cmd_session
+
     def config_session(self):
         """configures bfd session"""
 
@@ -449,35 +500,9 @@ class BfdSession(object):
                         msg="Error: dest_addr or use_default_ip must be set when bfd session is creating.")
 
                 # Creates a BFD session
-                if self.create_type:
-                    xml_str += "<createType>SESS_%s</createType>" % self.create_type.upper()
-                else:
-                    xml_str += "<createType>SESS_STATIC</createType>"
-                xml_str += "<linkType>IP</linkType>"
-                cmd_session += " bind"
-                if self.addr_type:
-                    xml_str += "<addrType>%s</addrType>" % self.addr_type.upper()
-                else:
-                    xml_str += "<addrType>IPV4</addrType>"
-                if self.dest_addr:
-                    xml_str += "<destAddr>%s</destAddr>" % self.dest_addr
-                    cmd_session += " peer-%s %s" % ("ipv6" if self.addr_type == "ipv6" else "ip", self.dest_addr)
-                if self.use_default_ip:
-                    xml_str += "<useDefaultIp>%s</useDefaultIp>" % str(self.use_default_ip).lower()
-                    cmd_session += " peer-ip default-ip"
-                if self.vrf_name:
-                    xml_str += "<vrfName>%s</vrfName>" % self.vrf_name
-                    cmd_session += " vpn-instance %s" % self.vrf_name
-                if self.out_if_name:
-                    xml_str += "<outIfName>%s</outIfName>" % self.out_if_name
-                    cmd_session += " interface %s" % self.out_if_name.lower()
-                if self.src_addr:
-                    xml_str += "<srcAddr>%s</srcAddr>" % self.src_addr
-                    cmd_session += " source-%s %s" % ("ipv6" if self.addr_type == "ipv6" else "ip", self.src_addr)
-                if self.create_type == "auto":
-                    cmd_session += " auto"
-
-            elif not self.is_session_match():
+                xml_str, cmd_session = self.get_create_config(self.get_want())
+
+            elif not self.is_session_match(self.bfd_dict["session"], self.get_want()):
                 # Bfd session is not match
                 self.module.fail_json(msg="Error: The specified BFD configuration view has been created.")
             else:
@@ -485,7 +510,7 @@ class BfdSession(object):
         else:   # absent
             if not self.bfd_dict["session"]:
                 self.module.fail_json(msg="Error: BFD session is not exist.")
-            if not self.is_session_match():
+            if not self.is_session_match(self.bfd_dict["session"], self.get_want()):
                 self.module.fail_json(msg="Error: BFD session parameter is invalid.")
 
         if self.state == "present":
@@ -515,49 +540,145 @@ class BfdSession(object):
             %s
             </bfd>
             </config>""" % xml_str
-        set_nc_config(self.module, xml_cfg)
+        if not self.module.check_mode:
+            set_nc_config(self.module, xml_cfg)
         self.changed = True
 
     def check_params(self):
         """Check all input params"""
 
+        if self.sessions is not None:
+            self.check_sessions()
+            return
+
         # check session_name
         if not self.session_name:
             self.module.fail_json(msg="Error: Missing required arguments: session_name.")
 
-        if self.session_name:
-            if len(self.session_name) < 1 or len(self.session_name) > 15:
+        self.check_session(self.get_want())
+
+    def check_session(self, want):
+        """Check the options of a session"""
+
+        if want["session_name"]:
+            if len(want["session_name"]) < 1 or len(want["session_name"]) > 15:
                 self.module.fail_json(msg="Error: Session name is invalid.")
 
         # check out_if_name
-        if self.out_if_name:
-            if not get_interface_type(self.out_if_name):
+        if want["out_if_name"]:
+            if not get_interface_type(want["out_if_name"]):
                 self.module.fail_json(msg="Error: Session out_if_name is invalid.")
 
         # check dest_addr
-        if self.dest_addr:
-            if not check_ip_addr(self.dest_addr):
+        if want["dest_addr"]:
+            if not check_ip_addr(want["dest_addr"]):
                 self.module.fail_json(msg="Error: Session dest_addr is invalid.")
 
         # check src_addr
-        if self.src_addr:
-            if not check_ip_addr(self.src_addr):
+        if want["src_addr"]:
+            if not check_ip_addr(want["src_addr"]):
                 self.module.fail_json(msg="Error: Session src_addr is invalid.")
 
         # check vrf_name
-        if self.vrf_name:
-            if not is_valid_ip_vpn(self.vrf_name):
+        if want["vrf_name"]:
+            if not is_valid_ip_vpn(want["vrf_name"]):
                 self.module.fail_json(msg="Error: Session vrf_name is invalid.")
-            if not self.dest_addr:
+            if not want["dest_addr"]:
                 self.module.fail_json(msg="Error: vrf_name and dest_addr must set at the same time.")
 
         # check use_default_ip
-        if self.use_default_ip and not self.out_if_name:
+        if want["use_default_ip"] and not want["out_if_name"]:
             self.module.fail_json(msg="Error: use_default_ip and out_if_name must set at the same time.")
 
+    def check_sessions(self):
+        """Check sessions and normalize each one to the options of a session"""
+
+        sessions = list()
+        for session in self.sessions:
+            if not isinstance(session, dict) or not session.get("session_name"):
+                self.module.fail_json(
+                    msg="Error: Each session must be a dict with session_name.")
+
+            want = dict()
+            for option in BFD_SESSION_OPTIONS:
+                value = session.get(option)
+                if value is None and option in BFD_SESSION_INHERITED:
+                    if option != "vrf_name" or session.get("dest_addr"):
+                        value = getattr(self, option)
+                if value is not None and option != "use_default_ip":
+                    value = str(value)
+                want[option] = value
+            want["use_default_ip"] = self.module.boolean(want["use_default_ip"] or False)
+
+            if want["create_type"] and want["create_type"] not in ["static", "auto"]:
+                self.module.fail_json(
+                    msg="Error: The create_type of session %s must be static or auto." % want["session_name"])
+            if want["addr_type"] and want["addr_type"] != "ipv4":
+                self.module.fail_json(
+                    msg="Error: The addr_type of session %s must be ipv4." % want["session_name"])
+            if want["use_default_ip"] and want["dest_addr"]:
+                self.module.fail_json(
+                    msg="Error: use_default_ip and dest_addr of session %s "
+                        "can not be set at the same time." % want["session_name"])
+            self.check_session(want)
+            if self.state == "present" and not want["dest_addr"] and not want["use_default_ip"]:
+                self.module.fail_json(
+                    msg="Error: dest_addr or use_default_ip of session %s must be set." % want["session_name"])
+
+            if [cur for cur in sessions if cur["session_name"] == want["session_name"]]:
+                self.module.fail_json(
+                    msg="Error: Session %s is listed more than once." % want["session_name"])
+            sessions.append(want)
+        self.sessions = sessions
+
+    def config_sessions(self):
+        """Config all bfd sessions with set semantics, the deletes and the creates go in one edit,
+        the binding of a session can not be changed, so a session that does not match fails"""
+
+        exist_sessions = self.bfd_dict["sessions"]
+        want_names = [want["session_name"] for want in self.sessions]
+
+        delete_items = list()
+        create_items = list()
+        if self.state == "present":
+            for name in exist_sessions:
+                if name not in want_names:
+                    delete_items.append(CE_NC_DELETE_BFD_SESSION % name)
+                    self.updates_cmd.append("undo bfd %s" % name)
+            for want in self.sessions:
+                session = exist_sessions.get(want["session_name"])
+                if self.is_session_match(session, want):
+                    continue
+                if session:
+                    self.module.fail_json(
+                        msg="Error: The binding of BFD session %s can not be changed, "
+                            "remove the session first." % want["session_name"])
+                xml_str, cmd_session = self.get_create_config(want)
+                create_items.append('<bfdCfgSession operation="merge">%s</bfdCfgSession>' % xml_str)
+                self.updates_cmd.append(cmd_session)
+        else:
+            for want in self.sessions:
+                if want["session_name"] in exist_sessions:
+                    delete_items.append(CE_NC_DELETE_BFD_SESSION % want["session_name"])
+                    self.updates_cmd.append("undo bfd %s" % want["session_name"])
+
+        if create_items and self.bfd_dict["global"].get("bfdEnable", "false") != "true":
+            self.module.fail_json(msg="Error: Please enable BFD globally first.")
+
+        if delete_items or create_items:
+            if not self.module.check_mode:
+                set_nc_config_chunks(self.module, CE_NC_SET_BFD_SESSIONS_HEAD,
+                                     delete_items + create_items, CE_NC_SET_BFD_SESSIONS_TAIL)
+            self.changed = True
+
     def get_proposed(self):
         """get proposed info"""
 
+        if self.sessions is not None:
+            self.proposed["sessions"] = self.sessions
+            self.proposed["state"] = self.state
+            return
+
         # base config
         self.proposed["session_name"] = self.session_name
         self.proposed["create_type"] = self.create_type
@@ -575,16 +696,22 @@ class BfdSession(object):
         if not self.bfd_dict:
             return
 
-        self.existing["session"] = self.bfd_dict.get("session")
+        if self.sessions is not None:
+            self.existing["sessions"] = list(self.bfd_dict["sessions"].values())
+        else:
+            self.existing["session"] = self.bfd_dict.get("session")
 
     def get_end_state(self):
         """get end state info"""
 
-        bfd_dict = self.get_bfd_dict()
+        bfd_dict = self.get_bfd_dict(refresh=self.changed and not self.module.check_mode)
         if not bfd_dict:
             return
 
-        self.end_state["session"] = bfd_dict.get("session")
+        if self.sessions is not None:
+            self.end_state["sessions"] = list(bfd_dict["sessions"].values())
+        else:
+            self.end_state["session"] = bfd_dict.get("session")
 
     def work(self):
         """worker"""
@@ -596,7 +723,9 @@ class BfdSession(object):
 
         # deal present or absent
         xml_str = ''
-        if self.session_name:
+        if self.sessions is not None:
+            self.config_sessions()
+        elif self.session_name:
             xml_str += self.config_session()
 
         # update to device
@@ -621,7 +750,7 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        session_name=dict(required=True, type='str'),
+        session_name=dict(required=False, type='str'),
         create_type=dict(required=False, type='str', choices=['static', 'auto']),
         addr_type=dict(required=False, type='str', choices=['ipv4']),
         out_if_name=dict(required=False, type='str'),
@@ -629,6 +758,7 @@ def main():
         src_addr=dict(required=False, type='str'),
         vrf_name=dict(required=False, type='str'),
         use_default_ip=dict(required=False, type='bool', default=False),
+        sessions=dict(required=False, type='list'),
         state=dict(required=False, default='present', choices=['present', 'absent'])
     )
 
@@ -203,42 +203,13 @@ changed:
 '''
 
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, get_bfd_snapshot
 
 
-CE_NC_GET_BFD = """
-    <filter type="subtree">
-      <bfd xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-      %s
-      </bfd>
-    </filter>
-"""
-
-CE_NC_GET_BFD_GLB = """
-        <bfdSchGlobal>
-          <bfdEnable></bfdEnable>
-        </bfdSchGlobal>
-"""
-
-CE_NC_GET_BFD_SESSION = """
-        <bfdCfgSessions>
-          <bfdCfgSession>
-            <sessName>%s</sessName>
-            <createType></createType>
-            <localDiscr></localDiscr>
-            <remoteDiscr></remoteDiscr>
-            <minTxInt></minTxInt>
-            <minRxInt></minRxInt>
-            <detectMulti></detectMulti>
-            <wtrTimerInt></wtrTimerInt>
-            <tosExp></tosExp>
-            <adminDown></adminDown>
-            <description></description>
-          </bfdCfgSession>
-        </bfdCfgSessions>
-"""
+# leaves of a bfd session that belong to the session view
+BFD_VIEW_ATTRS = ["sessName", "createType", "localDiscr", "remoteDiscr", "minTxInt", "minRxInt",
+                  "detectMulti", "wtrTimerInt", "tosExp", "adminDown", "description"]
 
 
 class BfdView(object):
@@ -283,34 +254,20 @@ class BfdView(object):
         self.module = AnsibleModule(argument_spec=self.spec,
                                     supports_check_mode=True)
 
-    def get_bfd_dict(self):
+    def get_bfd_dict(self, refresh=False):
         """bfd config dict"""
 
         bfd_dict = dict()
-        bfd_dict["global"] = dict()
-        bfd_dict["session"] = dict()
-        conf_str = CE_NC_GET_BFD % (CE_NC_GET_BFD_GLB + (CE_NC_GET_BFD_SESSION % self.session_name))
-
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return bfd_dict
-
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
+        snapshot = get_bfd_snapshot(self.module, refresh)
 
         # get bfd global info
-        glb = root.find("data/bfd/bfdSchGlobal")
-        if glb:
-            for attr in glb:
-                bfd_dict["global"][attr.tag] = attr.text
+        bfd_dict["global"] = dict(bfdEnable=snapshot["globals"].get("bfdEnable"))
 
         # get bfd session info
-        sess = root.find("data/bfd/bfdCfgSessions/bfdCfgSession")
-        if sess:
-            for attr in sess:
-                bfd_dict["session"][attr.tag] = attr.text
+        bfd_dict["session"] = dict()
+        session = snapshot["sessions"].get(self.session_name)
+        if session:
+            bfd_dict["session"] = dict((tag, session[tag]) for tag in BFD_VIEW_ATTRS if tag in session)
 
         return bfd_dict
 
@@ -428,7 +385,8 @@ class BfdView(object):
             </bfd>
             </config>""" % xml_str
 
-        set_nc_config(self.min_rx_interval, xml_cfg)
+        if not self.module.check_mode:
+            set_nc_config(self.module, xml_cfg)
         self.changed = True
 
     def check_params(self):
@@ -509,7 +467,7 @@ class BfdView(object):
     def get_end_state(self):
         """get end state info"""
 
-        bfd_dict = self.get_bfd_dict()
+        bfd_dict = self.get_bfd_dict(refresh=self.changed and not self.module.check_mode)
         if not bfd_dict:
             return
 
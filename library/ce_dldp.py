@@ -174,9 +174,8 @@ changed:
 '''
 
 import copy
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, set_nc_config, get_nc_config, execute_nc_action
+from ansible.module_utils.ce import ce_argument_spec, set_nc_config, execute_nc_action, get_dldp_snapshot
 
 CE_NC_ACTION_RESET_DLDP = """
 <action>
@@ -186,19 +185,6 @@ CE_NC_ACTION_RESET_DLDP = """
 </action>
 """
 
-CE_NC_GET_GLOBAL_DLDP_CONFIG = """
-<filter type="subtree">
-  <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <dldpSys>
-      <dldpEnable></dldpEnable>
-      <dldpInterval></dldpInterval>
-      <dldpWorkMode></dldpWorkMode>
-      <dldpAuthMode></dldpAuthMode>
-    </dldpSys>
-  </dldp>
-</filter>
-"""
-
 CE_NC_MERGE_DLDP_GLOBAL_CONFIG_HEAD = """
 <config>
   <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -318,36 +304,26 @@ class Dldp(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_dldp_exist_config(self):
+    def get_dldp_exist_config(self, refresh=False):
         """Get current dldp existed configuration"""
 
         dldp_conf = dict()
-        xml_str = CE_NC_GET_GLOBAL_DLDP_CONFIG
-        con_obj = get_nc_config(self.module, xml_str)
-        if "<data/>" in con_obj:
-            return dldp_conf
-
-        xml_str = con_obj.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        # get global DLDP info
-        root = ElementTree.fromstring(xml_str)
-        topo = root.find("data/dldp/dldpSys")
-        if not topo:
+        snapshot = get_dldp_snapshot(self.module, refresh)
+        if not snapshot["globals"]:
             self.module.fail_json(
                 msg="Error: Get current DLDP configration failed.")
 
-        for eles in topo:
-            if eles.tag in ["dldpEnable", "dldpInterval", "dldpWorkMode", "dldpAuthMode"]:
-                if eles.tag == 'dldpEnable':
-                    if eles.text == 'true':
+        # get global DLDP info
+        for tag, text in snapshot["globals"].items():
+            if tag in ["dldpEnable", "dldpInterval", "dldpWorkMode", "dldpAuthMode"]:
+                if tag == 'dldpEnable':
+                    if text == 'true':
                         value = 'enable'
                     else:
                         value = 'disable'
                 else:
-                    value = eles.text
-                dldp_conf[eles.tag] = value
+                    value = text
+                dldp_conf[tag] = value
 
         return dldp_conf
 
@@ -485,7 +461,7 @@ class Dldp(object):
         """Get end state info"""
 
         dldp_conf = dict()
-        self.dldp_conf = self.get_dldp_exist_config()
+        self.dldp_conf = self.get_dldp_exist_config(refresh=self.changed)
 
         dldp_conf['enable'] = self.dldp_conf.get('dldpEnable', None)
         dldp_conf['time_interval'] = self.dldp_conf.get('dldpInterval', None)
@@ -38,7 +38,8 @@ options:
     interface:
         description:
             - Must be fully qualified interface name, i.e. GE1/0/1, 10GE1/0/1, 40GE1/0/22, 100GE1/0/1.
-        required: true
+              Either interface or interfaces is required.
+        required: false
     enable:
         description:
             - Set interface DLDP enable state.
@@ -63,6 +64,18 @@ options:
         required: false
         default: null
         choices: ['enable', 'disable']
+    interfaces:
+        description:
+            - A list of interfaces, each one is a full interface name, a glob pattern
+              such as C(40GE2/0/*), or a dict with interface and optionally enable,
+              mode_enable, local_mac and reset. The options that an entry does not set are
+              taken from the module options of the same name.
+              Patterns are matched against the physical ethernet ports of the device,
+              sub-interfaces and logical interfaces are skipped,
+              if an interface matches several entries the last one wins.
+              Can not be used with C(interface).
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -121,6 +134,14 @@ EXAMPLES = '''
       state: absent
       local_mac: aa-aa-aa
       provider: "{{ cli }}"
+
+  - name: "Enable DLDP on all fiber uplinks, with compatible-mode off on 40GE2/0/2"
+    ce_dldp_interface:
+      enable: enable
+      interfaces:
+        - 40GE2/0/*
+        - {interface: 40GE2/0/2, mode_enable: disable}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -176,9 +197,9 @@ changed:
 
 import copy
 import re
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, set_nc_config, get_nc_config, execute_nc_action
+from ansible.module_utils.ce import ce_argument_spec, set_nc_config, set_nc_config_chunks, execute_nc_action, \
+    get_dldp_snapshot, get_ifm_snapshot, is_interface_pattern, match_interfaces
 
 
 CE_NC_ACTION_RESET_INTF_DLDP = """
@@ -191,21 +212,6 @@ CE_NC_ACTION_RESET_INTF_DLDP = """
 </action>
 """
 
-CE_NC_GET_INTF_DLDP_CONFIG = """
-<filter type="subtree">
-  <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <dldpInterfaces>
-      <dldpInterface>
-        <ifName>%s</ifName>
-        <dldpEnable></dldpEnable>
-        <dldpCompatibleEnable></dldpCompatibleEnable>
-        <dldpLocalMac></dldpLocalMac>
-      </dldpInterface>
-    </dldpInterfaces>
-  </dldp>
-</filter>
-"""
-
 CE_NC_MERGE_DLDP_INTF_CONFIG = """
 <config>
   <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -249,6 +255,36 @@ CE_NC_DELETE_DLDP_INTF_CONFIG = """
 """
 
 
+CE_NC_SET_DLDP_INTFS_HEAD = """
+<config>
+  <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <dldpInterfaces>
+"""
+
+CE_NC_SET_DLDP_INTFS_TAIL = """
+    </dldpInterfaces>
+  </dldp>
+</config>
+"""
+
+CE_NC_OPERATION_DLDP_INTF = """
+      <dldpInterface operation="%s">
+        <ifName>%s</ifName>%s
+      </dldpInterface>
+"""
+
+CE_NC_DLDP_INTF_LEAVES = """
+        <dldpEnable>%s</dldpEnable>
+        <dldpCompatibleEnable>%s</dldpCompatibleEnable>
+        <dldpLocalMac>%s</dldpLocalMac>"""
+
+# options of an interfaces entry
+DLDP_INTF_OPTIONS = ["enable", "mode_enable", "local_mac", "reset"]
+
+# interface types a pattern may match, physical ethernet ports
+DLDP_PATTERN_TYPE = ('ge', '10ge', '25ge', '4x10ge', '40ge', '100ge')
+
+
 def judge_is_mac_same(mac1, mac2):
     """Judge whether two macs are the same"""
 
@@ -317,6 +353,16 @@ def get_interface_type(interface):
     return iftype.lower()
 
 
+def is_dldp_pattern_candidate(intf):
+    """check whether an interface of the ifm snapshot may be picked up by a pattern,
+    dldp runs on physical ethernet ports only, so sub-interfaces and logical interfaces are skipped"""
+
+    name = intf.get("ifName")
+    if not name or "." in name:
+        return False
+    return get_interface_type(name) in DLDP_PATTERN_TYPE
+
+
 class DldpInterface(object):
     """Manage interface dldp configration"""
 
@@ -331,6 +377,7 @@ class DldpInterface(object):
         self.reset = self.module.params['reset'] or None
         self.mode_enable = self.module.params['mode_enable'] or None
         self.local_mac = self.module.params['local_mac'] or None
+        self.interfaces = self.module.params['interfaces']
         self.state = self.module.params['state']
 
         self.dldp_intf_conf = dict()
@@ -344,33 +391,40 @@ class DldpInterface(object):
         self.existing = list()
         self.end_state = list()
 
-    def check_config_if_same(self):
+    def get_want(self):
+        """Get the options of the single interface"""
+
+        return dict(interface=self.interface, enable=self.enable, mode_enable=self.mode_enable,
+                    local_mac=self.local_mac, reset=self.reset)
+
+    def check_config_if_same(self, want=None, dldp_intf_conf=None):
         """Judge whether current config is the same as what we excepted"""
 
+        want = want or self.get_want()
+        dldp_intf_conf = dldp_intf_conf or self.dldp_intf_conf
         if self.state == 'absent':
             return False
         else:
-            if self.enable and self.enable != self.dldp_intf_conf['dldpEnable']:
+            if want['enable'] and want['enable'] != dldp_intf_conf['dldpEnable']:
                 return False
 
-            if self.mode_enable and self.mode_enable != self.dldp_intf_conf['dldpCompatibleEnable']:
+            if want['mode_enable'] and want['mode_enable'] != dldp_intf_conf['dldpCompatibleEnable']:
                 return False
 
-            if self.local_mac:
+            if want['local_mac']:
                 flag = judge_is_mac_same(
-                    self.local_mac, self.dldp_intf_conf['dldpLocalMac'])
+                    want['local_mac'], dldp_intf_conf['dldpLocalMac'])
                 if not flag:
                     return False
 
-            if self.reset and self.reset == 'enable':
+            if want['reset'] and want['reset'] == 'enable':
                 return False
         return True
 
-    def check_macaddr(self):
+    def check_macaddr(self, mac):
         """Check mac-address whether valid"""
 
         valid_char = '0123456789abcdef-'
-        mac = self.local_mac
 
         if len(mac) > 16:
             return False
@@ -401,43 +455,52 @@ class DldpInterface(object):
                     msg='Error: Interface name of %s '
                         'is error.' % self.interface)
 
-        if (self.state == 'absent') and (self.reset or self.mode_enable or self.enable):
+        self.check_intf_params(self.get_want(), self.dldp_intf_conf)
+
+    def check_intf_params(self, want, dldp_intf_conf):
+        """Check the options of an interface against its current config"""
+
+        if (self.state == 'absent') and (want['reset'] or want['mode_enable'] or want['enable']):
             self.module.fail_json(msg="Error: It's better to use state=present when "
                                   "configuring or unconfiguring enable, mode_enable "
                                   "or using reset flag. state=absent is just for "
                                   "when using local_mac param.")
 
-        if self.state == 'absent' and not self.local_mac:
+        if self.state == 'absent' and not want['local_mac']:
             self.module.fail_json(
                 msg="Error: Please specify local_mac parameter.")
 
         if self.state == 'present':
-            if (self.dldp_intf_conf['dldpEnable'] == 'disable' and not self.enable and
-                    (self.mode_enable or self.local_mac or self.reset)):
+            if (dldp_intf_conf['dldpEnable'] == 'disable' and not want['enable'] and
+                    (want['mode_enable'] or want['local_mac'] or want['reset'])):
                 self.module.fail_json(msg="Error: when DLDP is already disabled on this port, "
                                       "mode_enable, local_mac and reset parameters are not "
                                       "expected to configure.")
 
-            if self.enable == 'disable' and (self.mode_enable or self.local_mac or self.reset):
+            if want['enable'] == 'disable' and (want['mode_enable'] or want['local_mac'] or want['reset']):
                 self.module.fail_json(msg="Error: when using enable=disable, "
                                       "mode_enable, local_mac and reset parameters "
                                       "are not expected to configure.")
 
-        if self.local_mac and (self.mode_enable == 'disable' or
-                               (self.dldp_intf_conf['dldpCompatibleEnable'] == 'disable' and self.mode_enable != 'enable')):
+        if want['local_mac'] and (want['mode_enable'] == 'disable' or
+                                  (dldp_intf_conf['dldpCompatibleEnable'] == 'disable' and
+                                   want['mode_enable'] != 'enable')):
             self.module.fail_json(msg="Error: when DLDP compatible-mode is disabled on this port, "
                                       "Configuring local_mac is not allowed.")
 
-        if self.local_mac:
-            if not self.check_macaddr():
+        if want['local_mac']:
+            if not self.check_macaddr(want['local_mac']):
                 self.module.fail_json(
-                    msg="Error: local_mac has invalid value %s." % self.local_mac)
+                    msg="Error: local_mac has invalid value %s." % want['local_mac'])
 
     def init_module(self):
         """Init module object"""
 
+        required_one_of = [("interface", "interfaces")]
+        mutually_exclusive = [("interface", "interfaces")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed"""
@@ -445,44 +508,154 @@ class DldpInterface(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_dldp_intf_exist_config(self):
+    def get_dldp_intf_exist_config(self, interface=None, refresh=False):
         """Get current dldp existed config"""
 
         dldp_conf = dict()
-        xml_str = CE_NC_GET_INTF_DLDP_CONFIG % self.interface
-        con_obj = get_nc_config(self.module, xml_str)
-        if "<data/>" in con_obj:
+        snapshot = get_dldp_snapshot(self.module, refresh)
+        intf = snapshot["interfaces"].get((interface or self.interface).upper())
+        if not intf:
             dldp_conf['dldpEnable'] = 'disable'
             dldp_conf['dldpCompatibleEnable'] = ""
             dldp_conf['dldpLocalMac'] = ""
             return dldp_conf
 
-        xml_str = con_obj.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        # get global DLDP info
-        root = ElementTree.fromstring(xml_str)
-        topo = root.find("data/dldp/dldpInterfaces/dldpInterface")
-        if topo is None:
-            self.module.fail_json(
-                msg="Error: Get current DLDP configration failed.")
-        for eles in topo:
-            if eles.tag in ["dldpEnable", "dldpCompatibleEnable", "dldpLocalMac"]:
-                if not eles.text:
-                    dldp_conf[eles.tag] = ""
+        for tag, text in intf.items():
+            if tag in ["dldpEnable", "dldpCompatibleEnable", "dldpLocalMac"]:
+                if not text:
+                    dldp_conf[tag] = ""
                 else:
-                    if eles.tag == "dldpEnable" or eles.tag == "dldpCompatibleEnable":
-                        if eles.text == 'true':
+                    if tag == "dldpEnable" or tag == "dldpCompatibleEnable":
+                        if text == 'true':
                             value = 'enable'
                         else:
                             value = 'disable'
                     else:
-                        value = eles.text
-                    dldp_conf[eles.tag] = value
+                        value = text
+                    dldp_conf[tag] = value
 
         return dldp_conf
 
+    def get_intf_plans(self):
+        """expand interface names and patterns, if an interface matches several entries the last one wins"""
+
+        plans = dict()
+        order = list()
+        names = None
+        for intf in self.interfaces:
+            if not isinstance(intf, dict):
+                intf = dict(interface=intf)
+            if not intf.get("interface"):
+                self.module.fail_json(
+                    msg='Error: Each interface must be a name, a pattern or a dict with interface.')
+
+            want = dict(interface=str(intf["interface"]))
+            for option in DLDP_INTF_OPTIONS:
+                value = intf.get(option)
+                if value is None:
+                    value = getattr(self, option)
+                if option != "local_mac" and value is not None and value not in ['enable', 'disable']:
+                    self.module.fail_json(
+                        msg='Error: The %s of interface %s must be enable or disable.' % (option, want["interface"]))
+                want[option] = value or None
+
+            if is_interface_pattern(want["interface"]):
+                if names is None:
+                    names = [item["ifName"] for item in get_ifm_snapshot(self.module)
+                             if is_dldp_pattern_candidate(item)]
+                matched = match_interfaces(names, want["interface"])
+                if not matched:
+                    self.module.fail_json(
+                        msg="Error: No interface matches %s." % want["interface"])
+            else:
+                if not get_interface_type(want["interface"]):
+                    self.module.fail_json(
+                        msg='Error: Interface name of %s '
+                            'is error.' % want["interface"])
+                matched = [want["interface"]]
+            for name in matched:
+                if name.upper() not in plans:
+                    order.append(name.upper())
+                plans[name.upper()] = dict(want, interface=name)
+
+        return [plans[name] for name in order]
+
+    def config_interfaces(self):
+        """diff every requested interface with the dldp interface table,
+        and apply all the changes by one edit"""
+
+        xml_items = list()
+        reset_intfs = list()
+        self.existing = dict(interfaces=list())
+        self.proposed = dict(interfaces=list(), state=self.state)
+        for want in self.get_intf_plans():
+            name = want["interface"]
+            conf = self.get_dldp_intf_exist_config(name)
+            self.check_intf_params(want, conf)
+            self.proposed["interfaces"].append(want)
+            self.existing["interfaces"].append(
+                dict(interface=name, enable=conf['dldpEnable'], mode_enable=conf['dldpCompatibleEnable'],
+                     local_mac=conf['dldpLocalMac'], reset='disable'))
+            if self.check_config_if_same(want, conf):
+                continue
+
+            cmds = list()
+            if self.state == "absent":
+                if not judge_is_mac_same(want['local_mac'], conf['dldpLocalMac']):
+                    continue
+                leaves = CE_NC_DLDP_INTF_LEAVES % (
+                    'true' if conf['dldpEnable'] == 'enable' else 'false',
+                    'true' if conf['dldpCompatibleEnable'] == 'enable' else 'false', '')
+                xml_items.append(CE_NC_OPERATION_DLDP_INTF % ("merge", name, leaves))
+                self.updates_cmd.append("interface %s" % name)
+                self.updates_cmd.append("undo dldp compatible-mode local-mac")
+                continue
+
+            if want['enable'] and want['enable'] != conf['dldpEnable']:
+                if want['enable'] == 'enable':
+                    cmds.append("dldp enable")
+                else:
+                    cmds.append("undo dldp enable")
+            if want['mode_enable'] and want['mode_enable'] != conf['dldpCompatibleEnable']:
+                if want['mode_enable'] == 'enable':
+                    cmds.append("dldp compatible-mode enable")
+                else:
+                    cmds.append("undo dldp compatible-mode enable")
+            if want['local_mac'] and not judge_is_mac_same(want['local_mac'], conf['dldpLocalMac']):
+                cmds.append("dldp compatible-mode local-mac %s" % want['local_mac'])
+
+            if cmds:
+                mode_enable = want['mode_enable'] or conf['dldpCompatibleEnable']
+                local_mac = want['local_mac'] or conf['dldpLocalMac']
+                if mode_enable != 'enable':
+                    local_mac = ''
+                mode_enable = 'true' if mode_enable == 'enable' else 'false'
+                if want['enable'] == 'disable':
+                    xml_items.append(CE_NC_OPERATION_DLDP_INTF % ("delete", name, ""))
+                elif conf['dldpEnable'] == 'disable':
+                    xml_items.append(CE_NC_OPERATION_DLDP_INTF % (
+                        "create", name, CE_NC_DLDP_INTF_LEAVES % ('true', mode_enable, local_mac)))
+                else:
+                    xml_items.append(CE_NC_OPERATION_DLDP_INTF % (
+                        "merge", name, CE_NC_DLDP_INTF_LEAVES % ('true', mode_enable, local_mac)))
+            if want['reset'] == 'enable':
+                reset_intfs.append(name)
+                cmds.append('dldp reset')
+            self.updates_cmd.append("interface %s" % name)
+            self.updates_cmd.extend(cmds)
+
+        if not xml_items and not reset_intfs:
+            return
+
+        if not self.module.check_mode:
+            if xml_items:
+                set_nc_config_chunks(self.module, CE_NC_SET_DLDP_INTFS_HEAD,
+                                     xml_items, CE_NC_SET_DLDP_INTFS_TAIL)
+            for name in reset_intfs:
+                ret_xml = execute_nc_action(self.module, CE_NC_ACTION_RESET_INTF_DLDP % name)
+                self.check_response(ret_xml, "ACTION_RESET_INTF_DLDP")
+        self.changed = True
+
     def config_intf_dldp(self):
         """Config global dldp"""
 
@@ -604,8 +777,20 @@ class DldpInterface(object):
     def get_end_state(self):
         """Get end state info"""
 
+        if self.interfaces is not None:
+            self.end_state = dict(interfaces=list())
+            if self.changed and not self.module.check_mode:
+                get_dldp_snapshot(self.module, refresh=True)
+            for want in self.proposed["interfaces"]:
+                conf = self.get_dldp_intf_exist_config(want["interface"])
+                self.end_state["interfaces"].append(
+                    dict(interface=want["interface"], enable=conf['dldpEnable'],
+                         mode_enable=conf['dldpCompatibleEnable'], local_mac=conf['dldpLocalMac'],
+                         reset=want['reset'] or 'disable'))
+            return
+
         dldp_conf = dict()
-        self.dldp_intf_conf = self.get_dldp_intf_exist_config()
+        self.dldp_intf_conf = self.get_dldp_intf_exist_config(refresh=self.changed)
 
         dldp_conf['interface'] = self.interface
         dldp_conf['enable'] = self.dldp_intf_conf.get('dldpEnable', None)
@@ -635,6 +820,12 @@ class DldpInterface(object):
     def work(self):
         """Excute task"""
 
+        if self.interfaces is not None:
+            self.config_interfaces()
+            self.get_end_state()
+            self.show_result()
+            return
+
         self.dldp_intf_conf = self.get_dldp_intf_exist_config()
         self.check_params()
         self.same_conf = self.check_config_if_same()
@@ -650,11 +841,12 @@ def main():
     """Main function entry"""
 
     argument_spec = dict(
-        interface=dict(required=True, type='str'),
+        interface=dict(required=False, type='str'),
         enable=dict(choices=['enable', 'disable'], type='str'),
         reset=dict(choices=['enable', 'disable'], type='str'),
         mode_enable=dict(choices=['enable', 'disable'], type='str'),
         local_mac=dict(type='str'),
+        interfaces=dict(type='list'),
         state=dict(choices=['absent', 'present'], default='present'),
     )
     argument_spec.update(ce_argument_spec)
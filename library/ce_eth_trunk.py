@@ -43,7 +43,8 @@ options:
               When 256 is specified, the value ranges from 0 to 255.
               When 512 is specified, the value ranges from 0 to 511.
               When 1024 is specified, the value ranges from 0 to 1023.
-        required: true
+              Either trunk_id or trunks is required.
+        required: false
     mode:
         description:
             - Specifies the working mode of an Eth-Trunk interface.
@@ -76,6 +77,16 @@ options:
               members.
         required: false
         default: false
+    trunks:
+        description:
+            - A list of Eth-Trunks, each one is a trunk_id, or a dict with trunk_id and
+              optionally mode, min_links, hash_type, members and force. The options other
+              than members that an entry does not set are taken from the module options
+              of the same name. An interface that is already a member of another Eth-Trunk
+              is moved only if either Eth-Trunk is forced, otherwise the module fails.
+              Can not be used with C(trunk_id).
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -104,6 +115,15 @@ EXAMPLES = '''
       mode: 'lacp-static'
       state: present
       provider: '{{ cli }}'
+
+  - name: Ensure the server LAGs Eth-Trunk1 and Eth-Trunk2 exist with their members
+    ce_eth_trunk:
+      mode: 'lacp-static'
+      hash_type: 'src-dst-ip'
+      trunks:
+        - {trunk_id: 1, members: ['10GE1/0/1', '10GE2/0/1']}
+        - {trunk_id: 2, members: ['10GE1/0/2', '10GE2/0/2']}
+      provider: '{{ cli }}'
 '''
 
 RETURN = '''
@@ -142,39 +162,24 @@ changed:
     sample: true
 '''
 
-import re
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import set_nc_config, set_nc_config_chunks, ce_argument_spec, \
+    get_nc_snapshot, get_nc_xml_root
 
-CE_NC_GET_TRUNK = """
-<filter type="subtree">
+CE_NC_XML_BUILD_TRUNK_CFG = """
+<config>
   <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <TrunkIfs>
-      <TrunkIf>
-        <ifName>Eth-Trunk%s</ifName>
-        <minUpNum></minUpNum>
-        <maxUpNum></maxUpNum>
-        <trunkType></trunkType>
-        <hashType></hashType>
-        <workMode></workMode>
-        <upMemberIfNum></upMemberIfNum>
-        <memberIfNum></memberIfNum>
-        <TrunkMemberIfs>
-          <TrunkMemberIf>
-            <memberIfName></memberIfName>
-            <memberIfState></memberIfState>
-          </TrunkMemberIf>
-        </TrunkMemberIfs>
-      </TrunkIf>
-    </TrunkIfs>
+    <TrunkIfs>%s</TrunkIfs>
   </ifmtrunk>
-</filter>
+</config>
 """
 
-CE_NC_XML_BUILD_TRUNK_CFG = """
+CE_NC_SET_TRUNKS_HEAD = """
 <config>
   <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <TrunkIfs>%s</TrunkIfs>
+    <TrunkIfs>"""
+
+CE_NC_SET_TRUNKS_TAIL = """</TrunkIfs>
   </ifmtrunk>
 </config>
 """
@@ -239,6 +244,67 @@ HASH_CLI2XML = {"src-dst-ip": "IP", "src-dst-mac": "MAC", "enhanced": "Enhanced"
                 "dst-ip": "Desip", "dst-mac": "Desmac", "src-ip": "Sourceip", "src-mac": "Sourcemac"}
 
 
+CE_NC_GET_TRUNK_SNAPSHOT = """
+<filter type="subtree">
+  <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <TrunkIfs>
+      <TrunkIf>
+        <ifName></ifName>
+        <minUpNum></minUpNum>
+        <maxUpNum></maxUpNum>
+        <trunkType></trunkType>
+        <hashType></hashType>
+        <workMode></workMode>
+        <upMemberIfNum></upMemberIfNum>
+        <memberIfNum></memberIfNum>
+        <TrunkMemberIfs>
+          <TrunkMemberIf>
+            <memberIfName></memberIfName>
+            <memberIfState></memberIfState>
+          </TrunkMemberIf>
+        </TrunkMemberIfs>
+      </TrunkIf>
+    </TrunkIfs>
+  </ifmtrunk>
+</filter>
+"""
+
+
+def parse_trunk_snapshot(xml_str):
+    """parse Eth-Trunk reply, trunks are indexed by trunk id,
+    and the trunk of every member by upper case member interface name"""
+
+    snapshot = dict(trunks=dict(), members=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    for trunk_ele in root.findall("data/ifmtrunk/TrunkIfs/TrunkIf"):
+        trunk = dict((tag, trunk_ele.findtext(tag) or "")
+                     for tag in ("ifName", "minUpNum", "maxUpNum", "trunkType", "hashType",
+                                 "workMode", "upMemberIfNum", "memberIfNum"))
+        if not trunk["ifName"]:
+            continue
+        trunk["trunkId"] = trunk["ifName"].lower().replace("eth-trunk", "").replace(" ", "")
+        trunk["TrunkMemberIfs"] = list()
+        for mem_ele in trunk_ele.findall("TrunkMemberIfs/TrunkMemberIf"):
+            mem = dict(memberIfName=mem_ele.findtext("memberIfName"),
+                       memberIfState=mem_ele.findtext("memberIfState"))
+            if mem["memberIfName"]:
+                trunk["TrunkMemberIfs"].append(mem)
+                snapshot["members"][mem["memberIfName"].replace(" ", "").upper()] = trunk["trunkId"]
+        snapshot["trunks"][trunk["trunkId"]] = trunk
+
+    return snapshot
+
+
+def get_trunk_snapshot(module, refresh=False):
+    """get all Eth-Trunk interfaces with their members in one netconf read"""
+
+    return get_nc_snapshot(module, ("ifmtrunk",), CE_NC_GET_TRUNK_SNAPSHOT,
+                           parse_trunk_snapshot, refresh)
+
+
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
 
@@ -325,6 +391,7 @@ class EthTrunk(object):
         self.members = self.module.params['members']
         self.state = self.module.params['state']
         self.force = self.module.params['force']
+        self.trunks = self.module.params['trunks']
 
         # state
         self.changed = False
@@ -340,8 +407,11 @@ class EthTrunk(object):
     def __init_module__(self):
         """ init module """
 
+        required_one_of = [("trunk_id", "trunks")]
+        mutually_exclusive = [("trunk_id", "trunks")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def netconf_set_config(self, xml_str, xml_name):
         """ netconf set config """
@@ -351,49 +421,11 @@ class EthTrunk(object):
         if "<ok/>" not in recv_xml:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_trunk_dict(self, trunk_id):
+    def get_trunk_dict(self, trunk_id, refresh=False):
         """ get one interface attributes dict."""
 
-        trunk_info = dict()
-        conf_str = CE_NC_GET_TRUNK % trunk_id
-        recv_xml = get_nc_config(self.module, conf_str)
-
-        if "<data/>" in recv_xml:
-            return trunk_info
-
-        # get trunk base info
-        base = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*'
-            r'<minUpNum>(.*)</minUpNum>.*\s*'
-            r'<maxUpNum>(.*)</maxUpNum>.*\s*'
-            r'<trunkType>(.*)</trunkType>.*\s*'
-            r'<hashType>(.*)</hashType>.*\s*'
-            r'<workMode>(.*)</workMode>.*\s*'
-            r'<upMemberIfNum>(.*)</upMemberIfNum>.*\s*'
-            r'<memberIfNum>(.*)</memberIfNum>.*', recv_xml)
-
-        if base:
-            trunk_info = dict(ifName=base[0][0],
-                              trunkId=base[0][0].lower().replace("eth-trunk", "").replace(" ", ""),
-                              minUpNum=base[0][1],
-                              maxUpNum=base[0][2],
-                              trunkType=base[0][3],
-                              hashType=base[0][4],
-                              workMode=base[0][5],
-                              upMemberIfNum=base[0][6],
-                              memberIfNum=base[0][7])
-
-        # get trunk member interface info
-        member = re.findall(
-            r'.*<memberIfName>(.*)</memberIfName>.*\s*'
-            r'<memberIfState>(.*)</memberIfState>.*', recv_xml)
-        trunk_info["TrunkMemberIfs"] = list()
-
-        for mem in member:
-            trunk_info["TrunkMemberIfs"].append(
-                dict(memberIfName=mem[0], memberIfState=mem[1]))
-
-        return trunk_info
+        snapshot = get_trunk_snapshot(self.module, refresh)
+        return snapshot["trunks"].get(str(trunk_id), dict())
 
     def is_member_exist(self, ifname):
         """is trunk member exist"""
@@ -574,6 +606,196 @@ class EthTrunk(object):
             for mem_id in range(len(self.members)):
                 self.members[mem_id] = self.members[mem_id].replace(" ", "").upper()
 
+    def get_trunk_plans(self):
+        """normalize the trunks entries, the options other than members
+        that an entry does not set are taken from the module options"""
+
+        plans = list()
+        claimed = dict()
+        for entry in self.trunks:
+            if not isinstance(entry, dict):
+                entry = dict(trunk_id=entry)
+            trunk_id = str(entry.get("trunk_id", ""))
+            if not trunk_id.isdigit():
+                self.module.fail_json(
+                    msg='Error: Each trunk must be a trunk_id or a dict with trunk_id, '
+                        'and trunk_id must be an integer.')
+
+            want = dict(trunk_id=str(int(trunk_id)))
+            for key in ("mode", "min_links", "hash_type", "force"):
+                want[key] = entry.get(key)
+                if want[key] is None:
+                    want[key] = getattr(self, key)
+            want["force"] = self.module.boolean(want["force"])
+            if want["trunk_id"] in [plan["trunk_id"] for plan in plans]:
+                self.module.fail_json(
+                    msg='Error: Eth-Trunk%s is listed more than once.' % want["trunk_id"])
+            if want["mode"] and want["mode"] not in MODE_CLI2XML:
+                self.module.fail_json(
+                    msg='Error: The mode of Eth-Trunk%s is invalid.' % want["trunk_id"])
+            if want["hash_type"] and want["hash_type"] not in HASH_CLI2XML:
+                self.module.fail_json(
+                    msg='Error: The hash_type of Eth-Trunk%s is invalid.' % want["trunk_id"])
+            if want["min_links"] is not None:
+                want["min_links"] = str(want["min_links"])
+                if not want["min_links"].isdigit():
+                    self.module.fail_json(
+                        msg='Error: The min_links of Eth-Trunk%s is invalid.' % want["trunk_id"])
+
+            # members that are not set are left as they are
+            want["members"] = None
+            if entry.get("members") is not None:
+                want["members"] = list()
+                for mem in entry["members"]:
+                    mem = str(mem).replace(" ", "").upper()
+                    if not get_interface_type(mem):
+                        self.module.fail_json(
+                            msg='Error: The member %s of Eth-Trunk%s is invalid.' % (mem, want["trunk_id"]))
+                    if mem in claimed:
+                        self.module.fail_json(
+                            msg='Error: Interface %s is listed in Eth-Trunk%s and Eth-Trunk%s.'
+                                % (mem, claimed[mem], want["trunk_id"]))
+                    claimed[mem] = want["trunk_id"]
+                    want["members"].append(mem)
+            plans.append(want)
+
+        return plans
+
+    def get_trunk_attr_xml(self, want, trunk_info):
+        """get the creation and the mode, hash type and min links changes of a trunks entry"""
+
+        trunk_id = want["trunk_id"]
+        cmds = list()
+        xml_str = ""
+        if not trunk_info:
+            xml_str += CE_NC_XML_CREATE_TRUNK % trunk_id
+
+        hash_type = HASH_CLI2XML.get(want["hash_type"])
+        if hash_type and (not trunk_info or hash_type != trunk_info["hashType"]):
+            cmds.append("load-balance %s" % want["hash_type"])
+            xml_str += CE_NC_XML_MERGE_HASHTYPE % (trunk_id, hash_type)
+        mode = MODE_CLI2XML.get(want["mode"])
+        if mode and (not trunk_info or mode != trunk_info["workMode"]):
+            cmds.append("mode %s" % want["mode"])
+            xml_str += CE_NC_XML_MERGE_WORKMODE % (trunk_id, mode)
+        if want["min_links"] and (not trunk_info or want["min_links"] != trunk_info["minUpNum"]):
+            cmds.append("least active-linknumber %s" % want["min_links"])
+            xml_str += CE_NC_XML_MERGE_MINUPNUM % (trunk_id, want["min_links"])
+
+        if xml_str:
+            cmds.insert(0, "interface Eth-Trunk %s" % trunk_id)
+        return cmds, xml_str
+
+    def get_member_removals(self, plans, snapshot):
+        """get the members to remove from each trunk, that is the members
+        a forced entry with members does not list, and the members listed in another trunk.
+        A member of another trunk is moved only if either trunk is forced."""
+
+        removals = dict()
+        for want in plans:
+            trunk_info = snapshot["trunks"].get(want["trunk_id"])
+            if not want["force"] or not trunk_info or want["members"] is None:
+                continue
+            for mem in trunk_info["TrunkMemberIfs"]:
+                mem_name = mem["memberIfName"].replace(" ", "").upper()
+                if mem_name not in want["members"]:
+                    removals.setdefault(want["trunk_id"], list()).append(mem_name)
+
+        for want in plans:
+            for mem in want["members"] or list():
+                cur_id = snapshot["members"].get(mem)
+                if not cur_id or cur_id == want["trunk_id"] or mem in removals.get(cur_id, list()):
+                    continue
+                if not want["force"]:
+                    self.module.fail_json(
+                        msg='Error: Interface %s is already a member of Eth-Trunk%s.' % (mem, cur_id))
+                removals.setdefault(cur_id, list()).append(mem)
+
+        return removals
+
+    def get_member_xml(self, trunk_id, members, template, cmd):
+        """get the merge or delete of some members of a trunk"""
+
+        mem_xml = ""
+        for mem in members:
+            mem_xml += template % mem
+            self.updates_cmd.append("interface %s" % mem)
+            self.updates_cmd.append(cmd)
+        return CE_NC_XML_BUILD_MEMBER_CFG % (trunk_id, mem_xml)
+
+    def config_trunks(self):
+        """diff every requested trunk with the Eth-Trunk snapshot,
+        and apply all trunk creations, member moves and trunk changes by one edit,
+        member removals are sent first so that a moved member is free when it is added"""
+
+        snapshot = get_trunk_snapshot(self.module)
+        plans = self.get_trunk_plans()
+        self.proposed = dict(trunks=plans, state=self.state)
+        self.existing = dict(trunks=list())
+        for want in plans:
+            trunk_info = snapshot["trunks"].get(want["trunk_id"])
+            if trunk_info:
+                self.existing["trunks"].append(self.get_trunk_state(trunk_info))
+
+        xml_items = list()
+        if self.state == "absent":
+            for want in plans:
+                trunk_info = snapshot["trunks"].get(want["trunk_id"])
+                if not trunk_info:
+                    continue
+                members = [mem["memberIfName"].replace(" ", "").upper() for mem in trunk_info["TrunkMemberIfs"]]
+                if want["members"] is not None:
+                    members = [mem for mem in want["members"] if mem in members]
+                if members:
+                    xml_items.append(self.get_member_xml(
+                        want["trunk_id"], members, CE_NC_XML_DELETE_MEMBER, "undo eth-trunk"))
+                if want["members"] is None:
+                    xml_items.append(CE_NC_XML_DELETE_TRUNK % want["trunk_id"])
+                    self.updates_cmd.append("undo interface Eth-Trunk %s" % want["trunk_id"])
+        else:
+            removals = self.get_member_removals(plans, snapshot)
+            for trunk_id in sorted(removals, key=int):
+                xml_items.append(self.get_member_xml(
+                    trunk_id, removals[trunk_id], CE_NC_XML_DELETE_MEMBER, "undo eth-trunk"))
+
+            for want in plans:
+                trunk_info = snapshot["trunks"].get(want["trunk_id"])
+                cmds, xml_str = self.get_trunk_attr_xml(want, trunk_info)
+                if xml_str:
+                    xml_items.append(xml_str)
+                    self.updates_cmd.extend(cmds)
+                members = [mem for mem in want["members"] or list()
+                           if snapshot["members"].get(mem) != want["trunk_id"]]
+                if members:
+                    xml_items.append(self.get_member_xml(
+                        want["trunk_id"], members, CE_NC_XML_MERGE_MEMBER, "eth-trunk %s" % want["trunk_id"]))
+
+        if not xml_items:
+            return
+
+        self.changed = True
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_SET_TRUNKS_HEAD, xml_items, CE_NC_SET_TRUNKS_TAIL)
+
+    def get_trunks_end_state(self):
+        """get the listed trunks after module execution"""
+
+        snapshot = get_trunk_snapshot(self.module, self.changed and not self.module.check_mode)
+        self.end_state = dict(trunks=list())
+        for want in self.proposed["trunks"]:
+            trunk_info = snapshot["trunks"].get(want["trunk_id"])
+            if trunk_info:
+                self.end_state["trunks"].append(self.get_trunk_state(trunk_info))
+
+    def get_trunk_state(self, trunk_info):
+        """get the k/v pairs of a trunk"""
+
+        return dict(trunk_id=trunk_info["trunkId"],
+                    min_links=trunk_info["minUpNum"],
+                    hash_type=hash_type_xml_to_cli_str(trunk_info["hashType"]),
+                    mode=mode_xml_to_cli_str(trunk_info["workMode"]),
+                    members_detail=trunk_info["TrunkMemberIfs"])
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -593,53 +815,49 @@ class EthTrunk(object):
         if not self.trunk_info:
             return
 
-        self.existing["trunk_id"] = self.trunk_info["trunkId"]
-        self.existing["min_links"] = self.trunk_info["minUpNum"]
-        self.existing["hash_type"] = hash_type_xml_to_cli_str(self.trunk_info["hashType"])
-        self.existing["mode"] = mode_xml_to_cli_str(self.trunk_info["workMode"])
-        self.existing["members_detail"] = self.trunk_info["TrunkMemberIfs"]
+        self.existing = self.get_trunk_state(self.trunk_info)
 
     def get_end_state(self):
         """get end state info"""
 
-        trunk_info = self.get_trunk_dict(self.trunk_id)
+        trunk_info = self.get_trunk_dict(self.trunk_id, refresh=self.changed)
         if not trunk_info:
             return
 
-        self.end_state["trunk_id"] = trunk_info["trunkId"]
-        self.end_state["min_links"] = trunk_info["minUpNum"]
-        self.end_state["hash_type"] = hash_type_xml_to_cli_str(trunk_info["hashType"])
-        self.end_state["mode"] = mode_xml_to_cli_str(trunk_info["workMode"])
-        self.end_state["members_detail"] = trunk_info["TrunkMemberIfs"]
+        self.end_state = self.get_trunk_state(trunk_info)
 
     def work(self):
         """worker"""
 
-        self.check_params()
-        self.trunk_info = self.get_trunk_dict(self.trunk_id)
-        self.get_existing()
-        self.get_proposed()
-
-        # deal present or absent
-        if self.state == "present":
-            if not self.trunk_info:
-                # create
-                self.create_eth_trunk()
-            else:
-                # merge trunk
-                self.merge_eth_trunk()
+        if self.trunks is not None:
+            self.config_trunks()
+            self.get_trunks_end_state()
         else:
-            if self.trunk_info:
-                if not self.members:
-                    # remove all members and delete trunk
-                    self.delete_eth_trunk()
+            self.check_params()
+            self.trunk_info = self.get_trunk_dict(self.trunk_id)
+            self.get_existing()
+            self.get_proposed()
+
+            # deal present or absent
+            if self.state == "present":
+                if not self.trunk_info:
+                    # create
+                    self.create_eth_trunk()
                 else:
-                    # remove some trunk members
-                    self.remove_member()
+                    # merge trunk
+                    self.merge_eth_trunk()
             else:
-                self.module.fail_json(msg='Error: Eth-Trunk does not exist.')
+                if self.trunk_info:
+                    if not self.members:
+                        # remove all members and delete trunk
+                        self.delete_eth_trunk()
+                    else:
+                        # remove some trunk members
+                        self.remove_member()
+                else:
+                    self.module.fail_json(msg='Error: Eth-Trunk does not exist.')
 
-        self.get_end_state()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -656,7 +874,7 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        trunk_id=dict(required=True),
+        trunk_id=dict(required=False),
         mode=dict(required=False,
                   choices=['manual', 'lacp-dynamic', 'lacp-static'],
                   type='str'),
@@ -667,6 +885,7 @@ def main():
                        type='str'),
         members=dict(required=False, default=None, type='list'),
         force=dict(required=False, default=False, type='bool'),
+        trunks=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
@@ -42,11 +42,15 @@ notes:
     - When using state:absent, evpn is not supported and it will be ignored.
     - When using state:absent to delete VPN target attributes, ensure the configuration of VPN target attributes has
       existed and otherwise it will report an error.
+    - When using bridge_domains, VPN targets and route distinguishers that do not exist are skipped
+      with state:absent instead of reporting an error.
 options:
     bridge_domain_id:
         description:
             - Specify an existed bridge domain (BD).The value is an integer ranging from 1 to 16777215.
-        required: true
+              Either bridge_domain_id or bridge_domains is required.
+        required: false
+        default: null
     evpn:
         description:
             - Create or delete an EVPN instance for a VXLAN in BD view.
@@ -88,6 +92,16 @@ options:
               The format is the same as route_distinguisher.
         required: false
         default: null
+    bridge_domains:
+        description:
+            - A list of BD EVPN instances managed in one task, each entry is a dict with the key bridge_domain_id,
+              and optionally evpn, route_distinguisher, vpn_target_both, vpn_target_import and vpn_target_export.
+              The existing VXLAN and EVPN state is read once and all changes are sent in a few merged edits.
+              Other keys, such as the vni_id and peer_list_ip used by ce_vxlan_tunnel, are ignored,
+              so the same list can be passed to both modules.
+              Can not be used with bridge_domain_id, route_distinguisher or any VPN target parameter.
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -174,6 +188,13 @@ EXAMPLES = '''
       bridge_domain_id: 20
       evpn: disable
       provider: "{{ cli }}"
+
+  - name: "Configure EVPN instances, RDs and VPN targets of several BDs at once"
+    ce_evpn_bd_vni:
+      bridge_domains:
+        - {bridge_domain_id: 10, route_distinguisher: '10:10', vpn_target_both: ['10:10']}
+        - {bridge_domain_id: 20, route_distinguisher: auto, vpn_target_import: ['20:1'], vpn_target_export: ['20:2']}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -257,49 +278,10 @@ changed:
 '''
 
 import copy
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-
-CE_NC_GET_VNI_BD = """
-<filter type="subtree">
-  <nvo3 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <nvo3Vni2Bds>
-      <nvo3Vni2Bd>
-        <vniId></vniId>
-        <bdId></bdId>
-      </nvo3Vni2Bd>
-    </nvo3Vni2Bds>
-  </nvo3>
-</filter>
-"""
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nvo3_evpn_snapshot, set_nc_config_chunks
 
-CE_NC_GET_EVPN_CONFIG = """
-<filter type="subtree">
-  <evpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <evpnInstances>
-      <evpnInstance>
-        <evpnName>%s</evpnName>
-        <bdId>%s</bdId>
-        <evpnAutoRD></evpnAutoRD>
-        <evpnRD></evpnRD>
-        <evpnRTs>
-          <evpnRT>
-            <vrfRTType></vrfRTType>
-            <vrfRTValue></vrfRTValue>
-          </evpnRT>
-        </evpnRTs>
-        <evpnAutoRTs>
-          <evpnAutoRT>
-            <vrfRTType></vrfRTType>
-          </evpnAutoRT>
-        </evpnAutoRTs>
-      </evpnInstance>
-    </evpnInstances>
-  </evpn>
-</filter>
-"""
 
 CE_NC_DELETE_EVPN_CONFIG = """
 <config>
@@ -381,6 +363,28 @@ CE_NC_MERGE_EVPN_CONFIG_TAIL = """
 </config>
 """
 
+CE_NC_MERGE_EVPN_INSTANCES_HEAD = """
+<config>
+  <evpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <evpnInstances>
+"""
+
+CE_NC_MERGE_EVPN_INSTANCES_TAIL = """
+    </evpnInstances>
+  </evpn>
+</config>
+"""
+
+CE_NC_MERGE_EVPN_INSTANCE_HEAD = """
+<evpnInstance operation="%s">
+  <evpnName>%s</evpnName>
+  <bdId>%s</bdId>
+"""
+
+CE_NC_MERGE_EVPN_INSTANCE_TAIL = """
+</evpnInstance>
+"""
+
 
 def is_valid_value(vrf_targe_value):
     """check whether VPN target value is valid"""
@@ -447,11 +451,13 @@ class EvpnBd(object):
             'vpn_target_import'] or list()
         self.vpn_target_export = self.module.params[
             'vpn_target_export'] or list()
+        self.bridge_domains = self.module.params['bridge_domains']
         self.state = self.module.params['state']
         self.__string_to_lowercase__()
 
         self.commands = list()
         self.evpn_info = dict()
+        self.nvo3_snapshot = None
         self.conf_exist = False
 
         # state
@@ -465,8 +471,15 @@ class EvpnBd(object):
     def __init_module__(self):
         """Init module"""
 
+        required_one_of = [['bridge_domain_id', 'bridge_domains']]
+        mutually_exclusive = [['bridge_domains', 'bridge_domain_id'],
+                              ['bridge_domains', 'route_distinguisher'],
+                              ['bridge_domains', 'vpn_target_both'],
+                              ['bridge_domains', 'vpn_target_import'],
+                              ['bridge_domains', 'vpn_target_export']]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def __check_response__(self, xml_str, xml_name):
         """Check if response message is already succeed"""
@@ -491,88 +504,41 @@ class EvpnBd(object):
             for index, ele in enumerate(self.vpn_target_both):
                 self.vpn_target_both[index] = ele.lower()
 
-    def get_all_evpn_rts(self, evpn_rts):
-        """Get all EVPN RTS"""
+    def get_evpn_bd_info(self, bd_id, refresh=False):
+        """Get EVPN instance information of a BD from the VXLAN snapshot"""
 
-        rts = evpn_rts.findall("evpnRT")
-        if not rts:
-            return
+        self.nvo3_snapshot = get_nvo3_evpn_snapshot(self.module, refresh)
+        evpn_info = dict(evpn_inst='disable',
+                         route_distinguisher=None,
+                         vpn_target_import=list(),
+                         vpn_target_export=list(),
+                         vpn_target_both=list())
 
-        for ele in rts:
-            vrf_rttype = ele.find('vrfRTType')
-            vrf_rtvalue = ele.find('vrfRTValue')
-
-            if vrf_rttype.text == 'export_extcommunity':
-                self.evpn_info['vpn_target_export'].append(vrf_rtvalue.text)
-            elif vrf_rttype.text == 'import_extcommunity':
-                self.evpn_info['vpn_target_import'].append(vrf_rtvalue.text)
-
-    def get_all_evpn_autorts(self, evpn_autorts):
-        """"Get all EVPN AUTORTS"""
-
-        autorts = evpn_autorts.findall("evpnAutoRT")
-        if not autorts:
-            return
+        evpn_inst = self.nvo3_snapshot["evpn_instances"].get(bd_id)
+        if not evpn_inst:
+            return evpn_info
 
-        for autort in autorts:
-            vrf_rttype = autort.find('vrfRTType')
+        evpn_info['evpn_inst'] = 'enable'
+        evpn_info['route_distinguisher'] = evpn_inst['route_distinguisher']
+        evpn_info['vpn_target_import'] = list(evpn_inst['vpn_target_import'])
+        evpn_info['vpn_target_export'] = list(evpn_inst['vpn_target_export'])
 
-            if vrf_rttype.text == 'export_extcommunity':
-                self.evpn_info['vpn_target_export'].append('auto')
-            elif vrf_rttype.text == 'import_extcommunity':
-                self.evpn_info['vpn_target_import'].append('auto')
+        # process RTS information
+        for ele in evpn_inst['vpn_target_export']:
+            if ele in evpn_info['vpn_target_import']:
+                evpn_info['vpn_target_both'].append(ele)
+                evpn_info['vpn_target_export'].remove(ele)
+                evpn_info['vpn_target_import'].remove(ele)
 
-    def process_rts_info(self):
-        """Process RTS information"""
+        return evpn_info
 
-        if not self.evpn_info['vpn_target_export'] or\
-                not self.evpn_info['vpn_target_import']:
-            return
-
-        vpn_target_export = copy.deepcopy(self.evpn_info['vpn_target_export'])
-        for ele in vpn_target_export:
-            if ele in self.evpn_info['vpn_target_import']:
-                self.evpn_info['vpn_target_both'].append(ele)
-                self.evpn_info['vpn_target_export'].remove(ele)
-                self.evpn_info['vpn_target_import'].remove(ele)
-
-    def get_evpn_instance_info(self):
+    def get_evpn_instance_info(self, refresh=False):
         """Get current EVPN instance information"""
 
         if not self.bridge_domain_id:
             self.module.fail_json(msg='Error: The value of bridge_domain_id cannot be empty.')
 
-        self.evpn_info['route_distinguisher'] = None
-        self.evpn_info['vpn_target_import'] = list()
-        self.evpn_info['vpn_target_export'] = list()
-        self.evpn_info['vpn_target_both'] = list()
-        self.evpn_info['evpn_inst'] = 'enable'
-
-        xml_str = CE_NC_GET_EVPN_CONFIG % (
-            self.bridge_domain_id, self.bridge_domain_id)
-        xml_str = get_nc_config(self.module, xml_str)
-        if "<data/>" in xml_str:
-            self.evpn_info['evpn_inst'] = 'disable'
-            return
-
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        root = ElementTree.fromstring(xml_str)
-        evpn_inst = root.find("data/evpn/evpnInstances/evpnInstance")
-        if evpn_inst:
-            for eles in evpn_inst:
-                if eles.tag in ["evpnAutoRD", "evpnRD", "evpnRTs", "evpnAutoRTs"]:
-                    if eles.tag == 'evpnAutoRD' and eles.text == 'true':
-                        self.evpn_info['route_distinguisher'] = 'auto'
-                    elif eles.tag == 'evpnRD' and self.evpn_info['route_distinguisher'] != 'auto':
-                        self.evpn_info['route_distinguisher'] = eles.text
-                    elif eles.tag == 'evpnRTs':
-                        self.get_all_evpn_rts(eles)
-                    elif eles.tag == 'evpnAutoRTs':
-                        self.get_all_evpn_autorts(eles)
-            self.process_rts_info()
+        self.evpn_info = self.get_evpn_bd_info(self.bridge_domain_id, refresh)
 
     def get_existing(self):
         """Get existing config"""
@@ -600,7 +566,7 @@ class EvpnBd(object):
     def get_end_state(self):
         """Get end config"""
 
-        self.get_evpn_instance_info()
+        self.get_evpn_instance_info(refresh=self.changed)
         self.end_state = dict(bridge_domain_id=self.bridge_domain_id,
                               evpn=self.evpn_info['evpn_inst'],
                               route_distinguisher=self.evpn_info[
@@ -1014,15 +980,196 @@ class EvpnBd(object):
     def check_vni_bd(self):
         """Check whether vxlan vni is configured in BD view"""
 
-        xml_str = CE_NC_GET_VNI_BD % self.bridge_domain_id
-        xml_str = get_nc_config(self.module, xml_str)
-        if "<data/>" in xml_str:
+        if self.bridge_domain_id not in self.nvo3_snapshot["bd2vni"]:
             self.module.fail_json(
                 msg='Error: The vxlan vni is not configured or the bridge domain id is invalid.')
 
+    def check_bridge_domains(self):
+        """Check and normalize the BD EVPN instance list"""
+
+        bridge_domains = list()
+        bd_ids = set()
+        for entry in self.bridge_domains:
+            if not isinstance(entry, dict) or not entry.get('bridge_domain_id'):
+                self.module.fail_json(
+                    msg='Error: Each bridge_domains entry must have bridge_domain_id.')
+            bd_id = str(entry['bridge_domain_id'])
+            if not bd_id.isdigit() or int(bd_id) > 16777215 or int(bd_id) < 1:
+                self.module.fail_json(
+                    msg='Error: The bridge domain id must be an integer between 1 and 16777215.')
+            if bd_id in bd_ids:
+                self.module.fail_json(
+                    msg='Error: The bridge domain %s is listed more than once.' % bd_id)
+            bd_ids.add(bd_id)
+
+            evpn = entry.get('evpn') or 'enable'
+            if evpn not in ['enable', 'disable']:
+                self.module.fail_json(
+                    msg='Error: The evpn of bridge domain %s must be enable or disable.' % bd_id)
+            route_distinguisher = entry.get('route_distinguisher')
+            if route_distinguisher:
+                route_distinguisher = str(route_distinguisher).lower()
+                if route_distinguisher != 'auto' and not is_valid_value(route_distinguisher):
+                    self.module.fail_json(
+                        msg='Error: Route distinguisher has invalid value %s.' % route_distinguisher)
+
+            vpn_targets = dict(export_extcommunity=list(), import_extcommunity=list())
+            for key, rt_types in [('vpn_target_export', ['export_extcommunity']),
+                                  ('vpn_target_import', ['import_extcommunity']),
+                                  ('vpn_target_both', ['export_extcommunity', 'import_extcommunity'])]:
+                for ele in entry.get(key) or list():
+                    ele = str(ele).lower()
+                    if ele != 'auto' and not is_valid_value(ele):
+                        self.module.fail_json(
+                            msg='Error: VPN target extended community attribute has invalid value %s.' % ele)
+                    for rt_type in rt_types:
+                        if ele not in vpn_targets[rt_type]:
+                            vpn_targets[rt_type].append(ele)
+
+            bridge_domains.append(dict(bridge_domain_id=bd_id, evpn=evpn,
+                                       route_distinguisher=route_distinguisher,
+                                       vpn_targets=vpn_targets))
+        self.bridge_domains = bridge_domains
+
+    def get_bridge_domains_state(self, refresh=False):
+        """Get EVPN instance information of all listed BDs"""
+
+        bridge_domains = list()
+        for entry in self.bridge_domains:
+            evpn_info = self.get_evpn_bd_info(entry['bridge_domain_id'], refresh)
+            refresh = False
+            bridge_domains.append(dict(bridge_domain_id=entry['bridge_domain_id'],
+                                       evpn=evpn_info['evpn_inst'],
+                                       route_distinguisher=evpn_info['route_distinguisher'],
+                                       vpn_target_both=evpn_info['vpn_target_both'],
+                                       vpn_target_import=evpn_info['vpn_target_import'],
+                                       vpn_target_export=evpn_info['vpn_target_export']))
+        return bridge_domains
+
+    def get_vpn_targets_xml(self, vpn_targets, operation):
+        """Get EVPN RTS and AUTORTS xml of VPN target list"""
+
+        xml_str = ''
+        autorts = [rt_type for rt_type, value in vpn_targets if value == 'auto']
+        if autorts:
+            xml_str += CE_NC_MERGE_EVPN_AUTORTS_HEAD
+            for rt_type in autorts:
+                if operation == 'delete':
+                    xml_str += CE_NC_DELETE_EVPN_AUTORTS_CONTEXT % rt_type
+                else:
+                    xml_str += CE_NC_MERGE_EVPN_AUTORTS_CONTEXT % rt_type
+            xml_str += CE_NC_MERGE_EVPN_AUTORTS_TAIL
+
+        rts = [(rt_type, value) for rt_type, value in vpn_targets if value != 'auto']
+        if rts:
+            xml_str += CE_NC_MERGE_EVPN_RTS_HEAD
+            for rt_type, value in rts:
+                if operation == 'delete':
+                    xml_str += CE_NC_DELETE_EVPN_RTS_CONTEXT % (rt_type, value)
+                else:
+                    xml_str += CE_NC_MERGE_EVPN_RTS_CONTEXT % (rt_type, value)
+            xml_str += CE_NC_MERGE_EVPN_RTS_TAIL
+
+        return xml_str
+
+    def config_bridge_domains(self):
+        """Configure EVPN instances of all listed BDs,
+        one edit-config carries many instances"""
+
+        xml_items = list()
+        for entry in self.bridge_domains:
+            bd_id = entry['bridge_domain_id']
+            evpn_inst = self.nvo3_snapshot['evpn_instances'].get(bd_id)
+            exist_rd = None
+            exist_rts = dict(export_extcommunity=list(), import_extcommunity=list())
+            if evpn_inst:
+                exist_rd = evpn_inst['route_distinguisher']
+                exist_rts['export_extcommunity'] = evpn_inst['vpn_target_export']
+                exist_rts['import_extcommunity'] = evpn_inst['vpn_target_import']
+
+            cmds = list()
+            xml_str = ''
+            operation = 'merge'
+            if self.state == 'present' and entry['evpn'] == 'disable':
+                if not evpn_inst:
+                    continue
+                operation = 'delete'
+                cmds.append("  undo evpn")
+            elif self.state == 'present':
+                if bd_id not in self.nvo3_snapshot['bd2vni']:
+                    self.module.fail_json(
+                        msg='Error: The vxlan vni is not configured for bridge domain %s.' % bd_id)
+                if entry['route_distinguisher'] and not exist_rd:
+                    if entry['route_distinguisher'] == 'auto':
+                        xml_str += '<evpnAutoRD>true</evpnAutoRD>'
+                    else:
+                        xml_str += '<evpnRD>%s</evpnRD>' % entry['route_distinguisher']
+                    cmds.append("    route-distinguisher %s" % entry['route_distinguisher'])
+                elif entry['route_distinguisher'] and entry['route_distinguisher'] != exist_rd:
+                    self.module.fail_json(
+                        msg='Error: Route distinguisher of bridge domain %s has already been configured.' % bd_id)
+
+                vpn_targets = [(rt_type, value) for rt_type in ['export_extcommunity', 'import_extcommunity']
+                               for value in entry['vpn_targets'][rt_type] if value not in exist_rts[rt_type]]
+                if vpn_targets and not (exist_rd or entry['route_distinguisher']):
+                    self.module.fail_json(
+                        msg='Error: Route distinguisher of bridge domain %s has not been configured.' % bd_id)
+                xml_str += self.get_vpn_targets_xml(vpn_targets, 'merge')
+                for rt_type, value in vpn_targets:
+                    cmds.append("    vpn-target %s %s" % (value, rt_type.replace('_', '-')))
+                if not evpn_inst or cmds:
+                    cmds.insert(0, "  evpn")
+            else:
+                if not evpn_inst:
+                    continue
+                if entry['route_distinguisher'] and entry['route_distinguisher'] == exist_rd:
+                    # all VPN targets are removed with the RD
+                    if exist_rd == 'auto':
+                        xml_str += '<evpnAutoRD>false</evpnAutoRD>'
+                    else:
+                        xml_str += '<evpnRD></evpnRD>'
+                    cmds.append("    undo route-distinguisher %s" % exist_rd)
+                else:
+                    vpn_targets = [(rt_type, value) for rt_type in ['export_extcommunity', 'import_extcommunity']
+                                   for value in entry['vpn_targets'][rt_type] if value in exist_rts[rt_type]]
+                    xml_str += self.get_vpn_targets_xml(vpn_targets, 'delete')
+                    for rt_type, value in vpn_targets:
+                        cmds.append("    undo vpn-target %s %s" % (value, rt_type.replace('_', '-')))
+                if cmds:
+                    cmds.insert(0, "  evpn")
+
+            if not cmds:
+                continue
+            xml_items.append(CE_NC_MERGE_EVPN_INSTANCE_HEAD % (operation, bd_id, bd_id) +
+                             xml_str + CE_NC_MERGE_EVPN_INSTANCE_TAIL)
+            self.updates_cmd.append("bridge-domain %s" % bd_id)
+            self.updates_cmd.extend(cmds)
+
+        if not xml_items:
+            return
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_MERGE_EVPN_INSTANCES_HEAD,
+                                 xml_items, CE_NC_MERGE_EVPN_INSTANCES_TAIL)
+        self.changed = True
+
+    def work_bridge_domains(self):
+        """Excute task of the BD list"""
+
+        self.check_bridge_domains()
+        self.existing = dict(bridge_domains=self.get_bridge_domains_state())
+        self.proposed = dict(bridge_domains=self.bridge_domains, state=self.state)
+        self.config_bridge_domains()
+        refresh = self.changed and not self.module.check_mode
+        self.end_state = dict(bridge_domains=self.get_bridge_domains_state(refresh))
+
     def work(self):
         """Excute task"""
 
+        if self.bridge_domains:
+            self.work_bridge_domains()
+            self.show_result()
+            return
+
         self.get_evpn_instance_info()
         self.process_input_params()
         self.check_params()
@@ -1040,13 +1187,14 @@ def main():
     """Main function entry"""
 
     argument_spec = dict(
-        bridge_domain_id=dict(required=True, type='str'),
+        bridge_domain_id=dict(required=False, type='str'),
         evpn=dict(required=False, type='str',
                   default='enable', choices=['enable', 'disable']),
         route_distinguisher=dict(required=False, type='str'),
         vpn_target_both=dict(required=False, type='list'),
         vpn_target_import=dict(required=False, type='list'),
         vpn_target_export=dict(required=False, type='list'),
+        bridge_domains=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
@@ -114,7 +114,8 @@ from xml.etree import ElementTree
 import paramiko
 from ansible.module_utils.shell import ShellError
 from ansible.module_utils.basic import get_exception, AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, run_commands, get_nc_config
+from ansible.module_utils.ce import ce_argument_spec, run_commands, get_nc_config, \
+    get_file_startup_index
 
 try:
     from scp import SCPClient
@@ -122,20 +123,6 @@ try:
 except ImportError:
     HAS_SCP = False
 
-CE_NC_GET_FILE_INFO = """
-<filter type="subtree">
-  <vfm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <dirs>
-      <dir>
-        <fileName>%s</fileName>
-        <dirName>%s</dirName>
-        <DirSize></DirSize>
-      </dir>
-    </dirs>
-  </vfm>
-</filter>
-"""
-
 CE_NC_GET_SCP_ENABLE = """
 <filter type="subtree">
   <sshs xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -206,33 +193,18 @@ class FileCopy(object):
         self.module = AnsibleModule(
             argument_spec=self.spec, supports_check_mode=True)
 
-    def remote_file_exists(self, dst, file_system='flash:'):
+    def remote_file_exists(self, dst, file_system='flash:', refresh=False):
         """Remote file whether exists"""
 
         full_path = file_system + dst
         file_name = os.path.basename(full_path)
         file_path = os.path.dirname(full_path)
         file_path = file_path + '/'
-        xml_str = CE_NC_GET_FILE_INFO % (file_name, file_path)
-        ret_xml = get_nc_config(self.module, xml_str)
-        if "<data/>" in ret_xml:
+        file_index = get_file_startup_index(self.module, file_path, refresh)
+        if file_name not in file_index["files"]:
             return False, 0
 
-        xml_str = ret_xml.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        # get file info
-        root = ElementTree.fromstring(xml_str)
-        topo = root.find("data/vfm/dirs/dir")
-        if topo is None:
-            return False, 0
-
-        for eles in topo:
-            if eles.tag in ["DirSize"]:
-                return True, int(eles.text.replace(',', ''))
-
-        return False, 0
+        return True, file_index["files"][file_name]
 
     def local_file_exists(self):
         """Local file whether exists"""
@@ -284,7 +256,7 @@ class FileCopy(object):
         except:
             time.sleep(10)
             file_exists, temp_size = self.remote_file_exists(
-                dest, self.file_system)
+                dest, self.file_system, refresh=True)
             file_size = os.path.getsize(self.local_file)
             if file_exists and int(temp_size) == int(file_size):
                 pass
@@ -147,72 +147,35 @@ updates:
     sample: ["info-center timestamp debugging boot"]
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import ce_argument_spec, get_syslog_snapshot, set_syslog_config
 
 
-# get info center debug global
-CE_GET_DEBUG_GLOBAL_HEADER = """
-    <filter type="subtree">
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <globalParam>
-"""
-CE_GET_DEBUG_GLOBAL_TAIL = """
-        </globalParam>
-      </syslog>
-    </filter>
-"""
 # merge info center debug global
 CE_MERGE_DEBUG_GLOBAL_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <globalParam operation="merge">
 """
 CE_MERGE_DEBUG_GLOBAL_TAIL = """
         </globalParam>
-      </syslog>
-    </config>
 """
 
-# get info center debug source
-CE_GET_DEBUG_SOURCE_HEADER = """
-    <filter type="subtree">
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <icSources>
-          <icSource>
-"""
-CE_GET_DEBUG_SOURCE_TAIL = """
-          </icSource>
-        </icSources>
-      </syslog>
-    </filter>
-"""
 # merge info center debug source
 CE_MERGE_DEBUG_SOURCE_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <icSources>
           <icSource operation="merge">
 """
 CE_MERGE_DEBUG_SOURCE_TAIL = """
           </icSource>
         </icSources>
-      </syslog>
-    </config>
 """
 # delete info center debug source
 CE_DELETE_DEBUG_SOURCE_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <icSources>
           <icSource operation="delete">
 """
 CE_DELETE_DEBUG_SOURCE_TAIL = """
           </icSource>
         </icSources>
-      </syslog>
-    </config>
 """
 
 TIME_STAMP_DICT = {"date_boot": "boot",
@@ -271,6 +234,7 @@ class InfoCenterDebug(object):
         # cur config
         self.cur_global_cfg = dict()
         self.cur_source_cfg = dict()
+        self.xml_items = list()
 
         # state
         self.changed = False
@@ -289,28 +253,14 @@ class InfoCenterDebug(object):
 
         if self.debug_time_stamp:
 
-            conf_str = CE_GET_DEBUG_GLOBAL_HEADER
-            conf_str += "<debugTimeStamp></debugTimeStamp>"
-            conf_str += CE_GET_DEBUG_GLOBAL_TAIL
-
-            xml_str = get_nc_config(self.module, conf_str)
-            if "<data/>" in xml_str:
+            global_param = get_syslog_snapshot(self.module)["globalParam"]
+            if not global_param:
                 find_flag = False
             else:
-                xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                global_cfg = root.findall("data/syslog/globalParam")
-                if global_cfg:
-                    for tmp in global_cfg:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["debugTimeStamp"]:
-                                tmp_dict[site.tag] = site.text
-
-                        self.cur_global_cfg["global_cfg"].append(tmp_dict)
+                tmp_dict = dict()
+                if "debugTimeStamp" in global_param:
+                    tmp_dict["debugTimeStamp"] = global_param["debugTimeStamp"]
+                self.cur_global_cfg["global_cfg"].append(tmp_dict)
 
                 if self.cur_global_cfg["global_cfg"]:
                     for tmp in self.cur_global_cfg["global_cfg"]:
@@ -356,39 +306,18 @@ class InfoCenterDebug(object):
                     self.module.fail_json(
                         msg='Error: The channel_id is not digit.')
 
-            conf_str = CE_GET_DEBUG_SOURCE_HEADER
-
-            if self.module_name != "default":
-                conf_str += "<moduleName>%s</moduleName>" % self.module_name.upper()
-            else:
-                conf_str += "<moduleName>default</moduleName>"
-
-            if self.channel_id:
-                conf_str += "<icChannelId></icChannelId>"
-            if self.debug_enable != 'no_use':
-                conf_str += "<dbgEnFlg></dbgEnFlg>"
-            if self.debug_level:
-                conf_str += "<dbgEnLevel></dbgEnLevel>"
-
-            conf_str += CE_GET_DEBUG_SOURCE_TAIL
-            xml_str = get_nc_config(self.module, conf_str)
-            if "<data/>" in xml_str:
+            source_cfg = [src for src in get_syslog_snapshot(self.module)["icSources"]
+                          if (src.get("moduleName") or "").lower() == self.module_name.lower()]
+            if not source_cfg:
                 find_flag = False
             else:
-                xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                source_cfg = root.findall("data/syslog/icSources/icSource")
-                if source_cfg:
-                    for tmp in source_cfg:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["moduleName", "icChannelId", "dbgEnFlg", "dbgEnLevel"]:
-                                tmp_dict[site.tag] = site.text
+                for src in source_cfg:
+                    tmp_dict = dict()
+                    for tag in ["moduleName", "icChannelId", "dbgEnFlg", "dbgEnLevel"]:
+                        if tag in src:
+                            tmp_dict[tag] = src[tag]
 
-                        self.cur_source_cfg["source_cfg"].append(tmp_dict)
+                    self.cur_source_cfg["source_cfg"].append(tmp_dict)
 
                 if self.cur_source_cfg["source_cfg"]:
                     for tmp in self.cur_source_cfg["source_cfg"]:
@@ -460,9 +389,7 @@ class InfoCenterDebug(object):
 
         conf_str += CE_MERGE_DEBUG_GLOBAL_TAIL
 
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge debug global failed.')
+        self.xml_items.append(conf_str)
 
         if self.debug_time_stamp:
             cmd = "info-center timestamp debugging " + TIME_STAMP_DICT.get(self.debug_time_stamp)
@@ -480,9 +407,7 @@ class InfoCenterDebug(object):
 
         conf_str += CE_MERGE_DEBUG_GLOBAL_TAIL
 
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: delete debug global failed.')
+        self.xml_items.append(conf_str)
 
         if self.debug_time_stamp:
             cmd = "undo info-center timestamp debugging"
@@ -506,9 +431,7 @@ class InfoCenterDebug(object):
 
         conf_str += CE_MERGE_DEBUG_SOURCE_TAIL
 
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge debug source failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "info-center source"
         if self.module_name:
@@ -548,9 +471,7 @@ class InfoCenterDebug(object):
                 conf_str += "<dbgEnLevel>%s</dbgEnLevel>" % CHANNEL_DEFAULT_DBG_LEVEL.get(self.channel_id)
             conf_str += CE_MERGE_DEBUG_SOURCE_TAIL
 
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Delete debug source failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "undo info-center source"
         if self.module_name:
@@ -585,6 +506,9 @@ class InfoCenterDebug(object):
             if self.cur_source_cfg["need_cfg"]:
                 self.delete_debug_source()
 
+        if self.xml_items and not self.module.check_mode:
+            set_syslog_config(self.module, self.xml_items)
+            get_syslog_snapshot(self.module, refresh=True)
         self.get_end_state()
 
         self.results['changed'] = self.changed
@@ -161,6 +161,20 @@ options:
               The value can be an valid IPv4 or IPv6 address.
         required: false
         default: null
+    loghosts:
+        description:
+            - A list of log hosts, each one is a dict with server_ip and optionally ip_type, vrf_name, level,
+              server_port, facility, channel_id, channel_name, timestamp, transport_mode, ssl_policy_name
+              and source_ip. ip_type is guessed from server_ip, the other unset keys take the value
+              of the module option of the same name and vrf_name defaults to _public_.
+              Log hosts are indexed by ip_type, server_ip and vrf_name.
+              If C(state=present), the list is the whole set of IP log hosts of the device,
+              the ones that are not in the list are removed.
+              If C(state=absent), the log hosts in the list are removed.
+              Channel and filter options of the same task are pushed in the same edit.
+              Can not be used with ip_type, server_ip and server_domain.
+        required: false
+        default: null
     state:
         description:
             - Specify desired state of the resource.
@@ -247,6 +261,18 @@ EXAMPLES = '''
       timestamp: UTC
       state: present
       provider: "{{ cli }}"
+
+  - name: Replace all syslog loghosts, sending them through channel 2
+    ce_info_center_global:
+      channel_id: 2
+      channel_cfg_name: collector
+      level: informational
+      loghosts:
+        - {server_ip: 10.1.1.1}
+        - {server_ip: 10.1.1.2, vrf_name: mgmt, transport_mode: tcp, server_port: 601}
+        - {server_ip: "2001:db8::1", level: warning}
+      state: present
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -328,50 +354,19 @@ changed:
 '''
 import socket
 import sys
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, get_nc_config, set_nc_config
+from ansible.module_utils.ce import ce_argument_spec, get_syslog_snapshot, set_syslog_config
 
 
-CE_NC_GET_CENTER_GLOBAL_INFO_HEADER = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <globalParam>
-"""
-CE_NC_GET_CENTER_GLOBAL_INFO_TAIL = """
-    </globalParam>
-  </syslog>
-</filter>
-"""
-
 CE_NC_MERGE_CENTER_GLOBAL_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <globalParam operation="merge">
 """
 
 CE_NC_MERGE_CENTER_GLOBAL_INFO_TAIL = """
     </globalParam>
-  </syslog>
-</config>
-"""
-
-CE_NC_GET_LOG_FILE_INFO_HEADER = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <icLogFileInfos>
-      <icLogFileInfo>
-"""
-CE_NC_GET_LOG_FILE_INFO_TAIL = """
-      </icLogFileInfo>
-    </icLogFileInfos>
-  </syslog>
-</filter>
 """
 
 CE_NC_MERGE_LOG_FILE_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <icLogFileInfos>
       <icLogFileInfo operation="merge">
 """
@@ -379,52 +374,18 @@ CE_NC_MERGE_LOG_FILE_INFO_HEADER = """
 CE_NC_MERGE_LOG_FILE_INFO_TAIL = """
       </icLogFileInfo>
     </icLogFileInfos>
-  </syslog>
-</config>
-"""
-
-
-CE_NC_GET_CHANNEL_INFO = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <icChannels>
-      <icChannel>
-        <icChnlId>%s</icChnlId>
-        <icChnlCfgName></icChnlCfgName>
-      </icChannel>
-    </icChannels>
-  </syslog>
-</filter>
 """
 
 CE_NC_MERGE_CHANNEL_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <icChannels>
       <icChannel operation="merge">
 """
 CE_NC_MERGE_CHANNEL_INFO_TAIL = """
       </icChannel>
     </icChannels>
-  </syslog>
-</config>
 """
 
-CE_NC_GET_CHANNEL_DIRECT_INFO = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <icDirChannels>
-      <icDirChannel>
-        <icOutDirect>%s</icOutDirect>
-        <icCfgChnlId></icCfgChnlId>
-      </icDirChannel>
-    </icDirChannels>
-  </syslog>
-</filter>
-"""
 CE_NC_MERGE_CHANNEL_DIRECT_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <icDirChannels>
       <icDirChannel operation="merge">
 """
@@ -432,26 +393,9 @@ CE_NC_MERGE_CHANNEL_DIRECT_HEADER = """
 CE_NC_MERGE_CHANNEL_DIRECT_TAIL = """
       </icDirChannel>
     </icDirChannels>
-  </syslog>
-</config>
-"""
-
-CE_NC_GET_FILTER_INFO = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <icFilters>
-      <icFilter>
-        <icFeatureName></icFeatureName>
-        <icFilterLogName></icFilterLogName>
-      </icFilter>
-    </icFilters>
-  </syslog>
-</filter>
 """
 
 CE_NC_CREATE_CHANNEL_FILTER_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <icFilters>
       <icFilter operation="create">
 
@@ -459,12 +403,8 @@ CE_NC_CREATE_CHANNEL_FILTER_HEADER = """
 CE_NC_CREATE_CHANNEL_FILTER_TAIL = """
      </icFilter>
     </icFilters>
-  </syslog>
-</config>
 """
 CE_NC_DELETE_CHANNEL_FILTER_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <icFilters>
       <icFilter operation="delete">
 
@@ -472,29 +412,9 @@ CE_NC_DELETE_CHANNEL_FILTER_HEADER = """
 CE_NC_DELETE_CHANNEL_FILTER_TAIL = """
      </icFilter>
     </icFilters>
-  </syslog>
-</config>
 """
 
-CE_NC_GET_SERVER_IP_INFO_HEADER = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <syslogServers>
-      <syslogServer>
-        <ipType>%s</ipType>
-        <serverIp>%s</serverIp>
-        <vrfName>%s</vrfName>
-        <isDefaultVpn>%s</isDefaultVpn>
-"""
-CE_NC_GET_SERVER_IP_INFO_TAIL = """
-      </syslogServer>
-    </syslogServers>
-  </syslog>
-</filter>
-"""
 CE_NC_MERGE_SERVER_IP_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <syslogServers>
       <syslogServer operation="merge">
         <ipType>%s</ipType>
@@ -505,12 +425,8 @@ CE_NC_MERGE_SERVER_IP_INFO_HEADER = """
 CE_NC_MERGE_SERVER_IP_INFO_TAIL = """
       </syslogServer>
     </syslogServers>
-  </syslog>
-</config>
 """
 CE_NC_DELETE_SERVER_IP_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <syslogServers>
       <syslogServer operation="delete">
         <ipType>%s</ipType>
@@ -521,26 +437,9 @@ CE_NC_DELETE_SERVER_IP_INFO_HEADER = """
 CE_NC_DELETE_SERVER_IP_INFO_TAIL = """
       </syslogServer>
     </syslogServers>
-  </syslog>
-</config>
-"""
-CE_NC_GET_SERVER_DNS_INFO_HEADER = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <syslogDNSs>
-      <syslogDNS>
-"""
-
-CE_NC_GET_SERVER_DNS_INFO_TAIL = """
-      </syslogDNS>
-    </syslogDNSs>
-  </syslog>
-</filter>
 """
 
 CE_NC_MERGE_SERVER_DNS_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <syslogDNSs>
       <syslogDNS operation="merge">
         <serverDomain>%s</serverDomain>
@@ -550,13 +449,9 @@ CE_NC_MERGE_SERVER_DNS_INFO_HEADER = """
 CE_NC_MERGE_SERVER_DNS_INFO_TAIL = """
       </syslogDNS>
     </syslogDNSs>
-  </syslog>
-</config>
 """
 
 CE_NC_DELETE_SERVER_DNS_INFO_HEADER = """
-<config>
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <syslogDNSs>
       <syslogDNS operation="delete">
         <serverDomain>%s</serverDomain>
@@ -566,8 +461,6 @@ CE_NC_DELETE_SERVER_DNS_INFO_HEADER = """
 CE_NC_DELETE_SERVER_DNS_INFO_TAIL = """
       </syslogDNS>
     </syslogDNSs>
-  </syslog>
-</config>
 """
 
 
@@ -590,6 +483,25 @@ def is_valid_address(address):
     return True
 
 
+# options of a loghost entry and the leaves of syslogServer they map to
+LOGHOST_OPTIONS = [("level", "level"), ("server_port", "serverPort"), ("facility", "facility"),
+                   ("channel_id", "chnlId"), ("channel_name", "chnlName"), ("timestamp", "timestamp"),
+                   ("transport_mode", "transportMode"), ("ssl_policy_name", "sslPolicyName"),
+                   ("source_ip", "sourceIP")]
+
+LOGHOST_CHOICES = dict(level=['emergencies', 'alert', 'critical', 'error', 'warning', 'notification',
+                              'informational', 'debugging'],
+                       facility=['local0', 'local1', 'local2', 'local3', 'local4', 'local5', 'local6', 'local7'],
+                       timestamp=['UTC', 'localtime'],
+                       transport_mode=['tcp', 'udp'])
+
+
+def get_loghost_key(host):
+    """loghosts are indexed by ip type, address and vrf"""
+
+    return (host.get("ipType"), host.get("serverIp"), host.get("vrfName"))
+
+
 def get_out_direct_default(out_direct):
     """get default out direct"""
 
@@ -643,6 +555,7 @@ class InfoCenterGlobal(object):
         self.ssl_policy_name = self.module.params['ssl_policy_name'] or None
         self.source_ip = self.module.params['source_ip'] or None
         self.state = self.module.params['state'] or None
+        self.loghosts = self.module.params['loghosts']
 
         # state
         self.changed = False
@@ -660,12 +573,15 @@ class InfoCenterGlobal(object):
         self.filter_info = None
         self.server_ip_info = None
         self.server_domain_info = None
+        self.loghost_info = None
+        self.xml_items = list()
 
     def init_module(self):
         """ init module """
 
+        mutually_exclusive = [('loghosts', 'ip_type'), ('loghosts', 'server_ip'), ('loghosts', 'server_domain')]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, con_obj, xml_name):
         """Check if response message is already succeed."""
@@ -679,23 +595,12 @@ class InfoCenterGlobal(object):
 
         channel_info = dict()
         # get channel info
-        conf_str = CE_NC_GET_CHANNEL_INFO % self.channel_id
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return channel_info
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        channel_info["channelInfos"] = list()
-        channels = root.findall("data/syslog/icChannels/icChannel")
+        snapshot = get_syslog_snapshot(self.module)
+        channels = [channel for channel in snapshot["icChannels"]
+                    if channel.get("icChnlId") == self.channel_id]
         if channels:
-            for channel in channels:
-                channel_dict = dict()
-                for ele in channel:
-                    if ele.tag in ["icChnlId", "icChnlCfgName"]:
-                        channel_dict[ele.tag] = ele.text
-                channel_info["channelInfos"].append(channel_dict)
+            channel_info["channelInfos"] = [dict((tag, channel.get(tag)) for tag in ["icChnlId", "icChnlCfgName"])
+                                            for channel in channels]
         return channel_info
 
     def is_exist_channel_id_name(self, channel_id, channel_name):
@@ -704,7 +609,7 @@ class InfoCenterGlobal(object):
         if not self.channel_info:
             return False
 
-        for id2name in self.channel_info["channelInfos"]:
+        for id2name in self.channel_info.get("channelInfos", list()):
             if id2name["icChnlId"] == channel_id and id2name["icChnlCfgName"] == channel_name:
                 return True
         return False
@@ -720,10 +625,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icChnlCfgName>%s</icChnlCfgName>" % channel_name
 
             conf_str += CE_NC_MERGE_CHANNEL_INFO_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog channel id failed.')
+            self.xml_items.append(conf_str)
 
             self.updates_cmd.append(
                 "info-center channel %s name %s" % (channel_id, channel_name))
@@ -735,7 +637,7 @@ class InfoCenterGlobal(object):
         change_flag = False
 
         if channel_name:
-            for id2name in self.channel_info["channelInfos"]:
+            for id2name in self.channel_info.get("channelInfos", list()):
                 channel_default_name = get_channel_name_default(
                     id2name["icChnlId"])
                 if id2name["icChnlId"] == channel_id and id2name["icChnlCfgName"] == channel_name:
@@ -743,7 +645,7 @@ class InfoCenterGlobal(object):
                     change_flag = True
 
         if not channel_name:
-            for id2name in self.channel_info["channelInfos"]:
+            for id2name in self.channel_info.get("channelInfos", list()):
                 channel_default_name = get_channel_name_default(
                     id2name["icChnlId"])
                 if id2name["icChnlId"] == channel_id and id2name["icChnlCfgName"] != channel_default_name:
@@ -757,10 +659,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icChnlCfgName>%s</icChnlCfgName>" % channel_name
 
             conf_str += CE_NC_MERGE_CHANNEL_INFO_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog channel id failed.')
+            self.xml_items.append(conf_str)
 
             self.updates_cmd.append("undo info-center channel %s" % channel_id)
             self.changed = True
@@ -770,24 +669,13 @@ class InfoCenterGlobal(object):
 
         channel_direct_info = dict()
         # get channel direct info
-        conf_str = CE_NC_GET_CHANNEL_DIRECT_INFO % self.channel_out_direct
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return channel_direct_info
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        channel_direct_info["channelDirectInfos"] = list()
-        dir_channels = root.findall("data/syslog/icDirChannels/icDirChannel")
+        snapshot = get_syslog_snapshot(self.module)
+        dir_channels = [dir_channel for dir_channel in snapshot["icDirChannels"]
+                        if dir_channel.get("icOutDirect") == self.channel_out_direct]
         if dir_channels:
-            for ic_dir_channel in dir_channels:
-                channel_direct_dict = dict()
-                for ele in ic_dir_channel:
-                    if ele.tag in ["icOutDirect", "icCfgChnlId"]:
-                        channel_direct_dict[ele.tag] = ele.text
-                channel_direct_info["channelDirectInfos"].append(
-                    channel_direct_dict)
+            channel_direct_info["channelDirectInfos"] = [
+                dict((tag, dir_channel.get(tag)) for tag in ["icOutDirect", "icCfgChnlId"])
+                for dir_channel in dir_channels]
         return channel_direct_info
 
     def is_exist_out_direct(self, out_direct, channel_id):
@@ -796,7 +684,7 @@ class InfoCenterGlobal(object):
         if not self.channel_direct_info:
             return False
 
-        for id2name in self.channel_direct_info["channelDirectInfos"]:
+        for id2name in self.channel_direct_info.get("channelDirectInfos", list()):
             if id2name["icOutDirect"] == out_direct and id2name["icCfgChnlId"] == channel_id:
                 return True
         return False
@@ -812,10 +700,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icCfgChnlId>%s</icCfgChnlId>" % channel_id
 
             conf_str += CE_NC_MERGE_CHANNEL_DIRECT_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog channel out direct failed.')
+            self.xml_items.append(conf_str)
 
             self.updates_cmd.append(
                 "info-center %s channel %s" % (out_direct, channel_id))
@@ -827,14 +712,14 @@ class InfoCenterGlobal(object):
         change_flag = False
         channel_id_default = get_out_direct_default(out_direct)
         if channel_id:
-            for id2name in self.channel_direct_info["channelDirectInfos"]:
+            for id2name in self.channel_direct_info.get("channelDirectInfos", list()):
                 if id2name["icOutDirect"] == out_direct and id2name["icCfgChnlId"] == channel_id:
                     if channel_id != channel_id_default:
                         channel_id = channel_id_default
                         change_flag = True
 
         if not channel_id:
-            for id2name in self.channel_direct_info["channelDirectInfos"]:
+            for id2name in self.channel_direct_info.get("channelDirectInfos", list()):
                 if id2name["icOutDirect"] == out_direct and id2name["icCfgChnlId"] != channel_id_default:
                     channel_id = channel_id_default
                     change_flag = True
@@ -847,10 +732,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icCfgChnlId>%s</icCfgChnlId>" % channel_id
 
             conf_str += CE_NC_MERGE_CHANNEL_DIRECT_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog channel out direct failed.')
+            self.xml_items.append(conf_str)
 
             self.updates_cmd.append("undo info-center logfile channel")
             self.changed = True
@@ -860,23 +742,10 @@ class InfoCenterGlobal(object):
 
         filter_info = dict()
         # get filter info
-        conf_str = CE_NC_GET_FILTER_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return filter_info
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        filter_info["filterInfos"] = list()
-        ic_filters = root.findall("data/syslog/icFilters/icFilter")
-        if ic_filters:
-            for ic_filter in ic_filters:
-                filter_dict = dict()
-                for ele in ic_filter:
-                    if ele.tag in ["icFeatureName", "icFilterLogName"]:
-                        filter_dict[ele.tag] = ele.text
-                filter_info["filterInfos"].append(filter_dict)
+        snapshot = get_syslog_snapshot(self.module)
+        if snapshot["icFilters"]:
+            filter_info["filterInfos"] = [dict((tag, ic_filter.get(tag)) for tag in ["icFeatureName", "icFilterLogName"])
+                                          for ic_filter in snapshot["icFilters"]]
         return filter_info
 
     def is_exist_filter(self, filter_feature_name, filter_log_name):
@@ -901,9 +770,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icFilterLogName>%s</icFilterLogName>" % filter_log_name
 
             conf_str += CE_NC_CREATE_CHANNEL_FILTER_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(msg='Error: Merge syslog filter failed.')
+            self.xml_items.append(conf_str)
 
             self.updates_cmd.append("info-center filter-id bymodule-alias %s %s"
                                     % (filter_feature_name, filter_log_name))
@@ -926,10 +793,7 @@ class InfoCenterGlobal(object):
                 conf_str += "<icFilterLogName>%s</icFilterLogName>" % filter_log_name
 
             conf_str += CE_NC_DELETE_CHANNEL_FILTER_TAIL
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog channel out direct failed.')
+            self.xml_items.append(conf_str)
             self.updates_cmd.append("undo info-center filter-id bymodule-alias %s %s"
                                     % (filter_feature_name, filter_log_name))
             self.changed = True
@@ -946,27 +810,13 @@ class InfoCenterGlobal(object):
             is_default_vpn = "true"
         if not self.vrf_name:
             self.vrf_name = "_public_"
-        conf_str = CE_NC_GET_SERVER_IP_INFO_HEADER % (
-            self.ip_type, self.server_ip, self.vrf_name, is_default_vpn)
-        conf_str += CE_NC_GET_SERVER_IP_INFO_TAIL
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return server_ip_info
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        server_ip_info["serverIpInfos"] = list()
-        syslog_servers = root.findall("data/syslog/syslogServers/syslogServer")
+        snapshot = get_syslog_snapshot(self.module)
+        syslog_servers = [server for server in snapshot["syslogServers"]
+                          if server.get("ipType") == self.ip_type and server.get("serverIp") == self.server_ip
+                          and server.get("vrfName") == self.vrf_name
+                          and server.get("isDefaultVpn") == is_default_vpn]
         if syslog_servers:
-            for syslog_server in syslog_servers:
-                server_dict = dict()
-                for ele in syslog_server:
-                    if ele.tag in ["ipType", "serverIp", "vrfName", "level", "serverPort", "facility", "chnlId",
-                                   "chnlName", "timestamp", "transportMode", "sslPolicyName", "isDefaultVpn",
-                                   "sourceIP", "isBriefFmt"]:
-                        server_dict[ele.tag] = ele.text
-                server_ip_info["serverIpInfos"].append(server_dict)
+            server_ip_info["serverIpInfos"] = syslog_servers
         return server_ip_info
 
     def config_merge_loghost(self):
@@ -1004,9 +854,7 @@ class InfoCenterGlobal(object):
             conf_str += CE_NC_MERGE_SERVER_IP_INFO_TAIL
         elif self.server_domain:
             conf_str += CE_NC_MERGE_SERVER_DNS_INFO_TAIL
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge server loghost failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "info-center loghost"
         if self.ip_type == "ipv4" and self.server_ip:
@@ -1074,9 +922,7 @@ class InfoCenterGlobal(object):
             conf_str += CE_NC_DELETE_SERVER_IP_INFO_TAIL
         elif self.server_domain:
             conf_str += CE_NC_DELETE_SERVER_DNS_INFO_TAIL
-        recv_xml = set_nc_config(self.module, conf_str)
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge server loghost failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "undo info-center loghost"
         if self.ip_type == "ipv4" and self.server_ip:
@@ -1118,26 +964,9 @@ class InfoCenterGlobal(object):
             self.is_default_vpn = False
         if not self.vrf_name:
             self.vrf_name = "_public_"
-        conf_str = CE_NC_GET_SERVER_DNS_INFO_HEADER
-        conf_str += CE_NC_GET_SERVER_DNS_INFO_TAIL
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return server_domain_info
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
-        server_domain_info["serverAddressInfos"] = list()
-        syslog_dnss = root.findall("data/syslog/syslogDNSs/syslogDNS")
-        if syslog_dnss:
-            for syslog_dns in syslog_dnss:
-                dns_dict = dict()
-                for ele in syslog_dns:
-                    if ele.tag in ["serverDomain", "vrfName", "level", "serverPort", "facility", "chnlId",
-                                   "chnlName", "timestamp", "transportMode", "sslPolicyName", "isDefaultVpn",
-                                   "sourceIP", "isBriefFmt"]:
-                        dns_dict[ele.tag] = ele.text
-                server_domain_info["serverAddressInfos"].append(dns_dict)
+        snapshot = get_syslog_snapshot(self.module)
+        if snapshot["syslogDNSs"]:
+            server_domain_info["serverAddressInfos"] = snapshot["syslogDNSs"]
 
         return server_domain_info
 
@@ -1213,40 +1042,168 @@ class InfoCenterGlobal(object):
             need_cfg = bool(find_flag)
         return need_cfg
 
-    def get_syslog_global(self):
-        """get syslog global attributes"""
+    def check_loghosts(self):
+        """check loghosts and normalize each one to the leaves of a syslogServer"""
 
-        cur_global_info = dict()
-        conf_str = CE_NC_GET_CENTER_GLOBAL_INFO_HEADER
-        if self.info_center_enable:
-            conf_str += "<icEnable></icEnable>"
-        if self.packet_priority:
-            conf_str += "<packetPriority></packetPriority>"
-        if self.suppress_enable:
-            conf_str += "<suppressEnable></suppressEnable>"
-        conf_str += CE_NC_GET_CENTER_GLOBAL_INFO_TAIL
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return cur_global_info
+        loghosts = list()
+        for loghost in self.loghosts:
+            if not isinstance(loghost, dict) or not loghost.get("server_ip"):
+                self.module.fail_json(
+                    msg='Error: Each loghost must be a dict with server_ip.')
+
+            server_ip = str(loghost["server_ip"])
+            if not is_valid_address(server_ip):
+                self.module.fail_json(
+                    msg='Error: The %s is not a valid ip address' % server_ip)
+            ip_type = loghost.get("ip_type")
+            if not ip_type:
+                ip_type = "ipv6" if ":" in server_ip else "ipv4"
+            if ip_type not in ["ipv4", "ipv6"]:
+                self.module.fail_json(
+                    msg='Error: The ip_type of loghost %s must be ipv4 or ipv6.' % server_ip)
+            vrf_name = str(loghost.get("vrf_name") or self.vrf_name or "_public_")
+            if len(vrf_name) > 31 or len(vrf_name.replace(' ', '')) < 1:
+                self.module.fail_json(
+                    msg='Error: vrf_name is not in the range from 1 to 31.')
+            if ip_type == "ipv6" and vrf_name != "_public_":
+                self.module.fail_json(
+                    msg='Error: ipType:ipv6 only support default vpn:_public_.')
+
+            host = dict(ipType=ip_type, serverIp=server_ip, vrfName=vrf_name,
+                        isDefaultVpn=str(vrf_name == "_public_").lower())
+            for option, tag in LOGHOST_OPTIONS:
+                value = loghost.get(option)
+                if value is None:
+                    value = getattr(self, option)
+                if value is not None:
+                    value = str(value)
+                    if option in LOGHOST_CHOICES and value not in LOGHOST_CHOICES[option]:
+                        self.module.fail_json(
+                            msg='Error: The %s of loghost %s must be one of %s.'
+                                % (option, server_ip, ", ".join(LOGHOST_CHOICES[option])))
+                host[tag] = value
+
+            if host["serverPort"] and (not host["serverPort"].isdigit()
+                                       or int(host["serverPort"]) > 65535 or int(host["serverPort"]) < 1):
+                self.module.fail_json(
+                    msg='Error: The server_port must be an integer between 1 and 65535.')
+            if host["chnlId"] and (not host["chnlId"].isdigit() or int(host["chnlId"]) > 9):
+                self.module.fail_json(
+                    msg='Error: The channel_id must be an integer between 0 and 9.')
+            if host["chnlId"] and host["chnlName"]:
+                self.module.fail_json(
+                    msg='Error: channel_id and channel_name can not be exist at the same time.')
+            if host["sourceIP"] and not is_valid_address(host["sourceIP"]):
+                self.module.fail_json(
+                    msg='Error: The %s is not a valid ip address' % host["sourceIP"])
+            if host["sslPolicyName"]:
+                if host["transportMode"] == "udp":
+                    self.module.fail_json(
+                        msg='Error: transport_mode: udp does not support ssl_policy.')
+                if not host["transportMode"]:
+                    self.module.fail_json(
+                        msg='Error: transport_mode, ssl_policy_name must be exist at the same time.')
+
+            if [cur for cur in loghosts if get_loghost_key(cur) == get_loghost_key(host)]:
+                self.module.fail_json(
+                    msg='Error: The loghost %s of vrf %s is listed more than once.' % (server_ip, vrf_name))
+            loghosts.append(host)
+        self.loghosts = loghosts
+
+    def get_loghost_info(self):
+        """get all ip loghosts"""
+
+        snapshot = get_syslog_snapshot(self.module)
+        return [dict(server) for server in snapshot["syslogServers"]]
+
+    def get_loghost_cmd(self, host, undo=False):
+        """get the command of a loghost"""
+
+        cmd = "info-center loghost"
+        if undo:
+            cmd = "undo info-center loghost"
+        if host["ipType"] == "ipv6":
+            cmd += " ipv6"
+        cmd += " %s" % host["serverIp"]
+        if host["vrfName"] and host["vrfName"] != "_public_":
+            cmd += " vpn-instance %s" % host["vrfName"]
+        if undo:
+            return cmd
+
+        if host["level"]:
+            cmd += " level %s" % host["level"]
+        if host["serverPort"]:
+            cmd += " port %s" % host["serverPort"]
+        if host["facility"]:
+            cmd += " facility %s" % host["facility"]
+        if host["chnlId"]:
+            cmd += " channel %s" % host["chnlId"]
+        if host["chnlName"]:
+            cmd += " channel %s" % host["chnlName"]
+        if host["timestamp"]:
+            cmd += " %s" % host["timestamp"]
+        if host["transportMode"]:
+            cmd += " transport %s" % host["transportMode"]
+        if host["sourceIP"]:
+            cmd += " source-ip %s" % host["sourceIP"]
+        if host["sslPolicyName"]:
+            cmd += " ssl-policy %s" % host["sslPolicyName"]
+        return cmd
+
+    def get_loghost_xml(self, host, undo=False):
+        """get the edit xml of a loghost"""
+
+        if undo:
+            return CE_NC_DELETE_SERVER_IP_INFO_HEADER % (
+                host["ipType"], host["serverIp"], host["vrfName"],
+                host.get("isDefaultVpn") or "false") + CE_NC_DELETE_SERVER_IP_INFO_TAIL
+
+        conf_str = CE_NC_MERGE_SERVER_IP_INFO_HEADER % (
+            host["ipType"], host["serverIp"], host["vrfName"], host["isDefaultVpn"])
+        for _, tag in LOGHOST_OPTIONS:
+            if host[tag]:
+                conf_str += "<%s>%s</%s>" % (tag, host[tag], tag)
+        conf_str += CE_NC_MERGE_SERVER_IP_INFO_TAIL
+        return conf_str
+
+    def config_loghosts(self):
+        """config all ip loghosts with replace semantics"""
+
+        exist_hosts = dict((get_loghost_key(cur), cur) for cur in self.loghost_info)
+        want_keys = [get_loghost_key(host) for host in self.loghosts]
+
+        if self.state == "present":
+            for key, cur in exist_hosts.items():
+                if key not in want_keys:
+                    self.xml_items.append(self.get_loghost_xml(cur, undo=True))
+                    self.updates_cmd.append(self.get_loghost_cmd(cur, undo=True))
+                    self.changed = True
+            for host in self.loghosts:
+                cur = exist_hosts.get(get_loghost_key(host))
+                if cur and all(cur.get(tag) == value for tag, value in host.items() if value):
+                    continue
+                self.xml_items.append(self.get_loghost_xml(host))
+                self.updates_cmd.append(self.get_loghost_cmd(host))
+                self.changed = True
         else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+            for host in self.loghosts:
+                cur = exist_hosts.get(get_loghost_key(host))
+                if cur:
+                    self.xml_items.append(self.get_loghost_xml(cur, undo=True))
+                    self.updates_cmd.append(self.get_loghost_cmd(cur, undo=True))
+                    self.changed = True
 
-            root = ElementTree.fromstring(xml_str)
-            global_info = root.findall(
-                "data/syslog/globalParam")
+    def get_syslog_global(self):
+        """get syslog global attributes"""
 
-            if global_info:
-                for tmp in global_info:
-                    for site in tmp:
-                        if site.tag in ["icEnable", "packetPriority", "suppressEnable"]:
-                            cur_global_info[site.tag] = site.text
-            return cur_global_info
+        snapshot = get_syslog_snapshot(self.module)
+        return dict((tag, text) for tag, text in snapshot["globalParam"].items()
+                    if tag in ["icEnable", "packetPriority", "suppressEnable"])
 
     def merge_syslog_global(self):
         """config global"""
 
+        updates_num = len(self.updates_cmd)
         conf_str = CE_NC_MERGE_CENTER_GLOBAL_INFO_HEADER
         if self.info_center_enable:
             conf_str += "<icEnable>%s</icEnable>" % self.info_center_enable
@@ -1290,43 +1247,25 @@ class InfoCenterGlobal(object):
                     cmd = "undo info-center syslog packet-priority %s" % self.packet_priority
                     self.updates_cmd.append(cmd)
                     self.changed = True
-        if self.changed:
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(msg='Error: Merge syslog global failed.')
+        if len(self.updates_cmd) != updates_num:
+            self.xml_items.append(conf_str)
 
     def get_syslog_logfile(self):
         """get syslog logfile"""
 
         cur_logfile_info = dict()
-        conf_str = CE_NC_GET_LOG_FILE_INFO_HEADER
-        conf_str += "<logFileType>log</logFileType>"
-        if self.logfile_max_num:
-            conf_str += "<maxFileNum></maxFileNum>"
-        if self.logfile_max_size:
-            conf_str += "<maxFileSize></maxFileSize>"
-        conf_str += CE_NC_GET_LOG_FILE_INFO_TAIL
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return cur_logfile_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            root = ElementTree.fromstring(xml_str)
-            logfile_info = root.findall(
-                "data/syslog/icLogFileInfos/icLogFileInfo")
-            if logfile_info:
-                for tmp in logfile_info:
-                    for site in tmp:
-                        if site.tag in ["maxFileNum", "maxFileSize"]:
-                            cur_logfile_info[site.tag] = site.text
-            return cur_logfile_info
+        snapshot = get_syslog_snapshot(self.module)
+        for logfile_info in snapshot["icLogFileInfos"]:
+            if logfile_info.get("logFileType") == "log":
+                for tag in ["maxFileNum", "maxFileSize"]:
+                    if tag in logfile_info:
+                        cur_logfile_info[tag] = logfile_info[tag]
+        return cur_logfile_info
 
     def merge_syslog_logfile(self):
         """config logfile"""
 
+        updates_num = len(self.updates_cmd)
         logfile_max_num = "200"
         conf_str = CE_NC_MERGE_LOG_FILE_INFO_HEADER
         if self.logfile_max_num:
@@ -1374,11 +1313,8 @@ class InfoCenterGlobal(object):
                     self.updates_cmd.append(cmd)
                     self.changed = True
 
-        if self.changed:
-            recv_xml = set_nc_config(self.module, conf_str)
-            if "<ok/>" not in recv_xml:
-                self.module.fail_json(
-                    msg='Error: Merge syslog logfile failed.')
+        if len(self.updates_cmd) != updates_num:
+            self.xml_items.append(conf_str)
 
     def check_params(self):
         """Check all input params"""
@@ -1479,6 +1415,10 @@ class InfoCenterGlobal(object):
                 self.module.fail_json(
                     msg='Error: ssl_policy_name is not in the range from 1 to 23.')
 
+        # loghosts check
+        if self.loghosts is not None:
+            self.check_loghosts()
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -1528,6 +1468,8 @@ class InfoCenterGlobal(object):
             self.proposed["is_default_vpn"] = self.is_default_vpn
         if self.source_ip:
             self.proposed["source_ip"] = self.source_ip
+        if self.loghosts is not None:
+            self.proposed["loghosts"] = self.loghosts
         if self.state:
             self.proposed["state"] = self.state
 
@@ -1572,9 +1514,14 @@ class InfoCenterGlobal(object):
                 self.existing["server_domain_info"] = self.server_domain_info[
                     "serverAddressInfos"]
 
+        if self.loghosts is not None:
+            self.existing["loghosts"] = self.loghost_info
+
     def get_end_state(self):
         """get end state info"""
 
+        if self.changed and not self.module.check_mode:
+            get_syslog_snapshot(self.module, refresh=True)
         if self.info_center_enable or self.packet_priority or self.suppress_enable:
             self.cur_global_info = self.get_syslog_global()
         if self.logfile_max_num or self.logfile_max_size:
@@ -1589,6 +1536,8 @@ class InfoCenterGlobal(object):
             self.server_ip_info = self.get_server_ip_dict()
         if self.server_domain:
             self.server_domain_info = self.get_server_domain_dict()
+        if self.loghosts is not None:
+            self.loghost_info = self.get_loghost_info()
 
         if self.info_center_enable:
             self.end_state[
@@ -1631,6 +1580,9 @@ class InfoCenterGlobal(object):
                 self.end_state["server_domain_info"] = self.server_domain_info[
                     "serverAddressInfos"]
 
+        if self.loghosts is not None:
+            self.end_state["loghosts"] = self.loghost_info
+
     def work(self):
         """worker"""
 
@@ -1649,6 +1601,8 @@ class InfoCenterGlobal(object):
             self.server_ip_info = self.get_server_ip_dict()
         if self.server_domain:
             self.server_domain_info = self.get_server_domain_dict()
+        if self.loghosts is not None:
+            self.loghost_info = self.get_loghost_info()
         self.get_existing()
         self.get_proposed()
         if self.info_center_enable or self.packet_priority or self.suppress_enable:
@@ -1666,7 +1620,8 @@ class InfoCenterGlobal(object):
                 self.module.fail_json(
                     msg='Error: ip_type and server_ip must be exist at the same time.')
 
-        if self.ip_type or self.server_domain or self.channel_id or self.filter_feature_name:
+        if self.ip_type or self.server_domain or self.channel_id or self.filter_feature_name \
+                or self.loghosts is not None:
             if self.ip_type and self.server_domain:
                 self.module.fail_json(
                     msg='Error: ip_type and server_domain can not be exist at the same time.')
@@ -1719,6 +1674,8 @@ class InfoCenterGlobal(object):
                         self.vrf_name = "_public_"
                     if self.check_need_loghost_cfg():
                         self.config_merge_loghost()
+                if self.loghosts is not None:
+                    self.config_loghosts()
 
             elif self.state == "absent":
                 if self.channel_id:
@@ -1740,7 +1697,11 @@ class InfoCenterGlobal(object):
                         self.vrf_name = "_public_"
                     if self.check_need_loghost_cfg():
                         self.delete_merge_loghost()
+                if self.loghosts is not None:
+                    self.config_loghosts()
 
+        if self.xml_items and not self.module.check_mode:
+            set_syslog_config(self.module, self.xml_items)
         self.get_end_state()
 
         self.results['changed'] = self.changed
@@ -1785,6 +1746,7 @@ def main():
         transport_mode=dict(choices=['tcp', 'udp']),
         ssl_policy_name=dict(type='str'),
         source_ip=dict(type='str'),
+        loghosts=dict(type='list'),
         state=dict(choices=['present', 'absent'], default='present')
 
     )
@@ -152,43 +152,9 @@ changed:
     sample: true
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-
-CE_NC_GET_LOG = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <globalParam>
-      <bufferSize></bufferSize>
-      <logTimeStamp></logTimeStamp>
-      <icLogBuffEn></icLogBuffEn>
-    </globalParam>
-    <icSources>
-      <icSource>
-        <moduleName>%s</moduleName>
-        <icChannelId>%s</icChannelId>
-        <icChannelName></icChannelName>
-        <logEnFlg></logEnFlg>
-        <logEnLevel></logEnLevel>
-      </icSource>
-    </icSources>
-  </syslog>
-</filter>
-"""
+from ansible.module_utils.ce import ce_argument_spec, get_syslog_snapshot, set_syslog_config
 
-CE_NC_GET_LOG_GLOBAL = """
-<filter type="subtree">
-  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <globalParam>
-      <bufferSize></bufferSize>
-      <logTimeStamp></logTimeStamp>
-      <icLogBuffEn></icLogBuffEn>
-    </globalParam>
-  </syslog>
-</filter>
-"""
 
 TIME_STAMP_DICT = {"date_boot": "boot",
                    "date_second": "date precision-time second",
@@ -259,47 +225,26 @@ class InfoCenterLog(object):
 
         self.module = AnsibleModule(argument_spec=self.spec, supports_check_mode=True)
 
-    def check_response(self, xml_str, xml_name):
-        """Check if response message is already succeed"""
-
-        if "<ok/>" not in xml_str:
-            self.module.fail_json(msg='Error: %s failed.' % xml_name)
-
-    def get_log_dict(self):
+    def get_log_dict(self, refresh=False):
         """ log config dict"""
 
         log_dict = dict()
-        if self.module_name:
-            if self.module_name.lower() == "default":
-                conf_str = CE_NC_GET_LOG % (self.module_name.lower(), self.channel_id)
-            else:
-                conf_str = CE_NC_GET_LOG % (self.module_name.upper(), self.channel_id)
-        else:
-            conf_str = CE_NC_GET_LOG_GLOBAL
-
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return log_dict
-
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-        root = ElementTree.fromstring(xml_str)
+        snapshot = get_syslog_snapshot(self.module, refresh)
 
         # get global param info
-        glb = root.find("data/syslog/globalParam")
-        if glb:
-            for attr in glb:
-                if attr.tag in ["bufferSize", "logTimeStamp", "icLogBuffEn"]:
-                    log_dict[attr.tag] = attr.text
+        for tag in ["bufferSize", "logTimeStamp", "icLogBuffEn"]:
+            if tag in snapshot["globalParam"]:
+                log_dict[tag] = snapshot["globalParam"][tag]
 
         # get info-center source info
         log_dict["source"] = dict()
-        src = root.find("data/syslog/icSources/icSource")
-        if src:
-            for attr in src:
-                if attr.tag in ["moduleName", "icChannelId", "icChannelName", "logEnFlg", "logEnLevel"]:
-                    log_dict["source"][attr.tag] = attr.text
+        if self.module_name:
+            for src in snapshot["icSources"]:
+                if (src.get("moduleName") or "").lower() == self.module_name.lower() \
+                        and src.get("icChannelId") == self.channel_id:
+                    log_dict["source"] = dict((tag, src.get(tag)) for tag in [
+                        "moduleName", "icChannelId", "icChannelName", "logEnFlg", "logEnLevel"] if tag in src)
+                    break
 
         return log_dict
 
@@ -407,15 +352,8 @@ class InfoCenterLog(object):
         if not xml_str:
             return
 
-        xml_cfg = """
-            <config>
-            <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-            %s
-            </syslog>
-            </config>""" % xml_str
-
-        recv_xml = set_nc_config(self.module, xml_cfg)
-        self.check_response(recv_xml, "SET_LOG")
+        if not self.module.check_mode:
+            set_syslog_config(self.module, [xml_str])
         self.changed = True
 
     def check_params(self):
@@ -480,7 +418,7 @@ class InfoCenterLog(object):
     def get_end_state(self):
         """get end state info"""
 
-        log_dict = self.get_log_dict()
+        log_dict = self.get_log_dict(refresh=self.changed and not self.module.check_mode)
         if not log_dict:
             return
 
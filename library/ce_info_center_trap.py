@@ -161,72 +161,35 @@ updates:
     sample: ["info-center trapbuffer", "info-center trapbuffer size 768"]
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import ce_argument_spec, get_syslog_snapshot, set_syslog_config
 
 
-# get info center trap global
-CE_GET_TRAP_GLOBAL_HEADER = """
-    <filter type="subtree">
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <globalParam>
-"""
-CE_GET_TRAP_GLOBAL_TAIL = """
-        </globalParam>
-      </syslog>
-    </filter>
-"""
 # merge info center trap global
 CE_MERGE_TRAP_GLOBAL_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <globalParam operation="merge">
 """
 CE_MERGE_TRAP_GLOBAL_TAIL = """
         </globalParam>
-      </syslog>
-    </config>
 """
 
-# get info center trap source
-CE_GET_TRAP_SOURCE_HEADER = """
-    <filter type="subtree">
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <icSources>
-          <icSource>
-"""
-CE_GET_TRAP_SOURCE_TAIL = """
-          </icSource>
-        </icSources>
-      </syslog>
-    </filter>
-"""
 # merge info center trap source
 CE_MERGE_TRAP_SOURCE_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <icSources>
           <icSource operation="merge">
 """
 CE_MERGE_TRAP_SOURCE_TAIL = """
           </icSource>
         </icSources>
-      </syslog>
-    </config>
 """
 # delete info center trap source
 CE_DELETE_TRAP_SOURCE_HEADER = """
-    <config>
-      <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
         <icSources>
           <icSource operation="delete">
 """
 CE_DELETE_TRAP_SOURCE_TAIL = """
           </icSource>
         </icSources>
-      </syslog>
-    </config>
 """
 
 TIME_STAMP_DICT = {"date_boot": "boot",
@@ -287,6 +250,7 @@ class InfoCenterTrap(object):
         # cur config
         self.cur_global_cfg = dict()
         self.cur_source_cfg = dict()
+        self.xml_items = list()
 
         # state
         self.changed = False
@@ -296,20 +260,6 @@ class InfoCenterTrap(object):
         self.existing = dict()
         self.end_state = dict()
 
-    def netconf_get_config(self, conf_str):
-        """ Netconf get config """
-
-        xml_str = get_nc_config(self.module, conf_str)
-
-        return xml_str
-
-    def netconf_set_config(self, conf_str):
-        """ Netconf set config """
-
-        xml_str = set_nc_config(self.module, conf_str)
-
-        return xml_str
-
     def check_global_args(self):
         """ Check global args """
 
@@ -327,35 +277,15 @@ class InfoCenterTrap(object):
                     self.module.fail_json(
                         msg='Error: The trap_buff_size is not digit.')
 
-            conf_str = CE_GET_TRAP_GLOBAL_HEADER
-
-            if self.trap_time_stamp:
-                conf_str += "<trapTimeStamp></trapTimeStamp>"
-            if self.trap_buff_enable != 'no_use':
-                conf_str += "<icTrapBuffEn></icTrapBuffEn>"
-            if self.trap_buff_size:
-                conf_str += "<trapBuffSize></trapBuffSize>"
-
-            conf_str += CE_GET_TRAP_GLOBAL_TAIL
-            recv_xml = self.netconf_get_config(conf_str=conf_str)
-
-            if "<data/>" in recv_xml:
+            global_param = get_syslog_snapshot(self.module)["globalParam"]
+            if not global_param:
                 find_flag = False
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                global_cfg = root.findall("data/syslog/globalParam")
-                if global_cfg:
-                    for tmp in global_cfg:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["trapTimeStamp", "icTrapBuffEn", "trapBuffSize"]:
-                                tmp_dict[site.tag] = site.text
-
-                        self.cur_global_cfg["global_cfg"].append(tmp_dict)
+                tmp_dict = dict()
+                for tag in ["trapTimeStamp", "icTrapBuffEn", "trapBuffSize"]:
+                    if tag in global_param:
+                        tmp_dict[tag] = global_param[tag]
+                self.cur_global_cfg["global_cfg"].append(tmp_dict)
 
                 if self.cur_global_cfg["global_cfg"]:
                     for tmp in self.cur_global_cfg["global_cfg"]:
@@ -405,40 +335,18 @@ class InfoCenterTrap(object):
                     self.module.fail_json(
                         msg='Error: The channel_id is not digit.')
 
-            conf_str = CE_GET_TRAP_SOURCE_HEADER
-
-            if self.module_name != "default":
-                conf_str += "<moduleName>%s</moduleName>" % self.module_name.upper()
-            else:
-                conf_str += "<moduleName>default</moduleName>"
-
-            if self.channel_id:
-                conf_str += "<icChannelId></icChannelId>"
-            if self.trap_enable != 'no_use':
-                conf_str += "<trapEnFlg></trapEnFlg>"
-            if self.trap_level:
-                conf_str += "<trapEnLevel></trapEnLevel>"
-
-            conf_str += CE_GET_TRAP_SOURCE_TAIL
-            recv_xml = self.netconf_get_config(conf_str=conf_str)
-
-            if "<data/>" in recv_xml:
+            source_cfg = [src for src in get_syslog_snapshot(self.module)["icSources"]
+                          if (src.get("moduleName") or "").lower() == self.module_name.lower()]
+            if not source_cfg:
                 find_flag = False
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                source_cfg = root.findall("data/syslog/icSources/icSource")
-                if source_cfg:
-                    for tmp in source_cfg:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["moduleName", "icChannelId", "trapEnFlg", "trapEnLevel"]:
-                                tmp_dict[site.tag] = site.text
+                for src in source_cfg:
+                    tmp_dict = dict()
+                    for tag in ["moduleName", "icChannelId", "trapEnFlg", "trapEnLevel"]:
+                        if tag in src:
+                            tmp_dict[tag] = src[tag]
 
-                        self.cur_source_cfg["source_cfg"].append(tmp_dict)
+                    self.cur_source_cfg["source_cfg"].append(tmp_dict)
 
                 if self.cur_source_cfg["source_cfg"]:
                     for tmp in self.cur_source_cfg["source_cfg"]:
@@ -518,10 +426,7 @@ class InfoCenterTrap(object):
 
         conf_str += CE_MERGE_TRAP_GLOBAL_TAIL
 
-        recv_xml = self.netconf_set_config(conf_str=conf_str)
-
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge trap global failed.')
+        self.xml_items.append(conf_str)
 
         if self.trap_time_stamp:
             cmd = "info-center timestamp trap " + TIME_STAMP_DICT.get(self.trap_time_stamp)
@@ -552,10 +457,7 @@ class InfoCenterTrap(object):
 
         conf_str += CE_MERGE_TRAP_GLOBAL_TAIL
 
-        recv_xml = self.netconf_set_config(conf_str=conf_str)
-
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: delete trap global failed.')
+        self.xml_items.append(conf_str)
 
         if self.trap_time_stamp:
             cmd = "undo info-center timestamp trap"
@@ -585,10 +487,7 @@ class InfoCenterTrap(object):
 
         conf_str += CE_MERGE_TRAP_SOURCE_TAIL
 
-        recv_xml = self.netconf_set_config(conf_str=conf_str)
-
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Merge trap source failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "info-center source"
         if self.module_name:
@@ -628,10 +527,7 @@ class InfoCenterTrap(object):
                 conf_str += "<trapEnLevel>%s</trapEnLevel>" % CHANNEL_DEFAULT_TRAP_LEVEL.get(self.channel_id)
             conf_str += CE_MERGE_TRAP_SOURCE_TAIL
 
-        recv_xml = self.netconf_set_config(conf_str=conf_str)
-
-        if "<ok/>" not in recv_xml:
-            self.module.fail_json(msg='Error: Delete trap source failed.')
+        self.xml_items.append(conf_str)
 
         cmd = "undo info-center source"
         if self.module_name:
@@ -666,6 +562,9 @@ class InfoCenterTrap(object):
             if self.cur_source_cfg["need_cfg"]:
                 self.delete_trap_source()
 
+        if self.xml_items and not self.module.check_mode:
+            set_syslog_config(self.module, self.xml_items)
+            get_syslog_snapshot(self.module, refresh=True)
         self.get_end_state()
 
         self.results['changed'] = self.changed
@@ -32,7 +32,9 @@ options:
     interface:
         description:
             - Full name of interface, i.e. 40GE1/0/10.
-        required: true
+              Either interface or interfaces is required.
+        required: false
+        default: null
     process_id:
         description:
             - Specifies a process ID.
@@ -43,7 +45,9 @@ options:
             - Ospf area associated with this ospf process.
               Valid values are a string, formatted as an IP address
               (i.e. "0.0.0.0") or as an integer between 1 and 4294967295.
-        required: true
+              Required with C(interface), the default area of the entries of C(interfaces).
+        required: false
+        default: null
     cost:
         description:
             - The cost associated with this interface.
@@ -93,6 +97,19 @@ options:
               The value is a string of 1 to 255 case-sensitive characters, spaces not supported.
         required: false
         default: null
+    interfaces:
+        description:
+            - A list of interfaces, each one is a full interface name, a glob pattern
+              such as C(10GE1/0/*), or a dict with interface and optionally area, cost,
+              hello_interval, dead_interval, silent_interface, auth_mode, auth_text_simple,
+              auth_key_id and auth_text_md5. The options that an entry does not set are
+              taken from the module options of the same name.
+              Patterns are matched against the layer 3 main interfaces of the device,
+              layer 2 switch ports, sub-interfaces and types that do not run OSPF are
+              skipped, if an interface matches several entries the last one wins.
+              Can not be used with C(interface).
+        required: false
+        default: null
     state:
         description:
             - Determines whether the config should be present or not
@@ -147,6 +164,17 @@ EXAMPLES = '''
       area: 100
       silent_interface: true
       provider: '{{ cli }}'
+
+  - name: Enables OSPF and sets the hello and dead intervals on all fabric links
+    ce_interface_ospf:
+      process_id: 1
+      area: 0
+      hello_interval: 1
+      dead_interval: 4
+      interfaces:
+        - 40GE1/0/*
+        - {interface: 10GE1/0/30, area: 100, cost: 100}
+      provider: '{{ cli }}'
 '''
 
 RETURN = '''
@@ -183,7 +211,8 @@ changed:
 
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec, \
+    is_interface_pattern, match_interfaces, get_ifm_snapshot
 
 CE_NC_GET_OSPF = """
     <filter type="subtree">
@@ -220,6 +249,35 @@ CE_NC_GET_OSPF = """
     </filter>
 """
 
+CE_NC_GET_OSPF_INTFS = """
+    <filter type="subtree">
+      <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+        <ospfv2comm>
+          <ospfSites>
+            <ospfSite>
+              <processId>%s</processId>
+              <areas>
+                <area>
+                  <areaId></areaId>
+                  <interfaces>
+                    <interface>
+                      <ifName></ifName>
+                      <helloInterval></helloInterval>
+                      <deadInterval></deadInterval>
+                      <silentEnable></silentEnable>
+                      <configCost></configCost>
+                      <authenticationMode></authenticationMode>
+                    </interface>
+                  </interfaces>
+                </area>
+              </areas>
+            </ospfSite>
+          </ospfSites>
+        </ospfv2comm>
+      </ospfv2>
+    </filter>
+"""
+
 CE_NC_XML_BUILD_PROCESS = """
     <config>
       <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -255,6 +313,34 @@ CE_NC_XML_BUILD_DELETE_INTF = """
                     </interface>
                   </interfaces>
 """
+
+CE_NC_XML_BUILD_PROCESS_AREAS = """
+    <config>
+      <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+        <ospfv2comm>
+          <ospfSites>
+            <ospfSite>
+              <processId>%s</processId>
+              <areas>%s
+              </areas>
+            </ospfSite>
+          </ospfSites>
+        </ospfv2comm>
+      </ospfv2>
+    </config>
+"""
+
+CE_NC_XML_BUILD_AREA_INTFS = """
+                <area>
+                  <areaId>%s</areaId>
+                  <interfaces>%s
+                  </interfaces>
+                </area>"""
+
+CE_NC_XML_BUILD_OPERATION_INTF = """
+                    <interface operation="%s">%s
+                    </interface>"""
+
 CE_NC_XML_SET_IF_NAME = """
                       <ifName>%s</ifName>
 """
@@ -290,6 +376,11 @@ CE_NC_XML_SET_AUTH_MD5 = """
 """
 
 
+# interface types a pattern may match, main interfaces that can be layer 3
+OSPF_PATTERN_TYPE = ('ge', '10ge', '25ge', '4x10ge', '40ge', '100ge',
+                     'eth-trunk', 'vlanif', 'vbdif', 'loopback', 'tunnel')
+
+
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
 
@@ -340,6 +431,16 @@ def get_interface_type(interface):
     return iftype.lower()
 
 
+def is_ospf_pattern_candidate(intf):
+    """check whether an interface of the ifm snapshot may be picked up by a pattern,
+    layer 2 switch ports, sub-interfaces and types that do not run ospf are skipped"""
+
+    name = intf.get("ifName")
+    if not name or "." in name or intf.get("isL2SwitchPort") == "true":
+        return False
+    return get_interface_type(name) in OSPF_PATTERN_TYPE
+
+
 def is_valid_v4addr(addr):
     """check is ipv4 addr is valid"""
 
@@ -382,10 +483,12 @@ class InterfaceOSPF(object):
         self.auth_text_simple = self.module.params['auth_text_simple']
         self.auth_key_id = self.module.params['auth_key_id']
         self.auth_text_md5 = self.module.params['auth_text_md5']
+        self.interfaces = self.module.params['interfaces']
         self.state = self.module.params['state']
 
         # ospf info
         self.ospf_info = dict()
+        self.intf_index = dict()
 
         # state
         self.changed = False
@@ -398,8 +501,11 @@ class InterfaceOSPF(object):
     def init_module(self):
         """init module"""
 
+        required_one_of = [("interface", "interfaces")]
+        mutually_exclusive = [("interface", "interfaces")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def netconf_set_config(self, xml_str, xml_name):
         """netconf set config"""
@@ -408,17 +514,18 @@ class InterfaceOSPF(object):
         if "<ok/>" not in rcv_xml:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_area_ip(self):
+    def get_area_ip(self, area=None):
         """convert integer to ip address"""
 
-        if not self.area.isdigit():
-            return self.area
+        area = area or self.area
+        if not area.isdigit():
+            return area
 
         addr_int = ['0'] * 4
-        addr_int[0] = str(((int(self.area) & 0xFF000000) >> 24) & 0xFF)
-        addr_int[1] = str(((int(self.area) & 0x00FF0000) >> 16) & 0xFF)
-        addr_int[2] = str(((int(self.area) & 0x0000FF00) >> 8) & 0XFF)
-        addr_int[3] = str(int(self.area) & 0xFF)
+        addr_int[0] = str(((int(area) & 0xFF000000) >> 24) & 0xFF)
+        addr_int[1] = str(((int(area) & 0x00FF0000) >> 16) & 0xFF)
+        addr_int[2] = str(((int(area) & 0x0000FF00) >> 8) & 0XFF)
+        addr_int[3] = str(int(area) & 0xFF)
 
         return '.'.join(addr_int)
 
@@ -617,81 +724,321 @@ class InterfaceOSPF(object):
             self.process_id, self.get_area_ip()))
         self.changed = True
 
-    def check_params(self):
-        """Check all input params"""
+    def get_ospf_intf_index(self):
+        """get all ospf interfaces of the process in one read, indexed by interface name"""
 
-        self.interface = self.interface.replace(" ", "").upper()
+        intf_index = dict()
+        rcv_xml = get_nc_config(self.module, CE_NC_GET_OSPF_INTFS % self.process_id)
+        if "<data/>" in rcv_xml:
+            return intf_index
 
-        # interface check
-        if not get_interface_type(self.interface):
-            self.module.fail_json(msg="Error: interface is invalid.")
+        xml_str = rcv_xml.replace('\r', '').replace('\n', '').\
+            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
+            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
 
-        # process_id check
-        if not self.process_id.isdigit():
-            self.module.fail_json(msg="Error: process_id is not digit.")
-        if int(self.process_id) < 1 or int(self.process_id) > 4294967295:
-            self.module.fail_json(msg="Error: process_id must be an integer between 1 and 4294967295.")
+        root = ElementTree.fromstring(xml_str)
+        areas = root.findall(
+            "data/ospfv2/ospfv2comm/ospfSites/ospfSite/areas/area")
+        for area in areas:
+            for intf in area.findall("interfaces/interface"):
+                intf_dict = dict((attr.tag, attr.text) for attr in intf)
+                intf_dict["areaId"] = area.findtext("areaId")
+                if intf_dict.get("ifName"):
+                    intf_index[intf_dict["ifName"].upper()] = intf_dict
+
+        return intf_index
+
+    def get_intf_plans(self):
+        """expand interface names and patterns, if an interface matches several entries the last one wins"""
+
+        plans = dict()
+        order = list()
+        names = None
+        for intf in self.interfaces:
+            if is_interface_pattern(intf["interface"]):
+                if names is None:
+                    names = [item["ifName"].upper() for item in get_ifm_snapshot(self.module)
+                             if is_ospf_pattern_candidate(item)]
+                matched = match_interfaces(names, intf["interface"])
+                if not matched:
+                    self.module.fail_json(
+                        msg="Error: No interface matches %s." % intf["interface"])
+            else:
+                matched = [intf["interface"]]
 
-        # area check
-        if self.area.isdigit():
-            if int(self.area) < 0 or int(self.area) > 4294967295:
+            for name in matched:
+                if name not in plans:
+                    order.append(name)
+                plans[name] = dict(intf, interface=name)
+
+        return [plans[name] for name in order]
+
+    def get_intf_auth(self, want):
+        """get authentication xml and command of an interface, passwords are hidden in the command"""
+
+        xml_intf = CE_NC_XML_SET_AUTH_MODE % want["auth_mode"]
+        if want["auth_mode"] == "none":
+            cmd = "undo ospf authentication-mode"
+        else:
+            cmd = "ospf authentication-mode %s" % want["auth_mode"]
+        if want["auth_mode"] == "simple" and want["auth_text_simple"]:
+            xml_intf += CE_NC_XML_SET_AUTH_TEXT_SIMPLE % want["auth_text_simple"]
+            cmd = "ospf authentication-mode %s ******" % want["auth_mode"]
+        elif want["auth_mode"] in ["hmac-sha256", "md5", "hmac-md5"] and want["auth_key_id"]:
+            xml_intf += CE_NC_XML_SET_AUTH_MD5 % (
+                want["auth_key_id"], want["auth_text_md5"])
+            cmd = "ospf authentication-mode %s %s ******" % (want["auth_mode"], want["auth_key_id"])
+        return xml_intf, cmd
+
+    def config_interfaces(self):
+        """diff every requested interface with the ospf interfaces of the process,
+        and apply all the changes by one edit"""
+
+        # interfaces that move to another area are removed from the old one first
+        area_items = dict()
+        area_order = list()
+
+        def add_item(area_id, operation, xml_intf, stage=1):
+            if (stage, area_id) not in area_items:
+                area_items[(stage, area_id)] = list()
+                area_order.append((stage, area_id))
+            area_items[(stage, area_id)].append(CE_NC_XML_BUILD_OPERATION_INTF % (operation, xml_intf))
+
+        for want in self.get_intf_plans():
+            name = want["interface"]
+            area_id = want["area"]
+            cur = self.intf_index.get(name)
+            xml_name = CE_NC_XML_SET_IF_NAME % name
+
+            if self.state == "absent":
+                if not cur or cur["areaId"] != area_id:
+                    continue
+                if cur.get("silentEnable") == "true":
+                    add_item(area_id, "merge", xml_name + (CE_NC_XML_SET_SILENT % "false"))
+                    self.updates_cmd.append("ospf %s" % self.process_id)
+                    self.updates_cmd.append("area %s" % area_id)
+                    self.updates_cmd.append("undo silent-interface %s" % name)
+                add_item(area_id, "delete", xml_name)
+                self.updates_cmd.append("interface %s" % name)
+                self.updates_cmd.append("undo ospf enable %s area %s" % (self.process_id, area_id))
+                continue
+
+            if cur and cur["areaId"] != area_id:
+                add_item(cur["areaId"], "delete", xml_name, 0)
+                self.updates_cmd.append("interface %s" % name)
+                self.updates_cmd.append("undo ospf enable %s area %s" % (self.process_id, cur["areaId"]))
+                cur = None
+
+            # ospf view
+            xml_intf = ""
+            silent = str(want["silent_interface"]).lower()
+            if (not cur and want["silent_interface"]) or (cur and cur.get("silentEnable") != silent):
+                xml_intf += CE_NC_XML_SET_SILENT % silent
+                self.updates_cmd.append("ospf %s" % self.process_id)
+                self.updates_cmd.append("area %s" % area_id)
+                if want["silent_interface"]:
+                    self.updates_cmd.append("silent-interface %s" % name)
+                else:
+                    self.updates_cmd.append("undo silent-interface %s" % name)
+
+            # interface view
+            intf_cmds = list()
+            if not cur:
+                intf_cmds.append("ospf enable process %s area %s" % (self.process_id, area_id))
+            if want["cost"] and (not cur or cur.get("configCost") != want["cost"]):
+                xml_intf += CE_NC_XML_SET_COST % want["cost"]
+                intf_cmds.append("ospf cost %s" % want["cost"])
+            if want["hello_interval"] and (not cur or cur.get("helloInterval") != want["hello_interval"]):
+                xml_intf += CE_NC_XML_SET_HELLO % want["hello_interval"]
+                intf_cmds.append("ospf timer hello %s" % want["hello_interval"])
+            if want["dead_interval"] and (not cur or cur.get("deadInterval") != want["dead_interval"]):
+                xml_intf += CE_NC_XML_SET_DEAD % want["dead_interval"]
+                intf_cmds.append("ospf timer dead %s" % want["dead_interval"])
+            if want["auth_mode"]:
+                # NOTE: for security, authentication config will always be update
+                xml_auth, cmd = self.get_intf_auth(want)
+                xml_intf += xml_auth
+                intf_cmds.append(cmd)
+
+            if not cur or xml_intf:
+                add_item(area_id, "merge", xml_name + xml_intf)
+            if intf_cmds:
+                self.updates_cmd.append("interface %s" % name)
+                self.updates_cmd.extend(intf_cmds)
+
+        if not area_order:
+            return
+
+        xml_areas = "".join([CE_NC_XML_BUILD_AREA_INTFS % (key[1], "".join(area_items[key]))
+                             for key in sorted(area_order, key=lambda item: item[0])])
+        if not self.module.check_mode:
+            self.netconf_set_config(CE_NC_XML_BUILD_PROCESS_AREAS % (self.process_id, xml_areas),
+                                    "CONFIG_INTERFACES_OSPF")
+        self.changed = True
+
+    def get_intf_states(self, intf_index):
+        """get the ospf attributes of the requested interfaces"""
+
+        states = list()
+        for name in sorted(intf_index):
+            if not any(name == intf["interface"] or
+                       (is_interface_pattern(intf["interface"]) and match_interfaces([name], intf["interface"]))
+                       for intf in self.interfaces):
+                continue
+            intf_dict = intf_index[name]
+            states.append(dict(interface=name, area=intf_dict.get("areaId"),
+                               cost=intf_dict.get("configCost"),
+                               hello_interval=intf_dict.get("helloInterval"),
+                               dead_interval=intf_dict.get("deadInterval"),
+                               silent_interface=intf_dict.get("silentEnable"),
+                               auth_mode=intf_dict.get("authenticationMode")))
+        return states
+
+    def check_area(self, area):
+        """check area id is an integer or an ip address"""
+
+        if area.isdigit():
+            if int(area) < 0 or int(area) > 4294967295:
                 self.module.fail_json(msg="Error: area id (Integer) must be between 0 and 4294967295.")
         else:
-            if not is_valid_v4addr(self.area):
+            if not is_valid_v4addr(area):
                 self.module.fail_json(msg="Error: area id is invalid.")
 
+    def check_intf_attrs(self, attrs):
+        """check the ospf attributes of an interface"""
+
         # area authentication check
+        auth_mode = attrs.get("auth_mode")
+        auth_text_simple = attrs.get("auth_text_simple")
+        auth_key_id = attrs.get("auth_key_id")
+        auth_text_md5 = attrs.get("auth_text_md5")
         if self.state == "present":
-            if self.auth_mode:
-                if self.auth_mode == "simple":
-                    if self.auth_text_simple and len(self.auth_text_simple) > 8:
+            if auth_mode:
+                if auth_mode == "simple":
+                    if auth_text_simple and len(auth_text_simple) > 8:
                         self.module.fail_json(
                             msg="Error: auth_text_simple is not in the range from 1 to 8.")
-                if self.auth_mode in ["hmac-sha256", "hmac-sha256", "md5"]:
-                    if self.auth_key_id and not self.auth_text_md5:
+                if auth_mode in ["hmac-sha256", "hmac-sha256", "md5"]:
+                    if auth_key_id and not auth_text_md5:
                         self.module.fail_json(
                             msg='Error: auth_key_id and auth_text_md5 should be set at the same time.')
-                    if not self.auth_key_id and self.auth_text_md5:
+                    if not auth_key_id and auth_text_md5:
                         self.module.fail_json(
                             msg='Error: auth_key_id and auth_text_md5 should be set at the same time.')
-                    if self.auth_key_id:
-                        if not self.auth_key_id.isdigit():
+                    if auth_key_id:
+                        if not auth_key_id.isdigit():
                             self.module.fail_json(
                                 msg="Error: auth_key_id is not digit.")
-                        if int(self.auth_key_id) < 1 or int(self.auth_key_id) > 255:
+                        if int(auth_key_id) < 1 or int(auth_key_id) > 255:
                             self.module.fail_json(
                                 msg="Error: auth_key_id is not in the range from 1 to 255.")
-                    if self.auth_text_md5 and len(self.auth_text_md5) > 255:
+                    if auth_text_md5 and len(auth_text_md5) > 255:
                         self.module.fail_json(
                             msg="Error: auth_text_md5 is not in the range from 1 to 255.")
         # cost check
-        if self.cost:
-            if not self.cost.isdigit():
+        cost = attrs.get("cost")
+        if cost:
+            if not cost.isdigit():
                 self.module.fail_json(msg="Error: cost is not digit.")
-            if int(self.cost) < 1 or int(self.cost) > 65535:
+            if int(cost) < 1 or int(cost) > 65535:
                 self.module.fail_json(
                     msg="Error: cost is not in the range from 1 to 65535")
 
         # hello_interval check
-        if self.hello_interval:
-            if not self.hello_interval.isdigit():
+        hello_interval = attrs.get("hello_interval")
+        if hello_interval:
+            if not hello_interval.isdigit():
                 self.module.fail_json(
                     msg="Error: hello_interval is not digit.")
-            if int(self.hello_interval) < 1 or int(self.hello_interval) > 65535:
+            if int(hello_interval) < 1 or int(hello_interval) > 65535:
                 self.module.fail_json(
                     msg="Error: hello_interval is not in the range from 1 to 65535")
 
         # dead_interval check
-        if self.dead_interval:
-            if not self.dead_interval.isdigit():
+        dead_interval = attrs.get("dead_interval")
+        if dead_interval:
+            if not dead_interval.isdigit():
                 self.module.fail_json(msg="Error: dead_interval is not digit.")
-            if int(self.dead_interval) < 1 or int(self.dead_interval) > 235926000:
+            if int(dead_interval) < 1 or int(dead_interval) > 235926000:
                 self.module.fail_json(
                     msg="Error: dead_interval is not in the range from 1 to 235926000")
 
+    def check_interfaces(self):
+        """check interfaces and normalize each entry to a dict,
+        the options an entry does not set are taken from the module options"""
+
+        interfaces = list()
+        for entry in self.interfaces:
+            if not isinstance(entry, dict):
+                entry = dict(interface=entry)
+            if not entry.get("interface"):
+                self.module.fail_json(
+                    msg="Error: Each entry of interfaces must be an interface name or a dict with interface.")
+
+            intf = dict(interface=str(entry["interface"]).replace(" ", "").upper())
+            for key in ["area", "cost", "hello_interval", "dead_interval",
+                        "auth_mode", "auth_text_simple", "auth_key_id", "auth_text_md5"]:
+                value = entry.get(key, self.module.params[key])
+                intf[key] = str(value) if value is not None else None
+            intf["silent_interface"] = self.module.boolean(
+                entry.get("silent_interface", self.silent_interface))
+
+            if not is_interface_pattern(intf["interface"]) and not get_interface_type(intf["interface"]):
+                self.module.fail_json(msg="Error: interface %s is invalid." % intf["interface"])
+            if not intf["area"]:
+                self.module.fail_json(msg="Error: area of interface %s is required." % intf["interface"])
+            self.check_area(intf["area"])
+            intf["area"] = self.get_area_ip(intf["area"])
+            if intf["auth_mode"] not in [None, 'none', 'null', 'hmac-sha256', 'md5', 'hmac-md5', 'simple']:
+                self.module.fail_json(msg="Error: auth_mode of interface %s is invalid." % intf["interface"])
+            self.check_intf_attrs(intf)
+            interfaces.append(intf)
+        self.interfaces = interfaces
+
+    def check_params(self):
+        """Check all input params"""
+
+        # process_id check
+        if not self.process_id.isdigit():
+            self.module.fail_json(msg="Error: process_id is not digit.")
+        if int(self.process_id) < 1 or int(self.process_id) > 4294967295:
+            self.module.fail_json(msg="Error: process_id must be an integer between 1 and 4294967295.")
+
+        if self.interfaces is not None:
+            self.check_interfaces()
+            return
+
+        self.interface = self.interface.replace(" ", "").upper()
+
+        # interface check
+        if not get_interface_type(self.interface):
+            self.module.fail_json(msg="Error: interface is invalid.")
+
+        # area check
+        if not self.area:
+            self.module.fail_json(msg="Error: area is required.")
+        self.check_area(self.area)
+
+        self.check_intf_attrs(dict(cost=self.cost, hello_interval=self.hello_interval,
+                                   dead_interval=self.dead_interval, auth_mode=self.auth_mode,
+                                   auth_text_simple=self.auth_text_simple,
+                                   auth_key_id=self.auth_key_id, auth_text_md5=self.auth_text_md5))
+
     def get_proposed(self):
         """get proposed info"""
 
+        if self.interfaces is not None:
+            self.proposed["process_id"] = self.process_id
+            self.proposed["interfaces"] = list()
+            for intf in self.interfaces:
+                intf = dict(intf)
+                for key in ["auth_text_simple", "auth_text_md5"]:
+                    if intf[key]:
+                        intf[key] = "******"
+                self.proposed["interfaces"].append(intf)
+            self.proposed["state"] = self.state
+            return
+
         self.proposed["interface"] = self.interface
         self.proposed["process_id"] = self.process_id
         self.proposed["area"] = self.get_area_ip()
@@ -711,6 +1058,11 @@ class InterfaceOSPF(object):
     def get_existing(self):
         """get existing info"""
 
+        if self.interfaces is not None:
+            self.existing["process_id"] = self.process_id
+            self.existing["interfaces"] = self.get_intf_states(self.intf_index)
+            return
+
         if not self.ospf_info:
             return
 
@@ -730,6 +1082,14 @@ class InterfaceOSPF(object):
     def get_end_state(self):
         """get end state info"""
 
+        if self.interfaces is not None:
+            self.end_state["process_id"] = self.process_id
+            if self.changed:
+                self.end_state["interfaces"] = self.get_intf_states(self.get_ospf_intf_index())
+            else:
+                self.end_state["interfaces"] = self.existing["interfaces"]
+            return
+
         ospf_info = self.get_ospf_dict()
         if not ospf_info:
             return
@@ -751,12 +1111,18 @@ class InterfaceOSPF(object):
         """worker"""
 
         self.check_params()
-        self.ospf_info = self.get_ospf_dict()
+        if self.interfaces is not None:
+            self.intf_index = self.get_ospf_intf_index()
+        else:
+            self.ospf_info = self.get_ospf_dict()
         self.get_existing()
         self.get_proposed()
 
         # deal present or absent
-        if self.state == "present":
+        if self.interfaces is not None:
+            # diff and apply all interfaces by one edit
+            self.config_interfaces()
+        elif self.state == "present":
             if not self.ospf_info or not self.ospf_info["interface"]:
                 # create ospf area and set interface config
                 self.set_ospf_interface()
@@ -785,9 +1151,9 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        interface=dict(required=True, type='str'),
+        interface=dict(required=False, type='str'),
         process_id=dict(required=True, type='str'),
-        area=dict(required=True, type='str'),
+        area=dict(required=False, type='str'),
         cost=dict(required=False, type='str'),
         hello_interval=dict(required=False, type='str'),
         dead_interval=dict(required=False, type='str'),
@@ -797,6 +1163,7 @@ def main():
         auth_text_simple=dict(required=False, type='str', no_log=True),
         auth_key_id=dict(required=False, type='str'),
         auth_text_md5=dict(required=False, type='str', no_log=True),
+        interfaces=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
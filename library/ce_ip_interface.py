@@ -38,7 +38,8 @@ options:
     interface:
         description:
             - Full name of interface, i.e. 40GE1/0/22, vlanif10.
-        required: true
+              Either interface or addresses is required.
+        required: false
     addr:
         description:
             - IPv4 or IPv6 Address.
@@ -73,6 +74,17 @@ options:
         required: false
         default: global
         choices: ['global','linkLocal']
+    addresses:
+        description:
+            - A list of addresses, each one is a dict with interface, addr and optionally mask,
+              version, ipv4_type and ipv6_type. addr may be given with its mask, i.e. 10.1.1.1/30.
+              The options that an entry does not set are taken from the module options of the
+              same name, except version which is taken from the format of addr.
+              The addresses of all interfaces are read once, and a new address must not overlap
+              any address of another interface in the same vrf, or another listed address.
+              All the changes are sent in one edit. Can not be used with C(interface) or C(addr).
+        required: false
+        default: null
     state:
         description:
             - Specify desired state of the resource.
@@ -139,6 +151,14 @@ EXAMPLES = '''
       mask: 10
       ipv6_type: linkLocal
       provider: '{{ cli }}'
+
+  - name: Ensure the addresses of the p2p uplinks are configured
+    ce_ip_interface:
+      addresses:
+        - {interface: 10GE1/0/1, addr: 10.1.1.1/30}
+        - {interface: 10GE1/0/2, addr: 10.1.1.5/30}
+        - {interface: 10GE1/0/2, addr: "2001:db8:1::1/64"}
+      provider: '{{ cli }}'
 '''
 
 RETURN = '''
@@ -170,9 +190,11 @@ changed:
     sample: true
 '''
 
-import re
+import socket
+import binascii
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, set_nc_config_chunks, \
+    ce_argument_spec, get_nc_snapshot, get_nc_xml_root, get_l3vpn_snapshot
 
 
 CE_NC_GET_INTF = """
@@ -183,8 +205,23 @@ CE_NC_GET_INTF = """
         <ifName>%s</ifName>
         <isL2SwitchPort></isL2SwitchPort>
         <ifmAm4>
+          <am4CfgAddrs>
+            <am4CfgAddr>
+              <ifIpAddr></ifIpAddr>
+              <subnetMask></subnetMask>
+              <addrType></addrType>
+            </am4CfgAddr>
+          </am4CfgAddrs>
         </ifmAm4>
         <ifmAm6>
+          <enableFlag></enableFlag>
+          <am6CfgAddrs>
+            <am6CfgAddr>
+              <ifIp6Addr></ifIp6Addr>
+              <addrPrefixLen></addrPrefixLen>
+              <addrType6></addrType6>
+            </am6CfgAddr>
+          </am6CfgAddrs>
         </ifmAm6>
       </interface>
     </interfaces>
@@ -318,6 +355,123 @@ CE_NC_MERGE_IPV6_ENABLE = """
 </config>
 """
 
+CE_NC_SET_INTFS_HEAD = """
+<config>
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+"""
+
+CE_NC_SET_INTFS_TAIL = """
+    </interfaces>
+  </ifm>
+</config>
+"""
+
+CE_NC_INTF_ADDR_ITEM = """
+      <interface>
+        <ifName>%s</ifName>%s
+      </interface>
+"""
+
+CE_NC_AM4_ITEM = """
+        <ifmAm4>
+          <am4CfgAddrs>%s
+          </am4CfgAddrs>
+        </ifmAm4>"""
+
+CE_NC_AM4_ADDR_ITEM = """
+            <am4CfgAddr operation="%s">
+              <ifIpAddr>%s</ifIpAddr>
+              <subnetMask>%s</subnetMask>
+              <addrType>%s</addrType>
+            </am4CfgAddr>"""
+
+CE_NC_AM6_ITEM = """
+        <ifmAm6>%s
+        </ifmAm6>"""
+
+CE_NC_AM6_ENABLE_ITEM = """
+          <enableFlag>true</enableFlag>"""
+
+CE_NC_AM6_ADDRS_ITEM = """
+          <am6CfgAddrs>%s
+          </am6CfgAddrs>"""
+
+CE_NC_AM6_ADDR_ITEM = """
+            <am6CfgAddr operation="%s">
+              <ifIp6Addr>%s</ifIp6Addr>
+              <addrPrefixLen>%s</addrPrefixLen>
+              <addrType6>%s</addrType6>
+            </am6CfgAddr>"""
+
+# bits of an IPv4 and IPv6 address
+ADDR_WIDTH = {"v4": 32, "v6": 128}
+
+
+CE_NC_GET_IFM_ADDR_SNAPSHOT = """
+<filter type="subtree">
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+      <interface>
+        <ifName></ifName>
+        <isL2SwitchPort></isL2SwitchPort>
+        <ifmAm4>
+          <am4CfgAddrs>
+            <am4CfgAddr>
+              <ifIpAddr></ifIpAddr>
+              <subnetMask></subnetMask>
+              <addrType></addrType>
+            </am4CfgAddr>
+          </am4CfgAddrs>
+        </ifmAm4>
+        <ifmAm6>
+          <enableFlag></enableFlag>
+          <am6CfgAddrs>
+            <am6CfgAddr>
+              <ifIp6Addr></ifIp6Addr>
+              <addrPrefixLen></addrPrefixLen>
+              <addrType6></addrType6>
+            </am6CfgAddr>
+          </am6CfgAddrs>
+        </ifmAm6>
+      </interface>
+    </interfaces>
+  </ifm>
+</filter>
+"""
+
+
+def parse_ifm_addr_snapshot(xml_str):
+    """parse interface address reply, interfaces are indexed by upper case
+    interface name"""
+
+    interfaces = dict()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return interfaces
+
+    for intf_ele in root.findall("data/ifm/interfaces/interface"):
+        intf = dict(ifName=intf_ele.findtext("ifName"),
+                    isL2SwitchPort=intf_ele.findtext("isL2SwitchPort"),
+                    enableFlag=intf_ele.findtext("ifmAm6/enableFlag"),
+                    am4CfgAddr=list(), am6CfgAddr=list())
+        if not intf["ifName"]:
+            continue
+        for addr_ele in intf_ele.findall("ifmAm4/am4CfgAddrs/am4CfgAddr"):
+            intf["am4CfgAddr"].append(dict((ele.tag, ele.text) for ele in addr_ele))
+        for addr_ele in intf_ele.findall("ifmAm6/am6CfgAddrs/am6CfgAddr"):
+            intf["am6CfgAddr"].append(dict((ele.tag, ele.text) for ele in addr_ele))
+        interfaces[intf["ifName"].upper()] = intf
+
+    return interfaces
+
+
+def get_ifm_addr_snapshot(module, refresh=False):
+    """get the IPv4 and IPv6 addresses of all interfaces in one netconf read"""
+
+    return get_nc_snapshot(module, ("ifm", "addr"), CE_NC_GET_IFM_ADDR_SNAPSHOT,
+                           parse_ifm_addr_snapshot, refresh)
+
 
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
@@ -389,6 +543,64 @@ def is_valid_v4addr(addr):
     return False
 
 
+def get_addr_value(addr, version):
+    """get the integer value of an IPv4 or IPv6 address, None if it is invalid"""
+
+    if not addr:
+        return None
+
+    try:
+        if version == "v4":
+            if not is_valid_v4addr(addr):
+                return None
+            packed = socket.inet_aton(addr)
+        else:
+            packed = socket.inet_pton(socket.AF_INET6, addr)
+    except (socket.error, ValueError):
+        return None
+    return int(binascii.hexlify(packed), 16)
+
+
+def get_mask_len(maskstr):
+    """convert ip address mask to mask length, i.e. 255.255.255.0 to 24"""
+
+    return bin(get_addr_value(maskstr, "v4") or 0).count("1")
+
+
+def get_prefix_bits(value, masklen, version):
+    """get the network bits of an address, the most significant one first"""
+
+    width = ADDR_WIDTH[version]
+    return [(value >> (width - 1 - index)) & 1 for index in range(masklen)]
+
+
+def find_prefix_overlap(trie, value, masklen, version):
+    """find the owner of an indexed prefix that contains, or is contained by,
+    the prefix value/masklen, walking at most one bit per level of the trie"""
+
+    node = trie
+    for bit in get_prefix_bits(value, masklen, version):
+        if "owner" in node:
+            return node["owner"]
+        node = node.get(bit)
+        if node is None:
+            return None
+
+    # every branch of the trie ends with an indexed prefix
+    while "owner" not in node:
+        node = node.get(0) or node.get(1)
+    return node["owner"]
+
+
+def insert_prefix(trie, value, masklen, version, owner):
+    """index the prefix value/masklen in a binary trie"""
+
+    node = trie
+    for bit in get_prefix_bits(value, masklen, version):
+        node = node.setdefault(bit, dict())
+    node["owner"] = owner
+
+
 class IpInterface(object):
     """
     Manages L3 attributes for IPv4 and IPv6 interfaces.
@@ -406,6 +618,7 @@ class IpInterface(object):
         self.version = self.module.params['version']
         self.ipv4_type = self.module.params['ipv4_type']
         self.ipv6_type = self.module.params['ipv6_type']
+        self.addresses = self.module.params['addresses']
         self.state = self.module.params['state']
 
         # state
@@ -419,11 +632,21 @@ class IpInterface(object):
         self.intf_info = dict()
         self.intf_type = None
 
+        # addresses list info
+        self.addr_changes = dict()
+        self.addr_intfs = list()
+        self.main_addrs = set()
+        self.removed_prefixes = set()
+        self.added_prefixes = list()
+
     def __init_module__(self):
         """ init module """
 
+        required_one_of = [("interface", "addresses")]
+        mutually_exclusive = [("interface", "addresses"), ("addr", "addresses")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def netconf_set_config(self, xml_str, xml_name):
         """ netconf set config """
@@ -435,48 +658,11 @@ class IpInterface(object):
     def get_interface_dict(self, ifname):
         """ get one interface attributes dict."""
 
-        intf_info = dict()
         conf_str = CE_NC_GET_INTF % ifname
         rcv_xml = get_nc_config(self.module, conf_str)
-
-        if "<data/>" in rcv_xml:
-            return intf_info
-
-        # get interface base info
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*'
-            r'<isL2SwitchPort>(.*)</isL2SwitchPort>.*', rcv_xml)
-
-        if intf:
-            intf_info = dict(ifName=intf[0][0],
-                             isL2SwitchPort=intf[0][1])
-
-        # get interface ipv4 address info
-        ipv4_info = re.findall(
-            r'.*<ifIpAddr>(.*)</ifIpAddr>.*\s*<subnetMask>(.*)'
-            r'</subnetMask>.*\s*<addrType>(.*)</addrType>.*', rcv_xml)
-        intf_info["am4CfgAddr"] = list()
-        for info in ipv4_info:
-            intf_info["am4CfgAddr"].append(
-                dict(ifIpAddr=info[0], subnetMask=info[1], addrType=info[2]))
-
-        # get interface ipv6 address info
-        ipv6_info = re.findall(
-            r'.*<ifmAm6>.*\s*<enableFlag>(.*)</enableFlag>.*', rcv_xml)
-        if not ipv6_info:
+        intf_info = parse_ifm_addr_snapshot(rcv_xml).get(ifname.upper(), dict())
+        if intf_info and intf_info["enableFlag"] is None:
             self.module.fail_json(msg='Error: Fail to get interface IPv6 state.')
-        else:
-            intf_info["enableFlag"] = ipv6_info[0]
-
-        # get interface ipv6 enable info
-        ipv6_info = re.findall(
-            r'.*<ifIp6Addr>(.*)</ifIp6Addr>.*\s*<addrPrefixLen>(.*)'
-            r'</addrPrefixLen>.*\s*<addrType6>(.*)</addrType6>.*', rcv_xml)
-
-        intf_info["am6CfgAddr"] = list()
-        for info in ipv6_info:
-            intf_info["am6CfgAddr"].append(
-                dict(ifIp6Addr=info[0], addrPrefixLen=info[1], addrType6=info[2]))
 
         return intf_info
 
@@ -695,6 +881,245 @@ class IpInterface(object):
         if self.intf_info["isL2SwitchPort"] == "true":
             self.module.fail_json(msg='Error: interface is layer2.')
 
+    def get_addr_plans(self):
+        """normalize the addresses entries, the options that an entry does not set
+        are taken from the module options"""
+
+        plans = list()
+        for entry in self.addresses:
+            if not isinstance(entry, dict) or not entry.get("interface") or not entry.get("addr"):
+                self.module.fail_json(
+                    msg='Error: Each address must be a dict with interface and addr.')
+
+            want = dict(interface=str(entry["interface"]), addr=str(entry["addr"]), mask=entry.get("mask"))
+            if "/" in want["addr"]:
+                want["addr"], want["mask"] = want["addr"].split("/", 1)
+            if want["mask"] is None:
+                want["mask"] = self.mask
+            if not get_interface_type(want["interface"]):
+                self.module.fail_json(
+                    msg='Error: Interface name of %s '
+                        'is error.' % want["interface"])
+
+            want["version"] = entry.get("version")
+            if not want["version"]:
+                want["version"] = "v6" if ":" in want["addr"] else "v4"
+            if want["version"] == "v4":
+                want["addr_type"] = entry.get("ipv4_type") or self.ipv4_type
+                if want["addr_type"] not in ["main", "sub"]:
+                    self.module.fail_json(
+                        msg='Error: The ipv4_type of address %s must be main or sub.' % want["addr"])
+            elif want["version"] == "v6":
+                want["addr_type"] = entry.get("ipv6_type") or self.ipv6_type
+                if want["addr_type"] not in ["global", "linkLocal"]:
+                    self.module.fail_json(
+                        msg='Error: The ipv6_type of address %s must be global or linkLocal.' % want["addr"])
+                if want["addr_type"] == "linkLocal":
+                    # Ignore mask for link-local addresses
+                    want["mask"] = 10
+            else:
+                self.module.fail_json(
+                    msg='Error: The version of address %s must be v4 or v6.' % want["addr"])
+
+            if get_addr_value(want["addr"], want["version"]) is None:
+                self.module.fail_json(
+                    msg='Error: The %s is not a valid address.' % want["addr"])
+            want["mask"] = str(want["mask"] or "")
+            if not want["mask"].isdigit() or int(want["mask"]) < 1 \
+                    or int(want["mask"]) > ADDR_WIDTH[want["version"]]:
+                self.module.fail_json(
+                    msg='Error: The mask of address %s must be an integer between 1 and %s.'
+                        % (want["addr"], ADDR_WIDTH[want["version"]]))
+            plans.append(want)
+
+        return plans
+
+    def get_addr_info(self, intf):
+        """get the addresses of an interface in the format of end_state"""
+
+        return dict(interface=intf["ifName"], ipv4addr=intf["am4CfgAddr"],
+                    ipv6addr=intf["am6CfgAddr"], ipv6enalbe=intf["enableFlag"])
+
+    def diff_ipv4_addr(self, intf, want):
+        """diff an IPv4 address with the addresses of the interface"""
+
+        name = intf["ifName"]
+        change = self.addr_changes[name.upper()]
+        value = get_addr_value(want["addr"], "v4")
+        maskstr = self.convert_len_to_mask(want["mask"])
+        is_exist = False
+        for address in intf["am4CfgAddr"]:
+            if get_addr_value(address.get("ifIpAddr"), "v4") == value:
+                is_exist = address.get("subnetMask") == maskstr and address.get("addrType") == want["addr_type"]
+                break
+
+        if want["addr_type"] == "main":
+            cmd = "ip address %s %s" % (want["addr"], maskstr)
+        else:
+            cmd = "ip address %s %s sub" % (want["addr"], maskstr)
+
+        if self.state == "absent":
+            if is_exist:
+                change["am4"].append(CE_NC_AM4_ADDR_ITEM % ("delete", want["addr"], maskstr, want["addr_type"]))
+                change["cmds"].append("undo " + cmd)
+            return
+
+        if want["addr_type"] == "main":
+            if name.upper() in self.main_addrs:
+                self.module.fail_json(
+                    msg='Error: Interface %s has more than one main address.' % name)
+            self.main_addrs.add(name.upper())
+        if is_exist:
+            return
+
+        if want["addr_type"] == "main":
+            # remove old address and set new
+            for address in intf["am4CfgAddr"]:
+                if address.get("addrType") == "main":
+                    change["am4"].append(CE_NC_AM4_ADDR_ITEM % (
+                        "delete", address["ifIpAddr"], address["subnetMask"], "main"))
+                    self.removed_prefixes.add((name.upper(), "v4", get_addr_value(address["ifIpAddr"], "v4"),
+                                               get_mask_len(address["subnetMask"])))
+        change["am4"].append(CE_NC_AM4_ADDR_ITEM % ("merge", want["addr"], maskstr, want["addr_type"]))
+        change["cmds"].append(cmd)
+        self.added_prefixes.append((name, "v4", value, int(want["mask"]), want["addr"]))
+
+    def diff_ipv6_addr(self, intf, want):
+        """diff an IPv6 address with the addresses of the interface"""
+
+        name = intf["ifName"]
+        change = self.addr_changes[name.upper()]
+        value = get_addr_value(want["addr"], "v6")
+        is_exist = False
+        for address in intf["am6CfgAddr"]:
+            if get_addr_value(address.get("ifIp6Addr"), "v6") == value:
+                if address.get("addrPrefixLen") == want["mask"] and address.get("addrType6") == "global":
+                    is_exist = True
+                elif address.get("addrType6") == "linkLocal":
+                    is_exist = True
+                else:
+                    self.module.fail_json(
+                        msg="Error: Input IPv6 address or mask of %s is invalid." % want["addr"])
+                break
+
+        if want["addr_type"] == "global":
+            cmd = "ipv6 address %s %s" % (want["addr"], want["mask"])
+        else:
+            cmd = "ipv6 address %s link-local" % want["addr"]
+
+        if self.state == "absent":
+            if is_exist:
+                change["am6"].append(CE_NC_AM6_ADDR_ITEM % ("delete", want["addr"], want["mask"], want["addr_type"]))
+                change["cmds"].append("undo " + cmd)
+            return
+
+        if intf["enableFlag"] == "false" and not change["enable"]:
+            change["enable"] = True
+            change["cmds"].insert(0, "ipv6 enable")
+        if is_exist:
+            return
+
+        change["am6"].append(CE_NC_AM6_ADDR_ITEM % ("merge", want["addr"], want["mask"], want["addr_type"]))
+        change["cmds"].append(cmd)
+        if want["addr_type"] == "global":
+            self.added_prefixes.append((name, "v6", value, int(want["mask"]), want["addr"]))
+
+    def check_addr_overlaps(self, snapshot):
+        """index the prefixes of every interface by vrf in binary tries,
+        and check that no new address overlaps them, or each other"""
+
+        if not self.added_prefixes:
+            return
+
+        vrfs = get_l3vpn_snapshot(self.module)["interfaces"]
+        tries = dict()
+        for intf in snapshot.values():
+            vrf = vrfs.get(intf["ifName"].upper(), "_public_")
+            prefixes = list()
+            for address in intf["am4CfgAddr"]:
+                prefixes.append(("v4", address.get("ifIpAddr"), get_mask_len(address.get("subnetMask"))))
+            for address in intf["am6CfgAddr"]:
+                if address.get("addrType6") == "global" and (address.get("addrPrefixLen") or "").isdigit():
+                    prefixes.append(("v6", address.get("ifIp6Addr"), int(address["addrPrefixLen"])))
+            for version, addr, masklen in prefixes:
+                value = get_addr_value(addr, version)
+                if value is None or not masklen \
+                        or (intf["ifName"].upper(), version, value, masklen) in self.removed_prefixes:
+                    continue
+                insert_prefix(tries.setdefault((vrf, version), dict()), value, masklen, version,
+                              "%s/%s of %s" % (addr, masklen, intf["ifName"]))
+
+        for name, version, value, masklen, addr in self.added_prefixes:
+            trie = tries.setdefault((vrfs.get(name.upper(), "_public_"), version), dict())
+            owner = find_prefix_overlap(trie, value, masklen, version)
+            if owner:
+                self.module.fail_json(
+                    msg='Error: The address %s/%s of %s overlaps %s.' % (addr, masklen, name, owner))
+            insert_prefix(trie, value, masklen, version, "%s/%s of %s" % (addr, masklen, name))
+
+    def config_addresses(self):
+        """diff every requested address with the addresses of all interfaces,
+        check the new ones for overlaps and apply all the changes by one edit"""
+
+        plans = self.get_addr_plans()
+        snapshot = get_ifm_addr_snapshot(self.module)
+        self.proposed = dict(addresses=plans, state=self.state)
+        self.existing = dict(interfaces=list())
+        for want in plans:
+            intf = snapshot.get(want["interface"].upper())
+            if not intf:
+                self.module.fail_json(
+                    msg='Error: Interface %s does not exist.' % want["interface"])
+            if intf["isL2SwitchPort"] == "true":
+                self.module.fail_json(
+                    msg='Error: Interface %s is layer2.' % want["interface"])
+
+            if intf["ifName"].upper() not in self.addr_changes:
+                self.addr_changes[intf["ifName"].upper()] = dict(am4=list(), am6=list(), enable=False, cmds=list())
+                self.addr_intfs.append(intf["ifName"])
+                self.existing["interfaces"].append(self.get_addr_info(intf))
+            if want["version"] == "v4":
+                self.diff_ipv4_addr(intf, want)
+            else:
+                self.diff_ipv6_addr(intf, want)
+
+        self.check_addr_overlaps(snapshot)
+
+        xml_items = list()
+        for name in self.addr_intfs:
+            change = self.addr_changes[name.upper()]
+            xml_str = ""
+            if change["am4"]:
+                xml_str += CE_NC_AM4_ITEM % "".join(change["am4"])
+            am6_str = ""
+            if change["enable"]:
+                am6_str += CE_NC_AM6_ENABLE_ITEM
+            if change["am6"]:
+                am6_str += CE_NC_AM6_ADDRS_ITEM % "".join(change["am6"])
+            if am6_str:
+                xml_str += CE_NC_AM6_ITEM % am6_str
+            if not xml_str:
+                continue
+            xml_items.append(CE_NC_INTF_ADDR_ITEM % (name, xml_str))
+            self.updates_cmd.append("interface %s" % name)
+            self.updates_cmd.extend(change["cmds"])
+
+        if not xml_items:
+            return
+
+        self.changed = True
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_SET_INTFS_HEAD, xml_items, CE_NC_SET_INTFS_TAIL)
+
+    def get_addresses_end_state(self):
+        """get the addresses of the listed interfaces after module execution"""
+
+        snapshot = get_ifm_addr_snapshot(self.module, self.changed and not self.module.check_mode)
+        self.end_state = dict(interfaces=list())
+        for name in self.addr_intfs:
+            if name.upper() in snapshot:
+                self.end_state["interfaces"].append(self.get_addr_info(snapshot[name.upper()]))
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -726,20 +1151,24 @@ class IpInterface(object):
     def work(self):
         """worker"""
 
-        self.check_params()
-        self.get_existing()
-        self.get_proposed()
-
-        # deal present or absent
-        if self.version == "v4":
-            self.set_ipv4_addr(self.interface, self.addr, self.mask, self.ipv4_type)
+        if self.addresses is not None:
+            self.config_addresses()
+            self.get_addresses_end_state()
         else:
-            if not self.addr and not self.mask:
-                self.set_ipv6_enable(self.interface)
+            self.check_params()
+            self.get_existing()
+            self.get_proposed()
+
+            # deal present or absent
+            if self.version == "v4":
+                self.set_ipv4_addr(self.interface, self.addr, self.mask, self.ipv4_type)
             else:
-                self.set_ipv6_addr(self.interface, self.addr, self.mask, self.ipv6_type)
+                if not self.addr and not self.mask:
+                    self.set_ipv6_enable(self.interface)
+                else:
+                    self.set_ipv6_addr(self.interface, self.addr, self.mask, self.ipv6_type)
 
-        self.get_end_state()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -756,13 +1185,14 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        interface=dict(required=True),
+        interface=dict(required=False),
         addr=dict(required=False),
         version=dict(required=False, choices=['v4', 'v6'],
                      default='v4'),
         mask=dict(type='str', required=False),
         ipv4_type=dict(required=False, choices=['main', 'sub'], default='main'),
         ipv6_type=dict(required=False, choices=['global', 'linkLocal'], default='global'),
+        addresses=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
@@ -163,45 +163,11 @@ updates:
     sample: {"peer-link 1"}
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.ce import load_config
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_mlag_snapshot, set_nc_config, ce_argument_spec
 
 
-CE_NC_GET_DFS_GROUP_INFO = """
-<filter type="subtree">
-<dfs xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-  <groupInstances>
-    <groupInstance>
-      <groupId></groupId>
-      <priority></priority>
-      <ipAddress></ipAddress>
-      <srcVpnName></srcVpnName>
-      <trillType>
-          <localNickname></localNickname>
-          <pseudoNickname></pseudoNickname>
-          <pseudoPriority></pseudoPriority>
-      </trillType>
-    </groupInstance>
-  </groupInstances>
-</dfs>
-</filter>
-"""
-CE_NC_GET_PEER_LINK_INFO = """
-<filter type="subtree">
-<mlag xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-  <peerlinks>
-    <peerlink>
-      <dfsgroupId></dfsgroupId>
-      <linkId></linkId>
-      <portName></portName>
-    </peerlink>
-  </peerlinks>
-</mlag>
-</filter>
-"""
-
 CE_NC_CREATE_DFS_GROUP_INFO_HEADER = """
 <config>
 <dfs xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -343,6 +309,7 @@ class MlagConfig(object):
         self.dfs_group_info = None
         # peer link info
         self.peer_link_info = None
+        self.mlag_snapshot = None
 
     def init_module(self):
         """ init module """
@@ -375,60 +342,34 @@ class MlagConfig(object):
         if not self.module.check_mode:
             load_config(self.module, commands)
 
+    def get_mlag_snapshot(self, refresh=False):
+        """ get dfs group and m-lag state of the device in one read."""
+
+        self.mlag_snapshot = get_mlag_snapshot(self.module, refresh)
+
     def get_dfs_group_info(self):
         """ get dfs group attributes info."""
 
         dfs_group_info = dict()
-        conf_str = CE_NC_GET_DFS_GROUP_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return dfs_group_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-            root = ElementTree.fromstring(xml_str)
-            dfs_info = root.findall(
-                "data/dfs/groupInstances/groupInstance")
-            if dfs_info:
-                for tmp in dfs_info:
-                    for site in tmp:
-                        if site.tag in ["groupId", "priority", "ipAddress", "srcVpnName"]:
-                            dfs_group_info[site.tag] = site.text
-
-            dfs_nick_info = root.findall(
-                "data/dfs/groupInstances/groupInstance/trillType")
-
-            if dfs_nick_info:
-                for tmp in dfs_nick_info:
-                    for site in tmp:
-                        if site.tag in ["localNickname", "pseudoNickname", "pseudoPriority"]:
-                            dfs_group_info[site.tag] = site.text
+        group = self.mlag_snapshot["dfs_groups"].get(self.dfs_group_id)
+        if not group:
             return dfs_group_info
 
+        for key in ["groupId", "priority", "ipAddress", "srcVpnName",
+                    "localNickname", "pseudoNickname", "pseudoPriority"]:
+            if key in group:
+                dfs_group_info[key] = group[key]
+        return dfs_group_info
+
     def get_peer_link_info(self):
         """ get peer link info."""
 
         peer_link_info = dict()
-        conf_str = CE_NC_GET_PEER_LINK_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return peer_link_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            root = ElementTree.fromstring(xml_str)
-            link_info = root.findall(
-                "data/mlag/peerlinks/peerlink")
-
-            if link_info:
-                for tmp in link_info:
-                    for site in tmp:
-                        if site.tag in ["linkId", "portName"]:
-                            peer_link_info[site.tag] = site.text
-            return peer_link_info
+        for link in self.mlag_snapshot["peer_links"]:
+            for key in ["linkId", "portName"]:
+                if key in link:
+                    peer_link_info[key] = link[key]
+        return peer_link_info
 
     def is_dfs_group_info_change(self):
         """whether dfs group info"""
@@ -757,6 +698,7 @@ class MlagConfig(object):
 
     def get_existing(self):
         """get existing info"""
+        self.get_mlag_snapshot()
         if self.dfs_group_id:
             self.dfs_group_info = self.get_dfs_group_info()
         if self.peer_link_id and not self.eth_trunk_id:
@@ -788,6 +730,8 @@ class MlagConfig(object):
 
     def get_end_state(self):
         """get end state info"""
+        if self.changed:
+            self.get_mlag_snapshot(refresh=True)
         if self.dfs_group_id:
             self.dfs_group_info = self.get_dfs_group_info()
         if self.peer_link_id and not self.eth_trunk_id:
@@ -156,21 +156,9 @@ updates:
 '''
 
 import re
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.ce import load_config
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-CE_NC_GET_MLAG_INFO = """
-<filter type="subtree">
-<mlag xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-  <mlagInstances>
-    <mlagInstance>
-    </mlagInstance>
-  </mlagInstances>
-</mlag>
-</filter>
-"""
+from ansible.module_utils.ce import get_mlag_snapshot, set_nc_config, ce_argument_spec
 
 CE_NC_CREATE_MLAG_INFO = """
 <config>
@@ -200,22 +188,6 @@ CE_NC_DELETE_MLAG_INFO = """
 </config>
 """
 
-CE_NC_GET_LACP_MLAG_INFO = """
-<filter type="subtree">
-  <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <TrunkIfs>
-      <TrunkIf>
-        <ifName>%s</ifName>
-        <lacpMlagIf>
-          <lacpMlagSysId></lacpMlagSysId>
-          <lacpMlagPriority></lacpMlagPriority>
-        </lacpMlagIf>
-      </TrunkIf>
-    </TrunkIfs>
-  </ifmtrunk>
-</filter>
-"""
-
 CE_NC_SET_LACP_MLAG_INFO_HEAD = """
 <config>
   <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -233,19 +205,6 @@ CE_NC_SET_LACP_MLAG_INFO_TAIL = """
 </config>
 """
 
-CE_NC_GET_GLOBAL_LACP_MLAG_INFO = """
-<filter type="subtree">
-  <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <lacpSysInfo>
-      <lacpMlagGlobal>
-        <lacpMlagSysId></lacpMlagSysId>
-        <lacpMlagPriority></lacpMlagPriority>
-      </lacpMlagGlobal>
-    </lacpSysInfo>
-  </ifmtrunk>
-</filter>
-"""
-
 CE_NC_SET_GLOBAL_LACP_MLAG_INFO_HEAD = """
 <config>
   <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -260,21 +219,6 @@ CE_NC_SET_GLOBAL_LACP_MLAG_INFO_TAIL = """
 </config>
 """
 
-CE_NC_GET_MLAG_ERROR_DOWN_INFO = """
-<filter type="subtree">
-<mlag xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-  <errordowns>
-    <errordown>
-      <dfsgroupId></dfsgroupId>
-      <portName></portName>
-      <portState></portState>
-    </errordown>
-  </errordowns>
-</mlag>
-</filter>
-
-"""
-
 CE_NC_CREATE_MLAG_ERROR_DOWN_INFO = """
 <config>
 <mlag xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -365,6 +309,7 @@ class MlagInterface(object):
         self.mlag_global_info = None
         self.mlag_error_down_info = None
         self.mlag_trunk_attribute_info = None
+        self.mlag_snapshot = None
 
     def init_module(self):
         """ init module """
@@ -396,111 +341,58 @@ class MlagInterface(object):
         if not self.module.check_mode:
             load_config(self.module, commands)
 
+    def get_mlag_snapshot(self, refresh=False):
+        """ get dfs group and m-lag state of the device in one read."""
+
+        self.mlag_snapshot = get_mlag_snapshot(self.module, refresh)
+
     def get_mlag_info(self):
         """ get mlag info."""
 
         mlag_info = dict()
-        conf_str = CE_NC_GET_MLAG_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return mlag_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            mlag_info["mlagInfos"] = list()
-            root = ElementTree.fromstring(xml_str)
-            dfs_mlag_infos = root.findall(
-                "data/mlag/mlagInstances/mlagInstance")
-
-            if dfs_mlag_infos:
-                for dfs_mlag_info in dfs_mlag_infos:
-                    mlag_dict = dict()
-                    for ele in dfs_mlag_info:
-                        if ele.tag in ["dfsgroupId", "mlagId", "localMlagPort"]:
-                            mlag_dict[ele.tag] = ele.text
-                    mlag_info["mlagInfos"].append(mlag_dict)
+        if not self.mlag_snapshot["mlag_infos"]:
             return mlag_info
 
+        mlag_info["mlagInfos"] = list()
+        for info in self.mlag_snapshot["mlag_infos"]:
+            mlag_dict = dict()
+            for key in ["dfsgroupId", "mlagId", "localMlagPort"]:
+                if key in info:
+                    mlag_dict[key] = info[key]
+            mlag_info["mlagInfos"].append(mlag_dict)
+        return mlag_info
+
     def get_mlag_global_info(self):
         """ get mlag global info."""
 
-        mlag_global_info = dict()
-        conf_str = CE_NC_GET_GLOBAL_LACP_MLAG_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return mlag_global_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            root = ElementTree.fromstring(xml_str)
-            global_info = root.findall(
-                "data/ifmtrunk/lacpSysInfo/lacpMlagGlobal")
-
-            if global_info:
-                for tmp in global_info:
-                    for site in tmp:
-                        if site.tag in ["lacpMlagSysId", "lacpMlagPriority"]:
-                            mlag_global_info[site.tag] = site.text
-            return mlag_global_info
+        return dict(self.mlag_snapshot["lacp_global"])
 
     def get_mlag_trunk_attribute_info(self):
-        """ get mlag global info."""
+        """ get mlag trunk attribute info."""
 
-        mlag_trunk_attribute_info = dict()
         eth_trunk = "Eth-Trunk"
         eth_trunk += self.eth_trunk_id
-        conf_str = CE_NC_GET_LACP_MLAG_INFO % eth_trunk
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return mlag_trunk_attribute_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            root = ElementTree.fromstring(xml_str)
-            global_info = root.findall(
-                "data/ifmtrunk/TrunkIfs/TrunkIf/lacpMlagIf")
-
-            if global_info:
-                for tmp in global_info:
-                    for site in tmp:
-                        if site.tag in ["lacpMlagSysId", "lacpMlagPriority"]:
-                            mlag_trunk_attribute_info[site.tag] = site.text
-            return mlag_trunk_attribute_info
+        trunk = self.mlag_snapshot["trunks"].get(eth_trunk.upper())
+        if not trunk:
+            return dict()
+        return dict(trunk["lacp_mlag"])
 
     def get_mlag_error_down_info(self):
         """ get error down info."""
 
         mlag_error_down_info = dict()
-        conf_str = CE_NC_GET_MLAG_ERROR_DOWN_INFO
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return mlag_error_down_info
-        else:
-            xml_str = xml_str.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            mlag_error_down_info["mlagErrorDownInfos"] = list()
-            root = ElementTree.fromstring(xml_str)
-            mlag_error_infos = root.findall(
-                "data/mlag/errordowns/errordown")
-
-            if mlag_error_infos:
-                for mlag_error_info in mlag_error_infos:
-                    mlag_error_dict = dict()
-                    for ele in mlag_error_info:
-                        if ele.tag in ["dfsgroupId", "portName"]:
-                            mlag_error_dict[ele.tag] = ele.text
-                    mlag_error_down_info[
-                        "mlagErrorDownInfos"].append(mlag_error_dict)
+        if not self.mlag_snapshot["error_downs"]:
             return mlag_error_down_info
 
+        mlag_error_down_info["mlagErrorDownInfos"] = list()
+        for info in self.mlag_snapshot["error_downs"]:
+            mlag_error_dict = dict()
+            for key in ["dfsgroupId", "portName"]:
+                if key in info:
+                    mlag_error_dict[key] = info[key]
+            mlag_error_down_info["mlagErrorDownInfos"].append(mlag_error_dict)
+        return mlag_error_down_info
+
     def check_macaddr(self):
         """check mac-address whether valid"""
 
@@ -879,6 +771,7 @@ class MlagInterface(object):
     def get_existing(self):
         """get existing info"""
 
+        self.get_mlag_snapshot()
         self.mlag_info = self.get_mlag_info()
         self.mlag_global_info = self.get_mlag_global_info()
         self.mlag_error_down_info = self.get_mlag_error_down_info()
@@ -914,6 +807,9 @@ class MlagInterface(object):
     def get_end_state(self):
         """get end state info"""
 
+        if self.changed:
+            self.get_mlag_snapshot(refresh=True)
+
         if self.eth_trunk_id or self.dfs_group_id or self.mlag_id:
             self.mlag_info = self.get_mlag_info()
             if not self.mlag_system_id and not self.mlag_priority_id:
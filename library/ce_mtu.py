@@ -30,6 +30,7 @@ description:
 author: QijunPan (@CloudEngine-Ansible)
 notes:
     - Either C(sysmtu) param is required or C(interface) AND C(mtu) params are req'd.
+    - Either C(interface) or C(interfaces) is required.
     - C(state=absent) unconfigures a given MTU if that value is currently present.
 options:
     interface:
@@ -56,6 +57,16 @@ options:
               The value is an integer that ranges from 1518 to jumbo_max, in bytes.
         required: false
         default: null
+    interfaces:
+        description:
+            - A list of interfaces, each one is a full interface name, a glob pattern
+              such as C(40GE1/0/*), or a dict with interface and optionally mtu, jumbo_max
+              and jumbo_min. The options that an entry does not set are taken from the
+              module options of the same name. Patterns only match the interfaces that
+              support the settings, if an interface matches several entries the last one wins.
+              Can not be used with C(interface).
+        required: false
+        default: null
     state:
         description:
             - Specify desired state of the resource.
@@ -111,6 +122,14 @@ EXAMPLES = '''
       state: absent
       interface: 40GE1/0/22
       provider: "{{ cli }}"
+
+  - name: "Config mtu and jumboframe on all routed 40GE interfaces"
+    ce_mtu:
+      interfaces:
+        - 40GE1/0/*
+      mtu: 9000
+      jumbo_max: 9216
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -144,33 +163,39 @@ changed:
 import re
 import copy
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, get_config, load_config, get_nc_config, set_nc_config
+from ansible.module_utils.ce import ce_argument_spec, get_config, load_config, set_nc_config, \
+    set_nc_config_chunks, is_interface_pattern, match_interfaces, get_ifm_snapshot
 
-CE_NC_GET_INTF = """
-<filter type="subtree">
+CE_NC_XML_MERGE_INTF_MTU = """
   <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <interfaces>
-      <interface>
+      <interface operation="merge">
         <ifName>%s</ifName>
-        <isL2SwitchPort></isL2SwitchPort>
-        <ifMtu></ifMtu>
+        <ifMtu>%s</ifMtu>
       </interface>
     </interfaces>
   </ifm>
-</filter>
 """
 
-CE_NC_XML_MERGE_INTF_MTU = """
+CE_NC_SET_INTFS_MTU_HEAD = """
+<config>
   <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <interfaces>
-      <interface operation="merge">
-        <ifName>%s</ifName>
-        <ifMtu>%s</ifMtu>
-      </interface>
+    <interfaces>"""
+
+CE_NC_SET_INTFS_MTU_TAIL = """
     </interfaces>
   </ifm>
+</config>
 """
 
+CE_NC_MERGE_INTF_MTU_ITEM = """
+      <interface operation="merge">
+        <ifName>%s</ifName>
+        <ifMtu>%s</ifMtu>
+      </interface>"""
+
+JUMBOFRAME_DEFAULT = ["9216", "1518"]
+
 
 def is_interface_support_setjumboframe(interface):
     """is interface support set jumboframe"""
@@ -245,6 +270,28 @@ def get_interface_type(interface):
     return iftype.lower()
 
 
+def parse_jumboframe_config(cfg):
+    """parse the jumboframe of all interfaces in one pass, indexed by upper case
+    interface name, cfg is the output of display current-configuration all
+    | include ^interface|jumboframe"""
+
+    jbf_config = dict()
+    ifname = None
+    for line in cfg.replace('*', ' ').splitlines():
+        args = line.strip().split()
+        if not args:
+            continue
+        if line.startswith("interface "):
+            ifname = args[1].upper()
+            jbf_config[ifname] = list(JUMBOFRAME_DEFAULT)
+        elif not line.startswith(" "):
+            ifname = None
+        elif ifname and args[:2] == ["jumboframe", "enable"] and len(args) > 2:
+            jbf_config[ifname] = (args[2:4] + JUMBOFRAME_DEFAULT[1:])[:2]
+
+    return jbf_config
+
+
 def build_config_xml(xmlstr):
     """ build_config_xml"""
 
@@ -265,6 +312,7 @@ class Mtu(object):
         self.state = self.module.params['state']
         self.jbf_max = self.module.params['jumbo_max'] or None
         self.jbf_min = self.module.params['jumbo_min'] or None
+        self.interfaces = self.module.params['interfaces']
         self.jbf_config = list()
         self.jbf_cli = ""
         self.commands = list()
@@ -282,8 +330,11 @@ class Mtu(object):
     def init_module(self):
         """ init_module"""
 
+        required_one_of = [("interface", "interfaces")]
+        mutually_exclusive = [("interface", "interfaces")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -291,25 +342,16 @@ class Mtu(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_interface_dict(self, ifname):
+    def get_interface_dict(self, ifname, refresh=False):
         """ get one interface attributes dict."""
-        intf_info = dict()
-        conf_str = CE_NC_GET_INTF % ifname
-        ret_xml = get_nc_config(self.module, conf_str)
-        if "<data/>" in ret_xml:
-            return intf_info
 
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*'
-            r'<isL2SwitchPort>(.*)</isL2SwitchPort>.*\s*'
-            r'<ifMtu>(.*)</ifMtu>.*', ret_xml)
+        for intf in get_ifm_snapshot(self.module, refresh):
+            if intf.get("ifName") and intf["ifName"].upper() == ifname.replace(" ", "").upper():
+                return dict(ifName=intf["ifName"],
+                            isL2SwitchPort=intf.get("isL2SwitchPort") or "",
+                            ifMtu=intf.get("ifMtu") or "")
 
-        if intf:
-            intf_info = dict(ifName=intf[0][0],
-                             isL2SwitchPort=intf[0][1],
-                             ifMtu=intf[0][2])
-
-        return intf_info
+        return dict()
 
     def prase_jumboframe_para(self, config_str):
         """prase_jumboframe_para"""
@@ -509,6 +551,178 @@ class Mtu(object):
                         msg='Error: please input MAX jumboframe '
                             'value.')
 
+    def check_intf_values(self, want):
+        """check the mtu and jumboframe of an interfaces entry"""
+
+        ifname = want["interface"]
+        if want["mtu"]:
+            if not want["mtu"].isdigit() or int(want["mtu"]) < 46 or int(want["mtu"]) > 9600:
+                self.module.fail_json(
+                    msg='Error: Mtu of %s is not in the range from 46 to 9600.' % ifname)
+        if want["jumbo_max"]:
+            if not want["jumbo_max"].isdigit() \
+                    or int(want["jumbo_max"]) > 12288 or int(want["jumbo_max"]) < 1536:
+                self.module.fail_json(
+                    msg='Error: Max jumboframe of %s is not between 1536 to 12288.' % ifname)
+        if want["jumbo_min"]:
+            if not want["jumbo_max"]:
+                self.module.fail_json(
+                    msg='Error: please specify max jumboframe value of %s.' % ifname)
+            if not want["jumbo_min"].isdigit() \
+                    or int(want["jumbo_min"]) > int(want["jumbo_max"]) or int(want["jumbo_min"]) < 1518:
+                self.module.fail_json(
+                    msg='Error: Min jumboframe of %s is not between '
+                        '1518 to jumboframe max value.' % ifname)
+
+    def get_intf_plans(self, intf_index):
+        """expand the interfaces entries to one plan per interface, the options
+        that an entry does not set are taken from the module options,
+        patterns only match the interfaces that support the wanted settings"""
+
+        plans = dict()
+        order = list()
+        for entry in self.interfaces:
+            if not isinstance(entry, dict):
+                entry = dict(interface=entry)
+            if not entry.get("interface"):
+                self.module.fail_json(
+                    msg='Error: Each interface must be a name or a dict with interface.')
+
+            want = dict()
+            for key, value in (("mtu", self.mtu), ("jumbo_max", self.jbf_max), ("jumbo_min", self.jbf_min)):
+                want[key] = entry.get(key)
+                if want[key] is None:
+                    want[key] = value
+                if want[key] is not None:
+                    want[key] = str(want[key])
+
+            pattern = str(entry["interface"]).replace(" ", "")
+            if is_interface_pattern(pattern):
+                names = list()
+                for name in match_interfaces(intf_index.keys(), pattern):
+                    intf = intf_index[name]
+                    if self.state == "present" and want["mtu"] and intf.get("isL2SwitchPort") == "true":
+                        continue
+                    if self.state == "present" and want["jumbo_max"] \
+                            and not is_interface_support_setjumboframe(name):
+                        continue
+                    names.append(name)
+            else:
+                intf = intf_index.get(pattern.upper())
+                if not intf:
+                    self.module.fail_json(
+                        msg='Error: Interface %s does not exist.' % pattern)
+                if self.state == "present" and want["mtu"] and intf.get("isL2SwitchPort") == "true":
+                    self.module.fail_json(
+                        msg='Error: L2Switch Port %s can not set mtu.' % pattern)
+                if self.state == "present" and want["jumbo_max"] \
+                        and not is_interface_support_setjumboframe(pattern):
+                    self.module.fail_json(
+                        msg='Error: Interface %s does not support jumboframe set.' % pattern)
+                names = [pattern.upper()]
+
+            for name in names:
+                plan = dict(want, interface=intf_index[name]["ifName"])
+                if self.state == "present":
+                    self.check_intf_values(plan)
+                if name not in plans:
+                    order.append(name)
+                plans[name] = plan
+
+        return [plans[name] for name in order]
+
+    def get_jumboframe_configs(self):
+        """get the jumboframe of all interfaces by one cli read"""
+
+        flags = list()
+        exp = " all | include ^interface|jumboframe"
+        flags.append(exp)
+        return parse_jumboframe_config(get_config(self.module, flags))
+
+    def get_intf_state(self, intf, jbf_configs):
+        """get the k/v pairs of an interface"""
+
+        state = dict(interface=intf["ifName"], mtu=intf.get("ifMtu"))
+        jbf_value = jbf_configs.get(intf["ifName"].upper())
+        if jbf_value and is_interface_support_setjumboframe(intf["ifName"]):
+            state["jumboframe"] = "jumboframe enable %s %s" % (jbf_value[0], jbf_value[1])
+        return state
+
+    def config_interfaces(self):
+        """diff every requested interface with the ifm snapshot and the jumboframe
+        config, apply all mtu changes by one netconf edit and all jumboframe
+        changes by one cli block"""
+
+        intf_index = dict((intf["ifName"].upper(), intf)
+                          for intf in get_ifm_snapshot(self.module) if intf.get("ifName"))
+        plans = self.get_intf_plans(intf_index)
+        jbf_configs = dict()
+        if self.state == "absent" or [want for want in plans if want["jumbo_max"]]:
+            jbf_configs = self.get_jumboframe_configs()
+
+        self.proposed = dict(interfaces=plans, state=self.state)
+        self.existing = dict(interfaces=list())
+        xml_items = list()
+        for want in plans:
+            ifname = want["interface"]
+            intf = intf_index[ifname.upper()]
+            self.existing["interfaces"].append(self.get_intf_state(intf, jbf_configs))
+
+            # mtu by netconf
+            mtu = want["mtu"]
+            if self.state == "absent":
+                mtu = None
+                if intf.get("isL2SwitchPort") != "true":
+                    mtu = "1500"
+            if mtu and intf.get("ifMtu") != mtu:
+                xml_items.append(CE_NC_MERGE_INTF_MTU_ITEM % (ifname, mtu))
+                self.updates_cmd.append("interface %s" % ifname)
+                self.updates_cmd.append("mtu %s" % mtu)
+
+            # jumboframe by cli
+            jbf_value = jbf_configs.get(ifname.upper())
+            if not jbf_value or not is_interface_support_setjumboframe(ifname):
+                continue
+            jbf_cli = None
+            if self.state == "absent":
+                if jbf_value != JUMBOFRAME_DEFAULT:
+                    jbf_cli = "jumboframe enable %s %s" % tuple(JUMBOFRAME_DEFAULT)
+            elif want["jumbo_max"] and want["jumbo_min"]:
+                if jbf_value != [want["jumbo_max"], want["jumbo_min"]]:
+                    jbf_cli = "jumboframe enable %s %s" % (want["jumbo_max"], want["jumbo_min"])
+            elif want["jumbo_max"]:
+                if jbf_value[0] != want["jumbo_max"]:
+                    jbf_cli = "jumboframe enable %s" % want["jumbo_max"]
+            if jbf_cli:
+                self.cli_add_command("interface %s" % ifname)
+                self.cli_add_command(jbf_cli)
+
+        if not xml_items and not self.commands:
+            return
+
+        self.changed = True
+        self.updates_cmd.extend(self.commands)
+        if not self.module.check_mode and xml_items:
+            set_nc_config_chunks(self.module, CE_NC_SET_INTFS_MTU_HEAD, xml_items, CE_NC_SET_INTFS_MTU_TAIL)
+        if self.commands:
+            self.cli_load_config(self.commands)
+
+    def get_interfaces_end_state(self):
+        """get the listed interfaces after module execution"""
+
+        refresh = self.changed and not self.module.check_mode
+        intf_index = dict((intf["ifName"].upper(), intf)
+                          for intf in get_ifm_snapshot(self.module, refresh) if intf.get("ifName"))
+        jbf_configs = dict()
+        if self.state == "absent" or [want for want in self.proposed["interfaces"] if want["jumbo_max"]]:
+            jbf_configs = self.get_jumboframe_configs()
+
+        self.end_state = dict(interfaces=list())
+        for want in self.proposed["interfaces"]:
+            intf = intf_index.get(want["interface"].upper())
+            if intf:
+                self.end_state["interfaces"].append(self.get_intf_state(intf, jbf_configs))
+
     def get_proposed(self):
         """ get_proposed"""
 
@@ -548,7 +762,7 @@ class Mtu(object):
         """ get_end_state"""
 
         if self.intf_info:
-            end_info = self.get_interface_dict(self.interface)
+            end_info = self.get_interface_dict(self.interface, refresh=self.changed)
             if end_info:
                 self.end_state["interface"] = end_info["ifName"]
                 self.end_state["mtu"] = end_info["ifMtu"]
@@ -573,15 +787,20 @@ class Mtu(object):
 
     def work(self):
         """worker"""
-        self.check_params()
 
-        self.get_proposed()
+        if self.interfaces:
+            self.config_interfaces()
+            self.get_interfaces_end_state()
+        else:
+            self.check_params()
+
+            self.get_proposed()
 
-        self.merge_interface(self.interface, self.mtu)
-        self.set_jumboframe()
+            self.merge_interface(self.interface, self.mtu)
+            self.set_jumboframe()
 
-        self.get_existing()
-        self.get_end_state()
+            self.get_existing()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -598,12 +817,13 @@ def main():
     """ main"""
 
     argument_spec = dict(
-        interface=dict(required=True, type='str'),
+        interface=dict(required=False, type='str'),
         mtu=dict(type='str'),
         state=dict(choices=['absent', 'present'],
                    default='present', required=False),
         jumbo_max=dict(type='str'),
         jumbo_min=dict(type='str'),
+        interfaces=dict(required=False, type='list'),
     )
     argument_spec.update(ce_argument_spec)
     interface = Mtu(argument_spec)
@@ -225,8 +225,7 @@ changed:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_config, load_config
-from ansible.module_utils.ce import ce_argument_spec
+from ansible.module_utils.ce import ce_argument_spec, get_netstream_interface, NetStreamCli
 
 
 def get_interface_type(interface):
@@ -259,7 +258,7 @@ def get_interface_type(interface):
     return iftype.lower()
 
 
-class NetStreamGlobal(object):
+class NetStreamGlobal(NetStreamCli):
     """
     Manages netstream global parameters.
     """
@@ -308,6 +307,7 @@ class NetStreamGlobal(object):
         self.statistic_changed = False
         self.flexible_changed = False
         self.index_switch_changed = False
+        self.ns_config = None
 
     def init_module(self):
         """init module"""
@@ -315,324 +315,101 @@ class NetStreamGlobal(object):
         self.module = AnsibleModule(
             argument_spec=self.spec, supports_check_mode=True)
 
-    def cli_load_config(self, commands):
-        """load config by cli"""
+    def get_sampler_state(self):
+        """get netstream sampler interval"""
 
-        if not self.module.check_mode:
-            load_config(self.module, commands)
-
-    def cli_add_command(self, command, undo=False):
-        """add command to self.update_cmd and self.commands"""
-
-        if undo and command.lower() not in ["quit", "return"]:
-            cmd = "undo " + command
-        else:
-            cmd = command
-
-        self.commands.append(cmd)
-        if command.lower() not in ["quit", "return"]:
-            self.updates_cmd.append(cmd)
-
-    def get_exist_sampler_interval(self):
-        """get exist netstream sampler interval"""
-
-        sampler_tmp = dict()
-        sampler_tmp1 = dict()
-        flags = list()
-        exp = " | ignore-case  include ^netstream sampler random-packets"
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            sampler_tmp["sampler_interval"] = "null"
-            sampler_tmp["sampler_direction"] = "null"
-        else:
-            config_list = config.split(' ')
-            config_num = len(config_list)
-            sampler_tmp["sampler_direction"] = config_list[config_num - 1]
-            sampler_tmp["sampler_interval"] = config_list[config_num - 2]
+        sampler = list()
+        sampler_tmp = dict(self.ns_config["sampler"])
         sampler_tmp["interface"] = "all"
-        self.existing["sampler"].append(sampler_tmp)
+        sampler.append(sampler_tmp)
         if self.interface != "all":
-            flags = list()
-            exp = " | ignore-case  section include ^interface %s$" \
-                  " | include netstream sampler random-packets" % self.interface
-            flags.append(exp)
-            config = get_config(self.module, flags)
-            if not config:
-                sampler_tmp1["sampler_interval"] = "null"
-                sampler_tmp1["sampler_direction"] = "null"
-            else:
-                config = config.lstrip()
-                config_list = config.split('\n')
-                for config_mem in config_list:
-                    sampler_tmp1 = dict()
-                    config_mem_list = config_mem.split(' ')
-                    config_num = len(config_mem_list)
-                    sampler_tmp1["sampler_direction"] = config_mem_list[
-                        config_num - 1]
-                    sampler_tmp1["sampler_interval"] = config_mem_list[
-                        config_num - 2]
-                    sampler_tmp1["interface"] = self.interface
-                    self.existing["sampler"].append(sampler_tmp1)
-
-    def get_exist_statistic_record(self):
-        """get exist netstream statistic record parameter"""
+            port = get_netstream_interface(self.ns_config, self.interface)
+            for sampler_mem in port["samplers"]:
+                sampler_tmp1 = dict(sampler_mem)
+                sampler_tmp1["interface"] = self.interface
+                sampler.append(sampler_tmp1)
+        return sampler
+
+    def get_flexible_statistic_state(self):
+        """get netstream statistic record parameter"""
 
         if self.statistics_record and self.statistics_direction:
             self.module.fail_json(
                 msg='Error: The statistic direction and record can not exist at the same time.')
-        statistic_tmp = dict()
+        port = get_netstream_interface(self.ns_config, self.interface)
+        flexible_statistic = list()
+        for ns_type in ["ip", "vxlan"]:
+            flexible_statistic.append(dict(interface=self.interface,
+                                           statistics_record=list(port["records"][ns_type]),
+                                           type=ns_type))
+        return flexible_statistic
+
+    def get_statistic_state(self):
+        """get netstream interface statistic parameter"""
+
+        port = get_netstream_interface(self.ns_config, self.interface)
         statistic_tmp1 = dict()
-        statistic_tmp["statistics_record"] = list()
-        statistic_tmp["interface"] = self.interface
-        statistic_tmp1["statistics_record"] = list()
-        statistic_tmp1["interface"] = self.interface
-        flags = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream record"\
-              % (self.interface)
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            statistic_tmp["type"] = "ip"
-            self.existing["flexible_statistic"].append(statistic_tmp)
-            statistic_tmp1["type"] = "vxlan"
-            self.existing["flexible_statistic"].append(statistic_tmp1)
+        statistic_tmp1["statistics_direction"] = list(port["statistics_direction"])
+        if port["statistics_direction"]:
+            statistic_tmp1["type"] = "ip"
         else:
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem = config_mem.lstrip()
-                statistic_tmp["statistics_record"] = list()
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[3]) == "ip":
-                    statistic_tmp["statistics_record"].append(
-                        str(config_mem_list[2]))
-            statistic_tmp["type"] = "ip"
-            self.existing["flexible_statistic"].append(statistic_tmp)
-            for config_mem in config_list:
-                statistic_tmp1["statistics_record"] = list()
-                config_mem = config_mem.lstrip()
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[3]) == "vxlan":
-                    statistic_tmp1["statistics_record"].append(
-                        str(config_mem_list[2]))
-            statistic_tmp1["type"] = "vxlan"
-            self.existing["flexible_statistic"].append(statistic_tmp1)
-
-    def get_exist_interface_statistic(self):
-        """get exist netstream interface statistic parameter"""
-
-        statistic_tmp1 = dict()
-        statistic_tmp1["statistics_direction"] = list()
-        flags = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream inbound|outbound"\
-              % self.interface
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
             statistic_tmp1["type"] = "null"
-        else:
-            statistic_tmp1["type"] = "ip"
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem = config_mem.lstrip()
-                config_mem_list = config_mem.split(' ')
-                statistic_tmp1["statistics_direction"].append(
-                    str(config_mem_list[1]))
         statistic_tmp1["interface"] = self.interface
-        self.existing["statistic"].append(statistic_tmp1)
-
-    def get_exist_index_switch(self):
-        """get exist netstream index-switch"""
-
-        index_switch_tmp = dict()
-        index_switch_tmp1 = dict()
-        index_switch_tmp["index-switch"] = "16"
-        index_switch_tmp["type"] = "ip"
-        index_switch_tmp1["index-switch"] = "16"
-        index_switch_tmp1["type"] = "vxlan"
-        flags = list()
-        exp = " | ignore-case  include index-switch"
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            self.existing["index-switch"].append(index_switch_tmp)
-            self.existing["index-switch"].append(index_switch_tmp1)
-        else:
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[2]) == "ip":
-                    index_switch_tmp["index-switch"] = "32"
-                    index_switch_tmp["type"] = "ip"
-                if str(config_mem_list[2]) == "vxlan":
-                    index_switch_tmp1["index-switch"] = "32"
-                    index_switch_tmp1["type"] = "vxlan"
-            self.existing["index-switch"].append(index_switch_tmp)
-            self.existing["index-switch"].append(index_switch_tmp1)
+        return [statistic_tmp1]
+
+    def get_index_switch_state(self):
+        """get netstream index-switch"""
+
+        index_switch = list()
+        for ns_type in ["ip", "vxlan"]:
+            index_switch.append({"index-switch": self.ns_config["index_switch"][ns_type],
+                                 "type": ns_type})
+        return index_switch
 
     def get_exist_record(self):
         """get exist netstream record"""
 
-        flags = list()
-        exp = " | ignore-case include netstream record"
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if config:
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem_list = config_mem.split(' ')
-                if config_mem_list[3] == "ip":
-                    self.existing["ip_record"].append(config_mem_list[2])
-                if config_mem_list[3] == "vxlan":
-                    self.existing["vxlan_record"].append(config_mem_list[2])
-
-    def get_end_sampler_interval(self):
-        """get end netstream sampler interval"""
+        self.existing["ip_record"] = list(self.ns_config["records"]["ip"])
+        self.existing["vxlan_record"] = list(self.ns_config["records"]["vxlan"])
 
-        sampler_tmp = dict()
-        sampler_tmp1 = dict()
-        flags = list()
-        exp = " | ignore-case  include ^netstream sampler random-packets"
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            sampler_tmp["sampler_interval"] = "null"
-            sampler_tmp["sampler_direction"] = "null"
-        else:
-            config_list = config.split(' ')
-            config_num = len(config_list)
-            sampler_tmp["sampler_direction"] = config_list[config_num - 1]
-            sampler_tmp["sampler_interval"] = config_list[config_num - 2]
-        sampler_tmp["interface"] = "all"
-        self.end_state["sampler"].append(sampler_tmp)
+    def update_netstream_config(self):
+        """apply the committed changes to the netstream configuration snapshot"""
+
+        port = None
         if self.interface != "all":
-            flags = list()
-            exp = " | ignore-case  section include ^interface %s$" \
-                  " | include netstream sampler random-packets" % self.interface
-            flags.append(exp)
-            config = get_config(self.module, flags)
-            if not config:
-                sampler_tmp1["sampler_interval"] = "null"
-                sampler_tmp1["sampler_direction"] = "null"
+            port = get_netstream_interface(self.ns_config, self.interface)
+
+        if self.sampler_changed:
+            if port is None:
+                if self.state == "present":
+                    self.ns_config["sampler"] = dict(sampler_interval=self.sampler_interval,
+                                                     sampler_direction=self.sampler_direction)
+                else:
+                    self.ns_config["sampler"] = dict(sampler_interval="null", sampler_direction="null")
             else:
-                config = config.lstrip()
-                config_list = config.split('\n')
-                for config_mem in config_list:
-                    sampler_tmp1 = dict()
-                    config_mem_list = config_mem.split(' ')
-                    config_num = len(config_mem_list)
-                    sampler_tmp1["sampler_direction"] = config_mem_list[
-                        config_num - 1]
-                    sampler_tmp1["sampler_interval"] = config_mem_list[
-                        config_num - 2]
-                    sampler_tmp1["interface"] = self.interface
-                    self.end_state["sampler"].append(sampler_tmp1)
-
-    def get_end_statistic_record(self):
-        """get end netstream statistic record parameter"""
+                port["samplers"] = [sampler for sampler in port["samplers"]
+                                    if sampler["sampler_direction"] != self.sampler_direction]
+                if self.state == "present":
+                    port["samplers"].append(dict(sampler_interval=self.sampler_interval,
+                                                 sampler_direction=self.sampler_direction))
 
-        if self.statistics_record and self.statistics_direction:
-            self.module.fail_json(
-                msg='Error: The statistic direction and record can not exist at the same time.')
-        statistic_tmp = dict()
-        statistic_tmp1 = dict()
-        statistic_tmp["statistics_record"] = list()
-        statistic_tmp["interface"] = self.interface
-        statistic_tmp1["statistics_record"] = list()
-        statistic_tmp1["interface"] = self.interface
-        flags = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream record"\
-              % (self.interface)
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            statistic_tmp["type"] = "ip"
-            self.end_state["flexible_statistic"].append(statistic_tmp)
-            statistic_tmp1["type"] = "vxlan"
-            self.end_state["flexible_statistic"].append(statistic_tmp1)
-        else:
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem = config_mem.lstrip()
-                statistic_tmp["statistics_record"] = list()
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[3]) == "ip":
-                    statistic_tmp["statistics_record"].append(
-                        str(config_mem_list[2]))
-            statistic_tmp["type"] = "ip"
-            self.end_state["flexible_statistic"].append(statistic_tmp)
-            for config_mem in config_list:
-                statistic_tmp1["statistics_record"] = list()
-                config_mem = config_mem.lstrip()
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[3]) == "vxlan":
-                    statistic_tmp1["statistics_record"].append(
-                        str(config_mem_list[2]))
-            statistic_tmp1["type"] = "vxlan"
-            self.end_state["flexible_statistic"].append(statistic_tmp1)
-
-    def get_end_interface_statistic(self):
-        """get end netstream interface statistic parameters"""
+        if self.statistic_changed:
+            if self.state == "present":
+                port["statistics_direction"].append(self.statistics_direction)
+            else:
+                port["statistics_direction"].remove(self.statistics_direction)
 
-        statistic_tmp1 = dict()
-        statistic_tmp1["statistics_direction"] = list()
-        flags = list()
-        exp = " | ignore-case  section include ^interface %s$" \
-              " | include netstream inbound|outbound"\
-              % self.interface
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            statistic_tmp1["type"] = "null"
-        else:
-            statistic_tmp1["type"] = "ip"
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem = config_mem.lstrip()
-                config_mem_list = config_mem.split(' ')
-                statistic_tmp1["statistics_direction"].append(
-                    str(config_mem_list[1]))
-        statistic_tmp1["interface"] = self.interface
-        self.end_state["statistic"].append(statistic_tmp1)
-
-    def get_end_index_switch(self):
-        """get end netstream index switch"""
-
-        index_switch_tmp = dict()
-        index_switch_tmp1 = dict()
-        index_switch_tmp["index-switch"] = "16"
-        index_switch_tmp["type"] = "ip"
-        index_switch_tmp1["index-switch"] = "16"
-        index_switch_tmp1["type"] = "vxlan"
-        flags = list()
-        exp = " | ignore-case  include index-switch"
-        flags.append(exp)
-        config = get_config(self.module, flags)
-        if not config:
-            self.end_state["index-switch"].append(index_switch_tmp)
-            self.end_state["index-switch"].append(index_switch_tmp1)
-        else:
-            config = config.lstrip()
-            config_list = config.split('\n')
-            for config_mem in config_list:
-                config_mem_list = config_mem.split(' ')
-                if str(config_mem_list[2]) == "ip":
-                    index_switch_tmp["index-switch"] = "32"
-                    index_switch_tmp["type"] = "ip"
-                if str(config_mem_list[2]) == "vxlan":
-                    index_switch_tmp1["index-switch"] = "32"
-                    index_switch_tmp1["type"] = "vxlan"
-            self.end_state["index-switch"].append(index_switch_tmp)
-            self.end_state["index-switch"].append(index_switch_tmp1)
+        if self.flexible_changed:
+            if self.state == "present":
+                port["records"][self.type] = [self.statistics_record]
+            else:
+                port["records"][self.type].remove(self.statistics_record)
+
+        if self.index_switch_changed:
+            if self.state == "present":
+                self.ns_config["index_switch"][self.type] = self.index_switch
+            else:
+                self.ns_config["index_switch"][self.type] = "16"
 
     def check_params(self):
         """check all input params"""
@@ -669,6 +446,7 @@ class NetStreamGlobal(object):
             self.module.fail_json(
                 msg="Error: Statistic type and record must be set at the same time.")
 
+        self.get_netstream_config()
         self.get_exist_record()
         if self.statistics_record:
             if self.type == "ip":
@@ -708,10 +486,10 @@ class NetStreamGlobal(object):
         index_tmp = dict()
         temp = False
 
-        self.get_exist_sampler_interval()
-        self.get_exist_interface_statistic()
-        self.get_exist_statistic_record()
-        self.get_exist_index_switch()
+        self.existing["sampler"] = self.get_sampler_state()
+        self.existing["statistic"] = self.get_statistic_state()
+        self.existing["flexible_statistic"] = self.get_flexible_statistic_state()
+        self.existing["index-switch"] = self.get_index_switch_state()
 
         if self.state == "present":
             for sampler_tmp in self.existing["sampler"]:
@@ -864,10 +642,13 @@ class NetStreamGlobal(object):
     def get_end_state(self):
         """get end state info"""
 
-        self.get_end_sampler_interval()
-        self.get_end_interface_statistic()
-        self.get_end_statistic_record()
-        self.get_end_index_switch()
+        # the end state is computed from the commands sent, not read again
+        if self.changed and not self.module.check_mode:
+            self.update_netstream_config()
+        self.end_state["sampler"] = self.get_sampler_state()
+        self.end_state["statistic"] = self.get_statistic_state()
+        self.end_state["flexible_statistic"] = self.get_flexible_statistic_state()
+        self.end_state["index-switch"] = self.get_index_switch_state()
 
     def work(self):
         """worker"""
@@ -0,0 +1,434 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.0'}
+
+DOCUMENTATION = """
+---
+module: ce_netstream_plan
+version_added: "2.4"
+short_description: Manages NetStream sampling plans on HUAWEI CloudEngine switches.
+description:
+    - Applies NetStream sampling, statistics records and collectors to many interfaces
+      of HUAWEI CloudEngine switches in one task.
+author: YangYang (@CloudEngine-Ansible)
+notes:
+    - The netstream configuration is read once, interface patterns are expanded against
+      the interfaces of that read and all changes are sent in one CLI block.
+    - Interfaces that are matched by more than one plan entry take the settings of the last entry.
+    - The flexible statistics records must have been created with ce_netstream_template.
+options:
+    plan:
+        description:
+            - A list of plan entries. Each entry is a dict with the key interfaces, a list of
+              interface full names or shell-style patterns such as C(10GE1/0/*), and any of
+              sampler_interval (1 - 65535), sampler_direction (inbound or outbound),
+              statistics_direction (inbound or outbound), statistics_record, type (ip or vxlan,
+              default ip) and collector, a dict with host_ip, host_port and optionally host_vpn.
+        required: true
+    state:
+        description:
+            - Specify desired state of the resource.
+        required: false
+        choices: ['present', 'absent']
+        default: present
+"""
+
+EXAMPLES = '''
+- name: netstream plan module test
+  hosts: cloudengine
+  connection: local
+  gather_facts: no
+  vars:
+    cli:
+      host: "{{ inventory_hostname }}"
+      port: "{{ ansible_ssh_port }}"
+      username: "{{ username }}"
+      password: "{{ password }}"
+      transport: cli
+
+  tasks:
+
+  - name: Sample all uplinks inbound and export the flows to one collector.
+    ce_netstream_plan:
+      plan:
+        - interfaces: ['100GE1/0/*', '40GE1/0/1']
+          sampler_interval: 1000
+          sampler_direction: inbound
+          statistics_record: uplink
+          collector: {host_ip: 192.8.2.4, host_port: 9995}
+        - interfaces: ['10GE1/0/4[0-8]']
+          sampler_interval: 4000
+          sampler_direction: outbound
+      provider: "{{ cli }}"
+'''
+
+RETURN = '''
+proposed:
+    description: k/v pairs of parameters passed into module
+    returned: verbose mode
+    type: dict
+    sample: {"plan": [{"interfaces": ["10GE1/0/4[0-8]"], "sampler_direction": "outbound",
+             "sampler_interval": "4000", "type": "ip"}],
+             "state": "present"}
+existing:
+    description: k/v pairs of existing configuration of the matched interfaces and collectors
+    returned: verbose mode
+    type: dict
+    sample: {"collectors": {"ip": [], "vxlan": []},
+             "interfaces": [{"interface": "10GE1/0/40", "samplers": [],
+                             "statistics_direction": [], "records": {"ip": [], "vxlan": []}}]}
+end_state:
+    description: k/v pairs of configuration after module execution
+    returned: verbose mode
+    type: dict
+    sample: {"collectors": {"ip": [], "vxlan": []},
+             "interfaces": [{"interface": "10GE1/0/40",
+                             "samplers": [{"sampler_direction": "outbound", "sampler_interval": "4000"}],
+                             "statistics_direction": [], "records": {"ip": [], "vxlan": []}}]}
+updates:
+    description: commands sent to the device
+    returned: always
+    type: list
+    sample: ["interface 10GE1/0/40",
+             "netstream sampler random-packets 4000 outbound"]
+changed:
+    description: check to see if a change was made on the device
+    returned: always
+    type: boolean
+    sample: true
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.ce import ce_argument_spec, get_netstream_interface, NetStreamCli, \
+    is_interface_pattern, match_interfaces
+
+
+def get_record_cmd(record, ns_type):
+    """Gets the netstream record command of a statistic type"""
+
+    if ns_type == "ip":
+        return "netstream record %s ip" % record
+    return "netstream record %s vxlan inner-ip" % record
+
+
+def get_host_cmd(host, ns_type):
+    """Gets the netstream export host command of a statistic type"""
+
+    if ns_type == "ip":
+        cmd = "netstream export ip host"
+    else:
+        cmd = "netstream export vxlan inner-ip host"
+    if ":" in host["host_ip"]:
+        cmd += " ipv6"
+    cmd += " %s %s" % (host["host_ip"], host["host_port"])
+    if host["host_vpn"]:
+        cmd += " vpn-instance %s" % host["host_vpn"]
+    return cmd
+
+
+class NetStreamPlan(NetStreamCli):
+    """
+    Manages netstream sampling plans.
+    """
+
+    def __init__(self, argument_spec):
+        self.spec = argument_spec
+        self.module = None
+        self.init_module()
+
+        # module input info
+        self.plan = self.module.params['plan']
+        self.state = self.module.params['state']
+
+        # state
+        self.changed = False
+        self.updates_cmd = list()
+        self.commands = list()
+        self.results = dict()
+        self.proposed = dict()
+        self.existing = dict()
+        self.end_state = dict()
+
+        # local parameters
+        self.ns_config = None
+        self.ports = list()
+        self.port_plans = dict()
+        self.collectors = dict(ip=list(), vxlan=list())
+
+    def init_module(self):
+        """init module"""
+
+        self.module = AnsibleModule(
+            argument_spec=self.spec, supports_check_mode=True)
+
+    def check_params(self):
+        """check and normalize all plan entries"""
+
+        if not self.plan:
+            self.module.fail_json(msg='Error: The plan can not be empty.')
+
+        plan = list()
+        for entry in self.plan:
+            if not isinstance(entry, dict) or not entry.get("interfaces"):
+                self.module.fail_json(
+                    msg='Error: Each plan entry must have interfaces.')
+
+            interfaces = entry["interfaces"]
+            if not isinstance(interfaces, list):
+                interfaces = str(interfaces).split(",")
+            plan_tmp = dict(interfaces=[str(interface).strip() for interface in interfaces])
+
+            plan_tmp["type"] = entry.get("type") or "ip"
+            if plan_tmp["type"] not in ["ip", "vxlan"]:
+                self.module.fail_json(
+                    msg='Error: The type %s is invalid.' % plan_tmp["type"])
+
+            plan_tmp["sampler_interval"] = entry.get("sampler_interval")
+            plan_tmp["sampler_direction"] = entry.get("sampler_direction")
+            if bool(plan_tmp["sampler_interval"]) != bool(plan_tmp["sampler_direction"]):
+                self.module.fail_json(
+                    msg="Error: Sampler interval and direction must be set at the same time.")
+            if plan_tmp["sampler_interval"]:
+                plan_tmp["sampler_interval"] = str(plan_tmp["sampler_interval"])
+                if not plan_tmp["sampler_interval"].isdigit() or \
+                        int(plan_tmp["sampler_interval"]) < 1 or int(plan_tmp["sampler_interval"]) > 65535:
+                    self.module.fail_json(
+                        msg="Error: Sampler interval should between 1 - 65535.")
+                if plan_tmp["sampler_direction"] not in ["inbound", "outbound"]:
+                    self.module.fail_json(
+                        msg="Error: Sampler direction should be inbound or outbound.")
+                if plan_tmp["type"] == "vxlan":
+                    self.module.fail_json(
+                        msg="Error: Netstream do not support vxlan sampler.")
+
+            plan_tmp["statistics_direction"] = entry.get("statistics_direction")
+            if plan_tmp["statistics_direction"]:
+                if plan_tmp["statistics_direction"] not in ["inbound", "outbound"]:
+                    self.module.fail_json(
+                        msg="Error: Statistic direction should be inbound or outbound.")
+                if plan_tmp["type"] == "vxlan":
+                    self.module.fail_json(
+                        msg="Error: Vxlan do not support inbound or outbound statistic.")
+
+            plan_tmp["statistics_record"] = entry.get("statistics_record")
+            if plan_tmp["statistics_record"]:
+                plan_tmp["statistics_record"] = str(plan_tmp["statistics_record"])
+                if len(plan_tmp["statistics_record"]) > 32:
+                    self.module.fail_json(
+                        msg="Error: Statistic record length should between 1 - 32.")
+                if plan_tmp["statistics_direction"]:
+                    self.module.fail_json(
+                        msg='Error: The statistic direction and record can not exist at the same time.')
+
+            plan_tmp["collector"] = None
+            collector = entry.get("collector")
+            if collector:
+                if not isinstance(collector, dict) or not collector.get("host_ip") or not collector.get("host_port"):
+                    self.module.fail_json(
+                        msg='Error: The collector must have host_ip and host_port.')
+                host_port = str(collector["host_port"])
+                if not host_port.isdigit() or int(host_port) < 1 or int(host_port) > 65535:
+                    self.module.fail_json(
+                        msg='Error: Host port should between 1 - 65535.')
+                plan_tmp["collector"] = dict(host_ip=str(collector["host_ip"]), host_port=host_port,
+                                             host_vpn=collector.get("host_vpn"))
+
+            plan.append(plan_tmp)
+        self.plan = plan
+
+    def expand_interfaces(self, interfaces):
+        """expand interface names and patterns against the interfaces of the device"""
+
+        ports = list()
+        for interface in interfaces:
+            if not is_interface_pattern(interface):
+                if interface.upper() not in self.ns_config["interfaces"]:
+                    self.module.fail_json(
+                        msg='Error: The interface %s is not exist.' % interface)
+                ports.append(interface.upper())
+                continue
+
+            matched = match_interfaces(sorted(self.ns_config["interfaces"]), interface)
+            if not matched:
+                self.module.fail_json(
+                    msg='Error: No interface matches %s.' % interface)
+            ports.extend(matched)
+
+        return ports
+
+    def get_port_plans(self):
+        """get the settings of every matched interface, the last plan entry wins"""
+
+        for plan_tmp in self.plan:
+            for port in self.expand_interfaces(plan_tmp["interfaces"]):
+                if port not in self.ports:
+                    self.ports.append(port)
+                    self.port_plans[port] = dict(samplers=dict(), statistics_direction=list(),
+                                                 records=dict())
+                port_plan = self.port_plans[port]
+                if plan_tmp["sampler_direction"]:
+                    port_plan["samplers"][plan_tmp["sampler_direction"]] = plan_tmp["sampler_interval"]
+                if plan_tmp["statistics_direction"] and \
+                        plan_tmp["statistics_direction"] not in port_plan["statistics_direction"]:
+                    port_plan["statistics_direction"].append(plan_tmp["statistics_direction"])
+                if plan_tmp["statistics_record"]:
+                    port_plan["records"][plan_tmp["type"]] = plan_tmp["statistics_record"]
+
+            if plan_tmp["collector"] and plan_tmp["collector"] not in self.collectors[plan_tmp["type"]]:
+                self.collectors[plan_tmp["type"]].append(plan_tmp["collector"])
+
+        for port_plan in self.port_plans.values():
+            for ns_type, record in port_plan["records"].items():
+                if record not in self.ns_config["records"][ns_type]:
+                    self.module.fail_json(
+                        msg="Error: The statistic record %s is not exist." % record)
+
+    def get_plan_state(self):
+        """get netstream configuration of the matched interfaces and the collectors"""
+
+        state = dict(interfaces=list(), collectors=dict())
+        for port in self.ports:
+            port_config = self.ns_config["interfaces"][port]
+            state["interfaces"].append(dict(interface=port_config["interface"],
+                                            samplers=port_config["samplers"],
+                                            statistics_direction=port_config["statistics_direction"],
+                                            records=port_config["records"]))
+        for ns_type in ["ip", "vxlan"]:
+            state["collectors"][ns_type] = self.ns_config["hosts"][ns_type]
+        return state
+
+    def get_port_commands(self, port):
+        """get netstream commands of an interface"""
+
+        port_config = get_netstream_interface(self.ns_config, port)
+        port_plan = self.port_plans[port]
+        cmds = list()
+
+        for direction, interval in sorted(port_plan["samplers"].items()):
+            exist = dict(sampler_interval=interval, sampler_direction=direction) in port_config["samplers"]
+            cmd = "netstream sampler random-packets %s %s" % (interval, direction)
+            if self.state == "present" and not exist:
+                cmds.append((cmd, False))
+            elif self.state == "absent" and exist:
+                cmds.append((cmd, True))
+
+        for direction in port_plan["statistics_direction"]:
+            exist = direction in port_config["statistics_direction"]
+            cmd = "netstream %s ip" % direction
+            if self.state == "present" and not exist:
+                cmds.append((cmd, False))
+            elif self.state == "absent" and exist:
+                cmds.append((cmd, True))
+
+        for ns_type, record in sorted(port_plan["records"].items()):
+            exist_records = port_config["records"][ns_type]
+            if self.state == "present" and record not in exist_records:
+                for exist_record in exist_records:
+                    cmds.append((get_record_cmd(exist_record, ns_type), True))
+                cmds.append((get_record_cmd(record, ns_type), False))
+            elif self.state == "absent" and record in exist_records:
+                cmds.append((get_record_cmd(record, ns_type), True))
+
+        return cmds
+
+    def operate_ns_plan(self):
+        """configure the sampling plan with one cli block"""
+
+        for port in self.ports:
+            cmds = self.get_port_commands(port)
+            if not cmds:
+                continue
+            self.cli_add_command("interface %s" % self.ns_config["interfaces"][port]["interface"])
+            for cmd, undo in cmds:
+                self.cli_add_command(cmd, undo)
+            self.cli_add_command("quit")
+
+        for ns_type in ["ip", "vxlan"]:
+            for host in self.collectors[ns_type]:
+                exist = False
+                for exist_host in self.ns_config["hosts"][ns_type]:
+                    if exist_host["host_ip"] == host["host_ip"] and \
+                            exist_host["host_port"] == host["host_port"] and \
+                            exist_host["host_vpn"] == host["host_vpn"]:
+                        exist = True
+                if self.state == "present" and not exist:
+                    self.cli_add_command(get_host_cmd(host, ns_type))
+                elif self.state == "absent" and exist:
+                    self.cli_add_command(get_host_cmd(host, ns_type), undo=True)
+
+        if self.commands:
+            self.cli_load_config(self.commands)
+            self.changed = True
+
+    def get_proposed(self):
+        """get proposed info"""
+
+        self.proposed["plan"] = self.plan
+        self.proposed["state"] = self.state
+
+    def get_existing(self):
+        """get existing info"""
+
+        self.get_netstream_config()
+        self.get_port_plans()
+        self.existing = self.get_plan_state()
+
+    def get_end_state(self):
+        """get end state info"""
+
+        if self.changed and not self.module.check_mode:
+            self.get_netstream_config()
+        self.end_state = self.get_plan_state()
+
+    def work(self):
+        """worker"""
+
+        self.check_params()
+        self.get_existing()
+        self.get_proposed()
+        self.operate_ns_plan()
+        self.get_end_state()
+        self.results['changed'] = self.changed
+        self.results['proposed'] = self.proposed
+        self.results['existing'] = self.existing
+        self.results['end_state'] = self.end_state
+        if self.changed:
+            self.results['updates'] = self.updates_cmd
+        else:
+            self.results['updates'] = list()
+
+        self.module.exit_json(**self.results)
+
+
+def main():
+    """Module main"""
+
+    argument_spec = dict(
+        plan=dict(required=True, type='list'),
+        state=dict(required=False, choices=['present', 'absent'], default='present'),
+    )
+    argument_spec.update(ce_argument_spec)
+    module = NetStreamPlan(argument_spec)
+    module.work()
+
+
+if __name__ == '__main__':
+    main()
@@ -65,6 +65,17 @@ options:
               C(MEth), C(NULL), C(Tunnel), C(Vlanif).
         required: false
         default: null
+    servers:
+        description:
+            - A list of NTP servers and peers, each one is a dict with address and optionally
+              type (server or peer, default server), key_id, is_preferred, vpn_name and source_int.
+              An entry without vpn_name uses the vpn_name option.
+              If C(state=present), the list is the whole set of servers and peers of the device,
+              the ones that are not in the list are removed.
+              If C(state=absent), the servers and peers in the list are removed.
+              Can not be used with server, peer, key_id, is_preferred and source_int.
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -105,6 +116,14 @@ EXAMPLES = '''
       is_preferred: enable
       key_id: 32
       provider: "{{ cli }}"
+
+  - name: "Replace all NTP servers and peers"
+    ce_ntp:
+      servers:
+        - {address: 192.8.2.6, is_preferred: enable}
+        - {address: 192.8.2.7, vpn_name: js, source_int: vlanif4001}
+        - {address: 192.8.2.8, type: peer}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -142,42 +161,39 @@ changed:
 '''
 
 import re
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, get_nc_config, set_nc_config
+from ansible.module_utils.ce import ce_argument_spec, set_nc_config, set_nc_config_chunks, get_ntp_snapshot
 
-CE_NC_GET_NTP_CONFIG = """
-<filter type="subtree">
+CE_NC_MERGE_NTP_CONFIG = """
+<config>
   <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ntpUCastCfgs>
-      <ntpUCastCfg>
-        <addrFamily></addrFamily>
-        <vpnName></vpnName>
-        <ifName></ifName>
-        <ipv4Addr></ipv4Addr>
-        <ipv6Addr></ipv6Addr>
-        <type></type>
-        <isPreferred></isPreferred>
-        <keyId></keyId>
+      <ntpUCastCfg operation="merge">
+        <addrFamily>%s</addrFamily>
+        <ipv4Addr>%s</ipv4Addr>
+        <ipv6Addr>%s</ipv6Addr>
+        <type>%s</type>
+        <vpnName>%s</vpnName>
+        <keyId>%s</keyId>
+        <isPreferred>%s</isPreferred>
+        <ifName>%s</ifName>
+        <neid>0-0</neid>
       </ntpUCastCfg>
     </ntpUCastCfgs>
   </ntp>
-</filter>
+</config>
 """
 
-CE_NC_MERGE_NTP_CONFIG = """
+CE_NC_DELETE_NTP_CONFIG = """
 <config>
   <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ntpUCastCfgs>
-      <ntpUCastCfg operation="merge">
+      <ntpUCastCfg operation="delete">
         <addrFamily>%s</addrFamily>
         <ipv4Addr>%s</ipv4Addr>
         <ipv6Addr>%s</ipv6Addr>
         <type>%s</type>
         <vpnName>%s</vpnName>
-        <keyId>%s</keyId>
-        <isPreferred>%s</isPreferred>
-        <ifName>%s</ifName>
         <neid>0-0</neid>
       </ntpUCastCfg>
     </ntpUCastCfgs>
@@ -185,10 +201,27 @@ CE_NC_MERGE_NTP_CONFIG = """
 </config>
 """
 
-CE_NC_DELETE_NTP_CONFIG = """
+CE_NC_MERGE_NTP_UCASTS_HEAD = """
 <config>
   <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ntpUCastCfgs>
+"""
+
+CE_NC_MERGE_NTP_UCAST = """
+      <ntpUCastCfg operation="merge">
+        <addrFamily>%s</addrFamily>
+        <ipv4Addr>%s</ipv4Addr>
+        <ipv6Addr>%s</ipv6Addr>
+        <type>%s</type>
+        <vpnName>%s</vpnName>
+        <keyId>%s</keyId>
+        <isPreferred>%s</isPreferred>
+        <ifName>%s</ifName>
+        <neid>0-0</neid>
+      </ntpUCastCfg>
+"""
+
+CE_NC_DELETE_NTP_UCAST = """
       <ntpUCastCfg operation="delete">
         <addrFamily>%s</addrFamily>
         <ipv4Addr>%s</ipv4Addr>
@@ -197,6 +230,9 @@ CE_NC_DELETE_NTP_CONFIG = """
         <vpnName>%s</vpnName>
         <neid>0-0</neid>
       </ntpUCastCfg>
+"""
+
+CE_NC_MERGE_NTP_UCASTS_TAIL = """
     </ntpUCastCfgs>
   </ntp>
 </config>
@@ -259,7 +295,8 @@ class Ntp(object):
     def __init__(self, argument_spec):
         self.spec = argument_spec
         self.module = None
-        self.mutually_exclusive = [('server', 'peer')]
+        self.mutually_exclusive = [('server', 'peer', 'servers'), ('servers', 'key_id'),
+                                   ('servers', 'is_preferred'), ('servers', 'source_int')]
         self.init_module()
 
         # ntp configration info
@@ -270,7 +307,8 @@ class Ntp(object):
         self.vpn_name = self.module.params['vpn_name']
         self.interface = self.module.params['source_int'] or ""
         self.state = self.module.params['state']
-        self.ntp_conf = dict()
+        self.servers = self.module.params['servers']
+        self.ntp_conf = list()
         self.conf_exsit = False
         self.ip_ver = 'IPv4'
 
@@ -311,7 +349,7 @@ class Ntp(object):
     def init_module(self):
         """Init module"""
 
-        required_one_of = [("server", "peer")]
+        required_one_of = [("server", "peer", "servers")]
         self.module = AnsibleModule(
             argument_spec=self.spec,
             supports_check_mode=True,
@@ -322,34 +360,41 @@ class Ntp(object):
     def check_ipaddr_validate(self):
         """Check ipaddress validate"""
 
+        self.ip_ver = self.get_ip_ver(self.address, self.peer_type)
+
+    def get_ip_ver(self, address, peer_type):
+        """Get ip version of a server or peer address, fail if it is illegal"""
+
         rule1 = r'(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])\.'
         rule2 = r'(25[0-5]|2[0-4][0-9]|1[0-9][0-9]|[1-9]?[0-9])'
         ipv4_regex = '%s%s%s%s%s%s' % ('^', rule1, rule1, rule1, rule2, '$')
         ipv6_regex = '^(?:[a-fA-F0-9]{1,4}:){7}[a-fA-F0-9]{1,4}$'
 
         flag = False
-        if bool(re.match(ipv4_regex, self.address)):
+        if bool(re.match(ipv4_regex, address)):
             flag = True
-            self.ip_ver = "IPv4"
-            if not self.ntp_ucast_ipv4_validate():
+            ip_ver = "IPv4"
+            if not self.ntp_ucast_ipv4_validate(address):
                 flag = False
-        elif bool(re.match(ipv6_regex, self.address)):
+        elif bool(re.match(ipv6_regex, address)):
             flag = True
-            self.ip_ver = "IPv6"
+            ip_ver = "IPv6"
         else:
             flag = True
-            self.ip_ver = "IPv6"
+            ip_ver = "IPv6"
 
         if not flag:
-            if self.peer_type == "Server":
+            if peer_type == "Server":
                 self.module.fail_json(msg='Error: Illegal server ip-address.')
             else:
                 self.module.fail_json(msg='Error: Illegal peer ip-address.')
 
-    def ntp_ucast_ipv4_validate(self):
+        return ip_ver
+
+    def ntp_ucast_ipv4_validate(self, address):
         """Check ntp ucast ipv4 address"""
 
-        addr_list = re.findall(r'(.*)\.(.*)\.(.*)\.(.*)', self.address)
+        addr_list = re.findall(r'(.*)\.(.*)\.(.*)\.(.*)', address)
         if not addr_list:
             self.module.fail_json(msg='Error: Match ip-address fail.')
 
@@ -379,6 +424,46 @@ class Ntp(object):
         if self.address:
             self.check_ipaddr_validate()
 
+        if self.servers is not None:
+            self.check_servers()
+
+    def check_servers(self):
+        """Check servers and normalize each one to a ntp unicast config"""
+
+        servers = list()
+        for server in self.servers:
+            if not isinstance(server, dict) or not server.get("address"):
+                self.module.fail_json(
+                    msg='Error: Each server must be a dict with address.')
+
+            peer_type = str(server.get("type") or "server").capitalize()
+            if peer_type not in ["Server", "Peer"]:
+                self.module.fail_json(
+                    msg='Error: The type of server %s must be server or peer.' % server["address"])
+
+            address = str(server["address"])
+            vpn_name = str(server.get("vpn_name") or self.vpn_name or "_public_")
+            if len(vpn_name) > 31:
+                self.module.fail_json(
+                    msg='Error: VPN name length is beetween 1 and 31.')
+
+            source_int = str(server.get("source_int") or "").lower()
+            if source_int and not get_interface_type(source_int):
+                self.module.fail_json(
+                    msg='Error: Interface name of %s '
+                        'is error.' % source_int)
+
+            is_preferred = server.get("is_preferred") or "disable"
+            if is_preferred not in ["enable", "disable"]:
+                self.module.fail_json(
+                    msg='Error: The is_preferred of server %s must be enable or disable.' % address)
+
+            servers.append(dict(ip_ver=self.get_ip_ver(address, peer_type), address=address,
+                                peer_type=peer_type, vpn_name=vpn_name,
+                                key_id=str(server.get("key_id") or ""),
+                                prefer=is_preferred, source_int=source_int))
+        self.servers = servers
+
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
 
@@ -439,28 +524,15 @@ class Ntp(object):
 
         self.module.exit_json(**self.results)
 
-    def get_ntp_exist_config(self):
+    def get_ntp_exist_config(self, refresh=False):
         """Get ntp existed configure"""
 
         ntp_config = list()
-        conf_str = CE_NC_GET_NTP_CONFIG
-        con_obj = get_nc_config(self.module, conf_str)
-        if "<data/>" in con_obj:
-            return ntp_config
-
-        xml_str = con_obj.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+        self.ntp_conf = list()
 
         # get all ntp config info
-        root = ElementTree.fromstring(xml_str)
-        ntpsite = root.findall("data/ntp/ntpUCastCfgs/ntpUCastCfg")
-        for nexthop in ntpsite:
-            ntp_dict = dict()
-            for ele in nexthop:
-                if ele.tag in ["addrFamily", "vpnName", "ifName", "ipv4Addr",
-                               "ipv6Addr", "type", "isPreferred", "keyId"]:
-                    ntp_dict[ele.tag] = ele.text
+        for ucast in get_ntp_snapshot(self.module, refresh)["ucasts"]:
+            ntp_dict = dict(ucast)
 
             ip_addr = ntp_dict['ipv6Addr']
             if ntp_dict['addrFamily'] == "IPv4":
@@ -472,10 +544,11 @@ class Ntp(object):
             else:
                 is_preferred = 'disable'
 
-            if self.state == "present":
-                key_id = ntp_dict['keyId'] or ""
-                cur_ntp_cfg = dict(vpn_name=ntp_dict['vpnName'], source_int=ntp_dict['ifName'].lower(), address=ip_addr,
-                                   peer_type=ntp_dict['type'], prefer=is_preferred, key_id=key_id)
+            key_id = ntp_dict['keyId'] or ""
+            cur_ntp_cfg = dict(vpn_name=ntp_dict['vpnName'], source_int=ntp_dict['ifName'].lower(), address=ip_addr,
+                               peer_type=ntp_dict['type'], prefer=is_preferred, key_id=key_id)
+            self.ntp_conf.append(dict(cur_ntp_cfg, ip_ver=ntp_dict['addrFamily']))
+            if self.state == "present" and self.address:
                 exp_ntp_cfg = dict(vpn_name=self.vpn_name, source_int=self.interface.lower(), address=self.address,
                                    peer_type=self.peer_type, prefer=self.is_preferred, key_id=self.key_id)
                 if cmp(cur_ntp_cfg, exp_ntp_cfg) == 0:
@@ -488,7 +561,7 @@ class Ntp(object):
             if_name = ntp_dict['ifName']
             if if_name == "":
                 if_name = None
-            if self.peer_type == 'Server':
+            if (self.peer_type or ntp_dict['type']) == 'Server':
                 ntp_config.append(dict(vpn_name=vpn_name,
                                        source_int=if_name, server=ip_addr,
                                        is_preferred=is_preferred, key_id=ntp_dict['keyId']))
@@ -502,12 +575,20 @@ class Ntp(object):
     def get_existing(self):
         """Get existing info"""
 
-        if self.address:
+        if self.address or self.servers is not None:
             self.existing = self.get_ntp_exist_config()
 
     def get_proposed(self):
         """Get proposed info"""
 
+        if self.servers is not None:
+            self.proposed = dict(state=self.state, servers=list())
+            for server in self.servers:
+                self.proposed["servers"].append(dict(
+                    address=server["address"], type=server["peer_type"].lower(),
+                    vpn_name=server["vpn_name"], source_int=server["source_int"] or None,
+                    is_preferred=server["prefer"], key_id=server["key_id"] or None))
+
         if self.address:
             vpn_name = self.vpn_name
             if vpn_name == "_public_":
@@ -532,8 +613,8 @@ class Ntp(object):
     def get_end_state(self):
         """Get end state info"""
 
-        if self.address:
-            self.end_state = self.get_ntp_exist_config()
+        if self.address or self.servers is not None:
+            self.end_state = self.get_ntp_exist_config(refresh=self.changed)
 
     def get_update_cmd(self):
         """Get updated commands"""
@@ -590,15 +671,96 @@ class Ntp(object):
 
         self.updates_cmd.append(cli_str)
 
+    def get_server_cmd(self, server, undo=False):
+        """Get the command of a server or peer"""
+
+        if server["peer_type"] == 'Server':
+            cli_str = "ntp unicast-server"
+        else:
+            cli_str = "ntp unicast-peer"
+        if server["ip_ver"] == "IPv6":
+            cli_str = "%s %s" % (cli_str, "ipv6")
+        cli_str = "%s %s" % (cli_str, server["address"])
+
+        if undo:
+            cli_str = "undo %s" % cli_str
+            if server["vpn_name"] != '_public_':
+                cli_str = "%s %s" % (cli_str, server["vpn_name"])
+            return cli_str
+
+        if server["key_id"]:
+            cli_str = "%s %s %s" % (cli_str, "authentication-keyid", server["key_id"])
+        if server["source_int"]:
+            cli_str = "%s %s %s" % (cli_str, "source-interface", server["source_int"])
+        if server["vpn_name"] != '_public_':
+            cli_str = "%s %s %s" % (cli_str, "vpn-instance", server["vpn_name"])
+        if server["prefer"] == "enable":
+            cli_str = "%s %s" % (cli_str, "preferred")
+        return cli_str
+
+    def get_server_xml(self, server, undo=False):
+        """Get the edit xml of a server or peer"""
+
+        ipv4_addr, ipv6_addr = server["address"], '::'
+        if server["ip_ver"] == 'IPv6':
+            ipv4_addr, ipv6_addr = '0.0.0.0', server["address"]
+
+        if undo:
+            return CE_NC_DELETE_NTP_UCAST % (
+                server["ip_ver"], ipv4_addr, ipv6_addr, server["peer_type"], server["vpn_name"])
+
+        if server["prefer"] == 'enable':
+            is_preferred = 'true'
+        else:
+            is_preferred = 'false'
+        return CE_NC_MERGE_NTP_UCAST % (
+            server["ip_ver"], ipv4_addr, ipv6_addr, server["peer_type"], server["vpn_name"],
+            server["key_id"], is_preferred, server["source_int"])
+
+    def config_servers(self):
+        """Config all servers and peers with set semantics by one edit"""
+
+        def get_server_key(server):
+            """servers and peers are indexed by address, type and vpn"""
+            return (server["ip_ver"], server["address"], server["peer_type"], server["vpn_name"])
+
+        exist_keys = [get_server_key(cur) for cur in self.ntp_conf]
+        want_keys = [get_server_key(server) for server in self.servers]
+
+        xml_items = list()
+        if self.state == "present":
+            for cur in self.ntp_conf:
+                if get_server_key(cur) not in want_keys:
+                    xml_items.append(self.get_server_xml(cur, undo=True))
+                    self.updates_cmd.append(self.get_server_cmd(cur, undo=True))
+            for server in self.servers:
+                if server not in self.ntp_conf:
+                    xml_items.append(self.get_server_xml(server))
+                    self.updates_cmd.append(self.get_server_cmd(server))
+        else:
+            for server in self.servers:
+                if get_server_key(server) in exist_keys:
+                    xml_items.append(self.get_server_xml(server, undo=True))
+                    self.updates_cmd.append(self.get_server_cmd(server, undo=True))
+
+        if xml_items:
+            if not self.module.check_mode:
+                set_nc_config_chunks(self.module, CE_NC_MERGE_NTP_UCASTS_HEAD,
+                                     xml_items, CE_NC_MERGE_NTP_UCASTS_TAIL)
+            self.changed = True
+
     def work(self):
         """Excute task"""
 
         self.get_existing()
         self.get_proposed()
 
-        self.config_ntp()
+        if self.servers is not None:
+            self.config_servers()
+        else:
+            self.config_ntp()
+            self.get_update_cmd()
 
-        self.get_update_cmd()
         self.get_end_state()
         self.show_result()
 
@@ -613,6 +775,7 @@ def main():
         is_preferred=dict(type='str', choices=['enable', 'disable']),
         vpn_name=dict(type='str', default='_public_'),
         source_int=dict(type='str'),
+        servers=dict(type='list'),
         state=dict(choices=['absent', 'present'], default='present'),
     )
     argument_spec.update(ce_argument_spec)
@@ -35,11 +35,15 @@ notes:
       If a matching key configuration isn't found on the device, the module will fail.
     - If C(state=absent) and C(authentication=on), authentication will be turned on.
     - If C(state=absent) and C(authentication=off), authentication will be turned off.
+    - With keys, the key passwords can not be read back, a key is only sent again when it is
+      new or its auth_mode or trusted_key changes.
 options:
     key_id:
         description:
             - Authentication key identifier (numeric).
-        required: true
+              Either key_id or keys is required.
+        required: false
+        default: null
     auth_pwd:
         description:
             - Plain text with length of 1 to 255, encrypted text with length of 20 to 392.
@@ -72,6 +76,16 @@ options:
         required: false
         default: null
         choices: ['enable', 'disable']
+    keys:
+        description:
+            - A list of authentication keys, each one is a dict with key_id, auth_pwd, auth_mode
+              and optionally auth_type (default encrypt) and trusted_key (default disable).
+              If C(state=present), the list is the whole set of keys of the device,
+              the keys that are not in the list are removed.
+              If C(state=absent), the keys in the list are removed, only key_id is needed.
+              Can not be used with key_id, auth_pwd and auth_mode.
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -130,6 +144,14 @@ EXAMPLES = '''
       authentication: enable
       state: absent
       provider: "{{ cli }}"
+
+  - name: "Replace all ntp authentication keys and enable authentication"
+    ce_ntp_auth:
+      keys:
+        - {key_id: 32, auth_mode: md5, auth_pwd: 11111111111111111111111, trusted_key: enable}
+        - {key_id: 33, auth_mode: hmac-sha256, auth_pwd: 1111, auth_type: text}
+      authentication: enable
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -200,50 +222,9 @@ changed:
     sample: true
 '''
 
-import re
 import copy
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, load_config, get_nc_config, set_nc_config
-
-CE_NC_GET_NTP_AUTH_CONFIG = """
-<filter type="subtree">
-  <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <ntpAuthKeyCfgs>
-      <ntpAuthKeyCfg>
-        <keyId>%s</keyId>
-        <mode></mode>
-        <keyVal></keyVal>
-        <isReliable></isReliable>
-      </ntpAuthKeyCfg>
-    </ntpAuthKeyCfgs>
-  </ntp>
-</filter>
-"""
-
-CE_NC_GET_ALL_NTP_AUTH_CONFIG = """
-<filter type="subtree">
-  <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <ntpAuthKeyCfgs>
-      <ntpAuthKeyCfg>
-        <keyId></keyId>
-        <mode></mode>
-        <keyVal></keyVal>
-        <isReliable></isReliable>
-      </ntpAuthKeyCfg>
-    </ntpAuthKeyCfgs>
-  </ntp>
-</filter>
-"""
-
-CE_NC_GET_NTP_AUTH_ENABLE = """
-<filter type="subtree">
-  <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <ntpSystemCfg>
-      <isAuthEnable></isAuthEnable>
-    </ntpSystemCfg>
-  </ntp>
-</filter>
-"""
+from ansible.module_utils.ce import ce_argument_spec, load_config, set_nc_config, get_ntp_snapshot
 
 CE_NC_MERGE_NTP_AUTH_CONFIG = """
 <config>
@@ -282,6 +263,40 @@ CE_NC_DELETE_NTP_AUTH_CONFIG = """
 </config>
 """
 
+CE_NC_MERGE_NTP_AUTH_HEAD = """
+<config>
+  <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+"""
+
+CE_NC_MERGE_NTP_AUTH_KEYS = """
+    <ntpAuthKeyCfgs>%s
+    </ntpAuthKeyCfgs>
+"""
+
+CE_NC_MERGE_NTP_AUTH_KEY = """
+      <ntpAuthKeyCfg operation="merge">
+        <keyId>%s</keyId>
+        <mode>%s</mode>
+        <keyVal>%s</keyVal>
+        <isReliable>%s</isReliable>
+      </ntpAuthKeyCfg>"""
+
+CE_NC_DELETE_NTP_AUTH_KEY = """
+      <ntpAuthKeyCfg operation="delete">
+        <keyId>%s</keyId>
+      </ntpAuthKeyCfg>"""
+
+CE_NC_MERGE_NTP_AUTH_SYSTEM = """
+    <ntpSystemCfg operation="merge">
+      <isAuthEnable>%s</isAuthEnable>
+    </ntpSystemCfg>
+"""
+
+CE_NC_MERGE_NTP_AUTH_TAIL = """
+  </ntp>
+</config>
+"""
+
 
 class NtpAuth(object):
     """Manage ntp authentication"""
@@ -298,6 +313,7 @@ class NtpAuth(object):
         self.auth_type = self.module.params['auth_type']
         self.trusted_key = self.module.params['trusted_key']
         self.authentication = self.module.params['authentication'] or None
+        self.keys = self.module.params['keys']
         self.state = self.module.params['state']
         self.check_params()
 
@@ -318,31 +334,72 @@ class NtpAuth(object):
     def check_params(self):
         """Check all input params"""
 
-        if not self.key_id.isdigit():
+        if self.keys is not None:
+            self.check_keys()
+            return
+
+        self.check_key(self.key_id, self.password, self.auth_mode, self.auth_type)
+
+    def check_key(self, key_id, password, auth_mode, auth_type):
+        """Check the params of an authentication key"""
+
+        if not key_id.isdigit():
             self.module.fail_json(
                 msg='Error: key_id is not digit.')
 
-        if (long(self.key_id) < 1) or (long(self.key_id) > 4294967295):
+        if (long(key_id) < 1) or (long(key_id) > 4294967295):
             self.module.fail_json(
                 msg='Error: The length of key_id is between 1 and 4294967295.')
 
         if self.state == "present":
-            if (self.auth_type == 'encrypt') and\
-                    ((len(self.password) < 20) or (len(self.password) > 392)):
+            if not password or not auth_mode:
+                self.module.fail_json(
+                    msg='Error: Please input auth_pwd and auth_mode for key_id %s.' % key_id)
+            if (auth_type == 'encrypt') and\
+                    ((len(password) < 20) or (len(password) > 392)):
                 self.module.fail_json(
                     msg='Error: The length of encrypted password is between 20 and 392.')
-            elif (self.auth_type == 'text') and\
-                    ((len(self.password) < 1) or (len(self.password) > 255)):
+            elif (auth_type == 'text') and\
+                    ((len(password) < 1) or (len(password) > 255)):
                 self.module.fail_json(
                     msg='Error: The length of text password is between 1 and 255.')
 
+    def check_keys(self):
+        """Check keys and normalize each one to strings"""
+
+        keys = list()
+        for key in self.keys:
+            if not isinstance(key, dict) or not key.get("key_id"):
+                self.module.fail_json(
+                    msg='Error: Each key must be a dict with key_id.')
+
+            tmp_key = dict(key_id=str(key["key_id"]),
+                           auth_pwd=str(key.get("auth_pwd") or "") or None,
+                           auth_mode=key.get("auth_mode") or None,
+                           auth_type=key.get("auth_type") or "encrypt",
+                           trusted_key=key.get("trusted_key") or "disable")
+            if tmp_key["auth_mode"] not in [None, "md5", "hmac-sha256"]:
+                self.module.fail_json(
+                    msg='Error: The auth_mode of key_id %s must be md5 or hmac-sha256.' % tmp_key["key_id"])
+            if tmp_key["auth_type"] not in ["text", "encrypt"]:
+                self.module.fail_json(
+                    msg='Error: The auth_type of key_id %s must be text or encrypt.' % tmp_key["key_id"])
+            if tmp_key["trusted_key"] not in ["enable", "disable"]:
+                self.module.fail_json(
+                    msg='Error: The trusted_key of key_id %s must be enable or disable.' % tmp_key["key_id"])
+            self.check_key(tmp_key["key_id"], tmp_key["auth_pwd"], tmp_key["auth_mode"], tmp_key["auth_type"])
+            keys.append(tmp_key)
+        self.keys = keys
+
     def init_module(self):
         """Init module object"""
 
-        required_if = [("state", "present", ("password", "auth_mode"))]
+        required_one_of = [("key_id", "keys")]
+        mutually_exclusive = [("keys", "key_id"), ("keys", "auth_pwd"), ("keys", "auth_mode")]
         self.module = AnsibleModule(
             argument_spec=self.spec,
-            required_if=required_if,
+            required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive,
             supports_check_mode=True
         )
 
@@ -352,38 +409,24 @@ class NtpAuth(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_ntp_auth_enable(self):
+    def get_ntp_auth_enable(self, snapshot):
         """Get ntp authentication enable state"""
 
-        xml_str = CE_NC_GET_NTP_AUTH_ENABLE
-        con_obj = get_nc_config(self.module, xml_str)
-        if "<data/>" in con_obj:
-            return
-
-        # get ntp authentication enable
-        auth_en = re.findall(
-            r'.*<isAuthEnable>(.*)</isAuthEnable>.*', con_obj)
-        if auth_en:
-            if auth_en[0] == 'true':
-                self.ntp_auth_conf['authentication'] = 'enable'
-            else:
-                self.ntp_auth_conf['authentication'] = 'disable'
+        if snapshot["authentication"]:
+            self.ntp_auth_conf['authentication'] = snapshot["authentication"]
 
-    def get_ntp_all_auth_keyid(self):
+    def get_ntp_all_auth_keyid(self, snapshot):
         """Get all authentication keyid info"""
 
         ntp_auth_conf = list()
 
-        xml_str = CE_NC_GET_ALL_NTP_AUTH_CONFIG
-        con_obj = get_nc_config(self.module, xml_str)
-        if "<data/>" in con_obj:
+        if not snapshot["keys"]:
             self.ntp_auth_conf["authentication-keyid"] = "None"
             return ntp_auth_conf
 
         # get ntp authentication config
-        ntp_auth = re.findall(
-            r'.*<keyId>(.*)</keyId>.*\s*<mode>(.*)</mode>.*\s*'
-            r'<keyVal>(.*)</keyVal>.*\s*<isReliable>(.*)</isReliable>.*', con_obj)
+        ntp_auth = [(key.get("keyId"), key.get("mode") or "", key.get("keyVal"), key.get("isReliable"))
+                    for key in snapshot["keys"]]
 
         for ntp_auth_num in ntp_auth:
             if ntp_auth_num[0] == self.key_id:
@@ -404,11 +447,12 @@ class NtpAuth(object):
 
         return ntp_auth_conf
 
-    def get_ntp_auth_exist_config(self):
+    def get_ntp_auth_exist_config(self, refresh=False):
         """Get ntp authentication existed configure"""
 
-        self.get_ntp_auth_enable()
-        self.get_ntp_all_auth_keyid()
+        snapshot = get_ntp_snapshot(self.module, refresh)
+        self.get_ntp_auth_enable(snapshot)
+        self.get_ntp_all_auth_keyid(snapshot)
 
     def config_ntp_auth_keyid(self):
         """Config ntp authentication keyid"""
@@ -483,6 +527,17 @@ class NtpAuth(object):
     def get_proposed(self):
         """Get proposed result"""
 
+        if self.keys is not None:
+            keys = list()
+            for key in self.keys:
+                tmp_key = dict(key)
+                if tmp_key["auth_pwd"]:
+                    tmp_key["auth_pwd"] = "******"
+                keys.append(tmp_key)
+            self.proposed = dict(keys=keys, authentication=self.authentication,
+                                 state=self.state)
+            return
+
         auth_type = self.auth_type
         trusted_key = self.trusted_key
         if self.state == 'absent':
@@ -537,8 +592,12 @@ class NtpAuth(object):
     def get_end_state(self):
         """Get end state info"""
 
+        if self.keys is not None and not self.changed:
+            self.end_state = copy.deepcopy(self.existing)
+            return
+
         self.ntp_auth_conf = dict()
-        self.get_ntp_auth_exist_config()
+        self.get_ntp_auth_exist_config(refresh=True)
         self.end_state = copy.deepcopy(self.ntp_auth_conf)
 
     def show_result(self):
@@ -555,11 +614,96 @@ class NtpAuth(object):
 
         self.module.exit_json(**self.results)
 
+    def get_key_cmds(self, key, exist_key=None):
+        """Get the commands of an authentication key"""
+
+        cmds = list()
+        cli_str = "ntp authentication-keyid %s authentication-mode %s " % (
+            key["key_id"], key["auth_mode"])
+        if key["auth_type"] == 'encrypt':
+            cli_str = "%s cipher %s" % (cli_str, "******")
+        else:
+            cli_str = "%s %s" % (cli_str, "******")
+        cmds.append(cli_str)
+        if key["trusted_key"] == 'enable':
+            cmds.append("ntp trusted authentication-keyid %s" % key["key_id"])
+        elif exist_key and exist_key["trusted_key"] == 'enable':
+            cmds.append("undo ntp trusted authentication-keyid %s" % key["key_id"])
+        return cmds
+
+    def config_ntp_auth_keys(self):
+        """Config all authentication keys with set semantics by one edit"""
+
+        exist_keys = dict()
+        if self.ntp_auth_conf["authentication-keyid"] != "None":
+            for key in self.ntp_auth_conf["authentication-keyid"]:
+                exist_keys[key["key_id"]] = key
+        want_ids = [key["key_id"] for key in self.keys]
+
+        keys_xml = ""
+        cli_cmds = list()
+        if self.state == "present":
+            for key_id in sorted(exist_keys):
+                if key_id not in want_ids:
+                    keys_xml += CE_NC_DELETE_NTP_AUTH_KEY % key_id
+                    self.updates_cmd.append("undo ntp authentication-keyid %s" % key_id)
+            for key in self.keys:
+                exist_key = exist_keys.get(key["key_id"])
+                if exist_key and exist_key["auth_mode"] == key["auth_mode"] and \
+                        exist_key["trusted_key"] == key["trusted_key"]:
+                    continue
+                if key["auth_type"] == 'encrypt':
+                    if key["trusted_key"] == 'enable':
+                        trusted_key = 'true'
+                    else:
+                        trusted_key = 'false'
+                    keys_xml += CE_NC_MERGE_NTP_AUTH_KEY % (
+                        key["key_id"], key["auth_mode"].upper(), key["auth_pwd"], trusted_key)
+                else:
+                    cli_cmds.append("ntp authentication-keyid %s authentication-mode %s %s" % (
+                        key["key_id"], key["auth_mode"], key["auth_pwd"]))
+                    if key["trusted_key"] == 'enable':
+                        cli_cmds.append("ntp trusted authentication-keyid %s" % key["key_id"])
+                    elif exist_key and exist_key["trusted_key"] == 'enable':
+                        cli_cmds.append("undo ntp trusted authentication-keyid %s" % key["key_id"])
+                self.updates_cmd.extend(self.get_key_cmds(key, exist_key))
+        else:
+            for key in self.keys:
+                if key["key_id"] in exist_keys:
+                    keys_xml += CE_NC_DELETE_NTP_AUTH_KEY % key["key_id"]
+                    self.updates_cmd.append("undo ntp authentication-keyid %s" % key["key_id"])
+
+        xml_str = ""
+        if keys_xml:
+            xml_str += CE_NC_MERGE_NTP_AUTH_KEYS % keys_xml
+        if self.authentication and self.ntp_auth_conf.get('authentication') != self.authentication:
+            if self.authentication == 'enable':
+                xml_str += CE_NC_MERGE_NTP_AUTH_SYSTEM % 'true'
+                self.updates_cmd.append("ntp authentication enable")
+            else:
+                xml_str += CE_NC_MERGE_NTP_AUTH_SYSTEM % 'false'
+                self.updates_cmd.append("undo ntp authentication enable")
+
+        if xml_str and not self.module.check_mode:
+            ret_xml = set_nc_config(self.module, CE_NC_MERGE_NTP_AUTH_HEAD + xml_str + CE_NC_MERGE_NTP_AUTH_TAIL)
+            self.check_response(ret_xml, "NTP_AUTH_KEYS_CONFIG")
+        if cli_cmds:
+            self.cli_load_config(cli_cmds)
+
+        if self.updates_cmd:
+            self.changed = True
+
     def work(self):
         """Excute task"""
 
         self.get_existing()
         self.get_proposed()
+        if self.keys is not None:
+            self.config_ntp_auth_keys()
+            self.get_end_state()
+            self.show_result()
+            return
+
         self.get_update_cmd()
 
         self.config_ntp_auth()
@@ -572,12 +716,13 @@ def main():
     """Main function entry"""
 
     argument_spec = dict(
-        key_id=dict(required=True, type='str'),
+        key_id=dict(type='str'),
         auth_pwd=dict(type='str', no_log=True),
         auth_mode=dict(choices=['md5', 'hmac-sha256'], type='str'),
         auth_type=dict(choices=['text', 'encrypt'], default='encrypt'),
         trusted_key=dict(choices=['enable', 'disable'], default='disable'),
         authentication=dict(choices=['enable', 'disable']),
+        keys=dict(type='list'),
         state=dict(choices=['absent', 'present'], default='present'),
     )
     argument_spec.update(ce_argument_spec)
@@ -95,6 +95,26 @@ options:
               Valid value is an integer in the range from 1 to 64.
         required: false
         default: null
+    areas:
+        description:
+            - A list of areas, each one is a dict with area and optionally networks,
+              a list of dicts with addr and mask.
+              If C(state=present), the list is the whole set of areas and networks of the process,
+              the areas and networks that are not in the list are removed.
+              If C(state=absent), the networks in the list are removed,
+              an area given without networks is removed with all its config.
+              Can not be used with area, addr, mask and the area authentication options.
+        required: false
+        default: null
+    nexthops:
+        description:
+            - A list of next-hop weights, each one is a dict with addr and weight.
+              If C(state=present), the list is the whole set of next-hop weights of the process,
+              the ones that are not in the list are removed.
+              If C(state=absent), the next-hop weights in the list are removed, only addr is needed.
+              Can not be used with nexthop_addr and nexthop_weight.
+        required: false
+        default: null
     state:
         description:
             - Determines whether the config should be present or not
@@ -125,6 +145,16 @@ EXAMPLES = '''
       area: 100
       state: present
       provider: "{{ cli }}"
+
+  - name: Replace all areas, networks and nexthop weights of ospf 1
+    ce_ospf:
+      process_id: 1
+      areas:
+        - {area: 0, networks: [{addr: 10.1.1.0, mask: 24}, {addr: 10.1.2.0, mask: 24}]}
+        - {area: 100, networks: [{addr: 10.2.1.0, mask: 24}]}
+      nexthops:
+        - {addr: 10.1.1.2, weight: 10}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -157,47 +187,9 @@ changed:
     sample: true
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-CE_NC_GET_OSPF = """
-    <filter type="subtree">
-      <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <ospfv2comm>
-          <ospfSites>
-            <ospfSite>
-              <processId>%s</processId>
-              <routerId></routerId>
-              <vrfName></vrfName>
-              <ProcessTopologys>
-                <ProcessTopology>
-                  <nexthopMTs></nexthopMTs>
-                  <maxLoadBalancing></maxLoadBalancing>
-                </ProcessTopology>
-              </ProcessTopologys>
-              <areas>
-                <area>
-                  <areaId></areaId>
-                  <areaType></areaType>
-                  <authenticationMode></authenticationMode>
-                  <authTextSimple></authTextSimple>
-                  <keyId></keyId>
-                  <authTextMd5></authTextMd5>
-                  <networks>
-                    <network>
-                      <ipAddress></ipAddress>
-                      <wildcardMask></wildcardMask>
-                    </network>
-                  </networks>
-                </area>
-              </areas>
-            </ospfSite>
-          </ospfSites>
-        </ospfv2comm>
-      </ospfv2>
-    </filter>
-"""
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, get_nc_snapshot, \
+    get_nc_xml_root
 
 CE_NC_CREATE_PROCESS = """
     <config>
@@ -357,6 +349,135 @@ CE_NC_XML_DELETE_NEXTHOP = """
                 </nexthopMTs>
 """
 
+CE_NC_XML_BUILD_AREAS = """
+              <areas>%s
+              </areas>
+"""
+
+CE_NC_XML_BUILD_OPERATION_AREA = """
+                <area operation="%s">
+                  <areaId>%s</areaId>%s
+                </area>"""
+
+CE_NC_XML_BUILD_NETWORKS = """
+                  <networks>%s
+                  </networks>"""
+
+CE_NC_XML_OPERATION_NETWORK = """
+                    <network operation="%s">
+                      <ipAddress>%s</ipAddress>
+                      <wildcardMask>%s</wildcardMask>
+                    </network>"""
+
+CE_NC_XML_BUILD_NEXTHOPS = """
+                <nexthopMTs>%s
+                </nexthopMTs>
+"""
+
+CE_NC_XML_MERGE_NEXTHOP_ITEM = """
+                  <nexthopMT operation="merge">
+                    <ipAddress>%s</ipAddress>
+                    <weight>%s</weight>
+                  </nexthopMT>"""
+
+CE_NC_XML_DELETE_NEXTHOP_ITEM = """
+                  <nexthopMT operation="delete">
+                    <ipAddress>%s</ipAddress>
+                  </nexthopMT>"""
+
+
+CE_NC_GET_OSPF_SNAPSHOT = """
+<filter type="subtree">
+  <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ospfv2comm>
+      <ospfSites>
+        <ospfSite>
+          <processId>%s</processId>
+          <routerId></routerId>
+          <vrfName></vrfName>
+          <ProcessTopologys>
+            <ProcessTopology>
+              <nexthopMTs></nexthopMTs>
+              <maxLoadBalancing></maxLoadBalancing>
+            </ProcessTopology>
+          </ProcessTopologys>
+          <areas>
+            <area>
+              <areaId></areaId>
+              <areaType></areaType>
+              <authenticationMode></authenticationMode>
+              <authTextSimple></authTextSimple>
+              <keyId></keyId>
+              <authTextMd5></authTextMd5>
+              <networks>
+                <network>
+                  <ipAddress></ipAddress>
+                  <wildcardMask></wildcardMask>
+                </network>
+              </networks>
+            </area>
+          </areas>
+        </ospfSite>
+      </ospfSites>
+    </ospfv2comm>
+  </ospfv2>
+</filter>
+"""
+
+
+def parse_ospf_snapshot(xml_str):
+    """parse one ospf process reply, empty dict if the process does not exist"""
+
+    ospf_info = dict()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return ospf_info
+
+    site_path = "data/ospfv2/ospfv2comm/ospfSites/ospfSite"
+    site = root.find(site_path)
+    if site is None:
+        return ospf_info
+
+    # get process base info
+    for ele in site:
+        if ele.tag in ["processId", "routerId", "vrfName"]:
+            ospf_info[ele.tag] = ele.text
+
+    # get Topology info
+    topo = root.find(site_path + "/ProcessTopologys/ProcessTopology")
+    if topo is not None:
+        ospf_info["maxLoadBalancing"] = topo.findtext("maxLoadBalancing")
+
+    # get nexthop info
+    ospf_info["nexthops"] = list()
+    for nexthop in root.findall(site_path + "/ProcessTopologys/ProcessTopology/nexthopMTs/nexthopMT"):
+        ospf_info["nexthops"].append(dict((ele.tag, ele.text) for ele in nexthop
+                                          if ele.tag in ["ipAddress", "weight"]))
+
+    # get areas info
+    ospf_info["areas"] = list()
+    for area in root.findall(site_path + "/areas/area"):
+        area_dict = dict()
+        for ele in area:
+            if ele.tag in ["areaId", "authTextSimple", "areaType",
+                           "authenticationMode", "keyId", "authTextMd5"]:
+                area_dict[ele.tag] = ele.text
+            if ele.tag == "networks":
+                area_dict["networks"] = list()
+                for net in ele:
+                    area_dict["networks"].append(dict((net_ele.tag, net_ele.text) for net_ele in net
+                                                      if net_ele.tag in ["ipAddress", "wildcardMask"]))
+        ospf_info["areas"].append(area_dict)
+
+    return ospf_info
+
+
+def get_ospf_snapshot(module, process_id, refresh=False):
+    """get one ospf process, its areas, networks and nexthops in one netconf read"""
+
+    return get_nc_snapshot(module, ("ospf", process_id), CE_NC_GET_OSPF_SNAPSHOT % process_id,
+                           parse_ospf_snapshot, refresh)
+
 
 class OSPF(object):
     """
@@ -380,10 +501,15 @@ class OSPF(object):
         self.nexthop_addr = self.module.params['nexthop_addr']
         self.nexthop_weight = self.module.params['nexthop_weight']
         self.max_load_balance = self.module.params['max_load_balance']
+        self.areas = self.module.params['areas']
+        self.nexthops = self.module.params['nexthops']
         self.state = self.module.params['state']
 
         # ospf info
         self.ospf_info = dict()
+        self.area_index = set()
+        self.network_index = set()
+        self.nexthop_index = dict()
 
         # state
         self.changed = False
@@ -401,8 +527,15 @@ class OSPF(object):
             ("auth_key_id", "auth_text_md5"),
             ("nexthop_addr", "nexthop_weight")
         ]
+        mutually_exclusive = [
+            ("areas", "area"), ("areas", "addr"), ("areas", "mask"),
+            ("areas", "auth_mode"), ("areas", "auth_text_simple"),
+            ("areas", "auth_key_id"), ("areas", "auth_text_md5"),
+            ("nexthops", "nexthop_addr"), ("nexthops", "nexthop_weight")
+        ]
         self.module = AnsibleModule(
-            argument_spec=self.spec, required_together=required_together, supports_check_mode=True)
+            argument_spec=self.spec, required_together=required_together,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -410,11 +543,11 @@ class OSPF(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_wildcard_mask(self):
+    def get_wildcard_mask(self, mask=None):
         """convert mask length to ip address wildcard mask, i.e. 24 to 0.0.0.255"""
 
         mask_int = ["255"] * 4
-        length = int(self.mask)
+        length = int(mask or self.mask)
 
         if length > 32:
             self.module.fail_json(msg='IPv4 ipaddress mask length is invalid')
@@ -434,142 +567,63 @@ class OSPF(object):
 
         return '.'.join(mask_int)
 
-    def get_area_ip(self):
+    def get_area_ip(self, area=None):
         """convert integer to ip address"""
 
-        if not self.area.isdigit():
-            return self.area
+        area = area or self.area
+        if not area.isdigit():
+            return area
 
         addr_int = ['0'] * 4
-        addr_int[0] = str(((int(self.area) & 0xFF000000) >> 24) & 0xFF)
-        addr_int[1] = str(((int(self.area) & 0x00FF0000) >> 16) & 0xFF)
-        addr_int[2] = str(((int(self.area) & 0x0000FF00) >> 8) & 0XFF)
-        addr_int[3] = str(int(self.area) & 0xFF)
+        addr_int[0] = str(((int(area) & 0xFF000000) >> 24) & 0xFF)
+        addr_int[1] = str(((int(area) & 0x00FF0000) >> 16) & 0xFF)
+        addr_int[2] = str(((int(area) & 0x0000FF00) >> 8) & 0XFF)
+        addr_int[3] = str(int(area) & 0xFF)
 
         return '.'.join(addr_int)
 
-    def get_ospf_dict(self, process_id):
+    def get_ospf_dict(self, process_id, refresh=False):
         """ get one ospf attributes dict."""
 
-        ospf_info = dict()
-        conf_str = CE_NC_GET_OSPF % process_id
-        xml_str = get_nc_config(self.module, conf_str)
-        if "<data/>" in xml_str:
-            return ospf_info
-
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        # get process base info
-        root = ElementTree.fromstring(xml_str)
-        ospfsite = root.find("data/ospfv2/ospfv2comm/ospfSites/ospfSite")
-        if ospfsite:
-            for site in ospfsite:
-                if site.tag in ["processId", "routerId", "vrfName"]:
-                    ospf_info[site.tag] = site.text
-
-        # get Topology info
-        topo = root.find(
-            "data/ospfv2/ospfv2comm/ospfSites/ospfSite/ProcessTopologys/ProcessTopology")
-        if topo:
-            for eles in topo:
-                if eles.tag in ["maxLoadBalancing"]:
-                    ospf_info[eles.tag] = eles.text
-
-        # get nexthop info
-        ospf_info["nexthops"] = list()
-        nexthops = root.findall(
-            "data/ospfv2/ospfv2comm/ospfSites/ospfSite/ProcessTopologys/ProcessTopology/nexthopMTs/nexthopMT")
-        if nexthops:
-            for nexthop in nexthops:
-                nh_dict = dict()
-                for ele in nexthop:
-                    if ele.tag in ["ipAddress", "weight"]:
-                        nh_dict[ele.tag] = ele.text
-                ospf_info["nexthops"].append(nh_dict)
-
-        # get areas info
-        ospf_info["areas"] = list()
-        areas = root.findall(
-            "data/ospfv2/ospfv2comm/ospfSites/ospfSite/areas/area")
-        if areas:
-            for area in areas:
-                area_dict = dict()
-                for ele in area:
-                    if ele.tag in ["areaId", "authTextSimple", "areaType",
-                                   "authenticationMode", "keyId", "authTextMd5"]:
-                        area_dict[ele.tag] = ele.text
-                    if ele.tag == "networks":
-                        # get networks info
-                        area_dict["networks"] = list()
-                        for net in ele:
-                            net_dict = dict()
-                            for net_ele in net:
-                                if net_ele.tag in ["ipAddress", "wildcardMask"]:
-                                    net_dict[net_ele.tag] = net_ele.text
-                            area_dict["networks"].append(net_dict)
-
-                ospf_info["areas"].append(area_dict)
+        return get_ospf_snapshot(self.module, process_id, refresh)
 
-        return ospf_info
-
-    def is_area_exist(self):
-        """is ospf area exist"""
+    def get_ospf_index(self):
+        """index areas by area id, networks by (area, address, wildcard)
+        and nexthop weights by address"""
 
+        self.area_index = set()
+        self.network_index = set()
+        self.nexthop_index = dict()
         if not self.ospf_info:
-            return False
+            return
 
         for area in self.ospf_info["areas"]:
-            if area["areaId"] == self.get_area_ip():
-                return True
+            self.area_index.add(area["areaId"])
+            for network in area.get("networks") or list():
+                self.network_index.add(
+                    (area["areaId"], network["ipAddress"], network["wildcardMask"]))
+        for nexthop in self.ospf_info["nexthops"]:
+            self.nexthop_index[nexthop["ipAddress"]] = nexthop.get("weight")
 
-        return False
+    def is_area_exist(self):
+        """is ospf area exist"""
+
+        return self.get_area_ip() in self.area_index
 
     def is_network_exist(self):
         """is ospf area network exist"""
 
-        if not self.ospf_info:
-            return False
-
-        for area in self.ospf_info["areas"]:
-            if area["areaId"] == self.get_area_ip():
-                if not area.get("networks"):
-                    return False
-                for network in area.get("networks"):
-                    if network["ipAddress"] == self.addr and network["wildcardMask"] == self.get_wildcard_mask():
-                        return True
-            else:
-                break
-
-        return False
+        return (self.get_area_ip(), self.addr, self.get_wildcard_mask()) in self.network_index
 
     def is_nexthop_exist(self):
         """is ospf nexthop exist"""
 
-        if not self.ospf_info:
-            return False
-
-        for nexthop in self.ospf_info["nexthops"]:
-            if nexthop["ipAddress"] == self.nexthop_addr:
-                return True
-
-        return False
+        return self.nexthop_addr in self.nexthop_index
 
     def is_nexthop_change(self):
         """is ospf nexthop change"""
 
-        if not self.ospf_info:
-            return True
-
-        for nexthop in self.ospf_info["nexthops"]:
-            if nexthop["ipAddress"] == self.nexthop_addr:
-                if nexthop["weight"] == self.nexthop_weight:
-                    return False
-                else:
-                    return True
-
-        return True
+        return self.nexthop_index.get(self.nexthop_addr) != self.nexthop_weight
 
     def create_process(self):
         """Create ospf process"""
@@ -766,6 +820,105 @@ class OSPF(object):
         self.updates_cmd.append("undo nexthop %s" % self.nexthop_addr)
         self.changed = True
 
+    def reconcile_process(self):
+        """apply the whole areas, networks and nexthops lists by one edit"""
+
+        xml_areas = ""
+        xml_nhs = ""
+        xml_lb = ""
+        cmds = list()
+
+        if self.areas is not None:
+            want_areas = [area["area"] for area in self.areas]
+            if self.state == "present":
+                for area_id in sorted(self.area_index):
+                    if area_id not in want_areas:
+                        xml_areas += CE_NC_XML_BUILD_OPERATION_AREA % ("delete", area_id, "")
+                        cmds.append("undo area %s" % area_id)
+
+            for area in self.areas:
+                area_id = area["area"]
+                if self.state == "absent" and area["networks"] is None:
+                    if area_id in self.area_index:
+                        xml_areas += CE_NC_XML_BUILD_OPERATION_AREA % ("delete", area_id, "")
+                        cmds.append("undo area %s" % area_id)
+                    continue
+
+                xml_network = ""
+                area_cmds = list()
+                if self.state == "present":
+                    for net in sorted(self.network_index):
+                        if net[0] == area_id and net[1:] not in area["networks"]:
+                            xml_network += CE_NC_XML_OPERATION_NETWORK % ("delete", net[1], net[2])
+                            area_cmds.append("undo network %s %s" % (net[1], net[2]))
+                    for addr, wildcard in area["networks"]:
+                        if (area_id, addr, wildcard) not in self.network_index:
+                            xml_network += CE_NC_XML_OPERATION_NETWORK % ("merge", addr, wildcard)
+                            area_cmds.append("network %s %s" % (addr, wildcard))
+                else:
+                    for addr, wildcard in area["networks"]:
+                        if (area_id, addr, wildcard) in self.network_index:
+                            xml_network += CE_NC_XML_OPERATION_NETWORK % ("delete", addr, wildcard)
+                            area_cmds.append("undo network %s %s" % (addr, wildcard))
+
+                if xml_network or (self.state == "present" and area_id not in self.area_index):
+                    if xml_network:
+                        xml_network = CE_NC_XML_BUILD_NETWORKS % xml_network
+                    xml_areas += CE_NC_XML_BUILD_OPERATION_AREA % ("merge", area_id, xml_network)
+                    cmds.append("area %s" % area_id)
+                    cmds.extend(area_cmds)
+
+        if self.nexthops is not None:
+            want_nhs = [nexthop["addr"] for nexthop in self.nexthops]
+            if self.state == "present":
+                for addr in sorted(self.nexthop_index):
+                    if addr not in want_nhs:
+                        xml_nhs += CE_NC_XML_DELETE_NEXTHOP_ITEM % addr
+                        cmds.append("undo nexthop %s" % addr)
+                for nexthop in self.nexthops:
+                    if self.nexthop_index.get(nexthop["addr"]) != nexthop["weight"]:
+                        xml_nhs += CE_NC_XML_MERGE_NEXTHOP_ITEM % (nexthop["addr"], nexthop["weight"])
+                        cmds.append("nexthop %s weight %s" % (nexthop["addr"], nexthop["weight"]))
+            else:
+                for nexthop in self.nexthops:
+                    if nexthop["addr"] in self.nexthop_index:
+                        xml_nhs += CE_NC_XML_DELETE_NEXTHOP_ITEM % nexthop["addr"]
+                        cmds.append("undo nexthop %s" % nexthop["addr"])
+
+        if self.state == "present" and self.max_load_balance and \
+                self.ospf_info.get("maxLoadBalancing") != self.max_load_balance:
+            xml_lb = CE_NC_XML_SET_LB % self.max_load_balance
+            cmds.append("maximum load-balancing %s" % self.max_load_balance)
+
+        xml_topo = ""
+        if xml_nhs:
+            xml_nhs = CE_NC_XML_BUILD_NEXTHOPS % xml_nhs
+        if xml_nhs or xml_lb:
+            if self.state == "present":
+                xml_topo = CE_NC_XML_BUILD_MERGE_TOPO % (xml_nhs + xml_lb)
+            else:
+                xml_topo = CE_NC_XML_BUILD_TOPO % xml_nhs
+        if xml_areas:
+            xml_areas = CE_NC_XML_BUILD_AREAS % xml_areas
+
+        if not self.ospf_info and self.state == "present":
+            cmds.insert(0, "ospf %s" % self.process_id)
+            xml_str = CE_NC_XML_BUILD_MERGE_PROCESS % (self.process_id, xml_topo + xml_areas)
+        elif xml_topo or xml_areas:
+            cmds.insert(0, "ospf %s" % self.process_id)
+            if self.state == "present":
+                xml_str = CE_NC_XML_BUILD_MERGE_PROCESS % (self.process_id, xml_topo + xml_areas)
+            else:
+                xml_str = CE_NC_XML_BUILD_PROCESS % (self.process_id, xml_topo + xml_areas)
+        else:
+            return
+
+        if not self.module.check_mode:
+            recv_xml = set_nc_config(self.module, xml_str)
+            self.check_response(recv_xml, "RECONCILE_PROCESS")
+        self.updates_cmd.extend(cmds)
+        self.changed = True
+
     def is_valid_v4addr(self, addr):
         """check is ipv4 addr is valid"""
 
@@ -782,16 +935,107 @@ class OSPF(object):
 
         return False
 
-    def convert_ip_to_network(self):
-        """convert ip to subnet address"""
+    def get_network_addr(self, addr, wildcard):
+        """convert ip to subnet address of the wildcard mask"""
 
-        ip_list = self.addr.split('.')
-        mask_list = self.get_wildcard_mask().split('.')
+        ip_list = addr.split('.')
+        mask_list = wildcard.split('.')
 
         for i in range(len(ip_list)):
             ip_list[i] = str((int(ip_list[i]) & (~int(mask_list[i]))) & 0xff)
 
-        self.addr = '.'.join(ip_list)
+        return '.'.join(ip_list)
+
+    def convert_ip_to_network(self):
+        """convert ip to subnet address"""
+
+        self.addr = self.get_network_addr(self.addr, self.get_wildcard_mask())
+
+    def check_area_id(self, area):
+        """check area id is an integer or an ip address"""
+
+        if area.isdigit():
+            if int(area) < 0 or int(area) > 4294967295:
+                self.module.fail_json(
+                    msg="Error: area id (Integer) must be between 0 and 4294967295.")
+
+        else:
+            if not self.is_valid_v4addr(area):
+                self.module.fail_json(msg="Error: area id is invalid.")
+
+    def check_network(self, addr, mask):
+        """check network address and mask length"""
+
+        if not self.is_valid_v4addr(addr):
+            self.module.fail_json(
+                msg="Error: network addr is invalid.")
+        if not mask.isdigit():
+            self.module.fail_json(
+                msg="Error: network mask is not digit.")
+        if int(mask) < 0 or int(mask) > 32:
+            self.module.fail_json(
+                msg="Error: network mask is invalid.")
+
+    def check_nexthop(self, addr, weight):
+        """check nexthop address and weight"""
+
+        if not self.is_valid_v4addr(addr):
+            self.module.fail_json(msg="Error: nexthop_addr is invalid.")
+        if not weight.isdigit():
+            self.module.fail_json(
+                msg="Error: nexthop_weight is not digit.")
+        if int(weight) < 1 or int(weight) > 254:
+            self.module.fail_json(
+                msg="Error: nexthop_weight is not in the range from 1 to 254.")
+
+    def check_areas(self):
+        """check areas and normalize each one to an area ip
+        and a list of (address, wildcard) networks"""
+
+        areas = list()
+        for area in self.areas:
+            if not isinstance(area, dict) or area.get("area") is None:
+                self.module.fail_json(
+                    msg="Error: Each area must be a dict with area.")
+            area_id = str(area["area"])
+            self.check_area_id(area_id)
+
+            networks = None
+            if area.get("networks") is not None:
+                networks = list()
+                for network in area["networks"]:
+                    if not isinstance(network, dict) or network.get("addr") is None \
+                            or network.get("mask") is None:
+                        self.module.fail_json(
+                            msg="Error: Each network of area %s must be a dict with addr and mask." % area_id)
+                    addr = str(network["addr"])
+                    mask = str(network["mask"])
+                    self.check_network(addr, mask)
+                    wildcard = self.get_wildcard_mask(mask)
+                    net = (self.get_network_addr(addr, wildcard), wildcard)
+                    if net not in networks:
+                        networks.append(net)
+            elif self.state == "present":
+                networks = list()
+            areas.append(dict(area=self.get_area_ip(area_id), networks=networks))
+        self.areas = areas
+
+    def check_nexthops(self):
+        """check nexthops and normalize each one to strings"""
+
+        nexthops = list()
+        for nexthop in self.nexthops:
+            if not isinstance(nexthop, dict) or nexthop.get("addr") is None:
+                self.module.fail_json(
+                    msg="Error: Each nexthop must be a dict with addr.")
+            addr = str(nexthop["addr"])
+            weight = str(nexthop.get("weight") or "")
+            if self.state == "present":
+                self.check_nexthop(addr, weight)
+            elif not self.is_valid_v4addr(addr):
+                self.module.fail_json(msg="Error: nexthop_addr is invalid.")
+            nexthops.append(dict(addr=addr, weight=weight))
+        self.nexthops = nexthops
 
     def check_params(self):
         """Check all input params"""
@@ -805,26 +1049,11 @@ class OSPF(object):
 
         if self.area:
             # area check
-            if self.area.isdigit():
-                if int(self.area) < 0 or int(self.area) > 4294967295:
-                    self.module.fail_json(
-                        msg="Error: area id (Integer) must be between 0 and 4294967295.")
-
-            else:
-                if not self.is_valid_v4addr(self.area):
-                    self.module.fail_json(msg="Error: area id is invalid.")
+            self.check_area_id(self.area)
 
             # area network check
             if self.addr:
-                if not self.is_valid_v4addr(self.addr):
-                    self.module.fail_json(
-                        msg="Error: network addr is invalid.")
-                if not self.mask.isdigit():
-                    self.module.fail_json(
-                        msg="Error: network mask is not digit.")
-                if int(self.mask) < 0 or int(self.mask) > 32:
-                    self.module.fail_json(
-                        msg="Error: network mask is invalid.")
+                self.check_network(self.addr, self.mask)
 
             # area authentication check
             if self.state == "present" and self.auth_mode:
@@ -855,22 +1084,31 @@ class OSPF(object):
 
         # process nexthop weight check
         if self.nexthop_addr:
-            if not self.is_valid_v4addr(self.nexthop_addr):
-                self.module.fail_json(msg="Error: nexthop_addr is invalid.")
-            if not self.nexthop_weight.isdigit():
-                self.module.fail_json(
-                    msg="Error: nexthop_weight is not digit.")
-            if int(self.nexthop_weight) < 1 or int(self.nexthop_weight) > 254:
-                self.module.fail_json(
-                    msg="Error: nexthop_weight is not in the range from 1 to 254.")
+            self.check_nexthop(self.nexthop_addr, self.nexthop_weight)
 
         if self.addr:
             self.convert_ip_to_network()
 
+        if self.areas is not None:
+            self.check_areas()
+        if self.nexthops is not None:
+            self.check_nexthops()
+
     def get_proposed(self):
         """get proposed info"""
 
         self.proposed["process_id"] = self.process_id
+        if self.areas is not None or self.nexthops is not None:
+            if self.areas is not None:
+                self.proposed["areas"] = [dict(area=area["area"], networks=[
+                    dict(addr=net[0], wildcard=net[1]) for net in area["networks"]])
+                    if area["networks"] is not None else dict(area=area["area"]) for area in self.areas]
+            if self.nexthops is not None:
+                self.proposed["nexthops"] = self.nexthops
+            self.proposed["max_load_balance"] = self.max_load_balance
+            self.proposed["state"] = self.state
+            return
+
         self.proposed["area"] = self.area
         if self.area:
             self.proposed["addr"] = self.addr
@@ -904,7 +1142,7 @@ class OSPF(object):
     def get_end_state(self):
         """get end state info"""
 
-        ospf_info = self.get_ospf_dict(self.process_id)
+        ospf_info = self.get_ospf_dict(self.process_id, self.changed)
         if not ospf_info:
             return
 
@@ -918,11 +1156,17 @@ class OSPF(object):
 
         self.check_params()
         self.ospf_info = self.get_ospf_dict(self.process_id)
+        self.get_ospf_index()
         self.get_existing()
         self.get_proposed()
 
         # deal present or absent
-        if self.state == "present":
+        if self.areas is not None or self.nexthops is not None:
+            if self.state == "absent" and not self.ospf_info:
+                self.module.fail_json(msg='Error: ospf process does not exist')
+            # reconcile areas, networks and nexthops
+            self.reconcile_process()
+        elif self.state == "present":
             if not self.ospf_info:
                 # create ospf process
                 self.create_process()
@@ -977,6 +1221,8 @@ def main():
         nexthop_addr=dict(required=False, type='str'),
         nexthop_weight=dict(required=False, type='str'),
         max_load_balance=dict(required=False, type='str'),
+        areas=dict(required=False, type='list'),
+        nexthops=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
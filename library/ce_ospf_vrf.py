@@ -33,7 +33,8 @@ options:
         description:
             - The ID of the ospf process.
               Valid values are an integer, 1 - 4294967295, the default value is 1.
-        required: true
+              Either ospf or processes is required.
+        required: false
         default: null
     route_id:
         description:
@@ -163,6 +164,15 @@ options:
               Valid value is an integer, in millisecond, from 1 to 5000, the default value is 200.
         required: false
         default: null
+    processes:
+        description:
+            - A list of existing ospf processes that the timer options are applied to,
+              each one is a process ID, a dict with ospf and/or vrf, or C(all) for every process.
+              If C(state=present), the given bandwidth, lsa and spf timers are set on every process.
+              If C(state=absent), the given bandwidth, lsa and spf timers are restored to their defaults.
+              Can not be used with ospf, route_id and description, vrf is ignored.
+        required: false
+        default: null
     state:
         description:
             - Specify desired state of the resource.
@@ -193,6 +203,17 @@ EXAMPLES = '''
       lsaointervalflag: False
       lsaointerval: 2
       provider: "{{ cli }}"
+
+  - name: Apply the same spf timers to every ospf process of two vpn instances
+    ce_ospf_vrf:
+      processes:
+        - {vrf: vpna}
+        - {vrf: vpnb}
+      spfintervaltype: intelligent-timer
+      spfmaxinterval: 1000
+      spfstartinterval: 10
+      spfholdinterval: 100
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -291,7 +312,7 @@ changed:
 
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec, set_nc_config_chunks
 
 CE_NC_GET_OSPF_VRF = """
     <filter type="subtree">
@@ -376,6 +397,46 @@ CE_NC_DELETE_OSPF = """
       </ospfv2>
 """
 
+CE_NC_MERGE_OSPF_SITES_HEAD = """
+<config>
+  <ospfv2 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ospfv2comm>
+      <ospfSites>
+"""
+
+CE_NC_MERGE_OSPF_SITE = """
+        <ospfSite operation="merge">
+          <processId>%s</processId>
+          <vrfName>%s</vrfName>%s
+        </ospfSite>
+"""
+
+CE_NC_MERGE_OSPF_SITES_TAIL = """
+      </ospfSites>
+    </ospfv2comm>
+  </ospfv2>
+</config>
+"""
+
+# timers of an ospf process and their default values
+OSPF_TIMER_DEFAULTS = [("bandwidthReference", "100"),
+                       ("lsaArrivalFlag", "false"),
+                       ("lsaArrivalInterval", ""),
+                       ("lsaArrivalMaxInterval", "1000"),
+                       ("lsaArrivalStartInterval", "500"),
+                       ("lsaArrivalHoldInterval", "500"),
+                       ("lsaOriginateIntervalFlag", "false"),
+                       ("lsaOriginateInterval", "5"),
+                       ("lsaOriginateMaxInterval", "5000"),
+                       ("lsaOriginateStartInterval", "500"),
+                       ("lsaOriginateHoldInterval", "1000"),
+                       ("spfScheduleIntervalType", "intelligent-timer"),
+                       ("spfScheduleInterval", ""),
+                       ("spfScheduleIntervalMillisecond", ""),
+                       ("spfScheduleMaxInterval", "5000"),
+                       ("spfScheduleStartInterval", "50"),
+                       ("spfScheduleHoldInterval", "200")]
+
 
 def build_config_xml(xmlstr):
     """build_config_xml"""
@@ -415,10 +476,12 @@ class OspfVrf(object):
         self.spfmaxinterval = self.module.params['spfmaxinterval']
         self.spfstartinterval = self.module.params['spfstartinterval']
         self.spfholdinterval = self.module.params['spfholdinterval']
+        self.processes = self.module.params['processes']
         self.state = self.module.params['state']
 
         # ospf info
         self.ospf_info = dict()
+        self.ospf_index = dict()
 
         # state
         self.changed = False
@@ -438,8 +501,12 @@ class OspfVrf(object):
     def init_module(self):
         """" init module """
 
+        required_one_of = [("ospf", "processes")]
+        mutually_exclusive = [("ospf", "processes"), ("route_id", "processes"),
+                              ("description", "processes")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -1101,6 +1168,176 @@ class OspfVrf(object):
                             ospf_site_ele.tag] = ospf_site_ele.text
                 self.ospf_info["ospfsite"].append(ospf_ele_info)
 
+    def get_ospf_index(self):
+        """index all ospf processes by (process_id, vrf)"""
+
+        self.ospf_index = dict()
+        for ospf_site in self.ospf_info["ospfsite"]:
+            self.ospf_index[(ospf_site.get("processId"), ospf_site.get("vrfName"))] = ospf_site
+
+    def get_target_processes(self):
+        """get the (process_id, vrf) keys of the processes that the timers are applied to"""
+
+        targets = list()
+        for process in self.processes:
+            if str(process).lower() == "all":
+                matched = sorted(self.ospf_index)
+            else:
+                entry = process if isinstance(process, dict) else dict(ospf=process)
+                if not entry.get("ospf") and not entry.get("vrf"):
+                    self.module.fail_json(
+                        msg='Error: Each process must be a process id, a dict with ospf and/or vrf, or all.')
+                ospf = str(entry["ospf"]) if entry.get("ospf") else None
+                vrf = entry.get("vrf")
+                matched = [key for key in sorted(self.ospf_index)
+                           if (ospf is None or key[0] == ospf) and (vrf is None or key[1] == vrf)]
+                if not matched:
+                    self.module.fail_json(
+                        msg='Error: The ospf process %s does not exist.' % process)
+            for key in matched:
+                if key not in targets:
+                    targets.append(key)
+        return targets
+
+    def is_spf_given(self):
+        """whether any spf schedule interval option is given"""
+
+        return bool(self.spfinterval or self.spfintervalmi or self.spfmaxinterval or
+                    self.spfstartinterval or self.spfholdinterval)
+
+    def get_timer_profile(self):
+        """get the timers to apply to every process, xml tag to value"""
+
+        profile = list()
+        if self.state == 'present':
+            if self.bandwidth:
+                profile.append(("bandwidthReference", self.bandwidth))
+            if self.lsaalflag is True:
+                profile.extend([("lsaArrivalFlag", "true"), ("lsaArrivalInterval", self.lsaainterval)])
+            elif self.lsaamaxinterval or self.lsaastartinterval or self.lsaaholdinterval:
+                profile.extend([("lsaArrivalFlag", "false"), ("lsaArrivalInterval", "")])
+                for tag, value in [("lsaArrivalMaxInterval", self.lsaamaxinterval),
+                                   ("lsaArrivalStartInterval", self.lsaastartinterval),
+                                   ("lsaArrivalHoldInterval", self.lsaaholdinterval)]:
+                    if value:
+                        profile.append((tag, value))
+            if self.lsaointervalflag is True:
+                profile.append(("lsaOriginateIntervalFlag", "true"))
+            elif self.lsaointerval or self.lsaomaxinterval or self.lsaostartinterval or self.lsaoholdinterval:
+                profile.append(("lsaOriginateIntervalFlag", "false"))
+                for tag, value in [("lsaOriginateInterval", self.lsaointerval),
+                                   ("lsaOriginateMaxInterval", self.lsaomaxinterval),
+                                   ("lsaOriginateStartInterval", self.lsaostartinterval),
+                                   ("lsaOriginateHoldInterval", self.lsaoholdinterval)]:
+                    if value:
+                        profile.append((tag, value))
+            # spfintervaltype has a default, so only an spf interval selects the spf leaves
+            if self.is_spf_given():
+                profile.append(("spfScheduleIntervalType", self.spfintervaltype))
+                if self.spfintervaltype == 'timer':
+                    profile.extend([("spfScheduleInterval", self.spfinterval),
+                                    ("spfScheduleIntervalMillisecond", "")])
+                elif self.spfintervaltype == 'millisecond':
+                    profile.extend([("spfScheduleInterval", ""),
+                                    ("spfScheduleIntervalMillisecond", self.spfintervalmi)])
+                else:
+                    profile.extend([("spfScheduleInterval", ""), ("spfScheduleIntervalMillisecond", "")])
+                    for tag, value in [("spfScheduleMaxInterval", self.spfmaxinterval),
+                                       ("spfScheduleStartInterval", self.spfstartinterval),
+                                       ("spfScheduleHoldInterval", self.spfholdinterval)]:
+                        if value:
+                            profile.append((tag, value))
+            return profile
+
+        # restore the given timers to their defaults
+        defaults = dict(OSPF_TIMER_DEFAULTS)
+        tags = list()
+        if self.bandwidth:
+            tags.append("bandwidthReference")
+        if self.lsaalflag is True or self.lsaamaxinterval or self.lsaastartinterval or self.lsaaholdinterval:
+            tags.extend(["lsaArrivalFlag", "lsaArrivalInterval", "lsaArrivalMaxInterval",
+                         "lsaArrivalStartInterval", "lsaArrivalHoldInterval"])
+        if self.lsaointervalflag is True or self.lsaointerval or self.lsaomaxinterval \
+                or self.lsaostartinterval or self.lsaoholdinterval:
+            tags.extend(["lsaOriginateIntervalFlag", "lsaOriginateInterval", "lsaOriginateMaxInterval",
+                         "lsaOriginateStartInterval", "lsaOriginateHoldInterval"])
+        if self.is_spf_given():
+            tags.extend(["spfScheduleIntervalType", "spfScheduleInterval", "spfScheduleIntervalMillisecond",
+                         "spfScheduleMaxInterval", "spfScheduleStartInterval", "spfScheduleHoldInterval"])
+        return [(tag, defaults[tag]) for tag in tags]
+
+    def get_timer_cmds(self, site):
+        """get the commands of the timers of a process"""
+
+        cmds = list()
+        if site["bandwidthReference"] != "100":
+            cmds.append('bandwidth-reference %s' % site["bandwidthReference"])
+        else:
+            cmds.append('undo bandwidth-reference')
+        if site["lsaArrivalFlag"] == "true":
+            cmds.append('lsa-arrival-interval %s' % site["lsaArrivalInterval"])
+        elif (site["lsaArrivalMaxInterval"], site["lsaArrivalStartInterval"],
+              site["lsaArrivalHoldInterval"]) != ("1000", "500", "500"):
+            cmds.append('lsa-arrival-interval intelligent-timer %s %s %s'
+                        % (site["lsaArrivalMaxInterval"], site["lsaArrivalStartInterval"],
+                           site["lsaArrivalHoldInterval"]))
+        else:
+            cmds.append('undo lsa-arrival-interval')
+        if site["lsaOriginateIntervalFlag"] == "true":
+            cmds.append('lsa-originate-interval 0 ')
+        elif (site["lsaOriginateInterval"], site["lsaOriginateMaxInterval"], site["lsaOriginateStartInterval"],
+              site["lsaOriginateHoldInterval"]) != ("5", "5000", "500", "1000"):
+            cmds.append('lsa-originate-interval other-type %s intelligent-timer %s %s %s'
+                        % (site["lsaOriginateInterval"], site["lsaOriginateMaxInterval"],
+                           site["lsaOriginateStartInterval"], site["lsaOriginateHoldInterval"]))
+        else:
+            cmds.append('undo lsa-originate-interval')
+        if site["spfScheduleIntervalType"] == 'millisecond':
+            cmds.append('spf-schedule-interval millisecond %s' % site["spfScheduleIntervalMillisecond"])
+        elif site["spfScheduleIntervalType"] == 'timer':
+            cmds.append('spf-schedule-interval %s' % site["spfScheduleInterval"])
+        elif (site["spfScheduleMaxInterval"], site["spfScheduleStartInterval"],
+              site["spfScheduleHoldInterval"]) != ("5000", "50", "200"):
+            cmds.append('spf-schedule-interval intelligent-timer %s %s %s'
+                        % (site["spfScheduleMaxInterval"], site["spfScheduleStartInterval"],
+                           site["spfScheduleHoldInterval"]))
+        else:
+            cmds.append('undo spf-schedule-interval')
+        return cmds
+
+    def operate_ospf_processes(self):
+        """diff the timers with every target process and apply the changes by chunked edits"""
+
+        profile = self.get_timer_profile()
+        defaults = dict(OSPF_TIMER_DEFAULTS)
+        xml_items = list()
+        for key in self.get_target_processes():
+            cur_site = self.ospf_index[key]
+            old_site = dict((tag, cur_site.get(tag) or defaults[tag]) for tag in defaults)
+            new_site = dict(old_site)
+            xml_timers = ""
+            for tag, value in profile:
+                if old_site[tag] != value:
+                    xml_timers += "\n          <%s>%s</%s>" % (tag, value, tag)
+                    new_site[tag] = value
+            if not xml_timers:
+                continue
+
+            xml_items.append(CE_NC_MERGE_OSPF_SITE % (key[0], key[1], xml_timers))
+            self.updates_cmd.append('ospf %s' % key[0])
+            old_cmds = self.get_timer_cmds(old_site)
+            for cmd in self.get_timer_cmds(new_site):
+                if cmd not in old_cmds:
+                    self.updates_cmd.append(cmd)
+
+        if not xml_items:
+            return
+
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_MERGE_OSPF_SITES_HEAD,
+                                 xml_items, CE_NC_MERGE_OSPF_SITES_TAIL)
+        self.changed = True
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -1590,6 +1827,10 @@ class OspfVrf(object):
     def get_end_state(self):
         """get end state info"""
 
+        if self.processes is not None and (not self.changed or self.module.check_mode):
+            self.end_state['ospf_info'] = self.existing['ospf_info']
+            return
+
         self.get_ospf_info()
         self.end_state['ospf_info'] = self.ospf_info["ospfsite"]
 
@@ -1599,9 +1840,17 @@ class OspfVrf(object):
         self.check_params()
         self.get_existing()
         self.get_proposed()
-        self.operate_ospf_info()
-        self.get_end_state()
-        self.set_update_cmd()
+        if self.processes is not None:
+            self.get_ospf_index()
+            for key in ("process_id", "route_id", "vrf", "description"):
+                self.proposed.pop(key)
+            self.proposed["processes"] = self.processes
+            self.operate_ospf_processes()
+            self.get_end_state()
+        else:
+            self.operate_ospf_info()
+            self.get_end_state()
+            self.set_update_cmd()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -1618,7 +1867,7 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        ospf=dict(required=True, type='str'),
+        ospf=dict(required=False, type='str'),
         route_id=dict(required=False, type='str'),
         vrf=dict(required=False, type='str', default='_public_'),
         description=dict(required=False, type='str'),
@@ -1640,6 +1889,7 @@ def main():
         spfmaxinterval=dict(required=False, type='str'),
         spfstartinterval=dict(required=False, type='str'),
         spfholdinterval=dict(required=False, type='str'),
+        processes=dict(required=False, type='list'),
         state=dict(required=False, choices=['present', 'absent'], default='present'),
     )
 
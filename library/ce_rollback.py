@@ -62,11 +62,23 @@ options:
               The value is an integer that ranges from 1 to 80.
         required: false
         default: null
+    index_file:
+        description:
+            - Path of the commit history index kept on the control node, one file per device.
+              Used by action sync and query, only commits newer than the last sync are fetched.
+        required: false
+        default: null
+    section:
+        description:
+            - Configuration section such as C(interface 10GE1/0/3), or a single configuration line,
+              to look up in the commit history index with action query.
+        required: false
+        default: null
     action:
         description:
             - The operation of configuration rollback.
         required: true
-        choices: ['rollback','clear','set','display','commit']
+        choices: ['rollback','clear','set','display','commit','sync','query']
 '''
 EXAMPLES = '''
 - name: rollback module test
@@ -89,6 +101,13 @@ EXAMPLES = '''
     commit_id: 1000000748
     action: rollback
     provider: "{{ cli }}"
+
+- name: Find the commit which last changed an interface section
+  ce_rollback:
+    section: interface 10GE1/0/3
+    index_file: "/var/lib/ce_rollback/{{ inventory_hostname }}.json"
+    action: query
+    provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -120,9 +139,20 @@ end_state:
     returned: always
     type: dict
     sample: {"commitId": "1000000748", "userLabel": "abc"}
+last_change:
+    description: the newest commit which changed the queried section
+    returned: when action is query
+    type: dict
+    sample: {"commitId": "1000000748", "userLabel": "abc", "userName": "admin",
+             "timeStamp": "2017-05-10 17:28:51"}
 '''
 
 import re
+import os
+import json
+import hashlib
+import tempfile
+from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.ce import get_nc_config, execute_nc_action, ce_argument_spec, run_commands
 
@@ -141,6 +171,21 @@ CE_NC_GET_CHECKPOINT = """
 </filter>
 """
 
+CE_NC_GET_CHECKPOINT_INDEX = """
+<filter type="subtree">
+  <cfg xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <checkPointInfos>
+      <checkPointInfo>
+        <commitId></commitId>
+        <userLabel></userLabel>
+        <userName></userName>
+        <timeStamp></timeStamp>
+      </checkPointInfo>
+    </checkPointInfos>
+  </cfg>
+</filter>
+"""
+
 CE_NC_ACTION_ROLLBACK_COMMIT_ID = """
 <action>
   <cfg xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -229,6 +274,8 @@ class RollBack(object):
         self.filename = self.module.params['filename']
         self.last = self.module.params['last']
         self.oldest = self.module.params['oldest']
+        self.index_file = self.module.params['index_file']
+        self.section = self.module.params['section']
         self.action = self.module.params['action']
 
         # state
@@ -241,6 +288,8 @@ class RollBack(object):
 
         # configuration rollback points info
         self.rollback_info = None
+        self.commit_index = None
+        self.last_change = None
 
     def init_module(self):
         """ init module """
@@ -273,6 +322,128 @@ class RollBack(object):
                     dict(commitId=mem[0], userLabel=mem[2]))
             return rollback_info
 
+    def get_checkpoint_list(self):
+        """ get all checkpoints with label, user and time stamp."""
+
+        checkpoints = list()
+        xml_str = get_nc_config(self.module, CE_NC_GET_CHECKPOINT_INDEX)
+        if "<data/>" in xml_str:
+            return checkpoints
+
+        xml_str = xml_str.replace('\r', '').replace('\n', '').\
+            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
+            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+        root = ElementTree.fromstring(xml_str)
+        for info in root.findall("data/cfg/checkPointInfos/checkPointInfo"):
+            checkpoint = dict()
+            for ele in info:
+                if ele.tag in ["commitId", "userLabel", "userName", "timeStamp"]:
+                    checkpoint[ele.tag] = ele.text
+            if checkpoint.get("commitId"):
+                checkpoints.append(checkpoint)
+        return checkpoints
+
+    def parse_commit_changes(self, changes):
+        """ get changed sections and changed line digests of one commit."""
+
+        sections = set()
+        digests = set()
+        cur_section = None
+        for line in changes.split("\n"):
+            line = line.rstrip()
+            if line[:1] in ["+", "-"]:
+                line = line[1:]
+            if not line.strip() or line.strip() in ["#", "return"]:
+                cur_section = None
+                continue
+            if not line.startswith(" "):
+                if line.startswith("Building configuration") or line[0] in ["<", "["]:
+                    continue
+                cur_section = line.strip()
+                sections.add(cur_section)
+            elif cur_section:
+                sections.add(cur_section)
+            digests.add(hashlib.sha1(line.strip().encode("utf-8")).hexdigest())
+        return sorted(sections), sorted(digests)
+
+    def load_commit_index(self):
+        """ load the local commit history index of this device."""
+
+        host = self.module.params['host'] or \
+            (self.module.params['provider'] or dict()).get('host')
+        index = dict(host=host, commits=dict())
+        if os.path.isfile(self.index_file):
+            try:
+                with open(self.index_file) as index_fd:
+                    saved = json.load(index_fd)
+            except ValueError:
+                saved = None
+            if saved and saved.get("host") == host:
+                index = saved
+        return index
+
+    def save_commit_index(self):
+        """ write the local commit history index atomically."""
+
+        index_dir = os.path.dirname(os.path.abspath(self.index_file))
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+        index_fd, tmp_path = tempfile.mkstemp(dir=index_dir)
+        with os.fdopen(index_fd, "w") as tmp_file:
+            json.dump(self.commit_index, tmp_file)
+        os.rename(tmp_path, self.index_file)
+
+    def sync_commit_index(self):
+        """ fetch changes of commits newer than the last sync only."""
+
+        self.commit_index = self.load_commit_index()
+        commits = self.commit_index["commits"]
+        checkpoints = self.get_checkpoint_list()
+
+        # drop commits cleared on the device
+        device_ids = set([checkpoint["commitId"] for checkpoint in checkpoints])
+        for commit_id in list(commits.keys()):
+            if commit_id not in device_ids:
+                del commits[commit_id]
+
+        new_checkpoints = list()
+        for checkpoint in checkpoints:
+            commit = commits.get(checkpoint["commitId"])
+            if commit:
+                # labels may be set or cleared after the commit
+                commit["userLabel"] = checkpoint.get("userLabel")
+            else:
+                new_checkpoints.append(checkpoint)
+
+        if new_checkpoints:
+            commands = list()
+            for checkpoint in new_checkpoints:
+                cmd = "display configuration commit changes at commit-id %s" % checkpoint["commitId"]
+                commands.append({'output': None, 'command': cmd})
+            outputs = run_commands(self.module, commands)
+            for checkpoint, changes in zip(new_checkpoints, outputs):
+                commit = dict(checkpoint)
+                commit["sections"], commit["digests"] = self.parse_commit_changes(str(changes))
+                commits[checkpoint["commitId"]] = commit
+
+        self.save_commit_index()
+        self.existing["synced"] = [checkpoint["commitId"] for checkpoint in new_checkpoints]
+        self.existing["commits"] = len(commits)
+
+    def query_commit_index(self):
+        """ find the newest commit which changed the section."""
+
+        section = self.section.strip()
+        digest = hashlib.sha1(section.encode("utf-8")).hexdigest()
+        commits = self.commit_index["commits"]
+        for commit_id in sorted(commits.keys(), key=int, reverse=True):
+            commit = commits[commit_id]
+            if section in commit["sections"] or digest in commit["digests"]:
+                self.last_change = dict(commitId=commit_id, userLabel=commit.get("userLabel"),
+                                        userName=commit.get("userName"),
+                                        timeStamp=commit.get("timeStamp"))
+                return
+
     def get_filename_type(self, filename):
         """Gets the type of filename, such as cfg, zip, dat..."""
 
@@ -423,6 +594,14 @@ class RollBack(object):
                 self.module.fail_json(
                     msg='Error: Number of configuration checkpoints is not in the range from 1 to 80.')
 
+        # index check
+        if self.action in ["sync", "query"] and not self.index_file:
+            self.module.fail_json(
+                msg='Error: The index_file is required when action is sync or query.')
+        if self.action == "query" and not self.section:
+            self.module.fail_json(
+                msg='Error: The section is required when action is query.')
+
         # oldest check
         if self.oldest:
             if not self.oldest.isdigit():
@@ -445,6 +624,8 @@ class RollBack(object):
             self.proposed["last"] = self.last
         if self.oldest:
             self.proposed["oldest"] = self.oldest
+        if self.section:
+            self.proposed["section"] = self.section
 
     def get_existing(self):
         """get existing info"""
@@ -486,6 +667,10 @@ class RollBack(object):
                 self.commit_label()
         elif self.action == "display":
             self.rollback_info = self.get_rollback_dict()
+        elif self.action in ["sync", "query"]:
+            self.sync_commit_index()
+            if self.action == "query":
+                self.query_commit_index()
 
         self.get_existing()
         self.get_end_state()
@@ -493,6 +678,8 @@ class RollBack(object):
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
         self.results['end_state'] = self.end_state
+        if self.action == "query":
+            self.results['last_change'] = self.last_change
         if self.changed:
             self.results['updates'] = self.updates_cmd
         else:
@@ -510,8 +697,10 @@ def main():
         filename=dict(required=False, type='str'),
         last=dict(required=False, type='str'),
         oldest=dict(required=False, type='str'),
+        index_file=dict(required=False, type='path'),
+        section=dict(required=False, type='str'),
         action=dict(required=False, type='str', choices=[
-            'rollback', 'clear', 'set', 'commit', 'display']),
+            'rollback', 'clear', 'set', 'commit', 'display', 'sync', 'query']),
     )
     argument_spec.update(ce_argument_spec)
     module = RollBack(argument_spec)
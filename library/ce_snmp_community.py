@@ -161,26 +161,10 @@ updates:
     sample: ["snmp-agent group v3 wdz_group noauthentication acl 2000"]
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, get_snmp_snapshot, get_snmp_rows
 
 
-# get snmp commutiny
-CE_GET_SNMP_COMMUNITY_HEADER = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <communitys>
-          <community>
-            <communityName></communityName>
-            <accessRight></accessRight>
-"""
-CE_GET_SNMP_COMMUNITY_TAIL = """
-          </community>
-        </communitys>
-      </snmp>
-    </filter>
-"""
 # merge snmp commutiny
 CE_MERGE_SNMP_COMMUNITY_HEADER = """
     <config>
@@ -227,21 +211,6 @@ CE_DELETE_SNMP_COMMUNITY_TAIL = """
     </config>
 """
 
-# get snmp v3 group
-CE_GET_SNMP_V3_GROUP_HEADER = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <snmpv3Groups>
-          <snmpv3Group>
-            <groupName></groupName>
-            <securityLevel></securityLevel>
-"""
-CE_GET_SNMP_V3_GROUP_TAIL = """
-          </snmpv3Group>
-        </snmpv3Groups>
-      </snmp>
-    </filter>
-"""
 # merge snmp v3 group
 CE_MERGE_SNMP_V3_GROUP_HEADER = """
     <config>
@@ -292,16 +261,6 @@ CE_DELETE_SNMP_V3_GROUP_TAIL = """
 class SnmpCommunity(object):
     """ Manages SNMP community configuration """
 
-    def netconf_get_config(self, **kwargs):
-        """ Get configure through netconf """
-
-        module = kwargs["module"]
-        conf_str = kwargs["conf_str"]
-
-        xml_str = get_nc_config(module, conf_str)
-
-        return xml_str
-
     def netconf_set_config(self, **kwargs):
         """ Set configure through netconf """
 
@@ -345,34 +304,19 @@ class SnmpCommunity(object):
                     module.fail_json(
                         msg='Error: The len of community_mib_view %s is out of [1 - 32].' % community_mib_view)
 
-            conf_str = CE_GET_SNMP_COMMUNITY_HEADER
+            keys = ["communityName", "accessRight"]
             if acl_number:
-                conf_str += "<aclNumber></aclNumber>"
+                keys.append("aclNumber")
             if community_mib_view:
-                conf_str += "<mibViewName></mibViewName>"
+                keys.append("mibViewName")
 
-            conf_str += CE_GET_SNMP_COMMUNITY_TAIL
-            recv_xml = self.netconf_get_config(module=module, conf_str=conf_str)
+            result["community_info"] = get_snmp_rows(
+                get_snmp_snapshot(module)["communities"], keys)
 
-            if "<data/>" in recv_xml:
+            if not result["community_info"]:
                 if state == "present":
                     need_cfg = True
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                community_info = root.findall("data/snmp/communitys/community")
-                if community_info:
-                    for tmp in community_info:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["communityName", "accessRight", "aclNumber", "mibViewName"]:
-                                tmp_dict[site.tag] = site.text
-
-                        result["community_info"].append(tmp_dict)
-
                 if result["community_info"]:
                     for tmp in result["community_info"]:
                         if "communityName" in tmp.keys():
@@ -461,39 +405,23 @@ class SnmpCommunity(object):
                     module.fail_json(
                         msg='Error: The len of notify_view %s is out of [1 - 32].' % notify_view)
 
-            conf_str = CE_GET_SNMP_V3_GROUP_HEADER
+            keys = ["groupName", "securityLevel"]
             if acl_number:
-                conf_str += "<aclNumber></aclNumber>"
+                keys.append("aclNumber")
             if read_view:
-                conf_str += "<readViewName></readViewName>"
+                keys.append("readViewName")
             if write_view:
-                conf_str += "<writeViewName></writeViewName>"
+                keys.append("writeViewName")
             if notify_view:
-                conf_str += "<notifyViewName></notifyViewName>"
+                keys.append("notifyViewName")
 
-            conf_str += CE_GET_SNMP_V3_GROUP_TAIL
-            recv_xml = self.netconf_get_config(module=module, conf_str=conf_str)
+            result["group_info"] = get_snmp_rows(
+                get_snmp_snapshot(module)["groups"], keys)
 
-            if "<data/>" in recv_xml:
+            if not result["group_info"]:
                 if state == "present":
                     need_cfg = True
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                group_info = root.findall("data/snmp/snmpv3Groups/snmpv3Group")
-                if group_info:
-                    for tmp in group_info:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["groupName", "securityLevel", "readViewName", "writeViewName",
-                                            "notifyViewName", "aclNumber"]:
-                                tmp_dict[site.tag] = site.text
-
-                        result["group_info"].append(tmp_dict)
-
                 if result["group_info"]:
                     for tmp in result["group_info"]:
                         if "groupName" in tmp.keys():
@@ -906,12 +834,14 @@ def main():
             updates.append(cmd)
 
     # state end snmp community config
+    if changed:
+        get_snmp_snapshot(module, refresh=True)
     snmp_community_rst = snmp_community_obj.check_snmp_community_args(
         module=module)
     end_tmp = dict()
     for item in snmp_community_rst:
         if item != "need_cfg":
-            exist_tmp[item] = snmp_community_rst[item]
+            end_tmp[item] = snmp_community_rst[item]
     if end_tmp:
         end_state["snmp community"] = end_tmp
     # state exist snmp v3 group config
@@ -920,7 +850,7 @@ def main():
     end_tmp = dict()
     for item in snmp_v3_group_rst:
         if item != "need_cfg":
-            exist_tmp[item] = snmp_v3_group_rst[item]
+            end_tmp[item] = snmp_v3_group_rst[item]
     if end_tmp:
         end_state["snmp v3 group"] = end_tmp
 
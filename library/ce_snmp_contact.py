@@ -102,7 +102,7 @@ updates:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_config, load_config, ce_argument_spec
+from ansible.module_utils.ce import load_config, ce_argument_spec, get_snmp_agent_config
 
 
 class SnmpContact(object):
@@ -176,12 +176,7 @@ class SnmpContact(object):
     def cli_get_config(self):
         """ Get configure by cli """
 
-        regular = "| include snmp | include contact"
-        flags = list()
-        flags.append(regular)
-        tmp_cfg = get_config(self.module, flags)
-
-        return tmp_cfg
+        return get_snmp_agent_config(self.module, "contact")
 
     def set_config(self):
         """ Set configure by cli """
@@ -103,7 +103,7 @@ updates:
 
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_config, load_config, ce_argument_spec
+from ansible.module_utils.ce import load_config, ce_argument_spec, get_snmp_agent_config
 
 
 class SnmpLocation(object):
@@ -177,12 +177,7 @@ class SnmpLocation(object):
     def cli_get_config(self):
         """ Get config by cli """
 
-        regular = "| include snmp | include location"
-        flags = list()
-        flags.append(regular)
-        tmp_cfg = get_config(self.module, flags)
-
-        return tmp_cfg
+        return get_snmp_agent_config(self.module, "location")
 
     def set_config(self):
         """ Set configure by cli """
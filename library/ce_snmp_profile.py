@@ -0,0 +1,655 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.0'}
+
+DOCUMENTATION = '''
+---
+module: ce_snmp_profile
+version_added: "2.4"
+short_description: Manages a whole SNMP profile on HUAWEI CloudEngine switches.
+description:
+    - Manages SNMP contact, location, communities, v3 groups, USM users, target hosts
+      and trap source on HUAWEI CloudEngine switches in one task.
+author:
+    - wangdezhuang (@CloudEngine-Ansible)
+notes:
+    - The SNMP configuration is read once, the communities, groups, users and target hosts
+      that differ are sent in one edit-config and the other settings in one CLI block.
+    - Communities are matched by name and access right, groups by name and security level,
+      USM users by name and target hosts by host name.
+    - Authentication and privacy keys are only sent when a USM user is created or one of
+      its other attributes changes.
+options:
+    contact:
+        description:
+            - Contact information of the device, length is 1 - 255.
+        required: false
+        default: null
+    location:
+        description:
+            - Location information of the device, length is 1 - 255.
+        required: false
+        default: null
+    communities:
+        description:
+            - A list of communities, each one is a dict with community_name, access_right
+              (read or write) and optionally acl_number and community_mib_view.
+        required: false
+        default: null
+    groups:
+        description:
+            - A list of SNMPv3 groups, each one is a dict with group_name, security_level
+              (noAuthNoPriv, authentication or privacy) and optionally read_view, write_view,
+              notify_view and acl_number.
+        required: false
+        default: null
+    usm_users:
+        description:
+            - A list of SNMPv3 USM users, each one is a dict with usm_user_name and optionally
+              user_group, remote_engine_id, auth_protocol (noAuth, md5 or sha), auth_key,
+              priv_protocol (noPriv, des56, 3des168, aes128, aes192 or aes256), priv_key and acl_number.
+        required: false
+        default: null
+    target_hosts:
+        description:
+            - A list of target hosts, each one is a dict with host_name, address, notify_type
+              (trap or inform) and optionally vpn_name, recv_port, security_model (v1, v2c or v3),
+              security_name, security_name_v3, security_level and interface_name.
+        required: false
+        default: null
+    trap_source_interface:
+        description:
+            - Full name of the trap source interface.
+        required: false
+        default: null
+    trap_source_port:
+        description:
+            - Trap source port, the value is 1025 - 65535.
+        required: false
+        default: null
+    state:
+        description:
+            - Manage the state of the resource.
+        required: false
+        default: present
+        choices: ['present','absent']
+'''
+
+EXAMPLES = '''
+
+- name: CloudEngine snmp profile test
+  hosts: cloudengine
+  connection: local
+  gather_facts: no
+  vars:
+    cli:
+      host: "{{ inventory_hostname }}"
+      port: "{{ ansible_ssh_port }}"
+      username: "{{ username }}"
+      password: "{{ password }}"
+      transport: cli
+
+  tasks:
+
+  - name: "Apply the SNMP baseline"
+    ce_snmp_profile:
+      contact: noc@example.com
+      location: dc1-row4
+      communities:
+        - {community_name: Wdz123456789, access_right: read, acl_number: 2000}
+      groups:
+        - {group_name: nms_group, security_level: privacy}
+      usm_users:
+        - {usm_user_name: nms, user_group: nms_group, auth_protocol: sha, auth_key: Wdz123456789,
+           priv_protocol: aes128, priv_key: Wdz123456789}
+      target_hosts:
+        - {host_name: nms1, address: 192.168.10.10, notify_type: trap, security_model: v3,
+           security_name_v3: nms, security_level: privacy}
+      trap_source_interface: LoopBack0
+      provider: "{{ cli }}"
+
+  - name: "Remove a target host of the profile"
+    ce_snmp_profile:
+      target_hosts:
+        - {host_name: nms1, address: 192.168.10.10, notify_type: trap}
+      state: absent
+      provider: "{{ cli }}"
+'''
+
+RETURN = '''
+changed:
+    description: check to see if a change was made on the device
+    returned: always
+    type: boolean
+    sample: true
+proposed:
+    description: k/v pairs of parameters passed into module
+    returned: always
+    type: dict
+    sample: {"contact": "noc@example.com", "state": "present",
+             "groups": [{"group_name": "nms_group", "security_level": "privacy"}]}
+existing:
+    description: k/v pairs of existing snmp profile
+    returned: always
+    type: dict
+    sample: {"contact": null, "location": null, "communities": [], "groups": [], "usm_users": [],
+             "target_hosts": [], "trap_source_interface": null, "trap_source_port": null}
+end_state:
+    description: k/v pairs of snmp profile after module execution
+    returned: always
+    type: dict
+    sample: {"contact": "noc@example.com", "location": null, "communities": [],
+             "groups": [{"groupName": "nms_group", "securityLevel": "privacy"}], "usm_users": [],
+             "target_hosts": [], "trap_source_interface": null, "trap_source_port": null}
+updates:
+    description: command sent to the device
+    returned: always
+    type: list
+    sample: ["snmp-agent group v3 nms_group privacy",
+             "snmp-agent sys-info contact noc@example.com"]
+'''
+
+import sys
+import socket
+from xml.sax.saxutils import escape
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.ce import set_nc_config, load_config, ce_argument_spec, \
+    get_snmp_snapshot, get_snmp_rows, get_snmp_agent_config
+
+
+CE_NC_MERGE_SNMP_PROFILE_HEAD = """
+    <config>
+      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+"""
+CE_NC_MERGE_SNMP_PROFILE_TAIL = """
+      </snmp>
+    </config>
+"""
+
+# list of (option, snapshot table, container, entry, [(option key, xml tag)], number of index keys)
+SNMP_PROFILE_TABLES = [
+    ("communities", "communities", "communitys", "community",
+     [("community_name", "communityName"), ("access_right", "accessRight"),
+      ("acl_number", "aclNumber"), ("community_mib_view", "mibViewName")], 2),
+    ("groups", "groups", "snmpv3Groups", "snmpv3Group",
+     [("group_name", "groupName"), ("security_level", "securityLevel"),
+      ("read_view", "readViewName"), ("write_view", "writeViewName"),
+      ("notify_view", "notifyViewName"), ("acl_number", "aclNumber")], 2),
+    ("usm_users", "usm_users", "usmUsers", "usmUser",
+     [("usm_user_name", "userName"), ("remote_engine_flag", "remoteEngineID"),
+      ("engine_id", "engineID"), ("user_group", "groupName"),
+      ("auth_protocol", "authProtocol"), ("priv_protocol", "privProtocol"),
+      ("acl_number", "aclNumber"), ("auth_key", "authKey"), ("priv_key", "privKey")], 1),
+    ("target_hosts", "target_hosts", "targetHosts", "targetHost",
+     [("host_name", "nmsName"), ("domain", "domain"), ("address", "address"),
+      ("notify_type", "notifyType"), ("vpn_name", "vpnInstanceName"),
+      ("recv_port", "portNumber"), ("security_model", "securityModel"),
+      ("security_name", "securityName"), ("security_name_v3", "securityNameV3"),
+      ("security_level", "securityLevel"), ("interface_name", "interface-name")], 1)
+]
+
+# keys of the device that are never compared or returned
+SNMP_PROFILE_SECRETS = ["authKey", "privKey", "securityName"]
+
+SECURITY_LEVEL_CLI = {"noAuthNoPriv": "noauthentication",
+                      "authentication": "authentication",
+                      "privacy": "privacy"}
+
+
+def check_ip_addr(ipaddr):
+    """ check_ip_addr, Supports IPv4 and IPv6 """
+
+    if not ipaddr or '\x00' in ipaddr:
+        return False
+
+    try:
+        res = socket.getaddrinfo(ipaddr, 0, socket.AF_UNSPEC,
+                                 socket.SOCK_STREAM,
+                                 0, socket.AI_NUMERICHOST)
+        return bool(res)
+    except socket.gaierror:
+        err = sys.exc_info()[1]
+        if err.args[0] == socket.EAI_NONAME:
+            return False
+        raise
+    return True
+
+
+class SnmpProfile(object):
+    """ Manages a whole SNMP profile """
+
+    def __init__(self, **kwargs):
+        """ Class init """
+
+        # module
+        argument_spec = kwargs["argument_spec"]
+        self.spec = argument_spec
+        self.module = AnsibleModule(
+            argument_spec=self.spec,
+            supports_check_mode=True
+        )
+
+        # module args
+        self.state = self.module.params['state']
+        self.contact = self.module.params['contact']
+        self.location = self.module.params['location']
+        self.trap_source_interface = self.module.params['trap_source_interface']
+        self.trap_source_port = self.module.params['trap_source_port']
+        self.tables = dict()
+        for option, _, _, _, _, _ in SNMP_PROFILE_TABLES:
+            self.tables[option] = self.module.params[option] or list()
+
+        # config
+        self.cur_cfg = dict()
+        self.snapshot = None
+        self.local_engine_id = None
+
+        # state
+        self.changed = False
+        self.updates_cmd = list()
+        self.results = dict()
+        self.proposed = dict()
+        self.existing = dict()
+        self.end_state = dict()
+
+    def check_entry(self, option, entry, required, lengths):
+        """ Check an entry of a list option and normalize it to strings """
+
+        if not isinstance(entry, dict):
+            self.module.fail_json(
+                msg='Error: Each item of %s must be a dict.' % option)
+
+        tmp_entry = dict()
+        for key, value in entry.items():
+            if value is not None and value != "":
+                tmp_entry[key] = str(value)
+
+        for key in required:
+            if not tmp_entry.get(key):
+                self.module.fail_json(
+                    msg='Error: The %s is required for each item of %s.' % (key, option))
+
+        for key, (min_len, max_len) in lengths.items():
+            if key in tmp_entry and (len(tmp_entry[key]) < min_len or len(tmp_entry[key]) > max_len):
+                self.module.fail_json(
+                    msg='Error: The len of %s %s is out of [%s - %s].' % (key, tmp_entry[key], min_len, max_len))
+
+        return tmp_entry
+
+    def check_acl_number(self, acl_number):
+        """ Check acl number """
+
+        if acl_number.isdigit():
+            if int(acl_number) > 2999 or int(acl_number) < 2000:
+                self.module.fail_json(
+                    msg='Error: The value of acl_number %s is out of [2000 - 2999].' % acl_number)
+        elif not acl_number[0].isalpha() or len(acl_number) > 32:
+            self.module.fail_json(
+                msg='Error: The len of acl_number %s is out of [1 - 32] or is invalid.' % acl_number)
+
+    def check_choice(self, option, key, value, choices):
+        """ Check the value of an entry key is one of choices """
+
+        if value not in choices:
+            self.module.fail_json(
+                msg='Error: The %s of %s must be one of %s.' % (key, option, ", ".join(choices)))
+
+    def check_args(self):
+        """ Check invalid args """
+
+        if self.contact is not None and (len(self.contact) > 255 or len(self.contact) < 1):
+            self.module.fail_json(
+                msg='Error: The len of contact %s is out of [1 - 255].' % self.contact)
+
+        if self.location is not None and (len(self.location) > 255 or len(self.location) < 1):
+            self.module.fail_json(
+                msg='Error: The len of location %s is out of [1 - 255].' % self.location)
+
+        if self.trap_source_port:
+            if not self.trap_source_port.isdigit() or \
+                    int(self.trap_source_port) < 1025 or int(self.trap_source_port) > 65535:
+                self.module.fail_json(
+                    msg='Error: The value of trap_source_port is out of [1025 - 65535].')
+
+        communities = list()
+        for entry in self.tables["communities"]:
+            entry = self.check_entry("communities", entry, ["community_name", "access_right"],
+                                     dict(community_name=(1, 32), community_mib_view=(1, 32)))
+            self.check_choice("communities", "access_right", entry["access_right"], ["read", "write"])
+            if entry.get("acl_number"):
+                self.check_acl_number(entry["acl_number"])
+            communities.append(entry)
+        self.tables["communities"] = communities
+
+        groups = list()
+        for entry in self.tables["groups"]:
+            entry = self.check_entry("groups", entry, ["group_name", "security_level"],
+                                     dict(group_name=(1, 32), read_view=(1, 32),
+                                          write_view=(1, 32), notify_view=(1, 32)))
+            self.check_choice("groups", "security_level", entry["security_level"],
+                              ["noAuthNoPriv", "authentication", "privacy"])
+            if entry.get("acl_number"):
+                self.check_acl_number(entry["acl_number"])
+            groups.append(entry)
+        self.tables["groups"] = groups
+
+        usm_users = list()
+        for entry in self.tables["usm_users"]:
+            entry = self.check_entry("usm_users", entry, ["usm_user_name"],
+                                     dict(usm_user_name=(1, 32), user_group=(1, 32),
+                                          remote_engine_id=(10, 64), auth_key=(1, 255), priv_key=(1, 255)))
+            if entry.get("auth_protocol"):
+                self.check_choice("usm_users", "auth_protocol", entry["auth_protocol"], ["noAuth", "md5", "sha"])
+            if entry.get("priv_protocol"):
+                if not entry.get("auth_protocol"):
+                    self.module.fail_json(
+                        msg='Error: Please input auth_protocol at the same time.')
+                self.check_choice("usm_users", "priv_protocol", entry["priv_protocol"],
+                                  ["noPriv", "des56", "3des168", "aes128", "aes192", "aes256"])
+            if entry.get("acl_number"):
+                self.check_acl_number(entry["acl_number"])
+            usm_users.append(entry)
+        self.tables["usm_users"] = usm_users
+
+        target_hosts = list()
+        for entry in self.tables["target_hosts"]:
+            required = ["host_name"]
+            if self.state == "present":
+                required.extend(["address", "notify_type"])
+            entry = self.check_entry("target_hosts", entry, required,
+                                     dict(host_name=(1, 32), vpn_name=(1, 31), security_name=(1, 32),
+                                          security_name_v3=(1, 32), interface_name=(1, 63)))
+            entry["domain"] = "snmpUDPDomain"
+            if entry.get("address") and not check_ip_addr(entry["address"]):
+                self.module.fail_json(
+                    msg='Error: The host address [%s] is invalid.' % entry["address"])
+            if entry.get("notify_type"):
+                self.check_choice("target_hosts", "notify_type", entry["notify_type"], ["trap", "inform"])
+            if entry.get("security_model"):
+                self.check_choice("target_hosts", "security_model", entry["security_model"], ["v1", "v2c", "v3"])
+            if entry.get("recv_port"):
+                if not entry["recv_port"].isdigit() or int(entry["recv_port"]) > 65535:
+                    self.module.fail_json(
+                        msg='Error: The value of recv_port is out of [0 - 65535].')
+            target_hosts.append(entry)
+        self.tables["target_hosts"] = target_hosts
+
+    def get_proposed(self):
+        """ Get proposed state """
+
+        self.proposed["state"] = self.state
+        for option in ["contact", "location", "trap_source_interface", "trap_source_port"]:
+            if getattr(self, option) is not None:
+                self.proposed[option] = getattr(self, option)
+
+        for option, _, _, _, _, _ in SNMP_PROFILE_TABLES:
+            if self.tables[option]:
+                self.proposed[option] = list()
+                for entry in self.tables[option]:
+                    tmp_entry = dict(entry)
+                    for key in ["community_name", "auth_key", "priv_key", "security_name"]:
+                        if key in tmp_entry:
+                            tmp_entry[key] = "******"
+                    self.proposed[option].append(tmp_entry)
+
+    def get_cli_state(self):
+        """ Get contact, location, trap source and local engine id by one cli read """
+
+        cur_cfg = dict(contact=None, location=None, trap_source_interface=None,
+                       trap_source_port=None, local_engine_id=None)
+        for line in get_snmp_agent_config(self.module).splitlines():
+            line = line.strip()
+            if line.startswith("snmp-agent sys-info contact "):
+                cur_cfg["contact"] = line[len("snmp-agent sys-info contact "):]
+            elif line.startswith("snmp-agent sys-info location "):
+                cur_cfg["location"] = line[len("snmp-agent sys-info location "):]
+            elif line.startswith("snmp-agent trap source-port "):
+                cur_cfg["trap_source_port"] = line[len("snmp-agent trap source-port "):]
+            elif line.startswith("snmp-agent trap source "):
+                cur_cfg["trap_source_interface"] = line[len("snmp-agent trap source "):]
+            elif line.startswith("snmp-agent local-engineid "):
+                cur_cfg["local_engine_id"] = line[len("snmp-agent local-engineid "):]
+
+        return cur_cfg
+
+    def get_profile_state(self, refresh=False):
+        """ Get the snmp profile state """
+
+        self.cur_cfg = self.get_cli_state()
+        self.snapshot = get_snmp_snapshot(self.module, refresh)
+
+        state = dict()
+        for option in ["contact", "location", "trap_source_interface", "trap_source_port"]:
+            state[option] = self.cur_cfg[option]
+        for option, table, _, _, fields, _ in SNMP_PROFILE_TABLES:
+            keys = [tag for _, tag in fields if tag not in SNMP_PROFILE_SECRETS]
+            state[option] = get_snmp_rows(self.snapshot[table], keys)
+        return state
+
+    def get_existing(self):
+        """ Get existing state """
+
+        self.existing = self.get_profile_state()
+
+    def get_end_state(self):
+        """ Get end state """
+
+        if self.changed and not self.module.check_mode:
+            self.end_state = self.get_profile_state(refresh=True)
+        else:
+            self.end_state = self.existing
+
+    def get_usm_user_fields(self, entry):
+        """ Fill the engine id fields of a USM user """
+
+        if entry.get("remote_engine_id"):
+            entry["remote_engine_flag"] = "true"
+            entry["engine_id"] = entry["remote_engine_id"]
+        else:
+            if not self.cur_cfg["local_engine_id"]:
+                self.module.fail_json(
+                    msg='Error: The local engine id is null, please input remote_engine_id.')
+            entry["remote_engine_flag"] = "false"
+            entry["engine_id"] = self.cur_cfg["local_engine_id"]
+
+    def find_row(self, table, fields, index_num, entry):
+        """ Find the row of a snapshot table with the same index as entry """
+
+        for row in self.snapshot[table]:
+            if all(row.get(tag) == entry.get(key) for key, tag in fields[:index_num]):
+                return row
+        return None
+
+    def get_entry_cmd(self, option, entry, undo):
+        """ Get the cli command which is the same as a netconf entry """
+
+        if option == "communities":
+            cmd = "snmp-agent community %s ******" % entry["access_right"]
+            if not undo:
+                if entry.get("acl_number"):
+                    cmd += " acl %s" % entry["acl_number"]
+                if entry.get("community_mib_view"):
+                    cmd += " mib-view %s" % entry["community_mib_view"]
+        elif option == "groups":
+            cmd = "snmp-agent group v3 %s %s" % (entry["group_name"],
+                                                 SECURITY_LEVEL_CLI[entry["security_level"]])
+            if not undo:
+                for key, word in [("read_view", "read-view"), ("write_view", "write-view"),
+                                  ("notify_view", "notify-view"), ("acl_number", "acl")]:
+                    if entry.get(key):
+                        cmd += " %s %s" % (word, entry[key])
+        elif option == "usm_users":
+            if entry.get("remote_engine_id"):
+                cmd = "snmp-agent remote-engineid %s usm-user v3 %s" % (
+                    entry["remote_engine_id"], entry["usm_user_name"])
+            else:
+                cmd = "snmp-agent usm-user v3 %s" % entry["usm_user_name"]
+            if not undo:
+                if entry.get("user_group"):
+                    cmd += " %s" % entry["user_group"]
+                if entry.get("auth_protocol") and entry["auth_protocol"] != "noAuth":
+                    cmd += " authentication-mode %s cipher ******" % entry["auth_protocol"]
+                if entry.get("priv_protocol") and entry["priv_protocol"] != "noPriv":
+                    cmd += " privacy-mode %s cipher ******" % entry["priv_protocol"]
+                if entry.get("acl_number"):
+                    cmd += " acl %s" % entry["acl_number"]
+        else:
+            cmd = "snmp-agent target-host host-name %s" % entry["host_name"]
+            if not undo:
+                cmd += " %s address udp-domain %s" % (entry["notify_type"], entry["address"])
+                if entry.get("recv_port"):
+                    cmd += " udp-port %s" % entry["recv_port"]
+                if entry.get("interface_name"):
+                    cmd += " source %s" % entry["interface_name"]
+                if entry.get("vpn_name"):
+                    cmd += " vpn-instance %s" % entry["vpn_name"]
+                if entry.get("security_model") in ["v1", "v2c"] and entry.get("security_name"):
+                    cmd += " params securityname ****** %s" % entry["security_model"]
+                if entry.get("security_model") == "v3" and entry.get("security_name_v3"):
+                    cmd += " params securityname %s v3" % entry["security_name_v3"]
+                    if entry.get("security_level") in ["authentication", "privacy"]:
+                        cmd += " %s" % entry["security_level"]
+
+        if undo:
+            cmd = "undo " + cmd
+        return cmd
+
+    def get_table_xml(self, option):
+        """ Get the edit xml of the changed entries of a list option """
+
+        _, table, container, entry_tag, fields, index_num = \
+            [item for item in SNMP_PROFILE_TABLES if item[0] == option][0]
+
+        entries_xml = ""
+        for entry in self.tables[option]:
+            if option == "usm_users":
+                self.get_usm_user_fields(entry)
+            row = self.find_row(table, fields, index_num, entry)
+
+            if self.state == "present":
+                if row is not None and all(row.get(tag) == entry[key] for key, tag in fields
+                                           if key in entry and tag not in SNMP_PROFILE_SECRETS):
+                    continue
+                operation = "merge"
+                xml_fields = [(key, tag) for key, tag in fields if key in entry]
+            else:
+                if row is None:
+                    continue
+                operation = "delete"
+                xml_fields = fields[:index_num]
+                if option == "usm_users":
+                    xml_fields = fields[:3]
+
+            entries_xml += "<%s operation=\"%s\">" % (entry_tag, operation)
+            for key, tag in xml_fields:
+                entries_xml += "<%s>%s</%s>" % (tag, escape(str(entry[key])), tag)
+            entries_xml += "</%s>" % entry_tag
+            self.updates_cmd.append(self.get_entry_cmd(option, entry, self.state == "absent"))
+
+        if not entries_xml:
+            return ""
+        return "<%s>%s</%s>" % (container, entries_xml, container)
+
+    def get_cli_commands(self):
+        """ Get the cli commands of contact, location and trap source """
+
+        cmds = list()
+        for option, cmd in [("contact", "snmp-agent sys-info contact"),
+                            ("location", "snmp-agent sys-info location"),
+                            ("trap_source_interface", "snmp-agent trap source"),
+                            ("trap_source_port", "snmp-agent trap source-port")]:
+            value = getattr(self, option)
+            if value is None:
+                continue
+            if self.state == "present":
+                if value != self.cur_cfg[option]:
+                    cmds.append("%s %s" % (cmd, value))
+            elif value == self.cur_cfg[option]:
+                cmds.append("undo %s" % cmd)
+        return cmds
+
+    def config_snmp_profile(self):
+        """ Config the snmp profile by one edit-config and one cli block """
+
+        options = [item[0] for item in SNMP_PROFILE_TABLES]
+        if self.state == "absent":
+            options.reverse()
+
+        xml_str = ""
+        for option in options:
+            xml_str += self.get_table_xml(option)
+
+        cmds = self.get_cli_commands()
+        self.updates_cmd.extend(cmds)
+
+        if xml_str:
+            self.changed = True
+            if not self.module.check_mode:
+                recv_xml = set_nc_config(
+                    self.module, CE_NC_MERGE_SNMP_PROFILE_HEAD + xml_str + CE_NC_MERGE_SNMP_PROFILE_TAIL)
+                if "<ok/>" not in recv_xml:
+                    self.module.fail_json(msg='Error: Merge snmp profile failed.')
+
+        if cmds:
+            self.changed = True
+            if not self.module.check_mode:
+                load_config(self.module, cmds)
+
+    def work(self):
+        """ Main work function """
+
+        self.check_args()
+        self.get_proposed()
+        self.get_existing()
+        self.config_snmp_profile()
+        self.get_end_state()
+
+        self.results['changed'] = self.changed
+        self.results['proposed'] = self.proposed
+        self.results['existing'] = self.existing
+        self.results['end_state'] = self.end_state
+        self.results['updates'] = self.updates_cmd
+
+        self.module.exit_json(**self.results)
+
+
+def main():
+    """ Module main """
+
+    argument_spec = dict(
+        state=dict(choices=['present', 'absent'], default='present'),
+        contact=dict(type='str'),
+        location=dict(type='str'),
+        communities=dict(type='list'),
+        groups=dict(type='list'),
+        usm_users=dict(type='list'),
+        target_hosts=dict(type='list'),
+        trap_source_interface=dict(type='str'),
+        trap_source_port=dict(type='str')
+    )
+
+    argument_spec.update(ce_argument_spec)
+    module = SnmpProfile(argument_spec=argument_spec)
+    module.work()
+
+
+if __name__ == '__main__':
+    main()
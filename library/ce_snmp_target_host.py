@@ -172,22 +172,11 @@ updates:
 
 import sys
 import socket
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, \
-    ce_argument_spec, get_config, load_config
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, load_config, \
+    get_snmp_snapshot, get_snmp_rows, get_snmp_agent_config
 
 
-# get snmp version
-CE_GET_SNMP_VERSION = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <engine>
-          <version></version>
-        </engine>
-      </snmp>
-    </filter>
-"""
 # merge snmp version
 CE_MERGE_SNMP_VERSION = """
     <config>
@@ -199,21 +188,6 @@ CE_MERGE_SNMP_VERSION = """
     </config>
 """
 
-# get snmp target host
-CE_GET_SNMP_TARGET_HOST_HEADER = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <targetHosts>
-          <targetHost>
-            <nmsName></nmsName>
-"""
-CE_GET_SNMP_TARGET_HOST_TAIL = """
-          </targetHost>
-        </targetHosts>
-      </snmp>
-    </filter>
-"""
-
 # merge snmp target host
 CE_MERGE_SNMP_TARGET_HOST_HEADER = """
     <config>
@@ -334,13 +308,6 @@ class SnmpTargetHost(object):
         self.existing = dict()
         self.end_state = dict()
 
-    def netconf_get_config(self, conf_str):
-        """ Get configure by netconf """
-
-        xml_str = get_nc_config(self.module, conf_str)
-
-        return xml_str
-
     def netconf_set_config(self, conf_str):
         """ Set configure by netconf """
 
@@ -375,52 +342,52 @@ class SnmpTargetHost(object):
                     self.module.fail_json(
                         msg='Error: Do not support vpn_name and is_public_net at the same time.')
 
-            conf_str = CE_GET_SNMP_TARGET_HOST_HEADER
+            keys = ["nmsName"]
 
             if self.domain:
-                conf_str += "<domain></domain>"
+                keys.append("domain")
 
             if self.address:
                 if not check_ip_addr(ipaddr=self.address):
                     self.module.fail_json(
                         msg='Error: The host address [%s] is invalid.' % self.address)
-                conf_str += "<address></address>"
+                keys.append("address")
 
             if self.notify_type:
-                conf_str += "<notifyType></notifyType>"
+                keys.append("notifyType")
 
             if self.vpn_name:
                 if len(self.vpn_name) > 31 or len(self.vpn_name) < 1:
                     self.module.fail_json(
                         msg='Error: The len of vpn_name is out of [1 - 31].')
-                conf_str += "<vpnInstanceName></vpnInstanceName>"
+                keys.append("vpnInstanceName")
 
             if self.recv_port:
                 if int(self.recv_port) > 65535 or int(self.recv_port) < 0:
                     self.module.fail_json(
                         msg='Error: The value of recv_port is out of [0 - 65535].')
-                conf_str += "<portNumber></portNumber>"
+                keys.append("portNumber")
 
             if self.security_model:
-                conf_str += "<securityModel></securityModel>"
+                keys.append("securityModel")
 
             if self.security_name:
                 if len(self.security_name) > 32 or len(self.security_name) < 1:
                     self.module.fail_json(
                         msg='Error: The len of security_name is out of [1 - 32].')
-                conf_str += "<securityName></securityName>"
+                keys.append("securityName")
 
             if self.security_name_v3:
                 if len(self.security_name_v3) > 32 or len(self.security_name_v3) < 1:
                     self.module.fail_json(
                         msg='Error: The len of security_name_v3 is out of [1 - 32].')
-                conf_str += "<securityNameV3></securityNameV3>"
+                keys.append("securityNameV3")
 
             if self.security_level:
-                conf_str += "<securityLevel></securityLevel>"
+                keys.append("securityLevel")
 
             if self.is_public_net != 'no_use':
-                conf_str += "<isPublicNet></isPublicNet>"
+                keys.append("isPublicNet")
 
             if self.interface_name:
                 if len(self.interface_name) > 63 or len(self.interface_name) < 1:
@@ -436,35 +403,17 @@ class SnmpTargetHost(object):
                     self.module.fail_json(
                         msg='Error: Please input full name of interface_name.')
 
-                conf_str += "<interface-name></interface-name>"
+                keys.append("interface-name")
 
-            conf_str += CE_GET_SNMP_TARGET_HOST_TAIL
-            recv_xml = self.netconf_get_config(conf_str=conf_str)
+            result["target_host_info"] = get_snmp_rows(
+                get_snmp_snapshot(self.module)["target_hosts"], keys)
 
-            if "<data/>" in recv_xml:
+            if not result["target_host_info"]:
                 if self.state == "present":
                     same_flag = False
                 else:
                     delete_flag = False
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                target_host_info = root.findall(
-                    "data/snmp/targetHosts/targetHost")
-                if target_host_info:
-                    for tmp in target_host_info:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["nmsName", "domain", "address", "notifyType", "vpnInstanceName",
-                                            "portNumber", "securityModel", "securityName", "securityNameV3",
-                                            "securityLevel", "isPublicNet", "interface-name"]:
-                                tmp_dict[site.tag] = site.text
-
-                        result["target_host_info"].append(tmp_dict)
-
                 if result["target_host_info"]:
                     for tmp in result["target_host_info"]:
 
@@ -543,34 +492,12 @@ class SnmpTargetHost(object):
     def get_snmp_version(self):
         """ Get snmp version """
 
-        version = None
-        conf_str = CE_GET_SNMP_VERSION
-        recv_xml = self.netconf_get_config(conf_str=conf_str)
-
-        if "<data/>" in recv_xml:
-            pass
-
-        else:
-            xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-            root = ElementTree.fromstring(xml_str)
-            version_info = root.find("data/snmp/engine")
-            if version_info:
-                for site in version_info:
-                    if site.tag in ["version"]:
-                        version = site.text
-
-        return version
+        return get_snmp_snapshot(self.module)["version"]
 
     def cli_get_connect_port(self):
         """ Get connect port by cli """
 
-        regular = "| include snmp | include snmp-agent udp-port"
-        flags = list()
-        flags.append(regular)
-        tmp_cfg = get_config(self.module, flags)
+        tmp_cfg = get_snmp_agent_config(self.module, "udp-port")
 
         return tmp_cfg
 
@@ -900,6 +827,8 @@ class SnmpTargetHost(object):
             if self.cur_netconf_cfg["need_cfg"]:
                 self.delete_snmp_target_host()
 
+        if self.changed:
+            get_snmp_snapshot(self.module, refresh=True)
         self.check_netconf_args(self.end_netconf_cfg)
         self.get_end_state()
 
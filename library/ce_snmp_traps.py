@@ -137,7 +137,7 @@ updates:
 
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_config, load_config, ce_argument_spec, run_commands
+from ansible.module_utils.ce import load_config, ce_argument_spec, get_snmp_agent_config, run_commands
 
 
 class SnmpTraps(object):
@@ -180,11 +180,6 @@ class SnmpTraps(object):
         self.end_state["snmp-agent trap"] = []
         self.end_state["undo snmp-agent trap"] = []
 
-        commands = list()
-        cmd1 = 'display interface brief'
-        commands.append(cmd1)
-        self.interface = run_commands(self.module, commands)
-
     def check_args(self):
         """ Check invalid args """
 
@@ -199,7 +194,8 @@ class SnmpTraps(object):
 
         if self.interface_type and self.interface_number:
             tmp_interface = self.interface_type + self.interface_number
-            if tmp_interface not in self.interface[0]:
+            interface = run_commands(self.module, ['display interface brief'])
+            if tmp_interface not in interface[0]:
                 self.module.fail_json(
                     msg='Error: The interface %s is not in the device.' % tmp_interface)
 
@@ -311,12 +307,7 @@ class SnmpTraps(object):
     def cli_get_config(self):
         """ Get configure through cli """
 
-        regular = "| include snmp | include trap"
-        flags = list()
-        flags.append(regular)
-        tmp_cfg = get_config(self.module, flags)
-
-        return tmp_cfg
+        return get_snmp_agent_config(self.module, "trap")
 
     def set_trap_feature_name(self):
         """ Set feature name for trap """
@@ -167,27 +167,11 @@ updates:
     sample: ["snmp-agent remote-engineid 800007DB03389222111200 usm-user v3 wdz_snmp wdz_group acl 2000"]
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec, get_config
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, \
+    get_snmp_snapshot, get_snmp_rows, get_snmp_agent_config
 
 
-# get snmp v3 USM user
-CE_GET_SNMP_V3_USM_USER_HEADER = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <usmUsers>
-          <usmUser>
-            <userName></userName>
-            <remoteEngineID></remoteEngineID>
-            <engineID></engineID>
-"""
-CE_GET_SNMP_V3_USM_USER_TAIL = """
-          </usmUser>
-        </usmUsers>
-      </snmp>
-    </filter>
-"""
 # merge snmp v3 USM user
 CE_MERGE_SNMP_V3_USM_USER_HEADER = """
     <config>
@@ -237,22 +221,6 @@ CE_DELETE_SNMP_V3_USM_USER_TAIL = """
     </config>
 """
 
-# get snmp v3 aaa local user
-CE_GET_SNMP_V3_LOCAL_USER = """
-    <filter type="subtree">
-      <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <localUsers>
-          <localUser>
-            <userName></userName>
-            <authProtocol></authProtocol>
-            <authKey></authKey>
-            <privProtocol></privProtocol>
-            <privKey></privKey>
-          </localUser>
-        </localUsers>
-      </snmp>
-    </filter>
-"""
 # merge snmp v3 aaa local user
 CE_MERGE_SNMP_V3_LOCAL_USER = """
     <config>
@@ -306,16 +274,6 @@ CE_DELETE_SNMP_V3_LOCAL_USER = """
 class SnmpUser(object):
     """ Manages SNMP user configuration """
 
-    def netconf_get_config(self, **kwargs):
-        """ Get configure by netconf """
-
-        module = kwargs["module"]
-        conf_str = kwargs["conf_str"]
-
-        xml_str = get_nc_config(module, conf_str)
-
-        return xml_str
-
     def netconf_set_config(self, **kwargs):
         """ Set configure by netconf """
 
@@ -355,7 +313,7 @@ class SnmpUser(object):
                     module.fail_json(
                         msg='Error: The length of remote_engine_id %s is out of [10 - 64].' % remote_engine_id)
 
-            conf_str = CE_GET_SNMP_V3_USM_USER_HEADER
+            keys = ["userName", "remoteEngineID", "engineID"]
 
             if acl_number:
                 if acl_number.isdigit():
@@ -367,62 +325,46 @@ class SnmpUser(object):
                         module.fail_json(
                             msg='Error: The length of acl_number %s is out of [1 - 32].' % acl_number)
 
-                conf_str += "<aclNumber></aclNumber>"
+                keys.append("aclNumber")
 
             if user_group:
                 if len(user_group) > 32 or len(user_group) == 0:
                     module.fail_json(
                         msg='Error: The length of user_group %s is out of [1 - 32].' % user_group)
 
-                conf_str += "<groupName></groupName>"
+                keys.append("groupName")
 
             if auth_protocol:
-                conf_str += "<authProtocol></authProtocol>"
+                keys.append("authProtocol")
 
             if auth_key:
                 if len(auth_key) > 255 or len(auth_key) == 0:
                     module.fail_json(
                         msg='Error: The length of auth_key %s is out of [1 - 255].' % auth_key)
 
-                conf_str += "<authKey></authKey>"
+                keys.append("authKey")
 
             if priv_protocol:
                 if not auth_protocol:
                     module.fail_json(
                         msg='Error: Please input auth_protocol at the same time.')
 
-                conf_str += "<privProtocol></privProtocol>"
+                keys.append("privProtocol")
 
             if priv_key:
                 if len(priv_key) > 255 or len(priv_key) == 0:
                     module.fail_json(
                         msg='Error: The length of priv_key %s is out of [1 - 255].' % priv_key)
-                conf_str += "<privKey></privKey>"
+                keys.append("privKey")
 
-            conf_str += CE_GET_SNMP_V3_USM_USER_TAIL
-            recv_xml = self.netconf_get_config(module=module, conf_str=conf_str)
+            result["usm_user_info"] = get_snmp_rows(
+                get_snmp_snapshot(module)["usm_users"], keys)
 
-            if "<data/>" in recv_xml:
+            if not result["usm_user_info"]:
                 if state == "present":
                     need_cfg = True
 
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                usm_user_info = root.findall("data/snmp/usmUsers/usmUser")
-                if usm_user_info:
-                    for tmp in usm_user_info:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["userName", "remoteEngineID", "engineID", "groupName", "authProtocol",
-                                            "authKey", "privProtocol", "privKey", "aclNumber"]:
-                                tmp_dict[site.tag] = site.text
-
-                        result["usm_user_info"].append(tmp_dict)
-
                 if result["usm_user_info"]:
                     for tmp in result["usm_user_info"]:
                         if "userName" in tmp.keys():
@@ -542,30 +484,15 @@ class SnmpUser(object):
                 module.fail_json(
                     msg='Error: The length of priv_key %s is out of [1 - 255].' % priv_key)
 
-            conf_str = CE_GET_SNMP_V3_LOCAL_USER
-            recv_xml = self.netconf_get_config(module=module, conf_str=conf_str)
+            result["local_user_info"] = get_snmp_rows(
+                get_snmp_snapshot(module)["local_users"],
+                ["userName", "authProtocol", "authKey", "privProtocol", "privKey"])
 
-            if "<data/>" in recv_xml:
+            if not result["local_user_info"]:
                 if state == "present":
                     need_cfg = True
 
             else:
-                xml_str = recv_xml.replace('\r', '').replace('\n', '').\
-                    replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-                    replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-                root = ElementTree.fromstring(xml_str)
-                local_user_info = root.findall(
-                    "data/snmp/localUsers/localUser")
-                if local_user_info:
-                    for tmp in local_user_info:
-                        tmp_dict = dict()
-                        for site in tmp:
-                            if site.tag in ["userName", "authProtocol", "authKey", "privProtocol", "privKey"]:
-                                tmp_dict[site.tag] = site.text
-
-                        result["local_user_info"].append(tmp_dict)
-
                 if result["local_user_info"]:
                     for tmp in result["local_user_info"]:
                         if "userName" in tmp.keys():
@@ -908,10 +835,7 @@ class SnmpUser(object):
 
         module = kwargs["module"]
 
-        regular = "| include snmp | include local-engineid"
-        flags = list()
-        flags.append(regular)
-        tmp_cfg = get_config(module, flags)
+        tmp_cfg = get_snmp_agent_config(module, "local-engineid")
 
         if tmp_cfg:
             tmp_data = tmp_cfg.split(r"snmp-agent local-engineid ")
@@ -1042,6 +966,8 @@ def main():
             updates.append(cmd)
 
     # state exist snmp v3 user config
+    if changed:
+        get_snmp_snapshot(module, refresh=True)
     snmp_v3_usm_user_rst = snmp_user_obj.check_snmp_v3_usm_user_args(
         module=module)
     end_tmp = dict()
@@ -131,7 +131,7 @@ end_state:
     description: k/v pairs of aaa params after module execution
     returned: always
     type: dict
-    sample: {"StartupInfos": null}
+    sample: {"StartupInfos": [{"nextStartupFile": "flash:/2.cfg", "position": "5"}]}
 updates:
     description: command sent to the device
     returned: always
@@ -139,29 +139,10 @@ updates:
     sample: {"startup patch 2.PAT all"}
 '''
 
-import re
+import os
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, ce_argument_spec, run_commands
-
-
-CE_NC_GET_STARTUP_INFO = """
-<filter type="subtree">
-  <cfg xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <startupInfos>
-      <startupInfo>
-        <position></position>
-        <configedSysSoft></configedSysSoft>
-        <curSysSoft></curSysSoft>
-        <nextSysSoft></nextSysSoft>
-        <curStartupFile></curStartupFile>
-        <nextStartupFile></nextStartupFile>
-        <curPatchFile></curPatchFile>
-        <nextPatchFile></nextPatchFile>
-      </startupInfo>
-    </startupInfos>
-  </cfg>
-</filter>
-"""
+from ansible.module_utils.ce import get_file_startup_index, clear_file_startup_index, \
+    ce_argument_spec, run_commands
 
 
 class StartUp(object):
@@ -191,6 +172,7 @@ class StartUp(object):
 
         # system startup info
         self.startup_info = None
+        self.file_index = None
 
     def init_module(self):
         """ init module """
@@ -204,30 +186,54 @@ class StartUp(object):
         if "<ok/>" not in xml_str:
             self.module.fail_json(msg='Error: %s failed.' % xml_name)
 
-    def get_startup_dict(self):
-        """ get rollback attributes dict."""
+    def get_startup_dict(self, refresh=False):
+        """ get startup attributes dict from the flash and startup index."""
 
-        startup_info = dict()
-        conf_str = CE_NC_GET_STARTUP_INFO
-        xml_str = get_nc_config(self.module, conf_str)
+        self.file_index = get_file_startup_index(self.module, refresh=refresh)
 
+        startup_info = dict()
         startup_info["StartupInfos"] = list()
-        if "<data/>" in xml_str:
-            return startup_info
-        else:
-            re_find = re.findall(r'.*<position>(.*)</position>.*\s*'
-                                 r'<nextStartupFile>(.*)</nextStartupFile>.*\s*'
-                                 r'<configedSysSoft>(.*)</configedSysSoft>.*\s*'
-                                 r'<curSysSoft>(.*)</curSysSoft>.*\s*'
-                                 r'<nextSysSoft>(.*)</nextSysSoft>.*\s*'
-                                 r'<curStartupFile>(.*)</curStartupFile>.*\s*'
-                                 r'<curPatchFile>(.*)</curPatchFile>.*\s*'
-                                 r'<nextPatchFile>(.*)</nextPatchFile>.*', xml_str)
-            for mem in re_find:
-                startup_info["StartupInfos"].append(
-                    dict(position=mem[0], nextStartupFile=mem[1], configSysSoft=mem[2], curentSysSoft=mem[3],
-                         nextSysSoft=mem[4], curentStartupFile=mem[5], curentPatchFile=mem[6], nextPatchFile=mem[7]))
-            return startup_info
+        for mem in self.file_index["startup"]:
+            startup_info["StartupInfos"].append(
+                dict(position=mem.get("position"), nextStartupFile=mem.get("nextStartupFile"),
+                     configSysSoft=mem.get("configedSysSoft"), curentSysSoft=mem.get("curSysSoft"),
+                     nextSysSoft=mem.get("nextSysSoft"), curentStartupFile=mem.get("curStartupFile"),
+                     curentPatchFile=mem.get("curPatchFile"), nextPatchFile=mem.get("nextPatchFile")))
+        return startup_info
+
+    def get_flash_filename(self, filename):
+        """Gets the file name relative to the flash root, None if it is elsewhere"""
+
+        if filename.startswith("flash:/"):
+            filename = filename[len("flash:/"):]
+        if "/" in filename or ":" in filename:
+            return None
+        return filename
+
+    def is_file_exist(self, filename):
+        """Whether the file is listed in the flash root directory"""
+
+        name = self.get_flash_filename(filename)
+        if name is None or not self.file_index["files"]:
+            # not in the indexed directory, let the device validate it
+            return True
+        return name in self.file_index["files"]
+
+    def is_startup_file_change(self, key, filename):
+        """Whether the next startup file differs on any selected position"""
+
+        name = self.get_flash_filename(filename) or filename
+        infos = self.startup_info["StartupInfos"]
+        if self.slot and self.slot.isdigit():
+            infos = [info for info in infos if info.get("position") == self.slot]
+        if not infos:
+            return True
+
+        for info in infos:
+            next_file = info.get(key) or ""
+            if os.path.basename(next_file) != os.path.basename(name):
+                return True
+        return False
 
     def get_cfg_filename_type(self, filename):
         """Gets the type of cfg filename, such as cfg, zip, dat..."""
@@ -286,84 +292,69 @@ class StartUp(object):
 
     def startup_next_cfg_file(self):
         """set next cfg file"""
-        commands = list()
-        cmd = {'output': None, 'command': ''}
+
         if self.slot:
-            cmd['command'] = "startup saved-configuration %s slot %s" % (
+            cmd = "startup saved-configuration %s slot %s" % (
                 self.cfg_file, self.slot)
-            commands.append(cmd)
-            self.updates_cmd.append(
-                "startup saved-configuration %s slot %s" % (self.cfg_file, self.slot))
-            run_commands(self.module, commands)
-            self.changed = True
         else:
-            cmd['command'] = "startup saved-configuration %s" % self.cfg_file
-            commands.append(cmd)
-            self.updates_cmd.append(
-                "startup saved-configuration %s" % self.cfg_file)
-            run_commands(self.module, commands)
-            self.changed = True
+            cmd = "startup saved-configuration %s" % self.cfg_file
+        self.updates_cmd.append(cmd)
 
     def startup_next_software_file(self):
         """set next software file"""
-        commands = list()
-        cmd = {'output': None, 'command': ''}
+
         if self.slot:
             if self.slot == "all" or self.slot == "slave-board":
-                cmd['command'] = "startup system-software %s %s" % (
+                cmd = "startup system-software %s %s" % (
                     self.software_file, self.slot)
-                commands.append(cmd)
-                self.updates_cmd.append(
-                    "startup system-software %s %s" % (self.software_file, self.slot))
-                run_commands(self.module, commands)
-                self.changed = True
             else:
-                cmd['command'] = "startup system-software %s slot %s" % (
+                cmd = "startup system-software %s slot %s" % (
                     self.software_file, self.slot)
-                commands.append(cmd)
-                self.updates_cmd.append(
-                    "startup system-software %s slot %s" % (self.software_file, self.slot))
-                run_commands(self.module, commands)
-                self.changed = True
-
-        if not self.slot:
-            cmd['command'] = "startup system-software %s" % self.software_file
-            commands.append(cmd)
-            self.updates_cmd.append(
-                "startup system-software %s" % self.software_file)
-            run_commands(self.module, commands)
-            self.changed = True
+        else:
+            cmd = "startup system-software %s" % self.software_file
+        self.updates_cmd.append(cmd)
 
     def startup_next_pat_file(self):
         """set next patch file"""
 
-        commands = list()
-        cmd = {'output': None, 'command': ''}
         if self.slot:
             if self.slot == "all":
-                cmd['command'] = "startup patch %s %s" % (
-                    self.patch_file, self.slot)
-                commands.append(cmd)
-                self.updates_cmd.append(
-                    "startup patch %s %s" % (self.patch_file, self.slot))
-                run_commands(self.module, commands)
-                self.changed = True
+                cmd = "startup patch %s %s" % (self.patch_file, self.slot)
             else:
-                cmd['command'] = "startup patch %s slot %s" % (
+                cmd = "startup patch %s slot %s" % (
                     self.patch_file, self.slot)
-                commands.append(cmd)
-                self.updates_cmd.append(
-                    "startup patch %s slot %s" % (self.patch_file, self.slot))
-                run_commands(self.module, commands)
-                self.changed = True
-
-        if not self.slot:
-            cmd['command'] = "startup patch %s" % self.patch_file
-            commands.append(cmd)
-            self.updates_cmd.append(
-                "startup patch %s" % self.patch_file)
+        else:
+            cmd = "startup patch %s" % self.patch_file
+        self.updates_cmd.append(cmd)
+
+    def check_file_exist(self):
+        """Check the startup files are present on the device"""
+
+        for filename in [self.cfg_file, self.software_file, self.patch_file]:
+            if filename and not self.is_file_exist(filename):
+                self.module.fail_json(
+                    msg='Error: The file %s does not exist on the device.' % filename)
+
+    def startup_next_files(self):
+        """set all changed next startup files in one cli session"""
+
+        if self.cfg_file and self.is_startup_file_change("nextStartupFile", self.cfg_file):
+            self.startup_next_cfg_file()
+        if self.software_file and self.is_startup_file_change("nextSysSoft", self.software_file):
+            self.startup_next_software_file()
+        if self.patch_file and self.is_startup_file_change("nextPatchFile", self.patch_file):
+            self.startup_next_pat_file()
+
+        if not self.updates_cmd:
+            return
+
+        commands = list()
+        for cmd in self.updates_cmd:
+            commands.append({'output': None, 'command': cmd})
+        if not self.module.check_mode:
             run_commands(self.module, commands)
-            self.changed = True
+            clear_file_startup_index()
+        self.changed = True
 
     def check_params(self):
         """Check all input params"""
@@ -418,7 +409,10 @@ class StartUp(object):
 
     def get_end_state(self):
         """get end state info"""
-        self.end_state["StartupInfos"] = None
+
+        if not self.startup_info:
+            return
+        self.end_state["StartupInfos"] = self.startup_info["StartupInfos"]
 
     def work(self):
         """worker"""
@@ -427,13 +421,9 @@ class StartUp(object):
         self.get_proposed()
         self.startup_info = self.get_startup_dict()
         self.get_existing()
-        if self.cfg_file:
-            self.startup_next_cfg_file()
-        if self.software_file:
-            self.startup_next_software_file()
-        if self.patch_file:
-            self.startup_next_pat_file()
-        if self.action == "display":
+        self.check_file_exist()
+        self.startup_next_files()
+        if self.changed or self.action == "display":
             self.startup_info = self.get_startup_dict()
 
         self.get_end_state()
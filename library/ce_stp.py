@@ -90,6 +90,15 @@ options:
               if the value is a special name, only support input the full name.
         required: false
         default: null
+    interfaces:
+        description:
+            - A list of interface full names or shell-style patterns, such as C(10GE1/0/*),
+              edged_port, bpdu_filter, cost, root_protection and loop_protection are applied
+              to every matched switch port in one commit.
+              Ports matched by a pattern that are not in switch mode are skipped.
+              Can not be used with interface.
+        required: false
+        default: null
     edged_port:
         description:
             - Set the current port as an edge port.
@@ -161,6 +170,16 @@ EXAMPLES = '''
       state:  present
       bpdu_protection:  disable
       provider: "{{ cli }}"
+
+  - name: "Set access ports as edge ports with bpdu filter"
+    ce_stp:
+      state:  present
+      interfaces:
+        - 10GE1/0/*
+        - 40GE2/0/1
+      edged_port:  enable
+      bpdu_filter:  enable
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -194,7 +213,138 @@ updates:
 
 import re
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_config, load_config, ce_argument_spec
+from ansible.module_utils.ce import get_config, load_config, ce_argument_spec, \
+    is_interface_pattern, match_interfaces
+
+
+STP_GLOBAL_KEYS = ["stp_mode", "stp_enable", "stp_converge", "bpdu_protection", "tc_protection",
+                   "tc_protection_interval", "tc_protection_threshold"]
+STP_PORT_KEYS = ["edged_port", "bpdu_filter", "cost", "root_protection", "loop_protection"]
+
+SWITCH_PORT_TYPE = ('ge', '10ge', '25ge',
+                    '4x10ge', '40ge', '100ge', 'eth-trunk')
+
+
+def get_interface_type(interface):
+    """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
+
+    if interface is None:
+        return None
+
+    iftype = None
+
+    if interface.upper().startswith('GE'):
+        iftype = 'ge'
+    elif interface.upper().startswith('10GE'):
+        iftype = '10ge'
+    elif interface.upper().startswith('25GE'):
+        iftype = '25ge'
+    elif interface.upper().startswith('4X10GE'):
+        iftype = '4x10ge'
+    elif interface.upper().startswith('40GE'):
+        iftype = '40ge'
+    elif interface.upper().startswith('100GE'):
+        iftype = '100ge'
+    elif interface.upper().startswith('VLANIF'):
+        iftype = 'vlanif'
+    elif interface.upper().startswith('LOOPBACK'):
+        iftype = 'loopback'
+    elif interface.upper().startswith('METH'):
+        iftype = 'meth'
+    elif interface.upper().startswith('ETH-TRUNK'):
+        iftype = 'eth-trunk'
+    elif interface.upper().startswith('VBDIF'):
+        iftype = 'vbdif'
+    elif interface.upper().startswith('NVE'):
+        iftype = 'nve'
+    elif interface.upper().startswith('TUNNEL'):
+        iftype = 'tunnel'
+    elif interface.upper().startswith('ETHERNET'):
+        iftype = 'ethernet'
+    elif interface.upper().startswith('FCOE-PORT'):
+        iftype = 'fcoe-port'
+    elif interface.upper().startswith('FABRIC-PORT'):
+        iftype = 'fabric-port'
+    elif interface.upper().startswith('STACK-PORT'):
+        iftype = 'stack-port'
+    elif interface.upper().startswith('NULL'):
+        iftype = 'null'
+    else:
+        return None
+
+    return iftype.lower()
+
+
+def is_portswitch_enalbed(iftype):
+    """"[undo] portswitch"""
+
+    return bool(iftype in SWITCH_PORT_TYPE)
+
+
+def parse_stp_config(cfg):
+    """ Parse global and all interfaces' stp configuration in one pass """
+
+    stp_model = dict(stp_mode="mstp", stp_enable="enable", stp_converge="normal",
+                     bpdu_protection="disable", tc_protection="disable",
+                     tc_protection_interval="null", tc_protection_threshold="1",
+                     edged_port="disable", bpdu_filter="disable", interfaces=dict())
+
+    port = None
+    for line in cfg.splitlines():
+        if line.startswith("interface "):
+            name = line[len("interface "):].strip()
+            # sub-interfaces and logical interfaces are never switch ports
+            portswitch = "." not in name and is_portswitch_enalbed(get_interface_type(name))
+            port = dict(interface=name, portswitch=portswitch,
+                        edged_port="disable", bpdu_filter="disable", cost="null",
+                        root_protection="disable", loop_protection="disable")
+            stp_model["interfaces"][port["interface"].upper()] = port
+            continue
+
+        if not line.startswith(" "):
+            # global configuration or end of an interface section
+            port = None
+            args = line.strip().split()
+            if line.startswith("stp mode ") and len(args) == 3:
+                stp_model["stp_mode"] = args[2]
+            elif args == ["stp", "disable"]:
+                stp_model["stp_enable"] = "disable"
+            elif args == ["stp", "converge", "fast"]:
+                stp_model["stp_converge"] = "fast"
+            elif args == ["stp", "bpdu-protection"]:
+                stp_model["bpdu_protection"] = "enable"
+            elif args == ["stp", "tc-protection"]:
+                stp_model["tc_protection"] = "enable"
+            elif line.startswith("stp tc-protection interval ") and len(args) == 4:
+                stp_model["tc_protection_interval"] = args[3]
+            elif line.startswith("stp tc-protection threshold ") and len(args) == 4:
+                stp_model["tc_protection_threshold"] = args[3]
+            elif args == ["stp", "edged-port", "default"]:
+                stp_model["edged_port"] = "enable"
+            elif args == ["stp", "bpdu-filter", "default"]:
+                stp_model["bpdu_filter"] = "enable"
+            continue
+
+        if port is None:
+            continue
+        line = line.strip()
+        if line == "undo portswitch":
+            port["portswitch"] = False
+        elif line == "stp edged-port enable":
+            port["edged_port"] = "enable"
+        elif line == "stp bpdu-filter enable":
+            port["bpdu_filter"] = "enable"
+        elif line == "stp root-protection":
+            port["root_protection"] = "enable"
+        elif line == "stp loop-protection":
+            port["loop_protection"] = "enable"
+        else:
+            # cost of the default instance
+            tmp_value = re.findall(r'^stp instance 0 cost (\d+)$', line)
+            if tmp_value:
+                port["cost"] = tmp_value[0]
+
+    return stp_model
 
 
 class Stp(object):
@@ -206,12 +356,14 @@ class Stp(object):
         # module
         argument_spec = kwargs["argument_spec"]
         self.spec = argument_spec
-        self.module = AnsibleModule(argument_spec=self.spec, supports_check_mode=True)
+        self.module = AnsibleModule(argument_spec=self.spec,
+                                    mutually_exclusive=[['interface', 'interfaces']],
+                                    supports_check_mode=True)
 
         # config
         self.cur_cfg = dict()
-        self.stp_cfg = None
-        self.interface_stp_cfg = None
+        self.stp_model = None
+        self.ports = list()
 
         # module args
         self.state = self.module.params['state'] or None
@@ -219,6 +371,7 @@ class Stp(object):
         self.stp_enable = self.module.params['stp_enable'] or None
         self.stp_converge = self.module.params['stp_converge'] or None
         self.interface = self.module.params['interface'] or None
+        self.interfaces = self.module.params['interfaces'] or None
         self.edged_port = self.module.params['edged_port'] or None
         self.bpdu_filter = self.module.params['bpdu_filter'] or None
         self.cost = self.module.params['cost'] or None
@@ -244,32 +397,77 @@ class Stp(object):
             load_config(self.module, commands)
 
     def cli_get_stp_config(self):
-        """ Cli get stp configuration """
+        """ Cli get global and all interfaces' stp configuration """
 
-        regular = "| include stp"
+        self.stp_model = parse_stp_config(get_config(self.module))
 
-        flags = list()
-        flags.append(regular)
-        self.stp_cfg = get_config(self.module, flags)
+    def get_port_model(self, interface):
+        """ Get stp model of a switch port """
 
-    def cli_get_interface_stp_config(self):
-        """ Cli get interface's stp configuration """
+        port = self.stp_model["interfaces"].get(interface.upper())
+        if not port:
+            self.module.fail_json(
+                msg='Error: The interface %s is not exist.' % interface)
 
-        if self.interface:
-            regular = "| ignore-case section include ^interface %s$" % self.interface
-            flags = list()
-            flags.append(regular)
-            tmp_cfg = get_config(self.module, flags)
+        if not port["portswitch"]:
+            self.module.fail_json(
+                msg='Error: The interface %s is not switch mode.' % interface)
 
-            if not tmp_cfg:
-                self.module.fail_json(
-                    msg='Error: The interface %s is not exist.' % self.interface)
+        return port
 
-            if "undo portswitch" in tmp_cfg:
-                self.module.fail_json(
-                    msg='Error: The interface %s is not switch mode.' % self.interface)
+    def get_ports(self):
+        """ Get stp models of all switch ports matched by interfaces """
+
+        ports = list()
+        for interface in self.interfaces:
+            if not is_interface_pattern(interface):
+                port = self.get_port_model(interface)
+                if port not in ports:
+                    ports.append(port)
+                continue
 
-            self.interface_stp_cfg = tmp_cfg
+            names = match_interfaces(sorted(self.stp_model["interfaces"]), interface)
+            for name in names:
+                port = self.stp_model["interfaces"][name]
+                if port["portswitch"] and port not in ports:
+                    ports.append(port)
+            if not names:
+                self.module.fail_json(
+                    msg='Error: No interface matches %s.' % interface)
+
+        return ports
+
+    def get_stp_state(self):
+        """ Get current value of proposed options from the stp model """
+
+        state = dict()
+        for key in STP_GLOBAL_KEYS:
+            if getattr(self, key):
+                state[key] = self.stp_model[key]
+
+        if self.interface == "all":
+            for key in ["edged_port", "bpdu_filter"]:
+                if getattr(self, key):
+                    state[key] = self.stp_model[key]
+        elif self.interface:
+            port = self.get_port_model(self.interface)
+            for key in STP_PORT_KEYS:
+                if getattr(self, key):
+                    state[key] = port[key]
+            # root_protection and loop_protection should get configuration at the same time
+            if self.root_protection or self.loop_protection:
+                state["root_protection"] = port["root_protection"]
+                state["loop_protection"] = port["loop_protection"]
+        elif self.interfaces:
+            state["interfaces"] = list()
+            for port in self.ports:
+                port_state = dict(interface=port["interface"])
+                for key in STP_PORT_KEYS:
+                    if getattr(self, key):
+                        port_state[key] = port[key]
+                state["interfaces"].append(port_state)
+
+        return state
 
     def check_params(self):
         """ Check module params """
@@ -302,7 +500,7 @@ class Stp(object):
                     msg='Error: The tc_protection_threshold is not digit.')
 
         if self.root_protection or self.loop_protection or self.cost:
-            if not self.interface:
+            if not self.interface and not self.interfaces:
                 self.module.fail_json(
                     msg='Error: Please input interface.')
             elif self.interface == "all":
@@ -315,10 +513,16 @@ class Stp(object):
                     msg='Error: Can not enable root_protection and loop_protection at the same interface.')
 
         if self.edged_port or self.bpdu_filter:
-            if not self.interface:
+            if not self.interface and not self.interfaces:
                 self.module.fail_json(
                     msg='Error: Please input interface.')
 
+        if self.interfaces:
+            if not (self.edged_port or self.bpdu_filter or self.cost or
+                    self.root_protection or self.loop_protection):
+                self.module.fail_json(
+                    msg='Error: Please input an interface option for interfaces.')
+
     def get_proposed(self):
         """ Get module proposed """
 
@@ -332,6 +536,8 @@ class Stp(object):
             self.proposed["stp_converge"] = self.stp_converge
         if self.interface:
             self.proposed["interface"] = self.interface
+        if self.interfaces:
+            self.proposed["interfaces"] = self.interfaces
         if self.edged_port:
             self.proposed["edged_port"] = self.edged_port
         if self.bpdu_filter:
@@ -355,234 +561,90 @@ class Stp(object):
         """ Get existing configuration """
 
         self.cli_get_stp_config()
-        if self.interface and self.interface != "all":
-            self.cli_get_interface_stp_config()
-
-        if self.stp_mode:
-            if "stp mode stp" in self.stp_cfg:
-                self.cur_cfg["stp_mode"] = "stp"
-                self.existing["stp_mode"] = "stp"
-            elif "stp mode rstp" in self.stp_cfg:
-                self.cur_cfg["stp_mode"] = "rstp"
-                self.existing["stp_mode"] = "rstp"
-            else:
-                self.cur_cfg["stp_mode"] = "mstp"
-                self.existing["stp_mode"] = "mstp"
-
-        if self.stp_enable:
-            if "stp disable" in self.stp_cfg:
-                self.cur_cfg["stp_enable"] = "disable"
-                self.existing["stp_enable"] = "disable"
-            else:
-                self.cur_cfg["stp_enable"] = "enable"
-                self.existing["stp_enable"] = "enable"
-
-        if self.stp_converge:
-            if "stp converge fast" in self.stp_cfg:
-                self.cur_cfg["stp_converge"] = "fast"
-                self.existing["stp_converge"] = "fast"
-            else:
-                self.cur_cfg["stp_converge"] = "normal"
-                self.existing["stp_converge"] = "normal"
-
-        if self.edged_port:
-            if self.interface == "all":
-                if "stp edged-port default" in self.stp_cfg:
-                    self.cur_cfg["edged_port"] = "enable"
-                    self.existing["edged_port"] = "enable"
-                else:
-                    self.cur_cfg["edged_port"] = "disable"
-                    self.existing["edged_port"] = "disable"
-            else:
-                if "stp edged-port enable" in self.interface_stp_cfg:
-                    self.cur_cfg["edged_port"] = "enable"
-                    self.existing["edged_port"] = "enable"
-                else:
-                    self.cur_cfg["edged_port"] = "disable"
-                    self.existing["edged_port"] = "disable"
-
-        if self.bpdu_filter:
-            if self.interface == "all":
-                if "stp bpdu-filter default" in self.stp_cfg:
-                    self.cur_cfg["bpdu_filter"] = "enable"
-                    self.existing["bpdu_filter"] = "enable"
-                else:
-                    self.cur_cfg["bpdu_filter"] = "disable"
-                    self.existing["bpdu_filter"] = "disable"
-            else:
-                if "stp bpdu-filter enable" in self.interface_stp_cfg:
-                    self.cur_cfg["bpdu_filter"] = "enable"
-                    self.existing["bpdu_filter"] = "enable"
-                else:
-                    self.cur_cfg["bpdu_filter"] = "disable"
-                    self.existing["bpdu_filter"] = "disable"
-
-        if self.bpdu_protection:
-            if "stp bpdu-protection" in self.stp_cfg:
-                self.cur_cfg["bpdu_protection"] = "enable"
-                self.existing["bpdu_protection"] = "enable"
-            else:
-                self.cur_cfg["bpdu_protection"] = "disable"
-                self.existing["bpdu_protection"] = "disable"
-
-        if self.tc_protection:
-            if "stp tc-protection" in self.stp_cfg:
-                self.cur_cfg["tc_protection"] = "enable"
-                self.existing["tc_protection"] = "enable"
-            else:
-                self.cur_cfg["tc_protection"] = "disable"
-                self.existing["tc_protection"] = "disable"
-
-        if self.tc_protection_interval:
-            if "stp tc-protection interval" in self.stp_cfg:
-                tmp_value = re.findall(r'stp tc-protection interval (.*)', self.stp_cfg)
-                if not tmp_value:
-                    self.module.fail_json(
-                        msg='Error: Can not find tc-protection interval on the device.')
-                self.cur_cfg["tc_protection_interval"] = tmp_value[0]
-                self.existing["tc_protection_interval"] = tmp_value[0]
-            else:
-                self.cur_cfg["tc_protection_interval"] = "null"
-                self.existing["tc_protection_interval"] = "null"
-
-        if self.tc_protection_threshold:
-            if "stp tc-protection threshold" in self.stp_cfg:
-                tmp_value = re.findall(r'stp tc-protection threshold (.*)', self.stp_cfg)
-                if not tmp_value:
-                    self.module.fail_json(
-                        msg='Error: Can not find tc-protection threshold on the device.')
-                self.cur_cfg["tc_protection_threshold"] = tmp_value[0]
-                self.existing["tc_protection_threshold"] = tmp_value[0]
-            else:
-                self.cur_cfg["tc_protection_threshold"] = "1"
-                self.existing["tc_protection_threshold"] = "1"
-
-        if self.cost:
-            tmp_value = re.findall(r'stp instance (.*) cost (.*)', self.interface_stp_cfg)
-            if not tmp_value:
-                self.cur_cfg["cost"] = "null"
-                self.existing["cost"] = "null"
-            else:
-                self.cur_cfg["cost"] = tmp_value[0][1]
-                self.existing["cost"] = tmp_value[0][1]
-
-        # root_protection and loop_protection should get configuration at the same time
-        if self.root_protection or self.loop_protection:
-            if "stp root-protection" in self.interface_stp_cfg:
-                self.cur_cfg["root_protection"] = "enable"
-                self.existing["root_protection"] = "enable"
-            else:
-                self.cur_cfg["root_protection"] = "disable"
-                self.existing["root_protection"] = "disable"
+        if self.interfaces:
+            self.ports = self.get_ports()
+        self.existing = self.get_stp_state()
 
-            if "stp loop-protection" in self.interface_stp_cfg:
-                self.cur_cfg["loop_protection"] = "enable"
-                self.existing["loop_protection"] = "enable"
-            else:
-                self.cur_cfg["loop_protection"] = "disable"
-                self.existing["loop_protection"] = "disable"
+        self.cur_cfg = dict((key, self.stp_model[key]) for key in STP_GLOBAL_KEYS)
+        self.cur_cfg["edged_port"] = self.stp_model["edged_port"]
+        self.cur_cfg["bpdu_filter"] = self.stp_model["bpdu_filter"]
+        if self.interface and self.interface != "all":
+            self.cur_cfg.update(self.get_port_model(self.interface))
 
     def get_end_state(self):
         """ Get end state """
 
-        self.cli_get_stp_config()
-        if self.interface and self.interface != "all":
-            self.cli_get_interface_stp_config()
+        if self.changed and not self.module.check_mode:
+            self.cli_get_stp_config()
+            if self.interfaces:
+                ports = [port["interface"].upper() for port in self.ports]
+                self.ports = [self.stp_model["interfaces"][name] for name in ports]
+        self.end_state = self.get_stp_state()
 
-        if self.stp_mode:
-            if "stp mode stp" in self.stp_cfg:
-                self.end_state["stp_mode"] = "stp"
-            elif "stp mode rstp" in self.stp_cfg:
-                self.end_state["stp_mode"] = "rstp"
-            else:
-                self.end_state["stp_mode"] = "mstp"
-
-        if self.stp_enable:
-            if "stp disable" in self.stp_cfg:
-                self.end_state["stp_enable"] = "disable"
-            else:
-                self.end_state["stp_enable"] = "enable"
-
-        if self.stp_converge:
-            if "stp converge fast" in self.stp_cfg:
-                self.end_state["stp_converge"] = "fast"
-            else:
-                self.end_state["stp_converge"] = "normal"
+    def get_port_cmds(self, port_cfg):
+        """ Get stp commands of a switch port """
 
+        cmds = list()
         if self.edged_port:
-            if self.interface == "all":
-                if "stp edged-port default" in self.stp_cfg:
-                    self.end_state["edged_port"] = "enable"
+            if self.edged_port != port_cfg["edged_port"]:
+                if self.edged_port == "enable":
+                    cmds.append("stp edged-port enable")
                 else:
-                    self.end_state["edged_port"] = "disable"
-            else:
-                if "stp edged-port enable" in self.interface_stp_cfg:
-                    self.end_state["edged_port"] = "enable"
-                else:
-                    self.end_state["edged_port"] = "disable"
+                    cmds.append("undo stp edged-port")
 
         if self.bpdu_filter:
-            if self.interface == "all":
-                if "stp bpdu-filter default" in self.stp_cfg:
-                    self.end_state["bpdu_filter"] = "enable"
+            if self.bpdu_filter != port_cfg["bpdu_filter"]:
+                if self.bpdu_filter == "enable":
+                    cmds.append("stp bpdu-filter enable")
                 else:
-                    self.end_state["bpdu_filter"] = "disable"
-            else:
-                if "stp bpdu-filter enable" in self.interface_stp_cfg:
-                    self.end_state["bpdu_filter"] = "enable"
+                    cmds.append("undo stp bpdu-filter")
+
+        if self.root_protection:
+            if self.root_protection == "enable" and port_cfg["loop_protection"] == "enable":
+                self.module.fail_json(
+                    msg='Error: The interface %s has enable loop_protection, '
+                        'can not enable root_protection.' % port_cfg["interface"])
+            if self.root_protection != port_cfg["root_protection"]:
+                if self.root_protection == "enable":
+                    cmds.append("stp root-protection")
                 else:
-                    self.end_state["bpdu_filter"] = "disable"
+                    cmds.append("undo stp root-protection")
 
-        if self.bpdu_protection:
-            if "stp bpdu-protection" in self.stp_cfg:
-                self.end_state["bpdu_protection"] = "enable"
-            else:
-                self.end_state["bpdu_protection"] = "disable"
+        if self.loop_protection:
+            if self.loop_protection == "enable" and port_cfg["root_protection"] == "enable":
+                self.module.fail_json(
+                    msg='Error: The interface %s has enable root_protection, '
+                        'can not enable loop_protection.' % port_cfg["interface"])
+            if self.loop_protection != port_cfg["loop_protection"]:
+                if self.loop_protection == "enable":
+                    cmds.append("stp loop-protection")
+                else:
+                    cmds.append("undo stp loop-protection")
 
-        if self.tc_protection:
-            if "stp tc-protection" in self.stp_cfg:
-                self.end_state["tc_protection"] = "enable"
-            else:
-                self.end_state["tc_protection"] = "disable"
+        if self.cost:
+            if self.state == "present" and self.cost != port_cfg["cost"]:
+                cmds.append("stp cost %s" % self.cost)
+            elif self.state == "absent" and self.cost == port_cfg["cost"]:
+                cmds.append("undo stp cost")
 
-        if self.tc_protection_interval:
-            if "stp tc-protection interval" in self.stp_cfg:
-                tmp_value = re.findall(r'stp tc-protection interval (.*)', self.stp_cfg)
-                if not tmp_value:
-                    self.module.fail_json(
-                        msg='Error: Can not find tc-protection interval on the device.')
-                self.end_state["tc_protection_interval"] = tmp_value[0]
-            else:
-                self.end_state["tc_protection_interval"] = "null"
+        return cmds
 
-        if self.tc_protection_threshold:
-            if "stp tc-protection threshold" in self.stp_cfg:
-                tmp_value = re.findall(r'stp tc-protection threshold (.*)', self.stp_cfg)
-                if not tmp_value:
-                    self.module.fail_json(
-                        msg='Error: Can not find tc-protection threshold on the device.')
-                self.end_state["tc_protection_threshold"] = tmp_value[0]
-            else:
-                self.end_state["tc_protection_threshold"] = "1"
+    def get_interfaces_cmds(self):
+        """ Get stp commands of the interface or all matched switch ports """
 
-        if self.cost:
-            tmp_value = re.findall(r'stp instance (.*) cost (.*)', self.interface_stp_cfg)
-            if not tmp_value:
-                self.end_state["cost"] = "null"
-            else:
-                self.end_state["cost"] = tmp_value[0][1]
+        cmds = list()
+        if self.interface and self.interface != "all":
+            ports = [self.cur_cfg]
+        else:
+            ports = self.ports
 
-        if self.root_protection:
-            if "stp root-protection" in self.interface_stp_cfg:
-                self.end_state["root_protection"] = "enable"
-            else:
-                self.end_state["root_protection"] = "disable"
+        for port_cfg in ports:
+            port_cmds = self.get_port_cmds(port_cfg)
+            if port_cmds:
+                cmds.append("interface %s" % port_cfg["interface"])
+                cmds.extend(port_cmds)
 
-        if self.loop_protection:
-            if "stp loop-protection" in self.interface_stp_cfg:
-                self.end_state["loop_protection"] = "enable"
-            else:
-                self.end_state["loop_protection"] = "disable"
+        return cmds
 
     def present_stp(self):
         """ Present stp configuration """
@@ -667,82 +729,9 @@ class Stp(object):
                 self.updates_cmd.append(cmd)
 
         # config interface stp
-        if self.interface and self.interface != "all":
-            tmp_changed = False
-
-            cmd = "interface %s" % self.interface
-            cmds.append(cmd)
-            self.updates_cmd.append(cmd)
-
-            if self.edged_port:
-                if self.edged_port != self.cur_cfg["edged_port"]:
-                    if self.edged_port == "enable":
-                        cmd = "stp edged-port enable"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp edged-port"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.bpdu_filter:
-                if self.bpdu_filter != self.cur_cfg["bpdu_filter"]:
-                    if self.bpdu_filter == "enable":
-                        cmd = "stp bpdu-filter enable"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp bpdu-filter"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.root_protection:
-                if self.root_protection == "enable" and self.cur_cfg["loop_protection"] == "enable":
-                    self.module.fail_json(
-                        msg='Error: The interface has enable loop_protection, can not enable root_protection.')
-                if self.root_protection != self.cur_cfg["root_protection"]:
-                    if self.root_protection == "enable":
-                        cmd = "stp root-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp root-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.loop_protection:
-                if self.loop_protection == "enable" and self.cur_cfg["root_protection"] == "enable":
-                    self.module.fail_json(
-                        msg='Error: The interface has enable root_protection, can not enable loop_protection.')
-                if self.loop_protection != self.cur_cfg["loop_protection"]:
-                    if self.loop_protection == "enable":
-                        cmd = "stp loop-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp loop-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.cost:
-                if self.cost != self.cur_cfg["cost"]:
-                    cmd = "stp cost %s" % self.cost
-                    cmds.append(cmd)
-                    self.updates_cmd.append(cmd)
-                    tmp_changed = True
-
-            if not tmp_changed:
-                cmd = "interface %s" % self.interface
-                self.updates_cmd.remove(cmd)
-                cmds.remove(cmd)
+        port_cmds = self.get_interfaces_cmds()
+        cmds.extend(port_cmds)
+        self.updates_cmd.extend(port_cmds)
 
         if cmds:
             self.cli_load_config(cmds)
@@ -836,82 +825,9 @@ class Stp(object):
                     self.changed = True
 
         # undo interface stp
-        if self.interface and self.interface != "all":
-            tmp_changed = False
-
-            cmd = "interface %s" % self.interface
-            cmds.append(cmd)
-            self.updates_cmd.append(cmd)
-
-            if self.edged_port:
-                if self.edged_port != self.cur_cfg["edged_port"]:
-                    if self.edged_port == "enable":
-                        cmd = "stp edged-port enable"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp edged-port"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.bpdu_filter:
-                if self.bpdu_filter != self.cur_cfg["bpdu_filter"]:
-                    if self.bpdu_filter == "enable":
-                        cmd = "stp bpdu-filter enable"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp bpdu-filter"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.root_protection:
-                if self.root_protection == "enable" and self.cur_cfg["loop_protection"] == "enable":
-                    self.module.fail_json(
-                        msg='Error: The interface has enable loop_protection, can not enable root_protection.')
-                if self.root_protection != self.cur_cfg["root_protection"]:
-                    if self.root_protection == "enable":
-                        cmd = "stp root-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp root-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.loop_protection:
-                if self.loop_protection == "enable" and self.cur_cfg["root_protection"] == "enable":
-                    self.module.fail_json(
-                        msg='Error: The interface has enable root_protection, can not enable loop_protection.')
-                if self.loop_protection != self.cur_cfg["loop_protection"]:
-                    if self.loop_protection == "enable":
-                        cmd = "stp loop-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-                    else:
-                        cmd = "undo stp loop-protection"
-                        cmds.append(cmd)
-                        self.updates_cmd.append(cmd)
-                        tmp_changed = True
-
-            if self.cost:
-                if self.cost == self.cur_cfg["cost"]:
-                    cmd = "undo stp cost"
-                    cmds.append(cmd)
-                    self.updates_cmd.append(cmd)
-                    tmp_changed = True
-
-            if not tmp_changed:
-                cmd = "interface %s" % self.interface
-                self.updates_cmd.remove(cmd)
-                cmds.remove(cmd)
+        port_cmds = self.get_interfaces_cmds()
+        cmds.extend(port_cmds)
+        self.updates_cmd.extend(port_cmds)
 
         if cmds:
             self.cli_load_config(cmds)
@@ -953,6 +869,7 @@ def main():
         tc_protection_interval=dict(type='str'),
         tc_protection_threshold=dict(type='str'),
         interface=dict(type='str'),
+        interfaces=dict(type='list'),
         edged_port=dict(choices=['enable', 'disable']),
         bpdu_filter=dict(choices=['enable', 'disable']),
         cost=dict(type='str'),
@@ -41,7 +41,8 @@ options:
     interface:
         description:
             - Full name of the interface, i.e. 40GE1/0/22.
-        required: true
+              Either interface or ports is required.
+        required: false
         default: null
     mode:
         description:
@@ -67,6 +68,17 @@ options:
           - trunk_add_vlans
         required: false
         default: null
+    ports:
+        description:
+            - A list of ports, each one is a full interface name, a glob pattern
+              such as C(10GE1/0/*), or a dict with interface and optionally mode,
+              access_vlan, native_vlan and trunk_vlans. The options that an entry does
+              not set are taken from the module options of the same name.
+              Patterns are matched against the Layer 2 ports of the device,
+              if a port matches several entries the last one wins.
+              Can not be used with C(interface).
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -125,6 +137,14 @@ EXAMPLES = '''
       trunk_vlans: 51-4000
       state: absent
       provider: '{{ cli }}'
+
+  - name: Ensure all server-facing ports allow vlans 100-200
+    ce_switchport:
+      ports:
+        - 10GE1/0/*
+      mode: trunk
+      trunk_vlans: 100-200
+      provider: '{{ cli }}'
 '''
 
 RETURN = '''
@@ -157,9 +177,10 @@ changed:
     sample: true
 '''
 
-import re
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, set_nc_config_chunks, \
+    ce_argument_spec, is_interface_pattern, match_interfaces, vlan_bitmap_to_int, \
+    vlan_int_to_bitmap, vlan_to_bit, get_nc_snapshot, get_nc_xml_root
 
 CE_NC_GET_INTF = """
 <filter type="subtree">
@@ -192,10 +213,19 @@ CE_NC_GET_PORT_ATTR = """
 </filter>
 """
 
-CE_NC_SET_ACCESS_PORT = """
+CE_NC_SET_PORTS_HEAD = """
 <config>
-   <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+  <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
     <ethernetIfs>
+"""
+
+CE_NC_SET_PORTS_TAIL = """
+    </ethernetIfs>
+  </ethernet>
+</config>
+"""
+
+CE_NC_SET_ACCESS_PORT = """
         <ethernetIf operation="merge">
             <ifName>%s</ifName>
             <l2Attribute>
@@ -205,27 +235,18 @@ CE_NC_SET_ACCESS_PORT = """
                 <untagVlans></untagVlans>
             </l2Attribute>
         </ethernetIf>
-    </ethernetIfs>
-  </ethernet>
-</config>
 """
 
 CE_NC_SET_TRUNK_PORT_MODE = """
-<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-<ethernetIfs>
     <ethernetIf operation="merge">
         <ifName>%s</ifName>
         <l2Attribute>
             <linkType>trunk</linkType>
         </l2Attribute>
     </ethernetIf>
-</ethernetIfs>
-</ethernet>
 """
 
 CE_NC_SET_TRUNK_PORT_PVID = """
-<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-<ethernetIfs>
     <ethernetIf operation="merge">
         <ifName>%s</ifName>
         <l2Attribute>
@@ -234,13 +255,9 @@ CE_NC_SET_TRUNK_PORT_PVID = """
             <untagVlans></untagVlans>
         </l2Attribute>
     </ethernetIf>
-</ethernetIfs>
-</ethernet>
 """
 
 CE_NC_SET_TRUNK_PORT_VLANS = """
-<ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-<ethernetIfs>
     <ethernetIf operation="merge">
         <ifName>%s</ifName>
         <l2Attribute>
@@ -249,14 +266,9 @@ CE_NC_SET_TRUNK_PORT_VLANS = """
             <untagVlans></untagVlans>
         </l2Attribute>
     </ethernetIf>
-</ethernetIfs>
-</ethernet>
 """
 
 CE_NC_SET_DEFAULT_PORT = """
-<config>
-   <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <ethernetIfs>
         <ethernetIf operation="merge">
             <ifName>%s</ifName>
             <l2Attribute>
@@ -266,16 +278,65 @@ CE_NC_SET_DEFAULT_PORT = """
                 <untagVlans></untagVlans>
             </l2Attribute>
         </ethernetIf>
-    </ethernetIfs>
-  </ethernet>
-</config>
 """
 
+# the integer of a vlan bitmap with all bits set
+VLAN_BITMAP_ALL = (1 << 4096) - 1
+
+# options of a ports entry
+SWITCH_PORT_OPTIONS = ["mode", "access_vlan", "native_vlan", "trunk_vlans"]
 
 SWITCH_PORT_TYPE = ('ge', '10ge', '25ge',
                     '4x10ge', '40ge', '100ge', 'eth-trunk')
 
 
+CE_NC_GET_ETHERNET_SNAPSHOT = """
+<filter type="subtree">
+  <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ethernetIfs>
+      <ethernetIf>
+        <ifName></ifName>
+        <l2Enable></l2Enable>
+        <l2Attribute>
+          <linkType></linkType>
+          <pvid></pvid>
+          <trunkVlans></trunkVlans>
+        </l2Attribute>
+      </ethernetIf>
+    </ethernetIfs>
+  </ethernet>
+</filter>
+"""
+
+
+def parse_ethernet_snapshot(xml_str):
+    """parse ethernet interface reply, interfaces are indexed by upper case
+    interface name"""
+
+    interfaces = dict()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return interfaces
+
+    for intf_ele in root.findall("data/ethernet/ethernetIfs/ethernetIf"):
+        intf = dict(ifName=intf_ele.findtext("ifName"),
+                    l2Enable=intf_ele.findtext("l2Enable") or "",
+                    linkType=intf_ele.findtext("l2Attribute/linkType") or "",
+                    pvid=intf_ele.findtext("l2Attribute/pvid") or "",
+                    trunkVlans=intf_ele.findtext("l2Attribute/trunkVlans") or "")
+        if intf["ifName"]:
+            interfaces[intf["ifName"].upper()] = intf
+
+    return interfaces
+
+
+def get_ethernet_snapshot(module, refresh=False):
+    """get the switchport config of all ethernet interfaces in one netconf read"""
+
+    return get_nc_snapshot(module, ("ethernet",), CE_NC_GET_ETHERNET_SNAPSHOT,
+                           parse_ethernet_snapshot, refresh)
+
+
 def get_interface_type(interface):
     """Gets the type of interface, such as 10GE, ETH-TRUNK, VLANIF..."""
 
@@ -335,31 +396,13 @@ def is_portswitch_enalbed(iftype):
 def vlan_bitmap_undo(bitmap):
     """convert vlan bitmap to undo bitmap"""
 
-    vlan_bit = ['F'] * 1024
-
-    if not bitmap or len(bitmap) == 0:
-        return ''.join(vlan_bit)
-
-    bit_len = len(bitmap)
-    for num in range(bit_len):
-        undo = (~int(bitmap[num], 16)) & 0xF
-        vlan_bit[num] = hex(undo)[2]
-
-    return ''.join(vlan_bit)
+    return vlan_int_to_bitmap(~vlan_bitmap_to_int(bitmap) & VLAN_BITMAP_ALL)
 
 
 def is_vlan_bitmap_empty(bitmap):
     """check vlan bitmap empty"""
 
-    if not bitmap or len(bitmap) == 0:
-        return True
-
-    bit_len = len(bitmap)
-    for num in range(bit_len):
-        if bitmap[num] != '0':
-            return False
-
-    return True
+    return not vlan_bitmap_to_int(bitmap)
 
 
 class SwitchPort(object):
@@ -379,6 +422,7 @@ class SwitchPort(object):
         self.access_vlan = self.module.params['access_vlan']
         self.native_vlan = self.module.params['native_vlan']
         self.trunk_vlans = self.module.params['trunk_vlans']
+        self.ports = self.module.params['ports']
 
         # host info
         self.host = self.module.params['host']
@@ -398,9 +442,11 @@ class SwitchPort(object):
     def init_module(self):
         """ init module """
 
-        required_if = [('state', 'absent', ['mode']), ('state', 'present', ['mode'])]
+        required_one_of = [("interface", "ports")]
+        mutually_exclusive = [("interface", "ports")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, required_if=required_if, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -411,176 +457,157 @@ class SwitchPort(object):
     def get_interface_dict(self, ifname):
         """ get one interface attributes dict."""
 
-        intf_info = dict()
         conf_str = CE_NC_GET_PORT_ATTR % ifname
         rcv_xml = get_nc_config(self.module, conf_str)
-        if "<data/>" in rcv_xml:
-            return intf_info
-
-        intf = re.findall(
-            r'.*<ifName>(.*)</ifName>.*\s*<l2Enable>(.*)</l2Enable>.*', rcv_xml)
-        if intf:
-            intf_info = dict(ifName=intf[0][0],
-                             l2Enable=intf[0][1],
-                             linkType="",
-                             pvid="",
-                             trunkVlans="")
-            if intf_info["l2Enable"] == "enable":
-                attr = re.findall(
-                    r'.*<linkType>(.*)</linkType>.*.*\s*<pvid>(.*)'
-                    r'</pvid>.*\s*<trunkVlans>(.*)</trunkVlans>.*', rcv_xml)
-                if attr:
-                    intf_info["linkType"] = attr[0][0]
-                    intf_info["pvid"] = attr[0][1]
-                    intf_info["trunkVlans"] = attr[0][2]
-
-        return intf_info
+
+        return parse_ethernet_snapshot(rcv_xml).get(ifname.upper(), dict())
+
+    def get_port_info(self, intf_info):
+        """get the switchport config of an interface in the format of end_state"""
+
+        return dict(interface=intf_info["ifName"], mode=intf_info["linkType"],
+                    switchport=intf_info["l2Enable"], access_vlan=intf_info["pvid"],
+                    native_vlan=intf_info["pvid"], trunk_vlans=intf_info["trunkVlans"])
 
     def is_l2switchport(self):
         """Check layer2 switch port"""
 
         return bool(self.intf_info["l2Enable"] == "enable")
 
-    def merge_access_vlan(self, ifname, access_vlan):
-        """Merge access interface vlan"""
+    def set_port_config(self, xml_items, xml_name):
+        """send the config items of an interface"""
 
-        change = False
-        conf_str = ""
-        self.updates_cmd.append("interface %s" % ifname)
+        conf_str = CE_NC_SET_PORTS_HEAD + "".join(xml_items) + CE_NC_SET_PORTS_TAIL
+        rcv_xml = set_nc_config(self.module, conf_str)
+        self.check_response(rcv_xml, xml_name)
+
+    def get_access_config(self, ifname, access_vlan, intf_info):
+        """get the commands and config items that merge access interface vlan"""
+
+        cmds = list()
+        xml_items = list()
         if self.state == "present":
-            if self.intf_info["linkType"] == "access":
-                if access_vlan and self.intf_info["pvid"] != access_vlan:
-                    self.updates_cmd.append(
-                        "port default vlan %s" % access_vlan)
-                    conf_str = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan)
-                    change = True
+            if intf_info["linkType"] == "access":
+                if access_vlan and intf_info["pvid"] != access_vlan:
+                    cmds.append("port default vlan %s" % access_vlan)
+                    xml_items.append(CE_NC_SET_ACCESS_PORT % (ifname, access_vlan))
             else:  # not access
-                self.updates_cmd.append("port link-type access")
+                cmds.append("port link-type access")
                 if access_vlan:
-                    self.updates_cmd.append(
-                        "port default vlan %s" % access_vlan)
-                    conf_str = CE_NC_SET_ACCESS_PORT % (ifname, access_vlan)
+                    cmds.append("port default vlan %s" % access_vlan)
+                    xml_items.append(CE_NC_SET_ACCESS_PORT % (ifname, access_vlan))
                 else:
-                    conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                change = True
+                    xml_items.append(CE_NC_SET_ACCESS_PORT % (ifname, "1"))
         elif self.state == "absent":
-            if self.intf_info["linkType"] == "access":
-                if access_vlan and self.intf_info["pvid"] == access_vlan and access_vlan != "1":
-                    self.updates_cmd.append(
-                        "undo port default vlan %s" % access_vlan)
-                    conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                    change = True
+            if intf_info["linkType"] == "access":
+                if access_vlan and intf_info["pvid"] == access_vlan and access_vlan != "1":
+                    cmds.append("undo port default vlan %s" % access_vlan)
+                    xml_items.append(CE_NC_SET_ACCESS_PORT % (ifname, "1"))
             else:  # not access
-                self.updates_cmd.append("port link-type access")
-                conf_str = CE_NC_SET_ACCESS_PORT % (ifname, "1")
-                change = True
+                cmds.append("port link-type access")
+                xml_items.append(CE_NC_SET_ACCESS_PORT % (ifname, "1"))
 
-        if not change:
-            self.updates_cmd.pop()   # remove interface
+        return cmds, xml_items
+
+    def merge_access_vlan(self, ifname, access_vlan):
+        """Merge access interface vlan"""
+
+        cmds, xml_items = self.get_access_config(ifname, access_vlan, self.intf_info)
+        if not xml_items:
             return
 
-        rcv_xml = set_nc_config(self.module, conf_str)
-        self.check_response(rcv_xml, "MERGE_ACCESS_PORT")
+        self.updates_cmd.append("interface %s" % ifname)
+        self.updates_cmd.extend(cmds)
+        self.set_port_config(xml_items, "MERGE_ACCESS_PORT")
         self.changed = True
 
-    def merge_trunk_vlan(self, ifname, native_vlan, trunk_vlans):
-        """Merge trunk interface vlan"""
+    def get_trunk_config(self, ifname, native_vlan, trunk_vlans, intf_info):
+        """get the commands and config items that merge trunk interface vlan"""
 
-        change = False
-        xmlstr = ""
-        self.updates_cmd.append("interface %s" % ifname)
+        cmds = list()
+        xml_items = list()
         if trunk_vlans:
             vlan_list = self.vlan_range_to_list(trunk_vlans)
             vlan_map = self.vlan_list_to_bitmap(vlan_list)
 
         if self.state == "present":
-            if self.intf_info["linkType"] == "trunk":
-                if native_vlan and self.intf_info["pvid"] != native_vlan:
-                    self.updates_cmd.append(
-                        "port trunk pvid vlan %s" % native_vlan)
-                    xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan)
-                    change = True
+            if intf_info["linkType"] == "trunk":
+                if native_vlan and intf_info["pvid"] != native_vlan:
+                    cmds.append("port trunk pvid vlan %s" % native_vlan)
+                    xml_items.append(CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan))
                 if trunk_vlans:
-                    add_vlans = self.vlan_bitmap_add(
-                        self.intf_info["trunkVlans"], vlan_map)
+                    add_vlans = self.vlan_bitmap_add(intf_info["trunkVlans"], vlan_map)
                     if not is_vlan_bitmap_empty(add_vlans):
-                        self.updates_cmd.append(
-                            "port trunk allow-pass %s"
-                            % trunk_vlans.replace(',', ' ').replace('-', ' to '))
-                        xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
-                            ifname, add_vlans, add_vlans)
-                        change = True
+                        cmds.append("port trunk allow-pass %s"
+                                    % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+                        xml_items.append(CE_NC_SET_TRUNK_PORT_VLANS % (ifname, add_vlans, add_vlans))
             else:   # not trunk
-                self.updates_cmd.append("port link-type trunk")
-                change = True
+                cmds.append("port link-type trunk")
                 if native_vlan:
-                    self.updates_cmd.append(
-                        "port trunk pvid vlan %s" % native_vlan)
-                    xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan)
+                    cmds.append("port trunk pvid vlan %s" % native_vlan)
+                    xml_items.append(CE_NC_SET_TRUNK_PORT_PVID % (ifname, native_vlan))
                 if trunk_vlans:
-                    self.updates_cmd.append(
-                        "port trunk allow-pass %s"
-                        % trunk_vlans.replace(',', ' ').replace('-', ' to '))
-                    xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
-                        ifname, vlan_map, vlan_map)
+                    cmds.append("port trunk allow-pass %s"
+                                % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+                    xml_items.append(CE_NC_SET_TRUNK_PORT_VLANS % (ifname, vlan_map, vlan_map))
                 if not native_vlan and not trunk_vlans:
-                    xmlstr += CE_NC_SET_TRUNK_PORT_MODE % ifname
-                    self.updates_cmd.append(
-                        "undo port trunk allow-pass vlan 1")
+                    xml_items.append(CE_NC_SET_TRUNK_PORT_MODE % ifname)
+                    cmds.append("undo port trunk allow-pass vlan 1")
         elif self.state == "absent":
-            if self.intf_info["linkType"] == "trunk":
-                if native_vlan and self.intf_info["pvid"] == native_vlan and native_vlan != '1':
-                    self.updates_cmd.append(
-                        "undo port trunk pvid vlan %s" % native_vlan)
-                    xmlstr += CE_NC_SET_TRUNK_PORT_PVID % (ifname, 1)
-                    change = True
+            if intf_info["linkType"] == "trunk":
+                if native_vlan and intf_info["pvid"] == native_vlan and native_vlan != '1':
+                    cmds.append("undo port trunk pvid vlan %s" % native_vlan)
+                    xml_items.append(CE_NC_SET_TRUNK_PORT_PVID % (ifname, 1))
                 if trunk_vlans:
-                    del_vlans = self.vlan_bitmap_del(
-                        self.intf_info["trunkVlans"], vlan_map)
+                    del_vlans = self.vlan_bitmap_del(intf_info["trunkVlans"], vlan_map)
                     if not is_vlan_bitmap_empty(del_vlans):
-                        self.updates_cmd.append(
-                            "undo port trunk allow-pass %s"
-                            % trunk_vlans.replace(',', ' ').replace('-', ' to '))
+                        cmds.append("undo port trunk allow-pass %s"
+                                    % trunk_vlans.replace(',', ' ').replace('-', ' to '))
                         undo_map = vlan_bitmap_undo(del_vlans)
-                        xmlstr += CE_NC_SET_TRUNK_PORT_VLANS % (
-                            ifname, undo_map, del_vlans)
-                        change = True
+                        xml_items.append(CE_NC_SET_TRUNK_PORT_VLANS % (ifname, undo_map, del_vlans))
             else:   # not trunk
-                self.updates_cmd.append("port link-type trunk")
-                self.updates_cmd.append("undo port trunk allow-pass vlan 1")
-                xmlstr += CE_NC_SET_TRUNK_PORT_MODE % ifname
-                change = True
+                cmds.append("port link-type trunk")
+                cmds.append("undo port trunk allow-pass vlan 1")
+                xml_items.append(CE_NC_SET_TRUNK_PORT_MODE % ifname)
 
-        if not change:
-            self.updates_cmd.pop()
+        return cmds, xml_items
+
+    def merge_trunk_vlan(self, ifname, native_vlan, trunk_vlans):
+        """Merge trunk interface vlan"""
+
+        cmds, xml_items = self.get_trunk_config(ifname, native_vlan, trunk_vlans, self.intf_info)
+        if not xml_items:
             return
 
-        conf_str = "<config>" + xmlstr + "</config>"
-        rcv_xml = set_nc_config(self.module, conf_str)
-        self.check_response(rcv_xml, "MERGE_TRUNK_PORT")
+        self.updates_cmd.append("interface %s" % ifname)
+        self.updates_cmd.extend(cmds)
+        self.set_port_config(xml_items, "MERGE_TRUNK_PORT")
         self.changed = True
 
+    def get_default_config(self, ifname, intf_info):
+        """get the commands and config items that set interface default"""
+
+        cmds = list()
+        if intf_info["linkType"] != "access":
+            cmds.append("port link-type access")
+            cmds.append("port default vlan 1")
+        elif intf_info["pvid"] != "1":
+            cmds.append("port default vlan 1")
+
+        if not cmds:
+            return cmds, list()
+        return cmds, [CE_NC_SET_DEFAULT_PORT % ifname]
+
     def default_switchport(self, ifname):
         """Set interface default or unconfigured"""
 
-        change = False
-        if self.intf_info["linkType"] != "access":
-            self.updates_cmd.append("interface %s" % ifname)
-            self.updates_cmd.append("port link-type access")
-            self.updates_cmd.append("port default vlan 1")
-            change = True
-        else:
-            if self.intf_info["pvid"] != "1":
-                self.updates_cmd.append("interface %s" % ifname)
-                self.updates_cmd.append("port default vlan 1")
-                change = True
-
-        if not change:
+        cmds, xml_items = self.get_default_config(ifname, self.intf_info)
+        if not xml_items:
             return
 
-        conf_str = CE_NC_SET_DEFAULT_PORT % ifname
-        rcv_xml = set_nc_config(self.module, conf_str)
-        self.check_response(rcv_xml, "DEFAULT_INTF_VLAN")
+        self.updates_cmd.append("interface %s" % ifname)
+        self.updates_cmd.extend(cmds)
+        self.set_port_config(xml_items, "DEFAULT_INTF_VLAN")
         self.changed = True
 
     def vlan_series(self, vlanid_s):
@@ -629,28 +656,19 @@ class SwitchPort(object):
     def vlan_list_to_bitmap(self, vlanlist):
         """ convert vlan list to vlan bitmap """
 
-        vlan_bit = ['0'] * 1024
-        bit_int = [0] * 1024
-
-        vlan_list_len = len(vlanlist)
-        for num in range(vlan_list_len):
-            tagged_vlans = int(vlanlist[num])
+        bitmap = 0
+        for vlan in vlanlist:
+            tagged_vlans = int(vlan)
             if tagged_vlans <= 0 or tagged_vlans > 4094:
                 self.module.fail_json(
                     msg='Error: Vlan id is not in the range from 1 to 4094.')
-            j = tagged_vlans / 4
-            bit_int[j] |= 0x8 >> (tagged_vlans % 4)
-            vlan_bit[j] = hex(bit_int[j])[2]
-
-        vlan_xml = ''.join(vlan_bit)
+            bitmap |= vlan_to_bit(tagged_vlans)
 
-        return vlan_xml
+        return vlan_int_to_bitmap(bitmap)
 
     def vlan_bitmap_add(self, oldmap, newmap):
         """vlan add bitmap"""
 
-        vlan_bit = ['0'] * 1024
-
         if len(newmap) != 1024:
             self.module.fail_json(msg='Error: New vlan bitmap is invalid.')
 
@@ -660,34 +678,39 @@ class SwitchPort(object):
         if len(oldmap) == 0:
             return newmap
 
-        for num in range(1024):
-            new_tmp = int(newmap[num], 16)
-            old_tmp = int(oldmap[num], 16)
-            add = (~(new_tmp & old_tmp)) & new_tmp
-            vlan_bit[num] = hex(add)[2]
-
-        vlan_xml = ''.join(vlan_bit)
-
-        return vlan_xml
+        add = vlan_bitmap_to_int(newmap) & ~vlan_bitmap_to_int(oldmap)
+        return vlan_int_to_bitmap(add)
 
     def vlan_bitmap_del(self, oldmap, delmap):
         """vlan del bitmap"""
 
-        vlan_bit = ['0'] * 1024
-
         if not oldmap or len(oldmap) == 0:
-            return ''.join(vlan_bit)
+            return vlan_int_to_bitmap(0)
 
         if len(oldmap) != 1024 or len(delmap) != 1024:
             self.module.fail_json(msg='Error: vlan bitmap is invalid.')
 
-        for num in range(1024):
-            tmp = int(delmap[num], 16) & int(oldmap[num], 16)
-            vlan_bit[num] = hex(tmp)[2]
+        tmp = vlan_bitmap_to_int(delmap) & vlan_bitmap_to_int(oldmap)
+        return vlan_int_to_bitmap(tmp)
 
-        vlan_xml = ''.join(vlan_bit)
+    def check_vlan_ids(self, access_vlan, native_vlan):
+        """Check access vlan and native vlan"""
+
+        # check access_vlan
+        if access_vlan:
+            if not access_vlan.isdigit():
+                self.module.fail_json(msg='Error: Access vlan id is invalid.')
+            if int(access_vlan) <= 0 or int(access_vlan) > 4094:
+                self.module.fail_json(
+                    msg='Error: Access vlan id is not in the range from 1 to 4094.')
 
-        return vlan_xml
+        # check native_vlan
+        if native_vlan:
+            if not native_vlan.isdigit():
+                self.module.fail_json(msg='Error: Native vlan id is invalid.')
+            if int(native_vlan) <= 0 or int(native_vlan) > 4094:
+                self.module.fail_json(
+                    msg='Error: Native vlan id is not in the range from 1 to 4094.')
 
     def check_params(self):
         """Check all input params"""
@@ -702,21 +725,11 @@ class SwitchPort(object):
         if not self.intf_type or not is_portswitch_enalbed(self.intf_type):
             self.module.fail_json(msg='Error: Interface %s is error.')
 
-        # check access_vlan
-        if self.access_vlan:
-            if not self.access_vlan.isdigit():
-                self.module.fail_json(msg='Error: Access vlan id is invalid.')
-            if int(self.access_vlan) <= 0 or int(self.access_vlan) > 4094:
-                self.module.fail_json(
-                    msg='Error: Access vlan id is not in the range from 1 to 4094.')
+        if self.state != "unconfigured" and not self.mode:
+            self.module.fail_json(
+                msg='Error: mode must be set when state is %s.' % self.state)
 
-        # check native_vlan
-        if self.native_vlan:
-            if not self.native_vlan.isdigit():
-                self.module.fail_json(msg='Error: Native vlan id is invalid.')
-            if int(self.native_vlan) <= 0 or int(self.native_vlan) > 4094:
-                self.module.fail_json(
-                    msg='Error: Native vlan id is not in the range from 1 to 4094.')
+        self.check_vlan_ids(self.access_vlan, self.native_vlan)
 
         # get interface info
         self.intf_info = self.get_interface_dict(self.interface)
@@ -727,6 +740,104 @@ class SwitchPort(object):
             self.module.fail_json(
                 msg='Error: Interface is not layer2 swtich port.')
 
+    def get_port_plans(self, snapshot):
+        """expand interface names and patterns, if an interface matches several entries the last one wins"""
+
+        plans = dict()
+        order = list()
+        names = [intf["ifName"] for intf in snapshot.values() if intf["l2Enable"] == "enable"]
+        for port in self.ports:
+            if not isinstance(port, dict):
+                port = dict(interface=port)
+            if not port.get("interface"):
+                self.module.fail_json(
+                    msg='Error: Each port must be a name, a pattern or a dict with interface.')
+
+            want = dict(interface=str(port["interface"]))
+            for option in SWITCH_PORT_OPTIONS:
+                value = port.get(option)
+                if value is None:
+                    value = getattr(self, option)
+                want[option] = None if value is None else str(value)
+            if want["mode"] not in [None, "access", "trunk"]:
+                self.module.fail_json(
+                    msg='Error: The mode of interface %s must be access or trunk.' % want["interface"])
+            if self.state != "unconfigured" and not want["mode"]:
+                self.module.fail_json(
+                    msg='Error: The mode of interface %s must be set when state is %s.'
+                        % (want["interface"], self.state))
+            self.check_vlan_ids(want["access_vlan"], want["native_vlan"])
+            if want["trunk_vlans"]:
+                self.vlan_list_to_bitmap(self.vlan_range_to_list(want["trunk_vlans"]))
+
+            if is_interface_pattern(want["interface"]):
+                matched = match_interfaces(names, want["interface"])
+                if not matched:
+                    self.module.fail_json(
+                        msg="Error: No layer2 switch port matches %s." % want["interface"])
+            else:
+                if not is_portswitch_enalbed(get_interface_type(want["interface"])):
+                    self.module.fail_json(
+                        msg='Error: Interface name of %s is error.' % want["interface"])
+                matched = [want["interface"]]
+            for name in matched:
+                if name.upper() not in plans:
+                    order.append(name.upper())
+                plans[name.upper()] = dict(want, interface=name)
+
+        return [plans[name] for name in order]
+
+    def config_ports(self):
+        """diff every requested port with the switchport config of all interfaces,
+        and apply all the changes by one edit"""
+
+        snapshot = get_ethernet_snapshot(self.module)
+        xml_items = list()
+        self.existing = dict(ports=list())
+        self.proposed = dict(ports=list(), state=self.state)
+        for want in self.get_port_plans(snapshot):
+            intf_info = snapshot.get(want["interface"].upper())
+            if not intf_info:
+                self.module.fail_json(
+                    msg='Error: Interface %s does not exists.' % want["interface"])
+            if intf_info["l2Enable"] != "enable":
+                self.module.fail_json(
+                    msg='Error: Interface %s is not layer2 swtich port.' % want["interface"])
+
+            ifname = intf_info["ifName"]
+            self.proposed["ports"].append(want)
+            self.existing["ports"].append(self.get_port_info(intf_info))
+            if self.state == "unconfigured":
+                cmds, port_items = self.get_default_config(ifname, intf_info)
+            elif want["mode"] == "access":
+                cmds, port_items = self.get_access_config(ifname, want["access_vlan"], intf_info)
+            else:
+                cmds, port_items = self.get_trunk_config(
+                    ifname, want["native_vlan"], want["trunk_vlans"], intf_info)
+            if not port_items:
+                continue
+
+            self.updates_cmd.append("interface %s" % ifname)
+            self.updates_cmd.extend(cmds)
+            xml_items.extend(port_items)
+
+        if not xml_items:
+            return
+
+        self.changed = True
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_SET_PORTS_HEAD, xml_items, CE_NC_SET_PORTS_TAIL)
+
+    def get_ports_end_state(self):
+        """get the switchport config of the listed ports after module execution"""
+
+        snapshot = get_ethernet_snapshot(self.module, self.changed and not self.module.check_mode)
+        self.end_state = dict(ports=list())
+        for want in self.proposed["ports"]:
+            intf_info = snapshot.get(want["interface"].upper())
+            if intf_info:
+                self.end_state["ports"].append(self.get_port_info(intf_info))
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -741,12 +852,7 @@ class SwitchPort(object):
         """get existing info"""
 
         if self.intf_info:
-            self.existing["interface"] = self.intf_info["ifName"]
-            self.existing["mode"] = self.intf_info["linkType"]
-            self.existing["switchport"] = self.intf_info["l2Enable"]
-            self.existing['access_vlan'] = self.intf_info["pvid"]
-            self.existing['native_vlan'] = self.intf_info["pvid"]
-            self.existing['trunk_vlans'] = self.intf_info["trunkVlans"]
+            self.existing = self.get_port_info(self.intf_info)
 
     def get_end_state(self):
         """get end state info"""
@@ -754,35 +860,34 @@ class SwitchPort(object):
         if self.intf_info:
             end_info = self.get_interface_dict(self.interface)
             if end_info:
-                self.end_state["interface"] = end_info["ifName"]
-                self.end_state["mode"] = end_info["linkType"]
-                self.end_state["switchport"] = end_info["l2Enable"]
-                self.end_state['access_vlan'] = end_info["pvid"]
-                self.end_state['native_vlan'] = end_info["pvid"]
-                self.end_state['trunk_vlans'] = end_info["trunkVlans"]
+                self.end_state = self.get_port_info(end_info)
 
     def work(self):
         """worker"""
 
-        self.check_params()
-        if not self.intf_info:
-            self.module.fail_json(msg='Error: interface does not exists.')
-
-        self.get_existing()
-        self.get_proposed()
-
-        # present or absent
-        if self.state == "present" or self.state == "absent":
-            if self.mode == "access":
-                self.merge_access_vlan(self.interface, self.access_vlan)
-            elif self.mode == "trunk":
-                self.merge_trunk_vlan(
-                    self.interface, self.native_vlan, self.trunk_vlans)
-        # unconfigured
+        if self.ports is not None:
+            self.config_ports()
+            self.get_ports_end_state()
         else:
-            self.default_switchport(self.interface)
+            self.check_params()
+            if not self.intf_info:
+                self.module.fail_json(msg='Error: interface does not exists.')
+
+            self.get_existing()
+            self.get_proposed()
+
+            # present or absent
+            if self.state == "present" or self.state == "absent":
+                if self.mode == "access":
+                    self.merge_access_vlan(self.interface, self.access_vlan)
+                elif self.mode == "trunk":
+                    self.merge_trunk_vlan(
+                        self.interface, self.native_vlan, self.trunk_vlans)
+            # unconfigured
+            else:
+                self.default_switchport(self.interface)
 
-        self.get_end_state()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -799,11 +904,12 @@ def main():
     """Module main"""
 
     argument_spec = dict(
-        interface=dict(required=True, type='str'),
+        interface=dict(required=False, type='str'),
         mode=dict(choices=['access', 'trunk'], required=False),
         access_vlan=dict(type='str', required=False),
         native_vlan=dict(type='str', required=False),
         trunk_vlans=dict(type='str', required=False),
+        ports=dict(required=False, type='list'),
         state=dict(choices=['absent', 'present', 'unconfigured'],
                    default='present')
     )
@@ -0,0 +1,543 @@
+#!/usr/bin/python
+#
+# This file is part of Ansible
+#
+# Ansible is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# Ansible is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with Ansible.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+ANSIBLE_METADATA = {'status': ['preview'],
+                    'supported_by': 'community',
+                    'metadata_version': '1.0'}
+
+DOCUMENTATION = '''
+---
+module: ce_upgrade
+version_added: "2.4"
+short_description: Upgrades the system software on HUAWEI CloudEngine switches.
+description:
+    - Transfers a system software file, checks its size on the device, sets it as
+      the next startup software and optionally reboots, in one task per device
+      on HUAWEI CloudEngine switches.
+author:
+    - Li Yanfeng (@CloudEngine-Ansible)
+notes:
+    - The feature must be enabled with feature scp-server.
+    - Run the play with a large number of forks and C(strategy: free) so that
+      the size check and startup staging of one device overlap the upload
+      of the next; I(max_transfers) bounds how many uploads run at once.
+    - The file is not transferred again if it is already present with the same size.
+    - The uploaded file is only compared with the local file by size, the device
+      offers no checksum of a file over NETCONF or the CLI that the module could
+      compare with a local digest, so the content of the file is not verified.
+requirements: ["ncclient", "scp"]
+options:
+    local_file:
+        description:
+            - Path to the local system software file, the file name extension must be *.cc.
+              The maximum length of local_file is 4096.
+        required: true
+    remote_file:
+        description:
+            - Remote file path of the software. If omitted, the name of the local file will be used.
+              The maximum length of remote_file is 4096.
+        required: false
+        default: null
+    file_system:
+        description:
+            - The remote file system of the device.
+        required: false
+        default: 'flash:'
+    slot:
+        description:
+            - Position of the device the startup software is applied to.
+              The possible value of slot is all, slave-board, or the specific slotID.
+        required: false
+        default: null
+    max_transfers:
+        description:
+            - Maximum number of devices uploading at the same time from this control node.
+              The value 0 means no limit.
+        required: false
+        default: 0
+    lock_dir:
+        description:
+            - Directory on the control node that holds the transfer slot locks.
+              All tasks sharing one limit must use the same directory.
+        required: false
+        default: null
+    reboot:
+        description:
+            - Reboot the device after staging when it is not running the new software yet.
+        required: false
+        type: bool
+        default: false
+    save_config:
+        description:
+            - Flag indicating whether to save the configuration before reboot.
+        required: false
+        type: bool
+        default: false
+'''
+
+EXAMPLES = '''
+- name: upgrade module test
+  hosts: cloudengine
+  connection: local
+  gather_facts: no
+  strategy: free
+  vars:
+    cli:
+      host: "{{ inventory_hostname }}"
+      port: "{{ ansible_ssh_port }}"
+      username: "{{ username }}"
+      password: "{{ password }}"
+      transport: cli
+
+  tasks:
+
+  - name: Stage the new software, at most 20 uploads at a time
+    ce_upgrade:
+      local_file: /opt/images/CE12800-V200R002C20.cc
+      max_transfers: 20
+      lock_dir: /tmp/ce_upgrade
+      provider: "{{ cli }}"
+
+  - name: Stage the new software and reboot
+    ce_upgrade:
+      local_file: /opt/images/CE12800-V200R002C20.cc
+      slot: all
+      reboot: true
+      save_config: true
+      provider: "{{ cli }}"
+'''
+
+RETURN = '''
+changed:
+    description: check to see if a change was made on the device
+    returned: always
+    type: boolean
+    sample: true
+transferred:
+    description: whether the software file was transferred to the device
+    returned: always
+    type: boolean
+    sample: true
+rebooted:
+    description: whether the device was instructed to reboot
+    returned: always
+    type: boolean
+    sample: false
+remote_file:
+    description: The path of the remote file.
+    returned: always
+    type: string
+    sample: '/CE12800-V200R002C20.cc'
+stage_timings:
+    description: seconds spent in each upgrade stage
+    returned: always
+    type: dict
+    sample: {"check": 0.52, "transfer_wait": 12.01, "transfer": 301.3,
+             "size_check": 0.48, "stage": 6.2, "reboot": 0.0}
+updates:
+    description: command sent to the device
+    returned: always
+    type: list
+    sample: ["startup system-software flash:/CE12800-V200R002C20.cc all"]
+'''
+
+import os
+import re
+import sys
+import socket
+import time
+import fcntl
+import tempfile
+from xml.etree import ElementTree
+import paramiko
+from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.ce import ce_argument_spec, run_commands, get_nc_config, \
+    execute_nc_action, get_file_startup_index
+
+try:
+    from scp import SCPClient, SCPException
+    HAS_SCP = True
+except ImportError:
+    HAS_SCP = False
+
+try:
+    from ncclient.operations.errors import TimeoutExpiredError
+    HAS_NCCLIENT = True
+except ImportError:
+    HAS_NCCLIENT = False
+
+# the device may still be writing the uploaded file to flash
+SIZE_CHECK_RETRIES = 3
+SIZE_CHECK_INTERVAL = 10
+
+CE_NC_GET_SCP_ENABLE = """
+<filter type="subtree">
+  <sshs xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <sshServer>
+      <scpEnable></scpEnable>
+    </sshServer>
+  </sshs>
+</filter>
+"""
+
+CE_NC_XML_EXECUTE_REBOOT = """
+    <action>
+      <devm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+        <reboot>
+            <saveConfig>%s</saveConfig>
+        </reboot>
+      </devm>
+    </action>
+"""
+
+
+class TransferSlot(object):
+    """Counting semaphore shared by all forks on the control node"""
+
+    def __init__(self, lock_dir, max_slots):
+        self.lock_dir = lock_dir
+        self.max_slots = max_slots
+        self.lock_file = None
+
+    def acquire(self):
+        """Block until one of the transfer slots is free"""
+
+        if self.max_slots <= 0:
+            return
+        if not os.path.isdir(self.lock_dir):
+            try:
+                os.makedirs(self.lock_dir)
+            except OSError:
+                if not os.path.isdir(self.lock_dir):
+                    raise
+
+        while True:
+            for index in range(self.max_slots):
+                path = os.path.join(self.lock_dir, 'transfer-%d.lock' % index)
+                lock_file = open(path, 'w')
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except IOError:
+                    lock_file.close()
+                    continue
+                self.lock_file = lock_file
+                return
+            time.sleep(1)
+
+    def release(self):
+        """Free the transfer slot held by this task"""
+
+        if not self.lock_file:
+            return
+        fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+        self.lock_file.close()
+        self.lock_file = None
+
+
+class Upgrade(object):
+    """Upgrade system software function class"""
+
+    def __init__(self, argument_spec):
+        self.spec = argument_spec
+        self.module = None
+        self.init_module()
+
+        # upgrade parameters
+        self.local_file = self.module.params['local_file']
+        self.remote_file = self.module.params['remote_file']
+        self.file_system = self.module.params['file_system']
+        self.slot = self.module.params['slot']
+        self.max_transfers = self.module.params['max_transfers']
+        self.lock_dir = self.module.params['lock_dir'] or \
+            os.path.join(tempfile.gettempdir(), 'ce_upgrade')
+        self.reboot = self.module.params['reboot']
+        self.save_config = self.module.params['save_config']
+
+        # state
+        self.changed = False
+        self.transferred = False
+        self.rebooted = False
+        self.updates_cmd = list()
+        self.stage_timings = dict()
+        self.file_index = None
+
+    def init_module(self):
+        """Init module"""
+
+        self.module = AnsibleModule(
+            argument_spec=self.spec, supports_check_mode=True)
+
+    def check_params(self):
+        """Check all input params"""
+
+        if not HAS_SCP:
+            self.module.fail_json(
+                msg='Error: No scp package, please install it.')
+
+        if not HAS_NCCLIENT:
+            self.module.fail_json(
+                msg='Error: The ncclient library is required.')
+
+        if len(self.local_file) > 4096:
+            self.module.fail_json(
+                msg='Error: The maximum length of local_file is 4096.')
+
+        if self.remote_file and len(self.remote_file) > 4096:
+            self.module.fail_json(
+                msg='Error: The maximum length of remote_file is 4096.')
+
+        if ' ' in self.local_file or not self.local_file.endswith('.cc'):
+            self.module.fail_json(
+                msg='Error: Invalid software file name or software file name extension ( *.cc).')
+
+        if not os.path.isfile(self.local_file):
+            self.module.fail_json(
+                msg='Error: Local file %s not found.' % self.local_file)
+
+        if self.slot and self.slot.isdigit():
+            if int(self.slot) <= 0 or int(self.slot) > 16:
+                self.module.fail_json(
+                    msg='Error: The number of slot is not in the range from 1 to 16.')
+
+        if self.max_transfers < 0:
+            self.module.fail_json(
+                msg='Error: The max_transfers must be greater than or equal to 0.')
+
+    def get_scp_enable(self):
+        """Get scp enable state"""
+
+        ret_xml = get_nc_config(self.module, CE_NC_GET_SCP_ENABLE)
+        if "<data/>" in ret_xml:
+            return None
+
+        xml_str = ret_xml.replace('\r', '').replace('\n', '').\
+            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
+            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+
+        root = ElementTree.fromstring(xml_str)
+        return root.findtext("data/sshs/sshServer/scpEnable")
+
+    def get_remote_path(self):
+        """Get remote directory and file name"""
+
+        full_path = self.file_system + self.remote_file
+        return os.path.dirname(full_path) + '/', os.path.basename(full_path)
+
+    def is_remote_size_match(self, refresh=False):
+        """Whether the remote file exists with the local file size"""
+
+        dir_name, file_name = self.get_remote_path()
+        self.file_index = get_file_startup_index(self.module, dir_name, refresh)
+        if file_name not in self.file_index["files"]:
+            return False
+        return self.file_index["files"][file_name] == os.path.getsize(self.local_file)
+
+    def enough_space(self):
+        """Whether device has enough space"""
+
+        commands = list()
+        cmd = 'dir %s' % self.file_system
+        commands.append(cmd)
+        output = run_commands(self.module, commands)
+        if not output:
+            return True
+
+        match = re.search(r'\((.*) KB free\)', output[0])
+        if not match:
+            return True
+        kbytes_free = match.group(1).replace(',', '')
+        if int(kbytes_free) * 1024 > os.path.getsize(self.local_file):
+            return True
+
+        return False
+
+    def transfer_file(self):
+        """Upload the software by scp while holding a transfer slot"""
+
+        if not self.enough_space():
+            self.module.fail_json(
+                msg='Error: Could not transfer file. Not enough space on device.')
+
+        slot = TransferSlot(self.lock_dir, self.max_transfers)
+        start = time.time()
+        slot.acquire()
+        self.stage_timings["transfer_wait"] = round(time.time() - start, 2)
+
+        start = time.time()
+        ssh = paramiko.SSHClient()
+        try:
+            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            ssh.connect(hostname=self.module.params['host'],
+                        username=self.module.params['username'],
+                        password=self.module.params['password'],
+                        port=self.module.params['port'])
+            scp = SCPClient(ssh.get_transport())
+            try:
+                scp.put(self.local_file, self.file_system + self.remote_file)
+            except socket.timeout:
+                # the device acknowledges the upload only after writing flash,
+                # the size is checked in check_file_size
+                pass
+            except SCPException:
+                # the scp package reports the same timeout as an SCPException
+                err = sys.exc_info()[1]
+                if 'Timeout waiting for scp response' not in str(err):
+                    self.module.fail_json(
+                        msg='Error: Could not transfer file. %s' % str(err))
+            except Exception:
+                err = sys.exc_info()[1]
+                self.module.fail_json(
+                    msg='Error: Could not transfer file. %s' % str(err))
+            finally:
+                scp.close()
+        finally:
+            ssh.close()
+            slot.release()
+        self.stage_timings["transfer"] = round(time.time() - start, 2)
+        self.transferred = True
+        self.changed = True
+
+    def check_file_size(self):
+        """Compare the size of the uploaded file with the local file, retry while the device writes flash"""
+
+        start = time.time()
+        for _ in range(SIZE_CHECK_RETRIES):
+            if self.is_remote_size_match(refresh=True):
+                break
+            time.sleep(SIZE_CHECK_INTERVAL)
+        else:
+            self.module.fail_json(
+                msg='Error: Could not transfer file. The size of the remote file differs from the local file.')
+        self.stage_timings["size_check"] = round(time.time() - start, 2)
+
+    def get_startup_infos(self):
+        """Get the startup entries selected by slot"""
+
+        infos = self.file_index["startup"]
+        if self.slot and self.slot.isdigit():
+            infos = [info for info in infos if info.get("position") == self.slot]
+        return infos
+
+    def is_software_match(self, key):
+        """Whether the selected positions already use the software"""
+
+        infos = self.get_startup_infos()
+        if not infos:
+            return False
+        file_name = os.path.basename(self.remote_file)
+        for info in infos:
+            if os.path.basename(info.get(key) or "") != file_name:
+                return False
+        return True
+
+    def stage_software(self):
+        """Set the software as the next startup software"""
+
+        start = time.time()
+        if self.is_software_match("nextSysSoft"):
+            self.stage_timings["stage"] = round(time.time() - start, 2)
+            return
+
+        software = self.file_system + self.remote_file
+        if self.slot:
+            if self.slot == "all" or self.slot == "slave-board":
+                cmd = "startup system-software %s %s" % (software, self.slot)
+            else:
+                cmd = "startup system-software %s slot %s" % (software, self.slot)
+        else:
+            cmd = "startup system-software %s" % software
+
+        self.updates_cmd.append(cmd)
+        if not self.module.check_mode:
+            run_commands(self.module, [{'output': None, 'command': cmd}])
+        self.changed = True
+        self.stage_timings["stage"] = round(time.time() - start, 2)
+
+    def reboot_device(self):
+        """Reboot the device when it is not running the software yet"""
+
+        start = time.time()
+        if self.is_software_match("curSysSoft"):
+            self.stage_timings["reboot"] = round(time.time() - start, 2)
+            return
+
+        if not self.module.check_mode:
+            try:
+                execute_nc_action(self.module, CE_NC_XML_EXECUTE_REBOOT % str(self.save_config).lower())
+            except TimeoutExpiredError:
+                pass
+        self.rebooted = True
+        self.changed = True
+        self.stage_timings["reboot"] = round(time.time() - start, 2)
+
+    def work(self):
+        """Excute task """
+
+        self.check_params()
+        if self.remote_file is None:
+            self.remote_file = '/' + os.path.basename(self.local_file)
+
+        start = time.time()
+        if self.get_scp_enable() == 'Disable':
+            self.module.fail_json(
+                msg='Error: Please ensure SCP server is enabled.')
+        size_match = self.is_remote_size_match()
+        self.stage_timings["check"] = round(time.time() - start, 2)
+
+        if not size_match:
+            if self.module.check_mode:
+                self.changed = True
+            else:
+                self.transfer_file()
+                self.check_file_size()
+
+        self.stage_software()
+        if self.reboot:
+            self.reboot_device()
+
+        self.module.exit_json(
+            changed=self.changed,
+            transferred=self.transferred,
+            rebooted=self.rebooted,
+            local_file=self.local_file,
+            remote_file=self.remote_file,
+            file_system=self.file_system,
+            stage_timings=self.stage_timings,
+            updates=self.updates_cmd)
+
+
+def main():
+    """Main function entry"""
+
+    argument_spec = dict(
+        local_file=dict(required=True),
+        remote_file=dict(required=False),
+        file_system=dict(required=False, default='flash:'),
+        slot=dict(required=False),
+        max_transfers=dict(required=False, type='int', default=0),
+        lock_dir=dict(required=False),
+        reboot=dict(required=False, type='bool', default=False),
+        save_config=dict(required=False, type='bool', default=False)
+    )
+    argument_spec.update(ce_argument_spec)
+    upgrade_obj = Upgrade(argument_spec)
+    upgrade_obj.work()
+
+
+if __name__ == '__main__':
+    main()
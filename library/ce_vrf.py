@@ -35,12 +35,25 @@ options:
     vrf:
         description:
             - VPN instance, the length of vrf name is 1 - 31, i.e. "test", but can not be C(_public_).
-        required: true
+              Either vrf or vrfs is required.
+        required: false
     description:
         description:
             - Description of the vrf, the string length is 1 - 242 .
         required: false
         default: null
+    vrfs:
+        description:
+            - A list of VPN instances, each one is a vrf name or a dict with vrf and optionally
+              description, afs and interfaces. afs is a list of address families, each one is
+              C(v4), C(v6) or a dict with vrf_aftype, route_distinguisher and vpn_targets,
+              vpn_targets is a list of dicts with vpn_target_type, vpn_target_value and evpn.
+              interfaces is a list of interfaces bound to the vrf.
+              If I(state=present), the vrfs are created or modified, route targets and interface
+              bindings are only added. If I(state=absent), the listed vrfs are removed.
+              All the changes are sent in one edit. Can not be used with C(vrf).
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -75,6 +88,21 @@ EXAMPLES = '''
       vrf: vpna
       state: absent
       provider: "{{ cli }}"
+  - name: Config two tenant vpn instances with route targets and interface bindings
+    ce_vrf:
+      vrfs:
+        - vrf: tenant1
+          description: tenant one
+          afs:
+            - vrf_aftype: v4
+              route_distinguisher: "65000:1"
+              vpn_targets:
+                - {vpn_target_type: export_extcommunity, vpn_target_value: "65000:1"}
+                - {vpn_target_type: import_extcommunity, vpn_target_value: "65000:1"}
+          interfaces: [Vlanif101]
+        - vrf: tenant2
+          afs: [v4, v6]
+      provider: "{{ cli }}"
 '''
 RETURN = '''
 proposed:
@@ -109,25 +137,9 @@ changed:
     sample: true
 '''
 
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-
-CE_NC_GET_VRF = """
-<filter type="subtree">
-      <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <l3vpncomm>
-          <l3vpnInstances>
-            <l3vpnInstance>
-              <vrfName></vrfName>
-              <vrfDescription></vrfDescription>
-            </l3vpnInstance>
-          </l3vpnInstances>
-        </l3vpncomm>
-      </l3vpn>
-    </filter>
-"""
+from ansible.module_utils.ce import set_nc_config, set_nc_config_chunks, ce_argument_spec, \
+    get_l3vpn_snapshot, get_ifm_snapshot
 
 CE_NC_CREATE_VRF = """
 <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -155,6 +167,82 @@ CE_NC_DELETE_VRF = """
       </l3vpn>
 """
 
+CE_NC_SET_VRFS_HEAD = """
+<config>
+  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <l3vpncomm>
+      <l3vpnInstances>
+"""
+
+CE_NC_SET_VRFS_TAIL = """
+      </l3vpnInstances>
+    </l3vpncomm>
+  </l3vpn>
+</config>
+"""
+
+CE_NC_MERGE_VRF_ITEM = """
+        <l3vpnInstance operation="merge">
+          <vrfName>%s</vrfName>%s
+        </l3vpnInstance>
+"""
+
+CE_NC_DELETE_VRF_ITEM = """
+        <l3vpnInstance operation="delete">
+          <vrfName>%s</vrfName>
+        </l3vpnInstance>
+"""
+
+CE_NC_VRF_ITEM_DESCRIPTION = """
+          <vrfDescription>%s</vrfDescription>"""
+
+CE_NC_VRF_ITEM_AFS = """
+          <vpnInstAFs>%s
+          </vpnInstAFs>"""
+
+CE_NC_VRF_ITEM_AF = """
+            <vpnInstAF operation="merge">
+              <afType>%s</afType>%s
+            </vpnInstAF>"""
+
+CE_NC_VRF_ITEM_RD = """
+              <vrfRD>%s</vrfRD>"""
+
+CE_NC_VRF_ITEM_TARGETS = """
+              <vpnTargets>%s
+              </vpnTargets>"""
+
+CE_NC_VRF_ITEM_TARGET = """
+                <vpnTarget operation="merge">
+                  <vrfRTType>%s</vrfRTType>
+                  <vrfRTValue>%s</vrfRTValue>
+                </vpnTarget>"""
+
+CE_NC_VRF_ITEM_EXTEND_TARGETS = """
+              <exVpnTargets>%s
+              </exVpnTargets>"""
+
+CE_NC_VRF_ITEM_EXTEND_TARGET = """
+                <exVpnTarget operation="merge">
+                  <vrfRTType>%s</vrfRTType>
+                  <vrfRTValue>%s</vrfRTValue>
+                  <extAddrFamily>evpn</extAddrFamily>
+                </exVpnTarget>"""
+
+CE_NC_VRF_ITEM_INTFS = """
+          <l3vpnIfs>%s
+          </l3vpnIfs>"""
+
+CE_NC_VRF_ITEM_INTF = """
+            <l3vpnIf operation="merge">
+              <ifName>%s</ifName>
+            </l3vpnIf>"""
+
+# vrf_aftype option to afType of the device
+VRF_AF_TYPES = {"v4": "ipv4uni", "v6": "ipv6uni"}
+
+VPN_TARGET_TYPES = ["export_extcommunity", "import_extcommunity"]
+
 
 def build_config_xml(xmlstr):
     """build_config_xml"""
@@ -162,6 +250,54 @@ def build_config_xml(xmlstr):
     return '<config> ' + xmlstr + ' </config>'
 
 
+def is_valid_value(vrf_targe_value):
+    """check if the vrf target value is valid"""
+
+    each_num = None
+    if len(vrf_targe_value) > 21 or len(vrf_targe_value) < 3:
+        return False
+    if vrf_targe_value.find(':') == -1:
+        return False
+    elif vrf_targe_value == '0:0':
+        return False
+    elif vrf_targe_value == '0.0:0':
+        return False
+    else:
+        value_list = vrf_targe_value.split(':')
+        if value_list[0].find('.') != -1:
+            if not value_list[1].isdigit():
+                return False
+            if int(value_list[1]) > 65535:
+                return False
+            value = value_list[0].split('.')
+            if len(value) == 4:
+                for each_num in value:
+                    if not each_num.isdigit():
+                        return False
+                if int(each_num) > 255:
+                    return False
+                return True
+            elif len(value) == 2:
+                for each_num in value:
+                    if not each_num.isdigit():
+                        return False
+                if int(each_num) > 65535:
+                    return False
+                return True
+            else:
+                return False
+        elif not value_list[0].isdigit():
+            return False
+        elif not value_list[1].isdigit():
+            return False
+        elif int(value_list[0]) < 65536 and int(value_list[1]) < 4294967296:
+            return True
+        elif int(value_list[0]) > 65535 and int(value_list[0]) < 4294967296:
+            return bool(int(value_list[1]) < 65536)
+        else:
+            return False
+
+
 class Vrf(object):
     """Manange vpn instance"""
 
@@ -173,7 +309,9 @@ class Vrf(object):
         # vpn instance info
         self.vrf = self.module.params['vrf']
         self.description = self.module.params['description']
+        self.vrfs = self.module.params['vrfs']
         self.state = self.module.params['state']
+        self.ifm_index = None
 
         # state
         self.changed = False
@@ -186,8 +324,11 @@ class Vrf(object):
     def init_module(self):
         """init_module"""
 
+        required_one_of = [("vrf", "vrfs")]
+        mutually_exclusive = [("vrf", "vrfs")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, required_one_of=required_one_of,
+            mutually_exclusive=mutually_exclusive, supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -206,47 +347,264 @@ class Vrf(object):
         else:
             self.updates_cmd.append('undo ip vpn-instance %s' % (self.vrf))
 
-    def get_vrf(self):
+    def get_vrf(self, refresh=False):
         """ check if vrf is need to change"""
 
-        getxmlstr = CE_NC_GET_VRF
-        xml_str = get_nc_config(self.module, getxmlstr)
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        root = ElementTree.fromstring(xml_str)
-        vpn_instances = root.findall(
-            "data/l3vpn/l3vpncomm/l3vpnInstances/l3vpnInstance")
-        if vpn_instances:
-            for vpn_instance in vpn_instances:
-                if vpn_instance.find('vrfName').text == self.vrf:
-                    if vpn_instance.find('vrfDescription').text == self.description:
-                        if self.state == "present":
-                            return False
-                        else:
-                            return True
-                    else:
-                        return True
-            return self.state == "present"
-        else:
-            return self.state == "present"
+        snapshot = get_l3vpn_snapshot(self.module, refresh)
+        vpn_instance = snapshot["vrfs"].get(self.vrf)
+        if vpn_instance:
+            if vpn_instance["vrfDescription"] == self.description:
+                return self.state != "present"
+            return True
+        return self.state == "present"
 
     def check_params(self):
         """Check all input params"""
 
+        self.check_vrf_params(self.vrf, self.description)
+
+    def check_vrf_params(self, vrf, description):
+        """Check the name and description of a vrf"""
+
         # vrf and description check
-        if self.vrf == '_public_':
+        if vrf == '_public_':
             self.module.fail_json(
                 msg='Error: The vrf name _public_ is reserved.')
-        if len(self.vrf) < 1 or len(self.vrf) > 31:
+        if len(vrf) < 1 or len(vrf) > 31:
             self.module.fail_json(
                 msg='Error: The vrf name length must between 1 and 242.')
-        if self.description:
-            if len(self.description) < 1 or len(self.description) > 242:
+        if description:
+            if len(description) < 1 or len(description) > 242:
                 self.module.fail_json(
                     msg='Error: The vrf description length must between 1 and 242.')
 
+    def get_af_plans(self, vrf, afs):
+        """normalize the address families of a vrfs entry"""
+
+        plans = list()
+        for vrf_af in afs:
+            if not isinstance(vrf_af, dict):
+                vrf_af = dict(vrf_aftype=vrf_af)
+            want = dict(vrf_aftype=vrf_af.get("vrf_aftype") or "v4",
+                        route_distinguisher=vrf_af.get("route_distinguisher"),
+                        vpn_targets=list())
+            if want["vrf_aftype"] not in VRF_AF_TYPES:
+                self.module.fail_json(
+                    msg='Error: The vrf_aftype of vrf %s must be v4 or v6.' % vrf)
+            if want["vrf_aftype"] in [plan["vrf_aftype"] for plan in plans]:
+                self.module.fail_json(
+                    msg='Error: The address family %s of vrf %s is listed more than once.'
+                        % (want["vrf_aftype"], vrf))
+            if want["route_distinguisher"] is not None:
+                want["route_distinguisher"] = str(want["route_distinguisher"])
+                if not is_valid_value(want["route_distinguisher"]):
+                    self.module.fail_json(
+                        msg='Error: The route distinguisher %s of vrf %s is invalid.'
+                            % (want["route_distinguisher"], vrf))
+
+            for target in vrf_af.get("vpn_targets") or list():
+                if not isinstance(target, dict) or target.get("vpn_target_type") not in VPN_TARGET_TYPES:
+                    self.module.fail_json(
+                        msg='Error: Each vpn target of vrf %s must be a dict with vpn_target_type '
+                            'export_extcommunity or import_extcommunity.' % vrf)
+                value = str(target.get("vpn_target_value") or "")
+                if not is_valid_value(value):
+                    self.module.fail_json(
+                        msg='Error: The vpn target value %s of vrf %s is invalid.' % (value, vrf))
+                want["vpn_targets"].append(dict(vpn_target_type=target["vpn_target_type"],
+                                                vpn_target_value=value,
+                                                evpn=self.module.boolean(target.get("evpn", False))))
+            plans.append(want)
+
+        return plans
+
+    def get_vrf_plans(self):
+        """normalize the vrfs entries, the options that an entry does not set
+        are taken from the module options"""
+
+        plans = list()
+        bindings = dict()
+        for entry in self.vrfs:
+            if not isinstance(entry, dict):
+                entry = dict(vrf=entry)
+            if not entry.get("vrf"):
+                self.module.fail_json(
+                    msg='Error: Each vrf must be a name or a dict with vrf.')
+
+            want = dict(vrf=str(entry["vrf"]), description=entry.get("description"),
+                        afs=list(), interfaces=list())
+            if want["description"] is None:
+                want["description"] = self.description
+            if want["vrf"] in [plan["vrf"] for plan in plans]:
+                self.module.fail_json(
+                    msg='Error: The vrf %s is listed more than once.' % want["vrf"])
+            self.check_vrf_params(want["vrf"], want["description"])
+
+            if self.state == "present":
+                want["afs"] = self.get_af_plans(want["vrf"], entry.get("afs") or list())
+                for interface in entry.get("interfaces") or list():
+                    interface = str(interface).replace(' ', '')
+                    if interface.upper() in bindings:
+                        self.module.fail_json(
+                            msg='Error: Interface %s is listed in vrf %s and %s.'
+                                % (interface, bindings[interface.upper()], want["vrf"]))
+                    bindings[interface.upper()] = want["vrf"]
+                    want["interfaces"].append(interface)
+            plans.append(want)
+
+        return plans
+
+    def get_l3_interface(self, interface):
+        """get the name of an interface on the device,
+        it must be a layer 3 interface"""
+
+        if self.ifm_index is None:
+            self.ifm_index = dict((intf["ifName"].upper(), intf)
+                                  for intf in get_ifm_snapshot(self.module) if intf.get("ifName"))
+        intf = self.ifm_index.get(interface.upper())
+        if not intf:
+            self.module.fail_json(
+                msg='Error: Interface %s does not exist.' % interface)
+        if intf.get("isL2SwitchPort") == "true":
+            self.module.fail_json(
+                msg='Error: L2Switch Port %s can not binding a VPN instance.' % interface)
+        return intf["ifName"]
+
+    def get_vrf_info(self, vpn_instance):
+        """get a vpn instance of the snapshot in the format of a vrfs entry"""
+
+        af_names = dict((af_type, name) for name, af_type in VRF_AF_TYPES.items())
+        afs = list()
+        for af_type in sorted(vpn_instance["afs"]):
+            vrf_af = vpn_instance["afs"][af_type]
+            targets = list()
+            for key, evpn in (("vpnTargets", False), ("evpnTargets", True)):
+                for rtarget in vrf_af[key]:
+                    targets.append(dict(vpn_target_type=rtarget.get("vrfRTType"),
+                                        vpn_target_value=rtarget.get("vrfRTValue"), evpn=evpn))
+            afs.append(dict(vrf_aftype=af_names.get(af_type, af_type),
+                            route_distinguisher=vrf_af["vrfRD"], vpn_targets=targets))
+
+        return dict(vrf=vpn_instance["vrfName"], description=vpn_instance["vrfDescription"],
+                    afs=afs, interfaces=list(vpn_instance["interfaces"]))
+
+    def get_vrf_merge_xml(self, want, vpn_instance, snapshot):
+        """get the merge of a vrfs entry, None if the vrf is already as expected"""
+
+        vrf = want["vrf"]
+        cmds = list()
+        xml_str = ""
+        if want["description"] and want["description"] != vpn_instance.get("vrfDescription"):
+            xml_str += CE_NC_VRF_ITEM_DESCRIPTION % want["description"]
+            cmds.append('description %s' % want["description"])
+
+        afs_xml = ""
+        for af in want["afs"]:
+            af_type = VRF_AF_TYPES[af["vrf_aftype"]]
+            vrf_af = vpn_instance.get("afs", dict()).get(af_type)
+            af_cmds = list()
+            af_xml = ""
+            if af["route_distinguisher"] and (not vrf_af or vrf_af["vrfRD"] != af["route_distinguisher"]):
+                af_xml += CE_NC_VRF_ITEM_RD % af["route_distinguisher"]
+                af_cmds.append('route-distinguisher %s' % af["route_distinguisher"])
+
+            targets_xml = ""
+            evpn_targets_xml = ""
+            for target in af["vpn_targets"]:
+                rt_type = target["vpn_target_type"]
+                rt_value = target["vpn_target_value"]
+                if vrf_af:
+                    rtargets = vrf_af["evpnTargets"] if target["evpn"] else vrf_af["vpnTargets"]
+                    if [rtarget for rtarget in rtargets
+                            if rtarget.get("vrfRTType") == rt_type and rtarget.get("vrfRTValue") == rt_value]:
+                        continue
+                if target["evpn"]:
+                    evpn_targets_xml += CE_NC_VRF_ITEM_EXTEND_TARGET % (rt_type, rt_value)
+                    af_cmds.append('vpn-target %s %s evpn' % (rt_value, rt_type))
+                else:
+                    targets_xml += CE_NC_VRF_ITEM_TARGET % (rt_type, rt_value)
+                    af_cmds.append('vpn-target %s %s' % (rt_value, rt_type))
+            if targets_xml:
+                af_xml += CE_NC_VRF_ITEM_TARGETS % targets_xml
+            if evpn_targets_xml:
+                af_xml += CE_NC_VRF_ITEM_EXTEND_TARGETS % evpn_targets_xml
+
+            if vrf_af and not af_xml:
+                continue
+            afs_xml += CE_NC_VRF_ITEM_AF % (af_type, af_xml)
+            if af["vrf_aftype"] == "v4":
+                cmds.append('ipv4-family')
+            else:
+                cmds.append('ipv6-family')
+            cmds.extend(af_cmds)
+        if afs_xml:
+            xml_str += CE_NC_VRF_ITEM_AFS % afs_xml
+
+        intfs_xml = ""
+        intf_cmds = list()
+        for interface in want["interfaces"]:
+            bound_vrf = snapshot["interfaces"].get(interface.upper())
+            if bound_vrf == vrf:
+                continue
+            if bound_vrf:
+                self.module.fail_json(
+                    msg='Error: Interface %s is already bound to vrf %s.' % (interface, bound_vrf))
+            if_name = self.get_l3_interface(interface)
+            intfs_xml += CE_NC_VRF_ITEM_INTF % if_name
+            intf_cmds.append('interface %s' % if_name)
+            intf_cmds.append('ip binding vpn-instance %s' % vrf)
+        if intfs_xml:
+            xml_str += CE_NC_VRF_ITEM_INTFS % intfs_xml
+
+        if vpn_instance and not xml_str:
+            return None
+
+        self.updates_cmd.append('ip vpn-instance %s' % vrf)
+        self.updates_cmd.extend(cmds)
+        self.updates_cmd.extend(intf_cmds)
+        return CE_NC_MERGE_VRF_ITEM % (vrf, xml_str)
+
+    def config_vrfs(self):
+        """diff every requested vrf with the l3vpn snapshot,
+        and apply all the changes by one edit"""
+
+        snapshot = get_l3vpn_snapshot(self.module)
+        xml_items = list()
+        self.existing = dict(vrfs=list())
+        self.proposed = dict(vrfs=list(), state=self.state)
+        for want in self.get_vrf_plans():
+            self.proposed["vrfs"].append(want)
+            vpn_instance = snapshot["vrfs"].get(want["vrf"])
+            if vpn_instance:
+                self.existing["vrfs"].append(self.get_vrf_info(vpn_instance))
+
+            if self.state == "absent":
+                if vpn_instance:
+                    xml_items.append(CE_NC_DELETE_VRF_ITEM % want["vrf"])
+                    self.updates_cmd.append('undo ip vpn-instance %s' % want["vrf"])
+                continue
+
+            xml_item = self.get_vrf_merge_xml(want, vpn_instance or dict(), snapshot)
+            if xml_item:
+                xml_items.append(xml_item)
+
+        if not xml_items:
+            return
+
+        self.changed = True
+        if not self.module.check_mode:
+            set_nc_config_chunks(self.module, CE_NC_SET_VRFS_HEAD, xml_items, CE_NC_SET_VRFS_TAIL)
+
+    def get_vrfs_end_state(self):
+        """get the listed vrfs after module execution"""
+
+        snapshot = get_l3vpn_snapshot(self.module, self.changed and not self.module.check_mode)
+        self.end_state = dict(vrfs=list())
+        for want in self.proposed["vrfs"]:
+            vpn_instance = snapshot["vrfs"].get(want["vrf"])
+            if vpn_instance:
+                self.end_state["vrfs"].append(self.get_vrf_info(vpn_instance))
+
     def operate_vrf(self):
         """config/delete vrf"""
         if not self.changed:
@@ -300,7 +658,7 @@ class Vrf(object):
     def get_end_state(self):
         """get_end_state"""
 
-        change = self.get_vrf()
+        change = self.get_vrf(refresh=self.changed)
         if not change:
             if self.state == 'present':
                 self.end_state['vrf'] = self.vrf
@@ -319,12 +677,16 @@ class Vrf(object):
     def work(self):
         """worker"""
 
-        self.check_params()
-        self.get_existing()
-        self.get_proposed()
-        self.operate_vrf()
-        self.set_update_cmd()
-        self.get_end_state()
+        if self.vrfs is not None:
+            self.config_vrfs()
+            self.get_vrfs_end_state()
+        else:
+            self.check_params()
+            self.get_existing()
+            self.get_proposed()
+            self.operate_vrf()
+            self.set_update_cmd()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -341,8 +703,9 @@ def main():
     """main"""
 
     argument_spec = dict(
-        vrf=dict(required=True, type='str'),
+        vrf=dict(required=False, type='str'),
         description=dict(required=False, type='str'),
+        vrfs=dict(required=False, type='list'),
         state=dict(choices=['absent', 'present'],
                    default='present', required=False),
     )
@@ -190,45 +190,8 @@ changed:
 '''
 
 
-import re
-from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
-
-CE_NC_GET_VRF = """
-<filter type="subtree">
-      <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-        <l3vpncomm>
-          <l3vpnInstances>
-            <l3vpnInstance>
-              <vrfName></vrfName>
-              <vrfDescription></vrfDescription>
-            </l3vpnInstance>
-          </l3vpnInstances>
-        </l3vpncomm>
-      </l3vpn>
-    </filter>
-"""
-
-CE_NC_GET_VRF_AF = """
-<filter type="subtree">
-  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <l3vpncomm>
-      <l3vpnInstances>
-        <l3vpnInstance>
-          <vrfName>%s</vrfName>
-          <vpnInstAFs>
-            <vpnInstAF>
-              <afType></afType>
-              <vrfRD></vrfRD>%s
-            </vpnInstAF>
-          </vpnInstAFs>
-        </l3vpnInstance>
-      </l3vpnInstances>
-    </l3vpncomm>
-  </l3vpn>
-</filter>
-"""
+from ansible.module_utils.ce import set_nc_config, ce_argument_spec, get_l3vpn_snapshot
 
 CE_NC_DELETE_VRF_AF = """
 <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
@@ -281,15 +244,6 @@ CE_NC_DELETE_VRF_TARGET = """
 </vpnTargets>
 """
 
-CE_NC_GET_VRF_TARGET = """
-<vpnTargets>
-  <vpnTarget>
-    <vrfRTValue></vrfRTValue>
-    <vrfRTType></vrfRTType>
-  </vpnTarget>
-</vpnTargets>
-"""
-
 CE_NC_CREATE_EXTEND_VRF_TARGET = """
 <exVpnTargets>
   <exVpnTarget operation="merge">
@@ -310,16 +264,6 @@ CE_NC_DELETE_EXTEND_VRF_TARGET = """
 </exVpnTargets>
 """
 
-CE_NC_GET_EXTEND_VRF_TARGET = """
-<exVpnTargets>
-  <exVpnTarget>
-    <vrfRTType></vrfRTType>
-    <vrfRTValue></vrfRTValue>
-    <extAddrFamily></extAddrFamily>
-  </exVpnTarget>
-</exVpnTargets>
-"""
-
 
 def build_config_xml(xmlstr):
     """build_config_xml"""
@@ -543,64 +487,30 @@ class VrfAf(object):
     def get_vrf(self):
         """ check if vrf is need to change"""
 
-        getxmlstr = CE_NC_GET_VRF
-        xmlstr_new_1 = (self.vrf.lower())
+        snapshot = get_l3vpn_snapshot(self.module)
+        return self.vrf.lower() in [name.lower() for name in snapshot["vrfs"]]
 
-        xml_str = get_nc_config(self.module, getxmlstr)
-        re_find_1 = re.findall(
-            r'.*<vrfname>(.*)</vrfname>.*', xml_str.lower())
-
-        if re_find_1 is None:
-            return False
-
-        return xmlstr_new_1 in re_find_1
-
-    def get_vrf_af(self):
+    def get_vrf_af(self, refresh=False):
         """ check if vrf is need to change"""
 
         self.vrf_af_info["vpnInstAF"] = list()
-        if self.evpn is True:
-            getxmlstr = CE_NC_GET_VRF_AF % (
-                self.vrf, CE_NC_GET_EXTEND_VRF_TARGET)
-        else:
-            getxmlstr = CE_NC_GET_VRF_AF % (self.vrf, CE_NC_GET_VRF_TARGET)
-
-        xml_str = get_nc_config(self.module, getxmlstr)
-
-        if 'data/' in xml_str:
+        snapshot = get_l3vpn_snapshot(self.module, refresh)
+        vrf = snapshot["vrfs"].get(self.vrf)
+        if not vrf or not vrf["afs"]:
             return self.state == 'present'
-        xml_str = xml_str.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        root = ElementTree.fromstring(xml_str)
 
         # get the vpn address family and RD text
-        vrf_addr_types = root.findall(
-            "data/l3vpn/l3vpncomm/l3vpnInstances/l3vpnInstance/vpnInstAFs/vpnInstAF")
-        if vrf_addr_types:
-            for vrf_addr_type in vrf_addr_types:
-                vrf_af_info = dict()
-                for vrf_addr_type_ele in vrf_addr_type:
-                    if vrf_addr_type_ele.tag in ["vrfName", "afType", "vrfRD"]:
-                        vrf_af_info[vrf_addr_type_ele.tag] = vrf_addr_type_ele.text
-                    if vrf_addr_type_ele.tag == 'vpnTargets':
-                        vrf_af_info["vpnTargets"] = list()
-                        for rtargets in vrf_addr_type_ele:
-                            rt_dict = dict()
-                            for rtarget in rtargets:
-                                if rtarget.tag in ["vrfRTValue", "vrfRTType"]:
-                                    rt_dict[rtarget.tag] = rtarget.text
-                            vrf_af_info["vpnTargets"].append(rt_dict)
-                    if vrf_addr_type_ele.tag == 'exVpnTargets':
-                        vrf_af_info["evpnTargets"] = list()
-                        for rtargets in vrf_addr_type_ele:
-                            rt_dict = dict()
-                            for rtarget in rtargets:
-                                if rtarget.tag in ["vrfRTValue", "vrfRTType"]:
-                                    rt_dict[rtarget.tag] = rtarget.text
-                            vrf_af_info["evpnTargets"].append(rt_dict)
-                self.vrf_af_info["vpnInstAF"].append(vrf_af_info)
+        if self.evpn is True:
+            target_key = "evpnTargets"
+        else:
+            target_key = "vpnTargets"
+        for vrf_af in vrf["afs"].values():
+            vrf_af_info = dict(afType=vrf_af["afType"], vrfRD=vrf_af["vrfRD"])
+            if vrf_af[target_key]:
+                vrf_af_info[target_key] = [dict(vrfRTValue=rtarget.get("vrfRTValue"),
+                                                vrfRTType=rtarget.get("vrfRTType"))
+                                           for rtarget in vrf_af[target_key]]
+            self.vrf_af_info["vpnInstAF"].append(vrf_af_info)
 
     def check_params(self):
         """Check all input params"""
@@ -779,7 +689,7 @@ class VrfAf(object):
     def get_end_state(self):
         """get_end_state"""
 
-        self.get_vrf_af()
+        self.get_vrf_af(refresh=self.changed)
         self.end_state['vrf'] = self.vrf
         self.end_state['vrf_aftype'] = list()
         self.end_state['route_distinguisher'] = list()
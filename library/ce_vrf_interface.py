@@ -122,40 +122,7 @@ changed:
 
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import ce_argument_spec, get_nc_config, set_nc_config
-
-CE_NC_GET_VRF = """
-<filter type="subtree">
-  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <l3vpncomm>
-      <l3vpnInstances>
-        <l3vpnInstance>
-          <vrfName>%s</vrfName>
-        </l3vpnInstance>
-      </l3vpnInstances>
-    </l3vpncomm>
-  </l3vpn>
-</filter>
-"""
-
-CE_NC_GET_VRF_INTERFACE = """
-<filter type="subtree">
-  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
-    <l3vpncomm>
-      <l3vpnInstances>
-        <l3vpnInstance>
-          <vrfName></vrfName>
-          <l3vpnIfs>
-            <l3vpnIf>
-              <ifName></ifName>
-            </l3vpnIf>
-          </l3vpnIfs>
-        </l3vpnInstance>
-      </l3vpnInstances>
-    </l3vpncomm>
-  </l3vpn>
-</filter>
-"""
+from ansible.module_utils.ce import ce_argument_spec, get_nc_config, set_nc_config, get_l3vpn_snapshot
 
 CE_NC_MERGE_VRF_INTERFACE = """
 <config>
@@ -346,53 +313,17 @@ class VrfInterface(object):
             self.module.fail_json(
                 msg='Error: The vrf name length must be between 1 and 31.')
 
-    def get_interface_vpn_name(self, vpninfo, vpn_name):
-        """ get vpn instance name"""
-
-        l3vpn_if = vpninfo.findall("l3vpnIf")
-        for l3vpn_ifinfo in l3vpn_if:
-            for ele in l3vpn_ifinfo:
-                if ele.tag in ['ifName']:
-                    if ele.text == self.vpn_interface:
-                        self.intf_info['vrfName'] = vpn_name
-
-    def get_interface_vpn(self):
+    def get_interface_vpn(self, refresh=False):
         """ get the VPN instance associated with the interface"""
 
-        xml_str = CE_NC_GET_VRF_INTERFACE
-        con_obj = get_nc_config(self.module, xml_str)
-        if "<data/>" in con_obj:
-            return
-
-        xml_str = con_obj.replace('\r', '').replace('\n', '').\
-            replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
-            replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
-
-        # get global vrf interface info
-        root = ElementTree.fromstring(xml_str)
-        vpns = root.findall(
-            "data/l3vpn/l3vpncomm/l3vpnInstances/l3vpnInstance")
-        if vpns:
-            for vpnele in vpns:
-                vpn_name = None
-                for vpninfo in vpnele:
-                    if vpninfo.tag == 'vrfName':
-                        vpn_name = vpninfo.text
-
-                    if vpninfo.tag == 'l3vpnIfs':
-                        self.get_interface_vpn_name(vpninfo, vpn_name)
-
-        return
+        snapshot = get_l3vpn_snapshot(self.module, refresh)
+        self.intf_info['vrfName'] = snapshot["interfaces"].get(self.vpn_interface)
 
     def is_vrf_exist(self):
         """ judge whether the VPN instance is existed"""
 
-        conf_str = CE_NC_GET_VRF % self.vrf
-        con_obj = get_nc_config(self.module, conf_str)
-        if "<data/>" in con_obj:
-            return False
-
-        return True
+        snapshot = get_l3vpn_snapshot(self.module)
+        return self.vrf in snapshot["vrfs"]
 
     def get_intf_conf_info(self):
         """ get related configuration of the interface"""
@@ -433,8 +364,7 @@ class VrfInterface(object):
     def get_end_state(self):
         """get_end_state"""
 
-        self.intf_info['vrfName'] = None
-        self.get_intf_conf_info()
+        self.get_interface_vpn(refresh=self.changed)
 
         self.end_state = dict(vrf=self.intf_info['vrfName'],
                               vpn_interface=self.vpn_interface)
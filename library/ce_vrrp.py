@@ -143,6 +143,19 @@ options:
         required: false
         choices: ['enable','disable']
         default: null
+    groups:
+        description:
+            - A list of VRRP groups, each one is a dict with interface, vrid and optionally
+              virtual_ip (an address or a list of addresses), vrrp_type, priority, advertise_interval,
+              preempt_timer_delay, holding_multiplier, fast_resume, auth_mode, auth_key, is_plain,
+              admin_interface, admin_vrid, admin_flowdown and admin_ignore_if_down.
+              The options that an entry does not set are taken from the module options of the same name.
+              If C(state=present), the virtual ips are added and the attributes are set.
+              If C(state=absent), the virtual ips are removed and the attributes are restored to
+              their defaults, an entry with neither removes the whole group.
+              Can not be used with interface, vrid and virtual_ip.
+        required: false
+        default: null
     state:
         description:
             - Specify desired state of the resource.
@@ -235,6 +248,16 @@ EXAMPLES = '''
       auth_mode: simple
       auth_key: aaa
       provider: "{{ cli }}"
+
+  - name: Set vrrp groups of many vlanif interfaces in one task
+    ce_vrrp:
+      priority: 120
+      preempt_timer_delay: 10
+      groups:
+        - {interface: Vlanif10, vrid: 1, virtual_ip: 10.1.10.254}
+        - {interface: Vlanif20, vrid: 1, virtual_ip: 10.1.20.254, priority: 110}
+        - {interface: Vlanif30, vrid: 2, virtual_ip: [10.1.30.253, 10.1.30.254]}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -287,7 +310,8 @@ updates:
 
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec, \
+    set_nc_config_chunks, get_nc_snapshot, get_nc_xml_root
 
 
 CE_NC_GET_VRRP_GROUP_INFO = """
@@ -401,6 +425,117 @@ CE_NC_DELETE_VRRP_VIRTUAL_IP_INFO = """
 
 """
 
+CE_NC_SET_VRRP_GROUPS_HEAD = """
+<config>
+  <vrrp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">%s
+    <vrrpGroups>
+"""
+
+CE_NC_SET_VRRP_GROUPS_TAIL = """
+    </vrrpGroups>
+  </vrrp>
+</config>
+"""
+
+CE_NC_MERGE_VRRP_GLOBAL = """
+    <vrrpGlobalCfg operation="merge">%s
+    </vrrpGlobalCfg>"""
+
+CE_NC_OPERATION_VRRP_GROUP = """
+      <vrrpGroup operation="%s">
+        <ifName>%s</ifName>
+        <vrrpId>%s</vrrpId>%s
+      </vrrpGroup>
+"""
+
+CE_NC_OPERATION_VRRP_VIRTUAL_IP = """
+          <virtualIp operation="%s">
+            <virtualIpAddress>%s</virtualIpAddress>
+          </virtualIp>"""
+
+# group options of the groups list and the integer range of the numeric ones
+VRRP_GROUP_OPTIONS = ["vrrp_type", "priority", "advertise_interval", "preempt_timer_delay",
+                      "holding_multiplier", "fast_resume", "auth_mode", "auth_key", "is_plain",
+                      "admin_interface", "admin_vrid", "admin_flowdown", "admin_ignore_if_down"]
+VRRP_GROUP_RANGES = [("vrid", 1, 255), ("admin_vrid", 1, 255), ("priority", 1, 254),
+                     ("advertise_interval", 1, 255000), ("preempt_timer_delay", 1, 3600),
+                     ("holding_multiplier", 3, 10)]
+# group options that state=absent restores, their xml tag and default value
+VRRP_GROUP_DEFAULTS = [("vrrp_type", "vrrpType", "normal"), ("priority", "priority", "100"),
+                       ("advertise_interval", "advertiseInterval", "1000"),
+                       ("preempt_timer_delay", "delayTime", "0"),
+                       ("holding_multiplier", "holdMultiplier", "3"),
+                       ("fast_resume", "fastResume", "false"),
+                       ("auth_mode", "authenticationMode", "none")]
+
+
+CE_NC_GET_VRRP_SNAPSHOT = """
+<filter type="subtree">
+  <vrrp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <vrrpGlobalCfg>
+      <gratuitousArpFlag></gratuitousArpFlag>
+      <gratuitousArpTimeOut></gratuitousArpTimeOut>
+      <recoverDelay></recoverDelay>
+      <version></version>
+    </vrrpGlobalCfg>
+    <vrrpGroups>
+      <vrrpGroup>
+        <ifName></ifName>
+        <vrrpId></vrrpId>
+        <priority></priority>
+        <advertiseInterval></advertiseInterval>
+        <preemptMode></preemptMode>
+        <delayTime></delayTime>
+        <authenticationMode></authenticationMode>
+        <authenticationKey></authenticationKey>
+        <vrrpType></vrrpType>
+        <adminVrrpId></adminVrrpId>
+        <adminIfName></adminIfName>
+        <adminIgnoreIfDown></adminIgnoreIfDown>
+        <isPlain></isPlain>
+        <unflowdown></unflowdown>
+        <fastResume></fastResume>
+        <holdMultiplier></holdMultiplier>
+        <virtualIps>
+          <virtualIp>
+            <virtualIpAddress></virtualIpAddress>
+          </virtualIp>
+        </virtualIps>
+      </vrrpGroup>
+    </vrrpGroups>
+  </vrrp>
+</filter>
+"""
+
+
+def parse_vrrp_snapshot(xml_str):
+    """parse vrrp global and group reply, groups are indexed by
+    (lower case interface name, vrid) and hold their virtual ip list"""
+
+    snapshot = dict(globals=dict(), groups=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    global_ele = root.find("data/vrrp/vrrpGlobalCfg")
+    if global_ele is not None:
+        snapshot["globals"] = dict((ele.tag, ele.text) for ele in global_ele)
+
+    for group_ele in root.findall("data/vrrp/vrrpGroups/vrrpGroup"):
+        group = dict((ele.tag, ele.text) for ele in group_ele if ele.tag != "virtualIps")
+        group["virtualIps"] = [vip.findtext("virtualIpAddress")
+                               for vip in group_ele.findall("virtualIps/virtualIp")]
+        snapshot["groups"][(group.get("ifName", "").lower(), group.get("vrrpId"))] = group
+
+    return snapshot
+
+
+def get_vrrp_snapshot(module, refresh=False):
+    """get vrrp global config, all groups and their virtual ips in one netconf read"""
+
+    return get_nc_snapshot(module, ("vrrp",), CE_NC_GET_VRRP_SNAPSHOT,
+                           parse_vrrp_snapshot, refresh)
+
 
 def is_valid_address(address):
     """check ip-address is valid"""
@@ -480,12 +615,14 @@ class Vrrp(object):
         self.is_plain = self.module.params['is_plain']
         self.auth_key = self.module.params['auth_key']
         self.fast_resume = self.module.params['fast_resume']
+        self.groups = self.module.params['groups']
         self.state = self.module.params['state']
 
         # vrrp info
         self.vrrp_global_info = None
         self.virtual_ip_info = None
         self.vrrp_group_info = None
+        self.group_plans = list()
 
         # state
         self.changed = False
@@ -498,8 +635,10 @@ class Vrrp(object):
     def init_module(self):
         """ init module """
 
+        mutually_exclusive = [("groups", "interface"), ("groups", "vrid"), ("groups", "virtual_ip")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, mutually_exclusive=mutually_exclusive,
+            supports_check_mode=True)
 
     def get_virtual_ip_info(self):
         """ get vrrp virtual ip info."""
@@ -663,6 +802,283 @@ class Vrrp(object):
                 self.module.fail_json(
                     msg='Error: The length of auth_key is not in the range from 1 to 16.')
 
+    def check_groups(self):
+        """check groups list and get the group plans"""
+
+        self.group_plans = list()
+        for group in self.groups:
+            if not isinstance(group, dict) or not group.get("interface") or not group.get("vrid"):
+                self.module.fail_json(
+                    msg='Error: Each group must be a dict with interface and vrid.')
+
+            plan = dict(interface=str(group["interface"]), vrid=str(group["vrid"]))
+            virtual_ips = group.get("virtual_ip") or list()
+            if not isinstance(virtual_ips, list):
+                virtual_ips = [virtual_ips]
+            plan["virtual_ips"] = [str(vip) for vip in virtual_ips]
+            for option in VRRP_GROUP_OPTIONS:
+                value = group.get(option, self.module.params[option])
+                if value is not None and not isinstance(value, bool):
+                    value = str(value)
+                plan[option] = value
+            for option in ["is_plain", "admin_flowdown", "admin_ignore_if_down"]:
+                plan[option] = self.module.boolean(plan[option]) if plan[option] is not None else False
+
+            if not get_interface_type(plan["interface"]):
+                self.module.fail_json(
+                    msg='Error: Interface name of %s is error.' % plan["interface"])
+            if plan["admin_interface"] and not get_interface_type(plan["admin_interface"]):
+                self.module.fail_json(
+                    msg='Error: Admin interface name of %s is error.' % plan["admin_interface"])
+            for option, min_value, max_value in VRRP_GROUP_RANGES:
+                if plan[option] is None:
+                    continue
+                if not plan[option].isdigit() or int(plan[option]) < min_value or int(plan[option]) > max_value:
+                    self.module.fail_json(
+                        msg='Error: The value of %s ranges from %s to %s.' % (option, min_value, max_value))
+            for vip in plan["virtual_ips"]:
+                if not is_valid_address(vip):
+                    self.module.fail_json(
+                        msg='Error: The %s is not a valid ip address.' % vip)
+            if plan["vrrp_type"] not in [None, "normal", "member", "admin"]:
+                self.module.fail_json(
+                    msg='Error: The vrrp_type of group %s %s is error.' % (plan["interface"], plan["vrid"]))
+            if plan["fast_resume"] not in [None, "enable", "disable"]:
+                self.module.fail_json(
+                    msg='Error: The fast_resume of group %s %s is error.' % (plan["interface"], plan["vrid"]))
+            if plan["auth_mode"] not in [None, "simple", "md5", "none"]:
+                self.module.fail_json(
+                    msg='Error: The auth_mode of group %s %s is error.' % (plan["interface"], plan["vrid"]))
+            if plan["auth_key"]:
+                if len(plan["auth_key"]) > 16 or len(plan["auth_key"].replace(' ', '')) < 1:
+                    self.module.fail_json(
+                        msg='Error: The length of auth_key is not in the range from 1 to 16.')
+            if plan["admin_ignore_if_down"] is True and plan["vrrp_type"] != "admin":
+                self.module.fail_json(
+                    msg='Error: vrrpType must be admin when admin_ignore_if_down is true.')
+            if (plan["admin_interface"] or plan["admin_vrid"]) and plan["vrrp_type"] != "member":
+                self.module.fail_json(
+                    msg='Error: it binds a VRRP group to an mVRRP group, vrrp_type must be "member".')
+            if plan["auth_mode"] == "md5" and plan["is_plain"] is True:
+                self.module.fail_json(
+                    msg='Error: is_plain can not be True when auth_mode is md5.')
+            self.group_plans.append(plan)
+
+    def get_group_leaves(self, plan, vrrp_group):
+        """get the group leaves that differ from the plan, xml tag to value"""
+
+        leaves = list()
+        if self.state == "present":
+            fast_resume = None
+            if plan["fast_resume"]:
+                fast_resume = "true" if plan["fast_resume"] == "enable" else "false"
+            wanted = [("vrrpType", plan["vrrp_type"]),
+                      ("adminVrrpId", plan["admin_vrid"]),
+                      ("adminIfName", plan["admin_interface"]),
+                      ("priority", plan["priority"]),
+                      ("fastResume", fast_resume),
+                      ("advertiseInterval", plan["advertise_interval"]),
+                      ("delayTime", plan["preempt_timer_delay"]),
+                      ("holdMultiplier", plan["holding_multiplier"]),
+                      ("authenticationMode", plan["auth_mode"])]
+            if plan["admin_interface"]:
+                wanted.append(("unflowdown", "true" if plan["admin_flowdown"] is True else "false"))
+            if plan["vrrp_type"] == "admin":
+                wanted.append(("adminIgnoreIfDown", "true" if plan["admin_ignore_if_down"] is True else "false"))
+            if plan["auth_mode"] == "simple":
+                wanted.append(("isPlain", "true" if plan["is_plain"] is True else "false"))
+            for tag, value in wanted:
+                if value is not None and (vrrp_group.get(tag) or "").lower() != value.lower():
+                    leaves.append((tag, value))
+            # the key is stored in ciphertext and can not be compared
+            if plan["auth_key"]:
+                leaves.append(("authenticationKey", plan["auth_key"]))
+            return leaves
+
+        for option, tag, value in VRRP_GROUP_DEFAULTS:
+            if plan[option] and vrrp_group.get(tag) not in [None, value]:
+                leaves.append((tag, value))
+        return leaves
+
+    def get_group_cmds(self, plan, vrrp_group, leaves, vips_add, vips_del):
+        """get the commands of the changes of a group"""
+
+        vrid = plan["vrid"]
+        cmds = ["vrrp vrid %s virtual-ip %s" % (vrid, vip) for vip in vips_add]
+        cmds.extend(["undo vrrp vrid %s virtual-ip %s" % (vrid, vip) for vip in vips_del])
+        leaves = dict(leaves)
+        if self.state == "present":
+            if leaves.get("vrrpType") == "admin" or "adminIgnoreIfDown" in leaves:
+                if plan["admin_ignore_if_down"] is True:
+                    cmds.append("vrrp vrid %s admin ignore-if-down" % vrid)
+                else:
+                    cmds.append("vrrp vrid %s admin" % vrid)
+            if "priority" in leaves:
+                cmds.append("vrrp vrid %s priority %s" % (vrid, leaves["priority"]))
+            if leaves.get("fastResume") == "true":
+                cmds.append("vrrp vrid %s fast-resume" % vrid)
+            if leaves.get("fastResume") == "false":
+                cmds.append("undo vrrp vrid %s fast-resume" % vrid)
+            if "advertiseInterval" in leaves:
+                cmds.append("vrrp vrid %s timer advertise %s" % (vrid, leaves["advertiseInterval"]))
+            if "delayTime" in leaves:
+                cmds.append("vrrp vrid %s preempt timer delay %s" % (vrid, leaves["delayTime"]))
+            if "holdMultiplier" in leaves:
+                cmds.append("vrrp vrid %s holding-multiplier %s" % (vrid, leaves["holdMultiplier"]))
+            if plan["admin_vrid"] and plan["admin_interface"] and \
+                    ("adminVrrpId" in leaves or "adminIfName" in leaves or "unflowdown" in leaves):
+                cmd = "vrrp vrid %s track admin-vrrp interface %s vrid %s" % (
+                    vrid, plan["admin_interface"], plan["admin_vrid"])
+                if plan["admin_flowdown"] is True:
+                    cmd += " unflowdown"
+                cmds.append(cmd)
+            if "authenticationKey" in leaves:
+                if plan["auth_mode"] == "simple":
+                    cmds.append("vrrp vrid %s authentication-mode simple %s ******"
+                                % (vrid, "plain" if plan["is_plain"] is True else "cipher"))
+                elif plan["auth_mode"] == "md5":
+                    cmds.append("vrrp vrid %s authentication-mode md5 ******" % vrid)
+            return cmds
+
+        if "vrrpType" in leaves:
+            if vrrp_group.get("vrrpType") == "admin":
+                cmds.append("undo vrrp vrid %s admin" % vrid)
+            else:
+                cmds.append("undo vrrp vrid %s track admin-vrrp" % vrid)
+        for tag, cmd in [("priority", "priority"), ("fastResume", "fast-resume"),
+                         ("advertiseInterval", "timer advertise"), ("delayTime", "preempt timer delay"),
+                         ("holdMultiplier", "holding-multiplier"),
+                         ("authenticationMode", "authentication-mode")]:
+            if tag in leaves:
+                cmds.append("undo vrrp vrid %s %s" % (vrid, cmd))
+        return cmds
+
+    def get_global_leaves(self, vrrp_global):
+        """get the vrrp global leaves that differ, xml tag to value"""
+
+        leaves = list()
+        if self.state == "present":
+            if self.gratuitous_arp_interval and vrrp_global.get("gratuitousArpFlag") == "false":
+                self.module.fail_json(msg="Error: gratuitousArpFlag is false.")
+            wanted = [("gratuitousArpTimeOut", self.gratuitous_arp_interval),
+                      ("recoverDelay", self.recover_delay), ("version", self.version)]
+        else:
+            wanted = [("gratuitousArpTimeOut", "120" if self.gratuitous_arp_interval else None),
+                      ("recoverDelay", "0" if self.recover_delay else None),
+                      ("version", "v2" if self.version else None)]
+        for tag, value in wanted:
+            if value and vrrp_global.get(tag) != value:
+                leaves.append((tag, value))
+        return leaves
+
+    def get_global_cmds(self, leaves):
+        """get the commands of the vrrp global changes"""
+
+        cmds = list()
+        for tag, value in leaves:
+            if tag == "gratuitousArpTimeOut":
+                cmds.append("vrrp gratuitous-arp interval %s" % value if self.state == "present"
+                            else "undo vrrp gratuitous-arp interval")
+            elif tag == "recoverDelay":
+                cmds.append("vrrp recover-delay %s" % value if self.state == "present"
+                            else "undo vrrp recover-delay")
+            elif value == "v3":
+                cmds.append("vrrp version 3")
+            else:
+                cmds.append("undo vrrp version")
+        return cmds
+
+    def get_groups_state(self, snapshot):
+        """get the global config and the state of the listed groups"""
+
+        state = dict()
+        for tag, option in [("gratuitousArpTimeOut", "gratuitous_arp_interval"),
+                            ("recoverDelay", "recover_delay"), ("version", "version")]:
+            if self.module.params[option]:
+                state[option] = snapshot["globals"].get(tag)
+        state["groups"] = list()
+        for plan in self.group_plans:
+            vrrp_group = snapshot["groups"].get((plan["interface"].lower(), plan["vrid"]))
+            if vrrp_group:
+                group = dict(vrrp_group)
+                group.pop("authenticationKey", None)
+                state["groups"].append(group)
+        return state
+
+    def config_groups(self):
+        """diff the groups with the snapshot and apply the changes by chunked edits"""
+
+        snapshot = get_vrrp_snapshot(self.module)
+        self.existing = self.get_groups_state(snapshot)
+
+        global_leaves = self.get_global_leaves(snapshot["globals"])
+        xml_global = ""
+        if global_leaves:
+            xml_global = CE_NC_MERGE_VRRP_GLOBAL % "".join(
+                "\n      <%s>%s</%s>" % (tag, value, tag) for tag, value in global_leaves)
+            self.updates_cmd.extend(self.get_global_cmds(global_leaves))
+
+        xml_items = list()
+        for plan in self.group_plans:
+            vrrp_group = snapshot["groups"].get((plan["interface"].lower(), plan["vrid"]))
+            if vrrp_group:
+                plan["interface"] = vrrp_group["ifName"]
+            if self.state == "present":
+                vips_add = [vip for vip in plan["virtual_ips"]
+                            if not vrrp_group or vip not in vrrp_group["virtualIps"]]
+                vips_del = list()
+                if not vrrp_group and not vips_add:
+                    self.module.fail_json(
+                        msg='Error: The VRRP group %s %s does not exist.' % (plan["interface"], plan["vrid"]))
+            else:
+                if not vrrp_group:
+                    continue
+                vips_add = list()
+                vips_del = [vip for vip in plan["virtual_ips"] if vip in vrrp_group["virtualIps"]]
+                if not plan["virtual_ips"] and not [opt for opt, _, _ in VRRP_GROUP_DEFAULTS if plan[opt]]:
+                    xml_items.append(CE_NC_OPERATION_VRRP_GROUP % (
+                        "delete", plan["interface"], plan["vrid"], ""))
+                    self.updates_cmd.append("interface %s" % plan["interface"])
+                    self.updates_cmd.append("undo vrrp vrid %s" % plan["vrid"])
+                    continue
+
+            leaves = self.get_group_leaves(plan, vrrp_group or dict())
+            if not vrrp_group and "vrrpType" not in dict(leaves):
+                leaves.insert(0, ("vrrpType", "normal"))
+            if not leaves and not vips_add and not vips_del:
+                continue
+
+            xml_leaves = "".join("\n        <%s>%s</%s>" % (tag, value, tag) for tag, value in leaves)
+            if vips_add or vips_del:
+                xml_leaves += "\n        <virtualIps>%s%s\n        </virtualIps>" % (
+                    "".join(CE_NC_OPERATION_VRRP_VIRTUAL_IP % ("create", vip) for vip in vips_add),
+                    "".join(CE_NC_OPERATION_VRRP_VIRTUAL_IP % ("delete", vip) for vip in vips_del))
+            xml_items.append(CE_NC_OPERATION_VRRP_GROUP % (
+                "merge", plan["interface"], plan["vrid"], xml_leaves))
+            self.updates_cmd.append("interface %s" % plan["interface"])
+            self.updates_cmd.extend(self.get_group_cmds(plan, vrrp_group or dict(), leaves, vips_add, vips_del))
+
+        if not xml_global and not xml_items:
+            self.end_state = self.existing
+            return
+
+        if not self.module.check_mode:
+            if xml_items:
+                set_nc_config_chunks(self.module, CE_NC_SET_VRRP_GROUPS_HEAD % xml_global,
+                                     xml_items, CE_NC_SET_VRRP_GROUPS_TAIL)
+            else:
+                recv_xml = set_nc_config(self.module, CE_NC_SET_VRRP_GROUPS_HEAD % xml_global +
+                                         CE_NC_SET_VRRP_GROUPS_TAIL)
+                if "<ok/>" not in recv_xml:
+                    self.module.fail_json(
+                        msg='Error: set vrrp global atrribute info failed.')
+        self.changed = True
+
+        if self.module.check_mode:
+            self.end_state = self.existing
+        else:
+            self.end_state = self.get_groups_state(get_vrrp_snapshot(self.module, refresh=True))
+
     def is_virtual_ip_change(self):
         """whether virtual ip change"""
 
@@ -1304,6 +1720,25 @@ class Vrrp(object):
         """worker"""
 
         self.check_params()
+        if self.groups is not None:
+            self.check_groups()
+            self.get_proposed()
+            if self.auth_key:
+                self.proposed["auth_key"] = "******"
+            self.proposed["groups"] = list()
+            for group in self.groups:
+                group = dict(group)
+                if group.get("auth_key"):
+                    group["auth_key"] = "******"
+                self.proposed["groups"].append(group)
+            self.config_groups()
+            self.results['changed'] = self.changed
+            self.results['proposed'] = self.proposed
+            self.results['existing'] = self.existing
+            self.results['end_state'] = self.end_state
+            self.results['updates'] = self.updates_cmd
+            self.module.exit_json(**self.results)
+
         if self.gratuitous_arp_interval or self.version or self.recover_delay:
             self.vrrp_global_info = self.get_vrrp_global_info()
         if self.interface and self.vrid:
@@ -1390,6 +1825,7 @@ def main():
         is_plain=dict(type='bool', default=False),
         auth_key=dict(type='str'),
         fast_resume=dict(type='str', choices=['enable', 'disable']),
+        groups=dict(type='list'),
         state=dict(type='str', default='present',
                    choices=['present', 'absent'])
     )
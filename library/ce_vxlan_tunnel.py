@@ -69,6 +69,17 @@ options:
             - Specifies an IP address for a source VTEP. The value is in dotted decimal notation.
         required: false
         default: null
+    bridge_domains:
+        description:
+            - A list of bridge domain to VNI mappings managed in one task, each entry is a dict with
+              the keys bridge_domain_id and vni_id, and optionally peer_list_ip and protocol_type
+              for the VNI members of the nve_name interface.
+              The existing VXLAN state is read once and all changes are sent in a few merged edits.
+              Other keys, such as the route distinguisher and VPN targets used by ce_evpn_bd_vni,
+              are ignored, so the same list can be passed to both modules.
+              Can not be used with bridge_domain_id, vni_id, peer_list_ip, protocol_type, nve_mode or source_ip.
+        required: false
+        default: null
     state:
         description:
             - Manage the state of the resource.
@@ -98,6 +109,15 @@ EXAMPLES = '''
       protocol_type: bgp
       state: present
       provider: "{{ cli }}"
+
+  - name: Map bridge domains to VNIs and configure their ingress replication lists on Nve1 interface.
+    ce_vxlan_tunnel:
+      nve_name: Nve1
+      bridge_domains:
+        - {bridge_domain_id: 10, vni_id: 10010, peer_list_ip: [1.1.1.1, 2.2.2.2]}
+        - {bridge_domain_id: 20, vni_id: 10020, protocol_type: bgp}
+      state: present
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -134,6 +154,7 @@ end_state:
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils.ce import get_nc_config, set_nc_config, get_config, ce_argument_spec
+from ansible.module_utils.ce import get_nvo3_evpn_snapshot, set_nc_config_chunks
 
 CE_NC_GET_VNI_BD_INFO = """
 <filter type="subtree">
@@ -320,6 +341,51 @@ CE_NC_DELETE_VNI_PROTOCOL = """
 </config>
 """
 
+CE_NC_MERGE_VNI_BDS_HEAD = """
+<config>
+  <nvo3 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <nvo3Vni2Bds>
+"""
+
+CE_NC_MERGE_VNI_BDS_TAIL = """
+    </nvo3Vni2Bds>
+  </nvo3>
+</config>
+"""
+
+CE_NC_MERGE_VNI_BDS_CONTEXT = """
+<nvo3Vni2Bd operation="%s">
+  <vniId>%s</vniId>
+  <bdId>%s</bdId>
+</nvo3Vni2Bd>
+"""
+
+CE_NC_MERGE_VNI_MEMBERS_HEAD = """
+<config>
+  <nvo3 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <nvo3Nves>
+      <nvo3Nve>
+        <ifName>%s</ifName>
+        <vniMembers>
+"""
+
+CE_NC_MERGE_VNI_MEMBERS_TAIL = """
+        </vniMembers>
+      </nvo3Nve>
+    </nvo3Nves>
+  </nvo3>
+</config>
+"""
+
+CE_NC_MERGE_VNI_MEMBER_HEAD = """
+<vniMember operation="%s">
+  <vniId>%s</vniId>
+"""
+
+CE_NC_MERGE_VNI_MEMBER_TAIL = """
+</vniMember>
+"""
+
 
 def is_valid_address(address):
     """check ip-address is valid"""
@@ -356,6 +422,7 @@ class VxlanTunnel(object):
         self.peer_list_ip = self.module.params['peer_list_ip']
         self.protocol_type = self.module.params['protocol_type']
         self.source_ip = self.module.params['source_ip']
+        self.bridge_domains = self.module.params['bridge_domains']
         self.state = self.module.params['state']
 
         # state
@@ -369,12 +436,20 @@ class VxlanTunnel(object):
         # configuration nve info
         self.vni2bd_info = None
         self.nve_info = None
+        self.nvo3_snapshot = None
 
     def init_module(self):
         """ init module """
 
+        mutually_exclusive = [['bridge_domains', 'bridge_domain_id'],
+                              ['bridge_domains', 'vni_id'],
+                              ['bridge_domains', 'peer_list_ip'],
+                              ['bridge_domains', 'protocol_type'],
+                              ['bridge_domains', 'nve_mode'],
+                              ['bridge_domains', 'source_ip']]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, mutually_exclusive=mutually_exclusive,
+            supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -759,6 +834,158 @@ class VxlanTunnel(object):
             "undo vni %s head-end peer-list protocol bgp " % vni_id)
         self.changed = True
 
+    def check_bridge_domains(self):
+        """check and normalize the bridge domain to vni mapping list"""
+
+        bridge_domains = list()
+        bd_ids = set()
+        for entry in self.bridge_domains:
+            if not isinstance(entry, dict) or not entry.get("bridge_domain_id") or not entry.get("vni_id"):
+                self.module.fail_json(
+                    msg='Error: Each bridge_domains entry must have bridge_domain_id and vni_id.')
+            bd_id = str(entry["bridge_domain_id"])
+            vni_id = str(entry["vni_id"])
+            if not bd_id.isdigit() or int(bd_id) > 16777215 or int(bd_id) < 1:
+                self.module.fail_json(
+                    msg='Error: The bridge domain id must be an integer between 1 and 16777215.')
+            if not vni_id.isdigit() or int(vni_id) > 16000000 or int(vni_id) < 1:
+                self.module.fail_json(
+                    msg='Error: The vni id must be an integer between 1 and 16000000.')
+            if bd_id in bd_ids:
+                self.module.fail_json(
+                    msg='Error: The bridge domain %s is listed more than once.' % bd_id)
+            bd_ids.add(bd_id)
+
+            peer_list_ip = [str(peer_ip) for peer_ip in entry.get("peer_list_ip") or list()]
+            for peer_ip in peer_list_ip:
+                if not is_valid_address(peer_ip):
+                    self.module.fail_json(
+                        msg='Error: The ip address %s is invalid.' % peer_ip)
+            protocol_type = entry.get("protocol_type")
+            if protocol_type not in [None, "bgp", "null"]:
+                self.module.fail_json(
+                    msg='Error: The protocol type %s is invalid.' % protocol_type)
+            if (peer_list_ip or protocol_type) and not self.nve_name:
+                self.module.fail_json(
+                    msg='Error: Please input nve_name for the vni members of bridge domain %s.' % bd_id)
+
+            bridge_domains.append(dict(bridge_domain_id=bd_id, vni_id=vni_id,
+                                       peer_list_ip=peer_list_ip, protocol_type=protocol_type))
+        self.bridge_domains = bridge_domains
+
+    def get_bridge_domains_state(self):
+        """get vni mapping and vni member state of all listed bridge domains"""
+
+        nve = dict()
+        if self.nve_name:
+            nve = self.nvo3_snapshot["nves"].get(self.nve_name, dict())
+
+        bridge_domains = list()
+        for entry in self.bridge_domains:
+            member = nve.get("vnis", dict()).get(entry["vni_id"], dict())
+            bridge_domains.append(dict(bridge_domain_id=entry["bridge_domain_id"],
+                                       vni_id=self.nvo3_snapshot["bd2vni"].get(entry["bridge_domain_id"]),
+                                       peer_list_ip=member.get("peers", list()),
+                                       protocol_type=member.get("protocol")))
+        return bridge_domains
+
+    def config_bridge_domains(self):
+        """config all listed bridge domain to vni mappings and vni members,
+        one edit-config carries many entries"""
+
+        nve = None
+        if self.nve_name:
+            nve = self.nvo3_snapshot["nves"].get(self.nve_name)
+            if not nve:
+                self.module.fail_json(
+                    msg='Error: Nve interface %s does not exist.' % self.nve_name)
+
+        vni2bd_xml = list()
+        vni2bd_cmds = list()
+        member_xml = list()
+        member_cmds = list()
+        for entry in self.bridge_domains:
+            bd_id = entry["bridge_domain_id"]
+            vni_id = entry["vni_id"]
+            bound_vni = self.nvo3_snapshot["bd2vni"].get(bd_id)
+            member = dict()
+            if nve:
+                member = nve["vnis"].get(vni_id, dict())
+            peers = member.get("peers", list())
+            protocol = member.get("protocol") or "null"
+
+            if self.state == "present":
+                if bound_vni != vni_id:
+                    if bound_vni:
+                        self.module.fail_json(
+                            msg='Error: The bridge domain %s is already mapped to vni %s.' % (bd_id, bound_vni))
+                    if vni_id in self.nvo3_snapshot["vni2bd"]:
+                        self.module.fail_json(
+                            msg='Error: The vni %s is already mapped to bridge domain %s.' % (
+                                vni_id, self.nvo3_snapshot["vni2bd"][vni_id]))
+                    vni2bd_xml.append(CE_NC_MERGE_VNI_BDS_CONTEXT % ("create", vni_id, bd_id))
+                    vni2bd_cmds.append("bridge-domain %s" % bd_id)
+                    vni2bd_cmds.append("vxlan vni %s" % vni_id)
+
+                add_peers = [peer_ip for peer_ip in entry["peer_list_ip"] if peer_ip not in peers]
+                set_protocol = entry["protocol_type"] and entry["protocol_type"] != protocol
+                if not add_peers and not set_protocol:
+                    continue
+                cfg_xml = CE_NC_MERGE_VNI_MEMBER_HEAD % ("merge", vni_id)
+                if set_protocol:
+                    cfg_xml += "<protocol>%s</protocol>" % entry["protocol_type"]
+                    if entry["protocol_type"] == "bgp":
+                        member_cmds.append("vni %s head-end peer-list protocol bgp" % vni_id)
+                    else:
+                        member_cmds.append("undo vni %s head-end peer-list protocol bgp" % vni_id)
+                for peer_ip in add_peers:
+                    cfg_xml += CE_NC_MERGE_VNI_PEER_ADDRESS_IP_MERGE % peer_ip
+                    member_cmds.append("vni %s head-end peer-list %s" % (vni_id, peer_ip))
+                cfg_xml += CE_NC_MERGE_VNI_MEMBER_TAIL
+                member_xml.append(cfg_xml)
+            else:
+                del_peers = [peer_ip for peer_ip in entry["peer_list_ip"] if peer_ip in peers]
+                del_protocol = entry["protocol_type"] == "bgp" and protocol == "bgp"
+                if del_peers or del_protocol:
+                    if set(del_peers) == set(peers) and (protocol != "bgp" or del_protocol):
+                        # nothing is left on the vni member, remove it
+                        member_xml.append(CE_NC_MERGE_VNI_MEMBER_HEAD % ("delete", vni_id) +
+                                          CE_NC_MERGE_VNI_MEMBER_TAIL)
+                    else:
+                        cfg_xml = CE_NC_MERGE_VNI_MEMBER_HEAD % ("merge", vni_id)
+                        if del_protocol:
+                            cfg_xml += "<protocol>null</protocol>"
+                        for peer_ip in del_peers:
+                            cfg_xml += CE_NC_DELETE_VNI_PEER_ADDRESS_IP_DELETE % peer_ip
+                        cfg_xml += CE_NC_MERGE_VNI_MEMBER_TAIL
+                        member_xml.append(cfg_xml)
+                    if del_protocol:
+                        member_cmds.append("undo vni %s head-end peer-list protocol bgp" % vni_id)
+                    for peer_ip in del_peers:
+                        member_cmds.append("undo vni %s head-end peer-list %s" % (vni_id, peer_ip))
+
+                if bound_vni == vni_id:
+                    vni2bd_xml.append(CE_NC_MERGE_VNI_BDS_CONTEXT % ("delete", vni_id, bd_id))
+                    vni2bd_cmds.append("bridge-domain %s" % bd_id)
+                    vni2bd_cmds.append("undo vxlan vni %s" % vni_id)
+
+        if member_cmds:
+            member_cmds.insert(0, "interface %s" % self.nve_name)
+        edits = [(CE_NC_MERGE_VNI_BDS_HEAD, vni2bd_xml, CE_NC_MERGE_VNI_BDS_TAIL, vni2bd_cmds),
+                 (CE_NC_MERGE_VNI_MEMBERS_HEAD % self.nve_name, member_xml,
+                  CE_NC_MERGE_VNI_MEMBERS_TAIL, member_cmds)]
+        if self.state == "absent":
+            # vni members go before the vni mappings they depend on
+            edits.reverse()
+
+        for xml_head, xml_items, xml_tail, cmds in edits:
+            if not xml_items:
+                continue
+            if not self.module.check_mode:
+                set_nc_config_chunks(self.module, xml_head, xml_items, xml_tail)
+            self.updates_cmd.extend(cmds)
+            self.changed = True
+
     def check_params(self):
         """Check all input params"""
 
@@ -797,6 +1024,10 @@ class VxlanTunnel(object):
                 self.module.fail_json(
                     msg='Error: The ip address %s is invalid.' % self.source_ip)
 
+        # bridge_domains check
+        if self.bridge_domains:
+            self.check_bridge_domains()
+
     def get_proposed(self):
         """get proposed info"""
 
@@ -812,6 +1043,8 @@ class VxlanTunnel(object):
             self.proposed["peer_list_ip"] = self.peer_list_ip
         if self.source_ip:
             self.proposed["source_ip"] = self.source_ip
+        if self.bridge_domains:
+            self.proposed["bridge_domains"] = self.bridge_domains
         if self.state:
             self.proposed["state"] = self.state
 
@@ -848,10 +1081,26 @@ class VxlanTunnel(object):
             self.end_state["vni_peer_list_protocol"] = nve_info[
                 "vni_peer_protocols"]
 
+    def work_bridge_domains(self):
+        """worker of the bridge domain list"""
+
+        self.nvo3_snapshot = get_nvo3_evpn_snapshot(self.module)
+        self.existing["bridge_domains"] = self.get_bridge_domains_state()
+        self.get_proposed()
+        self.config_bridge_domains()
+        if self.changed and not self.module.check_mode:
+            self.nvo3_snapshot = get_nvo3_evpn_snapshot(self.module, refresh=True)
+        self.end_state["bridge_domains"] = self.get_bridge_domains_state()
+
     def work(self):
         """worker"""
 
         self.check_params()
+        if self.bridge_domains:
+            self.work_bridge_domains()
+            self.show_result()
+            return
+
         self.vni2bd_info = self.get_vni2bd_dict()
         if self.nve_name:
             self.nve_info = self.get_nve_dict(self.nve_name)
@@ -899,6 +1148,11 @@ class VxlanTunnel(object):
                         msg='Error: Nve interface %s does not exist.' % self.nve_name)
 
         self.get_end_state()
+        self.show_result()
+
+    def show_result(self):
+        """show result"""
+
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -924,6 +1178,7 @@ def main():
             'bgp', 'null']),
 
         source_ip=dict(required=False),
+        bridge_domains=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
@@ -68,6 +68,15 @@ options:
               The value is an integer ranging from 1 to 4094.
         required: false
         default: null
+    vaps:
+        description:
+            - A list of virtual access points, each one is a l2_sub_interface, or a dict
+              with either l2_sub_interface or bind_vlan_id, and optionally bridge_domain_id,
+              encapsulation, ce_vid and pe_vid. The options other than l2_sub_interface
+              and bind_vlan_id that an entry does not set are taken from the module options
+              of the same name. Can not be used with C(l2_sub_interface) or C(bind_vlan_id).
+        required: false
+        default: null
     state:
         description:
             - Determines whether the config should be present or not
@@ -109,6 +118,16 @@ EXAMPLES = '''
       l2_sub_interface: 10GE2/0/20.1
       encapsulation: dot1q
       provider: "{{ cli }}"
+
+  - name: Configure the encapsulation of Layer 2 sub-interfaces and bind them and a VLAN to a BD
+    ce_vxlan_vap:
+      bridge_domain_id: 100
+      encapsulation: dot1q
+      vaps:
+        - {l2_sub_interface: 10GE2/0/20.1, ce_vid: 101}
+        - {l2_sub_interface: 10GE2/0/21.1, ce_vid: 101}
+        - {bind_vlan_id: 99}
+      provider: "{{ cli }}"
 '''
 
 RETURN = '''
@@ -144,7 +163,9 @@ changed:
 
 from xml.etree import ElementTree
 from ansible.module_utils.basic import AnsibleModule
-from ansible.module_utils.ce import get_nc_config, set_nc_config, ce_argument_spec
+from ansible.module_utils.ce import get_nc_config, set_nc_config, set_nc_config_chunks, \
+    ce_argument_spec, vlan_bitmap_to_int, vlan_int_to_bitmap, vlan_to_bit, get_nc_snapshot, \
+    get_nc_xml_root
 
 CE_NC_GET_BD_VAP = """
     <filter type="subtree">
@@ -299,69 +320,192 @@ CE_NC_SET_ENCAP_QINQ = """
 """
 
 
-def vlan_vid_to_bitmap(vid):
-    """convert VLAN list to VLAN bitmap"""
+CE_NC_SET_ENCAPS_HEAD = """
+    <config>
+      <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+        <servicePoints>"""
 
-    vlan_bit = ['0'] * 1024
-    int_vid = int(vid)
-    j = int_vid / 4
-    bit_int = 0x8 >> (int_vid % 4)
-    vlan_bit[j] = str(hex(bit_int))[2]
+CE_NC_SET_ENCAPS_TAIL = """
+        </servicePoints>
+      </ethernet>
+    </config>
+"""
 
-    return ''.join(vlan_bit)
+CE_NC_ENCAP_ITEM = """
+          <servicePoint operation="merge">
+            <ifName>%s</ifName>
+            <flowType>%s</flowType>
+          </servicePoint>"""
 
+CE_NC_ENCAP_DOT1Q_ITEM = """
+          <servicePoint operation="merge">
+            <ifName>%s</ifName>
+            <flowType>dot1q</flowType>
+            <flowDot1qs>
+              <dot1qVids>%s:%s</dot1qVids>
+            </flowDot1qs>
+          </servicePoint>"""
 
-def bitmap_to_vlan_list(bitmap):
-    """convert VLAN bitmap to VLAN list"""
+CE_NC_ENCAP_QINQ_ITEM = """
+          <servicePoint>
+            <ifName>%s</ifName>
+            <flowType>qinq</flowType>
+            <flowQinqs>
+              <flowQinq operation="merge">
+                <peVlanId>%s</peVlanId>
+                <ceVids>%s:%s</ceVids>
+              </flowQinq>
+            </flowQinqs>
+          </servicePoint>"""
+
+CE_NC_SET_BDS_HEAD = """
+    <config>
+      <evc xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+        <bds>"""
+
+CE_NC_SET_BDS_TAIL = """
+        </bds>
+      </evc>
+    </config>
+"""
+
+CE_NC_BD_ITEM = """
+          <bd>
+            <bdId>%s</bdId>%s
+          </bd>"""
+
+CE_NC_BD_VLAN_ITEM = """
+            <bdBindVlan operation="merge">
+              <vlanList>%s:%s</vlanList>
+            </bdBindVlan>"""
+
+CE_NC_BD_INTFS_ITEM = """
+            <servicePoints>%s
+            </servicePoints>"""
+
+CE_NC_BD_INTF_ITEM = """
+              <servicePoint operation="%s">
+                <ifName>%s</ifName>
+              </servicePoint>"""
+
+ENCAP_TYPES = ['dot1q', 'default', 'untag', 'qinq', 'none']
+
+
+CE_NC_GET_VAP_SNAPSHOT = """
+<filter type="subtree">
+  <evc xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <bds>
+      <bd>
+        <bdId></bdId>
+        <bdBindVlan>
+          <vlanList></vlanList>
+        </bdBindVlan>
+        <servicePoints>
+          <servicePoint>
+            <ifName></ifName>
+          </servicePoint>
+        </servicePoints>
+      </bd>
+    </bds>
+  </evc>
+  <ethernet xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <servicePoints>
+      <servicePoint>
+        <ifName></ifName>
+        <flowType></flowType>
+        <flowDot1qs>
+          <dot1qVids></dot1qVids>
+        </flowDot1qs>
+        <flowQinqs>
+          <flowQinq>
+            <peVlanId></peVlanId>
+            <ceVids></ceVids>
+          </flowQinq>
+        </flowQinqs>
+      </servicePoint>
+    </servicePoints>
+  </ethernet>
+</filter>
+"""
 
-    tmp = list()
-    if not bitmap:
-        return tmp
 
-    bit_len = len(bitmap)
-    for i in range(bit_len):
-        if bitmap[i] == "0":
+def parse_vap_snapshot(xml_str):
+    """parse bridge domain vap and sub-interface encapsulation reply, bds are
+    indexed by bd id, the bd of every bound sub-interface by upper case interface
+    name and of every bound vlan by vlan id, and the encapsulations by upper case
+    interface name"""
+
+    snapshot = dict(bds=dict(), interfaces=dict(), vlans=dict(), sub_intfs=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    for bd_ele in root.findall("data/evc/bds/bd"):
+        bd = dict(bdId=bd_ele.findtext("bdId"),
+                  vlanList=bd_ele.findtext("bdBindVlan/vlanList") or "",
+                  intfList=list())
+        if not bd["bdId"]:
+            continue
+        for if_ele in bd_ele.findall("servicePoints/servicePoint/ifName"):
+            if if_ele.text:
+                bd["intfList"].append(if_ele.text)
+                snapshot["interfaces"][if_ele.text.replace(" ", "").upper()] = bd["bdId"]
+        value = vlan_bitmap_to_int(bd["vlanList"])
+        if value:
+            for vid, bit in enumerate("{0:04096b}".format(value)):
+                if bit == "1":
+                    snapshot["vlans"][str(vid)] = bd["bdId"]
+        snapshot["bds"][bd["bdId"]] = bd
+
+    for sp_ele in root.findall("data/ethernet/servicePoints/servicePoint"):
+        intf = dict(ifName=sp_ele.findtext("ifName"),
+                    flowType=(sp_ele.findtext("flowType") or "").lower(),
+                    dot1qVids=sp_ele.findtext("flowDot1qs/dot1qVids") or "",
+                    flowQinqs=dict())
+        if not intf["ifName"]:
             continue
-        bit = int(bitmap[i])
-        if bit & 0x8:
-            tmp.append(str(i * 4))
-        if bit & 0x4:
-            tmp.append(str(i * 4 + 1))
-        if bit & 0x2:
-            tmp.append(str(i * 4 + 2))
-        if bit & 0x1:
-            tmp.append(str(i * 4 + 3))
+        for qinq_ele in sp_ele.findall("flowQinqs/flowQinq"):
+            if qinq_ele.findtext("peVlanId"):
+                intf["flowQinqs"][qinq_ele.findtext("peVlanId")] = qinq_ele.findtext("ceVids") or ""
+        snapshot["sub_intfs"][intf["ifName"].replace(" ", "").upper()] = intf
 
-    return tmp
+    return snapshot
 
 
-def is_vlan_bitmap_empty(bitmap):
-    """check VLAN bitmap empty"""
+def get_vap_snapshot(module, refresh=False):
+    """get the vlans and sub-interfaces of all bridge domains and the
+    encapsulation of all sub-interfaces in one netconf read"""
 
-    if not bitmap or len(bitmap) == 0:
-        return True
+    return get_nc_snapshot(module, ("vap",), CE_NC_GET_VAP_SNAPSHOT,
+                           parse_vap_snapshot, refresh)
 
-    for bit in bitmap:
-        if bit != '0':
-            return False
 
-    return True
+def vlan_vid_to_bitmap(vid):
+    """convert VLAN list to VLAN bitmap"""
 
+    return vlan_int_to_bitmap(vlan_to_bit(vid))
 
-def is_vlan_in_bitmap(vid, bitmap):
-    """check is VLAN id in bitmap"""
 
-    if is_vlan_bitmap_empty(bitmap):
-        return False
+def bitmap_to_vlan_list(bitmap):
+    """convert VLAN bitmap to VLAN list"""
 
-    i = int(vid) / 4
-    if i > len(bitmap):
-        return False
+    value = vlan_bitmap_to_int(bitmap)
+    if not value:
+        return list()
 
-    if int(bitmap[i]) & (0x8 >> (int(vid) % 4)):
-        return True
+    return [str(vid) for vid, bit in enumerate("{0:04096b}".format(value)) if bit == "1"]
+
+
+def is_vlan_bitmap_empty(bitmap):
+    """check VLAN bitmap empty"""
+
+    return not vlan_bitmap_to_int(bitmap)
 
-    return False
+
+def is_vlan_in_bitmap(vid, bitmap):
+    """check is VLAN id in bitmap"""
+
+    return bool(vlan_bitmap_to_int(bitmap) & vlan_to_bit(vid))
 
 
 def get_interface_type(interface):
@@ -432,6 +576,7 @@ class VxlanVap(object):
         self.pe_vid = self.module.params['pe_vid']
         self.encapsulation = self.module.params['encapsulation']
         self.state = self.module.params['state']
+        self.vaps = self.module.params['vaps']
 
         # state
         self.vap_info = dict()
@@ -448,8 +593,10 @@ class VxlanVap(object):
         """init module"""
 
         required_together = [()]
+        mutually_exclusive = [("vaps", "l2_sub_interface"), ("vaps", "bind_vlan_id")]
         self.module = AnsibleModule(
-            argument_spec=self.spec, supports_check_mode=True)
+            argument_spec=self.spec, mutually_exclusive=mutually_exclusive,
+            supports_check_mode=True)
 
     def check_response(self, xml_str, xml_name):
         """Check if response message is already succeed."""
@@ -789,12 +936,7 @@ class VxlanVap(object):
 
         # bridge domain id check
         if self.bridge_domain_id:
-            if not self.bridge_domain_id.isdigit():
-                self.module.fail_json(
-                    msg="Error: Bridge domain id is not digit.")
-            if int(self.bridge_domain_id) < 1 or int(self.bridge_domain_id) > 16777215:
-                self.module.fail_json(
-                    msg="Error: Bridge domain id is not in the range from 1 to 16777215.")
+            self.check_bd_id_valid(self.bridge_domain_id)
 
         # check bind_vlan_id
         if self.bind_vlan_id:
@@ -804,24 +946,259 @@ class VxlanVap(object):
         if self.l2_sub_interface and not self.is_l2_sub_intf_valid(self.l2_sub_interface):
             self.module.fail_json(msg="Error: l2_sub_interface is invalid.")
 
+        self.check_encap_params(self.encapsulation, self.ce_vid, self.pe_vid)
+
+    def check_bd_id_valid(self, bd_id):
+        """check bridge domain id"""
+
+        if not bd_id.isdigit():
+            self.module.fail_json(
+                msg="Error: Bridge domain id is not digit.")
+        if int(bd_id) < 1 or int(bd_id) > 16777215:
+            self.module.fail_json(
+                msg="Error: Bridge domain id is not in the range from 1 to 16777215.")
+
+    def check_encap_params(self, encapsulation, ce_vid, pe_vid):
+        """check the ce_vid and pe_vid of an encapsulation"""
+
         # check ce_vid
-        if self.ce_vid:
-            self.is_vlan_valid(self.ce_vid, "ce_vid")
-            if not self.encapsulation or self.encapsulation not in ["dot1q", "qinq"]:
+        if ce_vid:
+            self.is_vlan_valid(ce_vid, "ce_vid")
+            if not encapsulation or encapsulation not in ["dot1q", "qinq"]:
                 self.module.fail_json(msg="Error: ce_vid can not be set "
-                                          "when encapsulation is '%s'." % self.encapsulation)
-            if self.encapsulation == "qinq" and not self.pe_vid:
+                                          "when encapsulation is '%s'." % encapsulation)
+            if encapsulation == "qinq" and not pe_vid:
                 self.module.fail_json(msg="Error: ce_vid and pe_vid must be set at the same time "
-                                          "when encapsulation is '%s'." % self.encapsulation)
+                                          "when encapsulation is '%s'." % encapsulation)
         # check pe_vid
-        if self.pe_vid:
-            self.is_vlan_valid(self.pe_vid, "pe_vid")
-            if not self.encapsulation or self.encapsulation != "qinq":
+        if pe_vid:
+            self.is_vlan_valid(pe_vid, "pe_vid")
+            if not encapsulation or encapsulation != "qinq":
                 self.module.fail_json(msg="Error: pe_vid can not be set "
-                                          "when encapsulation is '%s'." % self.encapsulation)
-            if not self.ce_vid:
+                                          "when encapsulation is '%s'." % encapsulation)
+            if not ce_vid:
                 self.module.fail_json(msg="Error: ce_vid and pe_vid must be set at the same time "
-                                          "when encapsulation is '%s'." % self.encapsulation)
+                                          "when encapsulation is '%s'." % encapsulation)
+
+    def get_vap_plans(self):
+        """normalize the vaps entries, the bridge_domain_id, encapsulation, ce_vid
+        and pe_vid that an entry does not set are taken from the module options"""
+
+        plans = list()
+        listed = set()
+        for entry in self.vaps:
+            if not isinstance(entry, dict):
+                entry = dict(l2_sub_interface=entry)
+            want = dict()
+            for key in ("l2_sub_interface", "bind_vlan_id", "bridge_domain_id", "encapsulation", "ce_vid", "pe_vid"):
+                want[key] = entry.get(key)
+                if want[key] is None and key not in ("l2_sub_interface", "bind_vlan_id"):
+                    want[key] = getattr(self, key)
+                if want[key] is not None:
+                    want[key] = str(want[key])
+
+            if bool(want["l2_sub_interface"]) == bool(want["bind_vlan_id"]):
+                self.module.fail_json(
+                    msg="Error: Each vap must be a l2_sub_interface, or a dict with "
+                        "either l2_sub_interface or bind_vlan_id.")
+            if want["bridge_domain_id"]:
+                self.check_bd_id_valid(want["bridge_domain_id"])
+
+            if want["bind_vlan_id"]:
+                self.is_vlan_valid(want["bind_vlan_id"], "bind_vlan_id")
+                want["bind_vlan_id"] = str(int(want["bind_vlan_id"]))
+                if not want["bridge_domain_id"]:
+                    self.module.fail_json(
+                        msg="Error: bridge_domain_id must be set to bind vlan %s." % want["bind_vlan_id"])
+                key = "vlan %s" % want["bind_vlan_id"]
+                want.update(encapsulation=None, ce_vid=None, pe_vid=None)
+            else:
+                want["l2_sub_interface"] = want["l2_sub_interface"].replace(" ", "").upper()
+                if not self.is_l2_sub_intf_valid(want["l2_sub_interface"]):
+                    self.module.fail_json(
+                        msg="Error: l2_sub_interface %s is invalid." % want["l2_sub_interface"])
+                if not want["encapsulation"] and not want["bridge_domain_id"]:
+                    self.module.fail_json(
+                        msg="Error: Either encapsulation or bridge_domain_id must be set for %s."
+                            % want["l2_sub_interface"])
+                if want["encapsulation"] and want["encapsulation"] not in ENCAP_TYPES:
+                    self.module.fail_json(
+                        msg="Error: The encapsulation of %s is invalid." % want["l2_sub_interface"])
+                self.check_encap_params(want["encapsulation"], want["ce_vid"], want["pe_vid"])
+                key = want["l2_sub_interface"]
+
+            if key in listed:
+                self.module.fail_json(msg="Error: The %s is listed more than once." % key)
+            listed.add(key)
+            plans.append(want)
+
+        return plans
+
+    def get_encap_item(self, want, sub_intf):
+        """get the encapsulation change of a sub-interface and its command,
+        the bitmaps are compared as integers"""
+
+        ifname = want["l2_sub_interface"]
+        encap = want["encapsulation"]
+        flow_type = sub_intf.get("flowType")
+        vid_bit = 0
+        vids = 0
+        if want["ce_vid"]:
+            vid_bit = vlan_to_bit(want["ce_vid"])
+            if encap == "dot1q":
+                vids = vlan_bitmap_to_int(sub_intf.get("dot1qVids"))
+            else:
+                vids = vlan_bitmap_to_int(sub_intf.get("flowQinqs", dict()).get(want["pe_vid"]))
+
+        if self.state == "present":
+            if encap in ["default", "untag"]:
+                if encap != flow_type:
+                    return CE_NC_ENCAP_ITEM % (ifname, encap), "encapsulation %s" % encap
+            elif encap == "none":
+                if encap != flow_type:
+                    return CE_NC_ENCAP_ITEM % (ifname, "none"), "undo encapsulation %s" % flow_type
+            elif vid_bit:
+                if encap != flow_type or not vids & vid_bit:
+                    vlan_bitmap = vlan_int_to_bitmap(vid_bit)
+                    if encap == "dot1q":
+                        return CE_NC_ENCAP_DOT1Q_ITEM % (ifname, vlan_bitmap, vlan_bitmap), \
+                            "encapsulation dot1q vid %s" % want["ce_vid"]
+                    return CE_NC_ENCAP_QINQ_ITEM % (ifname, want["pe_vid"], vlan_bitmap, vlan_bitmap), \
+                        "encapsulation qinq vid %s ce-vid %s" % (want["pe_vid"], want["ce_vid"])
+            elif encap != flow_type:
+                return CE_NC_ENCAP_ITEM % (ifname, encap), "encapsulation %s" % encap
+        elif encap == flow_type and encap != "none":
+            if not vid_bit:
+                return CE_NC_ENCAP_ITEM % (ifname, "none"), "undo encapsulation %s" % encap
+            if vids & vid_bit:
+                if encap == "dot1q":
+                    return CE_NC_ENCAP_ITEM % (ifname, "none"), \
+                        "undo encapsulation dot1q vid %s" % want["ce_vid"]
+                return CE_NC_ENCAP_ITEM % (ifname, "none"), \
+                    "undo encapsulation qinq vid %s ce-vid %s" % (want["pe_vid"], want["ce_vid"])
+
+        return None, None
+
+    def get_vap_state(self, want, snapshot):
+        """get the k/v pairs of a vaps entry"""
+
+        if want["bind_vlan_id"]:
+            return dict(bind_vlan_id=want["bind_vlan_id"],
+                        bridge_domain_id=snapshot["vlans"].get(want["bind_vlan_id"]))
+
+        ifname = want["l2_sub_interface"]
+        state = dict(l2_sub_interface=ifname,
+                     bridge_domain_id=snapshot["interfaces"].get(ifname))
+        sub_intf = snapshot["sub_intfs"].get(ifname)
+        if not sub_intf:
+            return state
+
+        state["encapsulation"] = sub_intf["flowType"]
+        if sub_intf["flowType"] == "dot1q":
+            state["ce_vid"] = bitmap_to_vlan_list(sub_intf["dot1qVids"])
+        elif sub_intf["flowType"] == "qinq" and sub_intf["flowQinqs"]:
+            pe_vid = want["pe_vid"]
+            if pe_vid not in sub_intf["flowQinqs"]:
+                pe_vid = sorted(sub_intf["flowQinqs"], key=int)[0]
+            state["pe_vid"] = pe_vid
+            state["ce_vid"] = bitmap_to_vlan_list(sub_intf["flowQinqs"][pe_vid])
+        return state
+
+    def config_vaps(self):
+        """diff every requested vap with the vap snapshot, the vlans of a bridge
+        domain are merged into one bitmap, then apply all the encapsulations and
+        all the bridge domain bindings by chunked edits"""
+
+        snapshot = get_vap_snapshot(self.module)
+        plans = self.get_vap_plans()
+        self.proposed = dict(vaps=plans, state=self.state)
+        self.existing = dict(vaps=[self.get_vap_state(want, snapshot) for want in plans])
+
+        encap_items = list()
+        bd_changes = dict()
+        bd_order = list()
+        for want in plans:
+            bd_id = want["bridge_domain_id"]
+            if bd_id and bd_id not in snapshot["bds"]:
+                self.module.fail_json(msg="Error: Bridge domain %s does not exist." % bd_id)
+            if bd_id and bd_id not in bd_changes:
+                bd_changes[bd_id] = dict(value=0, mask=0, intfs=list())
+                bd_order.append(bd_id)
+
+            if want["bind_vlan_id"]:
+                vid = want["bind_vlan_id"]
+                bound_bd = snapshot["vlans"].get(vid)
+                if self.state == "present" and bound_bd != bd_id:
+                    if bound_bd:
+                        self.module.fail_json(
+                            msg="Error: Vlan %s is already bound to bridge domain %s." % (vid, bound_bd))
+                    bd_changes[bd_id]["value"] |= vlan_to_bit(vid)
+                    bd_changes[bd_id]["mask"] |= vlan_to_bit(vid)
+                    self.updates_cmd.append("bridge-domain %s" % bd_id)
+                    self.updates_cmd.append("l2 binding vlan %s" % vid)
+                elif self.state == "absent" and bound_bd == bd_id:
+                    bd_changes[bd_id]["mask"] |= vlan_to_bit(vid)
+                    self.updates_cmd.append("bridge-domain %s" % bd_id)
+                    self.updates_cmd.append("undo l2 binding vlan %s" % vid)
+                continue
+
+            ifname = want["l2_sub_interface"]
+            if want["encapsulation"]:
+                sub_intf = snapshot["sub_intfs"].get(ifname)
+                if not sub_intf:
+                    self.module.fail_json(msg="Error: Interface %s does not exist." % ifname)
+                xml_item, cmd = self.get_encap_item(want, sub_intf)
+                if xml_item:
+                    encap_items.append(xml_item)
+                    self.updates_cmd.append("interface %s" % ifname)
+                    self.updates_cmd.append(cmd)
+
+            if bd_id:
+                bound_bd = snapshot["interfaces"].get(ifname)
+                if self.state == "present" and bound_bd != bd_id:
+                    if bound_bd:
+                        self.module.fail_json(
+                            msg="Error: Interface %s is already bound to bridge domain %s." % (ifname, bound_bd))
+                    bd_changes[bd_id]["intfs"].append(CE_NC_BD_INTF_ITEM % ("merge", ifname))
+                    self.updates_cmd.append("interface %s" % ifname)
+                    self.updates_cmd.append("bridge-domain %s" % bd_id)
+                elif self.state == "absent" and bound_bd == bd_id:
+                    bd_changes[bd_id]["intfs"].append(CE_NC_BD_INTF_ITEM % ("delete", ifname))
+                    self.updates_cmd.append("interface %s" % ifname)
+                    self.updates_cmd.append("undo bridge-domain %s" % bd_id)
+
+        bd_items = list()
+        for bd_id in bd_order:
+            xml_str = ""
+            if bd_changes[bd_id]["mask"]:
+                xml_str += CE_NC_BD_VLAN_ITEM % (vlan_int_to_bitmap(bd_changes[bd_id]["value"]),
+                                                 vlan_int_to_bitmap(bd_changes[bd_id]["mask"]))
+            if bd_changes[bd_id]["intfs"]:
+                xml_str += CE_NC_BD_INTFS_ITEM % "".join(bd_changes[bd_id]["intfs"])
+            if xml_str:
+                bd_items.append(CE_NC_BD_ITEM % (bd_id, xml_str))
+
+        if not encap_items and not bd_items:
+            return
+
+        self.changed = True
+        if self.module.check_mode:
+            return
+
+        # sub-interfaces are encapsulated before they are bound, and unbound before
+        # the encapsulation is removed
+        if self.state == "present":
+            set_nc_config_chunks(self.module, CE_NC_SET_ENCAPS_HEAD, encap_items, CE_NC_SET_ENCAPS_TAIL)
+            set_nc_config_chunks(self.module, CE_NC_SET_BDS_HEAD, bd_items, CE_NC_SET_BDS_TAIL)
+        else:
+            set_nc_config_chunks(self.module, CE_NC_SET_BDS_HEAD, bd_items, CE_NC_SET_BDS_TAIL)
+            set_nc_config_chunks(self.module, CE_NC_SET_ENCAPS_HEAD, encap_items, CE_NC_SET_ENCAPS_TAIL)
+
+    def get_vaps_end_state(self):
+        """get the listed vaps after module execution"""
+
+        snapshot = get_vap_snapshot(self.module, self.changed and not self.module.check_mode)
+        self.end_state = dict(vaps=[self.get_vap_state(want, snapshot) for want in self.proposed["vaps"]])
 
     def get_proposed(self):
         """get proposed info"""
@@ -898,25 +1275,29 @@ class VxlanVap(object):
     def work(self):
         """worker"""
 
-        self.check_params()
-        self.data_init()
-        self.get_existing()
-        self.get_proposed()
-
-        # Traffic encapsulation types
-        if self.encapsulation and self.l2_sub_interface:
-            self.config_traffic_encap()
-
-        # A VXLAN service access point can be a Layer 2 sub-interface or VLAN
-        if self.bridge_domain_id:
-            if self.l2_sub_interface:
-                # configure a Layer 2 sub-interface as a service access point
-                self.config_vap_sub_intf()
-
-            if self.bind_vlan_id:
-                # configure a VLAN as a service access point
-                self.config_vap_vlan()
-        self.get_end_state()
+        if self.vaps:
+            self.config_vaps()
+            self.get_vaps_end_state()
+        else:
+            self.check_params()
+            self.data_init()
+            self.get_existing()
+            self.get_proposed()
+
+            # Traffic encapsulation types
+            if self.encapsulation and self.l2_sub_interface:
+                self.config_traffic_encap()
+
+            # A VXLAN service access point can be a Layer 2 sub-interface or VLAN
+            if self.bridge_domain_id:
+                if self.l2_sub_interface:
+                    # configure a Layer 2 sub-interface as a service access point
+                    self.config_vap_sub_intf()
+
+                if self.bind_vlan_id:
+                    # configure a VLAN as a service access point
+                    self.config_vap_vlan()
+            self.get_end_state()
         self.results['changed'] = self.changed
         self.results['proposed'] = self.proposed
         self.results['existing'] = self.existing
@@ -935,10 +1316,10 @@ def main():
         bridge_domain_id=dict(required=False, type='str'),
         bind_vlan_id=dict(required=False, type='str'),
         l2_sub_interface=dict(required=False, type='str'),
-        encapsulation=dict(required=False, type='str',
-                           choices=['dot1q', 'default', 'untag', 'qinq', 'none']),
+        encapsulation=dict(required=False, type='str', choices=ENCAP_TYPES),
         ce_vid=dict(required=False, type='str'),
         pe_vid=dict(required=False, type='str'),
+        vaps=dict(required=False, type='list'),
         state=dict(required=False, default='present',
                    choices=['present', 'absent'])
     )
@@ -29,6 +29,8 @@
 #
 
 import re
+import fnmatch
+from xml.etree import ElementTree
 
 from ansible.module_utils.basic import env_fallback
 from ansible.module_utils.network_common import to_list, ComplexList
@@ -49,6 +51,7 @@ except ImportError:
 
 _DEVICE_CLI_CONNECTION = None
 _DEVICE_NC_CONNECTION = None
+_DEVICE_SNAPSHOTS = dict()
 
 ce_argument_spec = {
     'host': dict(),
@@ -175,6 +178,8 @@ class Cli:
                 self._module.fail_json(msg=cli_err_msg(cmd.strip(), err))
 
         self.exec_command('return')
+        # the cached configuration is stale now
+        self._device_configs.clear()
 
 
 def cli_err_msg(cmd, err):
@@ -443,3 +448,945 @@ def execute_nc_cli(module, xml_str):
 
     conn = get_nc_connection(module)
     return conn.execute_cli(xml_str)
+
+
+def get_nc_xml_root(xml_str):
+    """get the element tree of a netconf reply without namespaces,
+    None if the reply has no data"""
+
+    if "<data/>" in xml_str:
+        return None
+
+    xml_str = xml_str.replace('\r', '').replace('\n', '').\
+        replace('xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"', "").\
+        replace('xmlns="http://www.huawei.com/netconf/vrp"', "")
+    return ElementTree.fromstring(xml_str)
+
+
+def get_nc_snapshot(module, key, xml_str, parser, refresh=False):
+    """get config by netconf and parse it once,
+    the result is cached by key for the rest of the task"""
+
+    if refresh or key not in _DEVICE_SNAPSHOTS:
+        _DEVICE_SNAPSHOTS[key] = parser(get_nc_config(module, xml_str))
+    return _DEVICE_SNAPSHOTS[key]
+
+
+def set_nc_config_chunks(module, xml_head, xml_items, xml_tail, chunk_size=100):
+    """push many list entries as a few merged edit-config payloads,
+    each one holding at most chunk_size entries"""
+
+    for start in range(0, len(xml_items), chunk_size):
+        xml_str = xml_head + "".join(xml_items[start:start + chunk_size]) + xml_tail
+        recv_xml = set_nc_config(module, xml_str)
+        if "<ok/>" not in recv_xml:
+            module.fail_json(msg='Error: Bulk edit-config failed.')
+
+
+CE_NC_GET_FILE_STARTUP_INDEX = """
+<filter type="subtree">
+  <vfm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <dirs>
+      <dir>
+        <fileName></fileName>
+        <dirName>%s</dirName>
+        <DirSize></DirSize>
+      </dir>
+    </dirs>
+  </vfm>
+  <cfg xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <startupInfos>
+      <startupInfo>
+        <position></position>
+        <configedSysSoft></configedSysSoft>
+        <curSysSoft></curSysSoft>
+        <nextSysSoft></nextSysSoft>
+        <curStartupFile></curStartupFile>
+        <nextStartupFile></nextStartupFile>
+        <curPatchFile></curPatchFile>
+        <nextPatchFile></nextPatchFile>
+      </startupInfo>
+    </startupInfos>
+  </cfg>
+</filter>
+"""
+
+
+def parse_file_startup_index(xml_str):
+    """parse directory listing and startup information reply"""
+
+    index = dict(files=dict(), startup=list())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return index
+
+    for dir_ele in root.findall("data/vfm/dirs/dir"):
+        file_name = dir_ele.findtext("fileName")
+        if not file_name:
+            continue
+        size = (dir_ele.findtext("DirSize") or "0").replace(',', '')
+        index["files"][file_name] = int(size) if size.isdigit() else 0
+
+    for info_ele in root.findall("data/cfg/startupInfos/startupInfo"):
+        info = dict()
+        for ele in info_ele:
+            info[ele.tag] = ele.text
+        index["startup"].append(info)
+
+    return index
+
+
+def get_file_startup_index(module, dir_name='flash:/', refresh=False):
+    """get directory listing and startup information in one netconf read"""
+
+    return get_nc_snapshot(module, ("file", dir_name), CE_NC_GET_FILE_STARTUP_INDEX % dir_name,
+                           parse_file_startup_index, refresh)
+
+
+def clear_file_startup_index():
+    """drop cached directory listing and startup information"""
+
+    for key in list(_DEVICE_SNAPSHOTS.keys()):
+        if key[0] == "file":
+            del _DEVICE_SNAPSHOTS[key]
+
+
+CE_NC_GET_MLAG_SNAPSHOT = """
+<filter type="subtree">
+  <dfs xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <groupInstances>
+      <groupInstance>
+        <groupId></groupId>
+        <priority></priority>
+        <ipAddress></ipAddress>
+        <srcVpnName></srcVpnName>
+        <trillType>
+          <localNickname></localNickname>
+          <pseudoNickname></pseudoNickname>
+          <pseudoPriority></pseudoPriority>
+        </trillType>
+      </groupInstance>
+    </groupInstances>
+  </dfs>
+  <mlag xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <mlagInstances>
+      <mlagInstance>
+        <dfsgroupId></dfsgroupId>
+        <mlagId></mlagId>
+        <localMlagPort></localMlagPort>
+      </mlagInstance>
+    </mlagInstances>
+    <peerlinks>
+      <peerlink>
+        <dfsgroupId></dfsgroupId>
+        <linkId></linkId>
+        <portName></portName>
+      </peerlink>
+    </peerlinks>
+    <errordowns>
+      <errordown>
+        <dfsgroupId></dfsgroupId>
+        <portName></portName>
+        <portState></portState>
+      </errordown>
+    </errordowns>
+  </mlag>
+  <ifmtrunk xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <lacpSysInfo>
+      <lacpMlagGlobal>
+        <lacpMlagSysId></lacpMlagSysId>
+        <lacpMlagPriority></lacpMlagPriority>
+      </lacpMlagGlobal>
+    </lacpSysInfo>
+    <TrunkIfs>
+      <TrunkIf>
+        <ifName></ifName>
+        <lacpMlagIf>
+          <lacpMlagSysId></lacpMlagSysId>
+          <lacpMlagPriority></lacpMlagPriority>
+        </lacpMlagIf>
+      </TrunkIf>
+    </TrunkIfs>
+  </ifmtrunk>
+</filter>
+"""
+
+
+def parse_mlag_snapshot(xml_str):
+    """parse dfs group, m-lag, peer-link, error-down and lacp m-lag reply,
+    indexed by dfs group id and Eth-Trunk name"""
+
+    snapshot = dict(dfs_groups=dict(), mlag_infos=list(), peer_links=list(),
+                    error_downs=list(), lacp_global=dict(), trunks=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    for group_ele in root.findall("data/dfs/groupInstances/groupInstance"):
+        group = dict()
+        for ele in group_ele:
+            if ele.tag == "trillType":
+                for trill_ele in ele:
+                    group[trill_ele.tag] = trill_ele.text
+            else:
+                group[ele.tag] = ele.text
+        snapshot["dfs_groups"][group.get("groupId")] = group
+
+    for key, path in [("mlag_infos", "data/mlag/mlagInstances/mlagInstance"),
+                      ("peer_links", "data/mlag/peerlinks/peerlink"),
+                      ("error_downs", "data/mlag/errordowns/errordown")]:
+        for item_ele in root.findall(path):
+            item = dict()
+            for ele in item_ele:
+                item[ele.tag] = ele.text
+            snapshot[key].append(item)
+
+    for ele in root.findall("data/ifmtrunk/lacpSysInfo/lacpMlagGlobal/*"):
+        snapshot["lacp_global"][ele.tag] = ele.text
+
+    for trunk_ele in root.findall("data/ifmtrunk/TrunkIfs/TrunkIf"):
+        if_name = trunk_ele.findtext("ifName")
+        if not if_name:
+            continue
+        trunk = dict(lacp_mlag=dict(), mlag_infos=list())
+        for ele in trunk_ele.findall("lacpMlagIf/*"):
+            trunk["lacp_mlag"][ele.tag] = ele.text
+        snapshot["trunks"][if_name.upper()] = trunk
+
+    for info in snapshot["mlag_infos"]:
+        port = (info.get("localMlagPort") or "").upper()
+        if port:
+            snapshot["trunks"].setdefault(port, dict(lacp_mlag=dict(), mlag_infos=list()))
+            snapshot["trunks"][port]["mlag_infos"].append(info)
+
+    return snapshot
+
+
+def get_mlag_snapshot(module, refresh=False):
+    """get all dfs group and m-lag state in one netconf read"""
+
+    return get_nc_snapshot(module, ("mlag",), CE_NC_GET_MLAG_SNAPSHOT,
+                           parse_mlag_snapshot, refresh)
+
+
+CE_NC_GET_NVO3_EVPN_SNAPSHOT = """
+<filter type="subtree">
+  <nvo3 xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <nvo3Vni2Bds>
+      <nvo3Vni2Bd>
+        <vniId></vniId>
+        <bdId></bdId>
+      </nvo3Vni2Bd>
+    </nvo3Vni2Bds>
+    <nvo3Nves>
+      <nvo3Nve>
+        <ifName></ifName>
+        <nveType></nveType>
+        <srcAddr></srcAddr>
+        <vniMembers>
+          <vniMember>
+            <vniId></vniId>
+            <protocol></protocol>
+            <nvo3VniPeers>
+              <nvo3VniPeer>
+                <peerAddr></peerAddr>
+              </nvo3VniPeer>
+            </nvo3VniPeers>
+          </vniMember>
+        </vniMembers>
+      </nvo3Nve>
+    </nvo3Nves>
+  </nvo3>
+  <evpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <evpnInstances>
+      <evpnInstance>
+        <evpnName></evpnName>
+        <bdId></bdId>
+        <evpnAutoRD></evpnAutoRD>
+        <evpnRD></evpnRD>
+        <evpnRTs>
+          <evpnRT>
+            <vrfRTType></vrfRTType>
+            <vrfRTValue></vrfRTValue>
+          </evpnRT>
+        </evpnRTs>
+        <evpnAutoRTs>
+          <evpnAutoRT>
+            <vrfRTType></vrfRTType>
+          </evpnAutoRT>
+        </evpnAutoRTs>
+      </evpnInstance>
+    </evpnInstances>
+  </evpn>
+</filter>
+"""
+
+
+def parse_nvo3_evpn_snapshot(xml_str):
+    """parse vni to bd, nve vni member and bd evpn instance reply,
+    indexed by vni id, bd id and nve name"""
+
+    snapshot = dict(vni2bd=dict(), bd2vni=dict(), nves=dict(), evpn_instances=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    for vni2bd in root.findall("data/nvo3/nvo3Vni2Bds/nvo3Vni2Bd"):
+        vni_id = vni2bd.findtext("vniId")
+        bd_id = vni2bd.findtext("bdId")
+        snapshot["vni2bd"][vni_id] = bd_id
+        snapshot["bd2vni"][bd_id] = vni_id
+
+    for nve_ele in root.findall("data/nvo3/nvo3Nves/nvo3Nve"):
+        nve = dict(ifName=nve_ele.findtext("ifName"), nveType=nve_ele.findtext("nveType"),
+                   srcAddr=nve_ele.findtext("srcAddr"), vnis=dict())
+        for member in nve_ele.findall("vniMembers/vniMember"):
+            peers = [peer.text for peer in member.findall("nvo3VniPeers/nvo3VniPeer/peerAddr")]
+            nve["vnis"][member.findtext("vniId")] = dict(protocol=member.findtext("protocol"),
+                                                         peers=peers)
+        snapshot["nves"][nve["ifName"]] = nve
+
+    for inst_ele in root.findall("data/evpn/evpnInstances/evpnInstance"):
+        inst = dict(evpnName=inst_ele.findtext("evpnName"), route_distinguisher=None,
+                    vpn_target_import=list(), vpn_target_export=list())
+        if inst_ele.findtext("evpnAutoRD") == "true":
+            inst["route_distinguisher"] = "auto"
+        elif inst_ele.findtext("evpnRD"):
+            inst["route_distinguisher"] = inst_ele.findtext("evpnRD")
+        for rt_ele in inst_ele.findall("evpnRTs/evpnRT"):
+            rt_type = rt_ele.findtext("vrfRTType")
+            if rt_type == "import_extcommunity":
+                inst["vpn_target_import"].append(rt_ele.findtext("vrfRTValue"))
+            elif rt_type == "export_extcommunity":
+                inst["vpn_target_export"].append(rt_ele.findtext("vrfRTValue"))
+        for rt_ele in inst_ele.findall("evpnAutoRTs/evpnAutoRT"):
+            rt_type = rt_ele.findtext("vrfRTType")
+            if rt_type == "import_extcommunity":
+                inst["vpn_target_import"].append("auto")
+            elif rt_type == "export_extcommunity":
+                inst["vpn_target_export"].append("auto")
+        snapshot["evpn_instances"][inst_ele.findtext("bdId")] = inst
+
+    return snapshot
+
+
+def get_nvo3_evpn_snapshot(module, refresh=False):
+    """get all vxlan vni, nve and bd evpn state in one netconf read"""
+
+    return get_nc_snapshot(module, ("nvo3_evpn",), CE_NC_GET_NVO3_EVPN_SNAPSHOT,
+                           parse_nvo3_evpn_snapshot, refresh)
+
+
+class NetStreamCli(object):
+    """cli helpers shared by the netstream modules, the subclass provides
+    self.module, self.commands, self.updates_cmd and self.ns_config"""
+
+    def cli_load_config(self, commands):
+        """load config by cli"""
+
+        if not self.module.check_mode:
+            load_config(self.module, commands)
+
+    def cli_add_command(self, command, undo=False):
+        """add command to self.update_cmd and self.commands"""
+
+        if undo and command.lower() not in ["quit", "return"]:
+            cmd = "undo " + command
+        else:
+            cmd = command
+
+        self.commands.append(cmd)
+        if command.lower() not in ["quit", "return"]:
+            self.updates_cmd.append(cmd)
+
+    def get_netstream_config(self):
+        """get global and interfaces netstream configuration by one cli read"""
+
+        flags = list()
+        exp = " | ignore-case include ^interface|netstream"
+        flags.append(exp)
+        self.ns_config = parse_netstream_config(get_config(self.module, flags))
+
+
+def get_netstream_interface(ns_config, interface):
+    """get the netstream config of an interface, an empty one is added if not exist"""
+
+    key = interface.upper()
+    if key not in ns_config["interfaces"]:
+        ns_config["interfaces"][key] = dict(interface=interface,
+                                            samplers=list(),
+                                            statistics_direction=list(),
+                                            records=dict(ip=list(), vxlan=list()))
+    return ns_config["interfaces"][key]
+
+
+def parse_netstream_config(cfg):
+    """parse global and all interfaces netstream config in one pass,
+    cfg is the output of display current-configuration | include ^interface|netstream"""
+
+    ns_config = dict(sampler=dict(sampler_interval="null", sampler_direction="null"),
+                     index_switch=dict(ip="16", vxlan="16"),
+                     records=dict(ip=list(), vxlan=list()),
+                     hosts=dict(ip=list(), vxlan=list()),
+                     interfaces=dict())
+
+    port = None
+    for line in cfg.splitlines():
+        args = line.strip().split()
+        if not args:
+            continue
+
+        if line.startswith("interface "):
+            port = get_netstream_interface(ns_config, args[1])
+            continue
+
+        if not line.startswith(" "):
+            port = None
+            if args[:3] == ["netstream", "sampler", "random-packets"] and len(args) == 5:
+                ns_config["sampler"] = dict(sampler_interval=args[3], sampler_direction=args[4])
+            elif args[:2] == ["netstream", "record"] and len(args) >= 4 and args[3] in ["ip", "vxlan"]:
+                ns_config["records"][args[3]].append(args[2])
+            elif args[:2] == ["netstream", "export"] and len(args) > 3 and args[2] in ["ip", "vxlan"]:
+                if args[-2] == "index-switch":
+                    ns_config["index_switch"][args[2]] = args[-1]
+                elif "host" in args:
+                    host = args[args.index("host") + 1:]
+                    if host and host[0] == "ipv6":
+                        host = host[1:]
+                    if len(host) >= 2:
+                        host_vpn = None
+                        if len(host) >= 4 and host[2] == "vpn-instance":
+                            host_vpn = host[3]
+                        ns_config["hosts"][args[2]].append(
+                            dict(host_ip=host[0], host_port=host[1], host_vpn=host_vpn))
+            continue
+
+        if port is None:
+            continue
+        if args[:3] == ["netstream", "sampler", "random-packets"] and len(args) == 5:
+            port["samplers"].append(dict(sampler_interval=args[3], sampler_direction=args[4]))
+        elif args[0] == "netstream" and len(args) == 3 and args[1] in ["inbound", "outbound"]:
+            port["statistics_direction"].append(args[1])
+        elif args[:2] == ["netstream", "record"] and len(args) >= 4 and args[3] in ["ip", "vxlan"]:
+            port["records"][args[3]].append(args[2])
+
+    return ns_config
+
+
+CE_NC_GET_SNMP_SNAPSHOT = """
+<filter type="subtree">
+  <snmp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <engine>
+      <version></version>
+    </engine>
+    <communitys>
+      <community>
+        <communityName></communityName>
+        <accessRight></accessRight>
+        <aclNumber></aclNumber>
+        <mibViewName></mibViewName>
+      </community>
+    </communitys>
+    <snmpv3Groups>
+      <snmpv3Group>
+        <groupName></groupName>
+        <securityLevel></securityLevel>
+        <readViewName></readViewName>
+        <writeViewName></writeViewName>
+        <notifyViewName></notifyViewName>
+        <aclNumber></aclNumber>
+      </snmpv3Group>
+    </snmpv3Groups>
+    <usmUsers>
+      <usmUser>
+        <userName></userName>
+        <remoteEngineID></remoteEngineID>
+        <engineID></engineID>
+        <groupName></groupName>
+        <authProtocol></authProtocol>
+        <authKey></authKey>
+        <privProtocol></privProtocol>
+        <privKey></privKey>
+        <aclNumber></aclNumber>
+      </usmUser>
+    </usmUsers>
+    <localUsers>
+      <localUser>
+        <userName></userName>
+        <authProtocol></authProtocol>
+        <authKey></authKey>
+        <privProtocol></privProtocol>
+        <privKey></privKey>
+      </localUser>
+    </localUsers>
+    <targetHosts>
+      <targetHost>
+        <nmsName></nmsName>
+        <domain></domain>
+        <address></address>
+        <notifyType></notifyType>
+        <vpnInstanceName></vpnInstanceName>
+        <portNumber></portNumber>
+        <securityModel></securityModel>
+        <securityName></securityName>
+        <securityNameV3></securityNameV3>
+        <securityLevel></securityLevel>
+        <isPublicNet></isPublicNet>
+        <interface-name></interface-name>
+      </targetHost>
+    </targetHosts>
+  </snmp>
+</filter>
+"""
+
+SNMP_SNAPSHOT_TABLES = [("communities", "communitys/community"),
+                        ("groups", "snmpv3Groups/snmpv3Group"),
+                        ("usm_users", "usmUsers/usmUser"),
+                        ("local_users", "localUsers/localUser"),
+                        ("target_hosts", "targetHosts/targetHost")]
+
+
+def parse_snmp_snapshot(xml_str):
+    """parse snmp engine version, communities, v3 groups, usm users,
+    local users and target hosts reply, each table is a list of dicts"""
+
+    snapshot = dict(version=None)
+    for table, _ in SNMP_SNAPSHOT_TABLES:
+        snapshot[table] = list()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    snapshot["version"] = root.findtext("data/snmp/engine/version")
+    for table, path in SNMP_SNAPSHOT_TABLES:
+        for row_ele in root.findall("data/snmp/" + path):
+            snapshot[table].append(dict((site.tag, site.text) for site in row_ele))
+
+    return snapshot
+
+
+def get_snmp_snapshot(module, refresh=False):
+    """get all snmp agent netconf config in one netconf read"""
+
+    return get_nc_snapshot(module, ("snmp",), CE_NC_GET_SNMP_SNAPSHOT,
+                           parse_snmp_snapshot, refresh)
+
+
+def get_snmp_rows(rows, keys):
+    """get the rows of a snmp snapshot table with the given keys only"""
+
+    return [dict((key, row[key]) for key in keys if key in row) for row in rows]
+
+
+def get_snmp_agent_config(module, keyword=None):
+    """get the snmp-agent lines of the configuration by one cli read,
+    only the lines that contain keyword if it is given"""
+
+    cfg = get_config(module, ["| include snmp-agent"])
+    if not keyword:
+        return cfg
+    return "\n".join([line for line in cfg.splitlines() if keyword in line])
+
+
+CE_NC_GET_NTP_SNAPSHOT = """
+<filter type="subtree">
+  <ntp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <ntpSystemCfg>
+      <isAuthEnable></isAuthEnable>
+    </ntpSystemCfg>
+    <ntpUCastCfgs>
+      <ntpUCastCfg>
+        <addrFamily></addrFamily>
+        <vpnName></vpnName>
+        <ifName></ifName>
+        <ipv4Addr></ipv4Addr>
+        <ipv6Addr></ipv6Addr>
+        <type></type>
+        <isPreferred></isPreferred>
+        <keyId></keyId>
+      </ntpUCastCfg>
+    </ntpUCastCfgs>
+    <ntpAuthKeyCfgs>
+      <ntpAuthKeyCfg>
+        <keyId></keyId>
+        <mode></mode>
+        <keyVal></keyVal>
+        <isReliable></isReliable>
+      </ntpAuthKeyCfg>
+    </ntpAuthKeyCfgs>
+  </ntp>
+</filter>
+"""
+
+
+def parse_ntp_snapshot(xml_str):
+    """parse ntp authentication enable, unicast server and peer and
+    authentication key reply, unicast and key lists are lists of dicts"""
+
+    snapshot = dict(authentication=None, ucasts=list(), keys=list())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    auth_en = root.findtext("data/ntp/ntpSystemCfg/isAuthEnable")
+    if auth_en is not None:
+        snapshot["authentication"] = 'enable' if auth_en == 'true' else 'disable'
+
+    for ucast_ele in root.findall("data/ntp/ntpUCastCfgs/ntpUCastCfg"):
+        snapshot["ucasts"].append(dict((ele.tag, ele.text) for ele in ucast_ele))
+    for key_ele in root.findall("data/ntp/ntpAuthKeyCfgs/ntpAuthKeyCfg"):
+        snapshot["keys"].append(dict((ele.tag, ele.text) for ele in key_ele))
+
+    return snapshot
+
+
+def get_ntp_snapshot(module, refresh=False):
+    """get ntp authentication, unicast and key config in one netconf read"""
+
+    return get_nc_snapshot(module, ("ntp",), CE_NC_GET_NTP_SNAPSHOT,
+                           parse_ntp_snapshot, refresh)
+
+
+CE_NC_GET_IFM_SNAPSHOT = """
+<filter type="subtree">
+  <ifm xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <interfaces>
+      <interface>
+        <ifName></ifName>
+        <ifPhyType></ifPhyType>
+        <isL2SwitchPort></isL2SwitchPort>
+        <ifMtu></ifMtu>
+      </interface>
+    </interfaces>
+  </ifm>
+</filter>
+"""
+
+
+def parse_ifm_snapshot(xml_str):
+    """parse interfaces reply, a list of dicts"""
+
+    interfaces = list()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return interfaces
+
+    for intf in root.findall("data/ifm/interfaces/interface"):
+        interfaces.append(dict((ele.tag, ele.text) for ele in intf))
+    return interfaces
+
+
+def get_ifm_snapshot(module, refresh=False):
+    """get the name, type, switchport and mtu of all interfaces in one netconf read"""
+
+    return get_nc_snapshot(module, ("ifm",), CE_NC_GET_IFM_SNAPSHOT,
+                           parse_ifm_snapshot, refresh)
+
+
+CE_NC_GET_SYSLOG_SNAPSHOT = """
+<filter type="subtree">
+  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0"/>
+</filter>
+"""
+
+
+CE_NC_MERGE_SYSLOG_HEAD = """
+<config>
+  <syslog xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+"""
+
+
+CE_NC_MERGE_SYSLOG_TAIL = """
+  </syslog>
+</config>
+"""
+
+
+# list containers of the syslog snapshot
+SYSLOG_SNAPSHOT_LISTS = ["icLogFileInfos", "icChannels", "icDirChannels", "icFilters",
+                         "syslogServers", "syslogDNSs", "icSources"]
+
+
+def parse_syslog_snapshot(xml_str):
+    """parse the whole syslog container reply, globalParam is a dict of leaves,
+    every list container is a list of dicts"""
+
+    snapshot = dict(globalParam=dict())
+    for container in SYSLOG_SNAPSHOT_LISTS:
+        snapshot[container] = list()
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    global_ele = root.find("data/syslog/globalParam")
+    if global_ele is not None:
+        snapshot["globalParam"] = dict((ele.tag, ele.text) for ele in global_ele)
+    for container in SYSLOG_SNAPSHOT_LISTS:
+        for entry in root.findall("data/syslog/%s/*" % container):
+            snapshot[container].append(dict((ele.tag, ele.text) for ele in entry))
+
+    return snapshot
+
+
+def get_syslog_snapshot(module, refresh=False):
+    """get the whole info-center (syslog) config in one netconf read"""
+
+    return get_nc_snapshot(module, ("syslog",), CE_NC_GET_SYSLOG_SNAPSHOT,
+                           parse_syslog_snapshot, refresh)
+
+
+def set_syslog_config(module, xml_items):
+    """push info-center global param and list entries in one edit-config,
+    each item is a whole container such as <icSources>...</icSources>,
+    items of the same list container are merged into one container"""
+
+    if not xml_items:
+        return
+
+    containers = list()
+    entries = dict()
+    for xml_item in xml_items:
+        xml_item = xml_item.strip()
+        tag = re.match(r'<(\w+)', xml_item).group(1)
+        if tag not in SYSLOG_SNAPSHOT_LISTS:
+            containers.append((None, xml_item))
+            continue
+        if tag not in entries:
+            entries[tag] = list()
+            containers.append((tag, None))
+        entries[tag].append(xml_item[xml_item.index(">") + 1:xml_item.rindex("<")])
+
+    xml_str = CE_NC_MERGE_SYSLOG_HEAD
+    for tag, xml_item in containers:
+        if tag is None:
+            xml_str += xml_item
+        else:
+            xml_str += "<%s>%s</%s>" % (tag, "".join(entries[tag]), tag)
+    xml_str += CE_NC_MERGE_SYSLOG_TAIL
+
+    recv_xml = set_nc_config(module, xml_str)
+    if "<ok/>" not in recv_xml:
+        module.fail_json(msg='Error: Merge syslog config failed.')
+
+
+CE_NC_GET_BFD_SNAPSHOT = """
+<filter type="subtree">
+  <bfd xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <bfdSchGlobal>
+      <bfdEnable></bfdEnable>
+      <defaultIp></defaultIp>
+    </bfdSchGlobal>
+    <bfdCfgSessions>
+      <bfdCfgSession>
+        <sessName></sessName>
+        <createType></createType>
+        <addrType></addrType>
+        <outIfName></outIfName>
+        <destAddr></destAddr>
+        <srcAddr></srcAddr>
+        <vrfName></vrfName>
+        <useDefaultIp></useDefaultIp>
+        <localDiscr></localDiscr>
+        <remoteDiscr></remoteDiscr>
+        <minTxInt></minTxInt>
+        <minRxInt></minRxInt>
+        <detectMulti></detectMulti>
+        <wtrTimerInt></wtrTimerInt>
+        <tosExp></tosExp>
+        <adminDown></adminDown>
+        <description></description>
+      </bfdCfgSession>
+    </bfdCfgSessions>
+  </bfd>
+</filter>
+"""
+
+
+def parse_bfd_snapshot(xml_str):
+    """parse bfd global and session reply, sessions are indexed by name"""
+
+    snapshot = dict(globals=dict(), sessions=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    global_ele = root.find("data/bfd/bfdSchGlobal")
+    if global_ele is not None:
+        snapshot["globals"] = dict((ele.tag, ele.text) for ele in global_ele)
+
+    for session_ele in root.findall("data/bfd/bfdCfgSessions/bfdCfgSession"):
+        session = dict((ele.tag, ele.text) for ele in session_ele)
+        snapshot["sessions"][session.get("sessName")] = session
+
+    return snapshot
+
+
+def get_bfd_snapshot(module, refresh=False):
+    """get bfd global config and all configured sessions in one netconf read"""
+
+    return get_nc_snapshot(module, ("bfd",), CE_NC_GET_BFD_SNAPSHOT,
+                           parse_bfd_snapshot, refresh)
+
+
+CE_NC_GET_DLDP_SNAPSHOT = """
+<filter type="subtree">
+  <dldp xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <dldpSys>
+      <dldpEnable></dldpEnable>
+      <dldpInterval></dldpInterval>
+      <dldpWorkMode></dldpWorkMode>
+      <dldpAuthMode></dldpAuthMode>
+    </dldpSys>
+    <dldpInterfaces>
+      <dldpInterface>
+        <ifName></ifName>
+        <dldpEnable></dldpEnable>
+        <dldpCompatibleEnable></dldpCompatibleEnable>
+        <dldpLocalMac></dldpLocalMac>
+      </dldpInterface>
+    </dldpInterfaces>
+  </dldp>
+</filter>
+"""
+
+
+def parse_dldp_snapshot(xml_str):
+    """parse dldp global and interface reply, interfaces are indexed by
+    upper case interface name"""
+
+    snapshot = dict(globals=dict(), interfaces=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    global_ele = root.find("data/dldp/dldpSys")
+    if global_ele is not None:
+        snapshot["globals"] = dict((ele.tag, ele.text) for ele in global_ele)
+
+    for intf_ele in root.findall("data/dldp/dldpInterfaces/dldpInterface"):
+        intf = dict((ele.tag, ele.text) for ele in intf_ele)
+        if intf.get("ifName"):
+            snapshot["interfaces"][intf["ifName"].upper()] = intf
+
+    return snapshot
+
+
+def get_dldp_snapshot(module, refresh=False):
+    """get dldp global config and the config of all interfaces in one netconf read"""
+
+    return get_nc_snapshot(module, ("dldp",), CE_NC_GET_DLDP_SNAPSHOT,
+                           parse_dldp_snapshot, refresh)
+
+
+CE_NC_GET_L3VPN_SNAPSHOT = """
+<filter type="subtree">
+  <l3vpn xmlns="http://www.huawei.com/netconf/vrp" content-version="1.0" format-version="1.0">
+    <l3vpncomm>
+      <l3vpnInstances>
+        <l3vpnInstance>
+          <vrfName></vrfName>
+          <vrfDescription></vrfDescription>
+          <vpnInstAFs>
+            <vpnInstAF>
+              <afType></afType>
+              <vrfRD></vrfRD>
+              <vpnTargets>
+                <vpnTarget>
+                  <vrfRTType></vrfRTType>
+                  <vrfRTValue></vrfRTValue>
+                </vpnTarget>
+              </vpnTargets>
+              <exVpnTargets>
+                <exVpnTarget>
+                  <vrfRTType></vrfRTType>
+                  <vrfRTValue></vrfRTValue>
+                  <extAddrFamily></extAddrFamily>
+                </exVpnTarget>
+              </exVpnTargets>
+            </vpnInstAF>
+          </vpnInstAFs>
+          <l3vpnIfs>
+            <l3vpnIf>
+              <ifName></ifName>
+            </l3vpnIf>
+          </l3vpnIfs>
+        </l3vpnInstance>
+      </l3vpnInstances>
+    </l3vpncomm>
+  </l3vpn>
+</filter>
+"""
+
+
+def parse_l3vpn_snapshot(xml_str):
+    """parse l3vpn instance reply, vrfs are indexed by name, the address
+    families of a vrf by afType, and the bound interfaces by upper case
+    interface name"""
+
+    snapshot = dict(vrfs=dict(), interfaces=dict())
+    root = get_nc_xml_root(xml_str)
+    if root is None:
+        return snapshot
+
+    for vrf_ele in root.findall("data/l3vpn/l3vpncomm/l3vpnInstances/l3vpnInstance"):
+        vrf = dict(vrfName=vrf_ele.findtext("vrfName"),
+                   vrfDescription=vrf_ele.findtext("vrfDescription"),
+                   afs=dict(), interfaces=list())
+        for af_ele in vrf_ele.findall("vpnInstAFs/vpnInstAF"):
+            af = dict(afType=af_ele.findtext("afType"),
+                      vrfRD=af_ele.findtext("vrfRD"),
+                      vpnTargets=list(), evpnTargets=list())
+            for rt_ele in af_ele.findall("vpnTargets/vpnTarget"):
+                af["vpnTargets"].append(dict((ele.tag, ele.text) for ele in rt_ele))
+            for rt_ele in af_ele.findall("exVpnTargets/exVpnTarget"):
+                af["evpnTargets"].append(dict((ele.tag, ele.text) for ele in rt_ele))
+            vrf["afs"][af["afType"]] = af
+        for if_ele in vrf_ele.findall("l3vpnIfs/l3vpnIf"):
+            if_name = if_ele.findtext("ifName")
+            if if_name:
+                vrf["interfaces"].append(if_name)
+                snapshot["interfaces"][if_name.upper()] = vrf["vrfName"]
+        snapshot["vrfs"][vrf["vrfName"]] = vrf
+
+    return snapshot
+
+
+def get_l3vpn_snapshot(module, refresh=False):
+    """get all vpn instances with their address families, route targets
+    and bound interfaces in one netconf read"""
+
+    return get_nc_snapshot(module, ("l3vpn",), CE_NC_GET_L3VPN_SNAPSHOT,
+                           parse_l3vpn_snapshot, refresh)
+
+
+def is_interface_pattern(interface):
+    """is the interface name a glob pattern, i.e. 10GE1/0/*"""
+
+    return any(char in interface for char in "*?[")
+
+
+def match_interfaces(names, pattern):
+    """interface names that match a glob pattern, case insensitive"""
+
+    return [name for name in names if fnmatch.fnmatchcase(name.upper(), pattern.upper())]
+
+
+def vlan_bitmap_to_int(bitmap):
+    """convert a vlan bitmap of 1024 hex digits to an integer,
+    vlan N is the bit 1 << (4095 - N)"""
+
+    if not bitmap:
+        return 0
+    return int(bitmap, 16)
+
+
+def vlan_int_to_bitmap(value):
+    """convert an integer to a vlan bitmap of 1024 hex digits"""
+
+    return "%01024x" % value
+
+
+def vlan_to_bit(vid):
+    """get the bit of a vlan in the integer of a vlan bitmap"""
+
+    return 1 << (4095 - int(vid))